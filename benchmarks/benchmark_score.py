@@ -0,0 +1,336 @@
+"""
+Benchmark do Cálculo de Score
+
+Mede, para cada quantidade de agências, o tempo e o pico de memória de cada etapa do cálculo:
+scores dos KPIs (faixa, com e sem tabela de consulta, inflexão e índice), agregação do tema, score pilar, score global e
+a leitura/escrita dos resultados em cada formato. Os dados de entrada são gerados pelos
+geradores sintéticos de src/utils/faker e os resultados são gravados em JSON, podendo ser
+comparados com uma execução de referência (baseline).
+
+Exemplo:
+    python benchmarks/benchmark_score.py --sizes 10000 --sizes 1000000 --baseline benchmarks/baseline.json
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import typer
+
+from src.models.models_common.score_aggregation import aggregate_scores
+from src.models.models_global.score_global.global_calculator import (
+    ScoreGlobalCalculator,
+)
+from src.models.models_global.score_global.models import (
+    ScoreDetails as ScoreDetailsGlobal,
+)
+from src.models.models_kpi.calculator_score.esg.esg.score_ica import (
+    Model_Score_ICA_batch,
+)
+from src.models.models_kpi.calculator_score.performance.aa.score_atm import (
+    calculadora_score,
+)
+from src.models.models_kpi.calculator_score.performance.ab.score_tcx import (
+    Model_Score_TCX_batch,
+)
+from src.models.models_kpi.lookup import get_lookup_scorer
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+from src.utils.benchmark_functions import (
+    compare_results,
+    load_results,
+    run_stage,
+    save_results,
+    skip_stage,
+)
+from src.utils.faker.generate_faker_dataframe_aa import (
+    generate_dataframe_score_view as generate_dataframe_aa,
+)
+from src.utils.faker.generate_faker_dataframe_ab import (
+    generate_dataframe_score_view as generate_dataframe_ab,
+)
+from src.utils.faker.generate_faker_dataframe_esg import (
+    generate_dataframe_esg_score_view as generate_dataframe_esg,
+)
+from src.utils.faker.generate_faker_dataframe_infra_civil import (
+    generate_dataframe_score_view as generate_dataframe_infra_civil,
+)
+from src.utils.pandas_functions import load_data_auto, save_data_auto
+
+app = typer.Typer()
+
+# Diretório padrão dos resultados e arquivo padrão da execução de referência
+DIR_BENCHMARK = Path(__file__).parent
+DEFAULT_BASELINE = Path(DIR_BENCHMARK, "baseline.json")
+
+# Quantidade máxima de linhas de dados em uma planilha Excel (descontando o cabeçalho)
+EXCEL_MAX_ROWS = 1_048_575
+
+# Colunas chave mantidas nos DataFrames de entrada
+KEY_COLUMNS = ["CD_PONTO", "DIA", "MES", "ANO"]
+
+# Faixa dos percentuais de indisponibilidade do ATM: cobre as três faixas do modelo (0-4, 4-8 e 8-100)
+INDISPONIBILIDADE_ATM = (0.0, 16.0)
+
+# Faixa dos índices de consumo de água (consumo / consumo base), em torno dos pontos do modelo (1.0 e 1.3)
+INDICE_AGUA = (0.5, 2.0)
+
+
+def build_inputs(n, seed=None):
+    """
+    Gera os DataFrames sintéticos de entrada, mantendo apenas as colunas usadas nas etapas.
+
+    Args:
+        n (int): Quantidade de agências.
+        seed (int, optional): Semente do gerador aleatório.
+
+    Returns:
+        dict: DataFrames de entrada, por tema ('AA', 'AB', 'INFRA_CIVIL', 'ESG'), e os valores dos
+        KPIs de faixa e de índice ('KPI'), no domínio dos respectivos modelos.
+    """
+    generators = {
+        "AA": (
+            generate_dataframe_aa,
+            ["SCORE_OCORRENCIAS", "SCORE_RECORRENCIA", "SCORE_MTTR"],
+        ),
+        "AB": (generate_dataframe_ab, ["VOLUME_RECORRENCIA"]),
+        "INFRA_CIVIL": (generate_dataframe_infra_civil, []),
+        "ESG": (generate_dataframe_esg, []),
+    }
+
+    # Os temas são gerados um a um, descartando as colunas não usadas para limitar a memória
+    inputs = {}
+    for tema, (generator, columns) in generators.items():
+        df = generator(n=n, save=False, seed=seed)
+        inputs[tema] = df[KEY_COLUMNS + columns + ["SCORE_TEMA", "FAROL_TEMA"]].copy()
+        del df
+
+    # Percentuais com duas casas decimais (faixas do ATM) e índices de consumo (modelo do ICA)
+    rng = np.random.default_rng(seed)
+    inputs["KPI"] = pd.DataFrame(
+        {
+            "INDISPONIBILIDADE_ATM": np.round(rng.uniform(*INDISPONIBILIDADE_ATM, size=n), 2),
+            "INDICE_AGUA": np.round(rng.uniform(*INDICE_AGUA, size=n), 2),
+        }
+    )
+
+    return inputs
+
+
+def run_scenario(n, formats, repeat=1, seed=None):
+    """
+    Executa todas as etapas do benchmark para uma quantidade de agências.
+
+    Args:
+        n (int): Quantidade de agências.
+        formats (list): Formatos de arquivo da etapa de leitura/escrita (ex.: ['csv', 'parquet']).
+        repeat (int): Quantidade de repetições de cada etapa. Default: 1.
+        seed (int, optional): Semente do gerador aleatório.
+
+    Returns:
+        list: Lista de BenchmarkResult, uma por etapa.
+    """
+    results = []
+    inputs = build_inputs(n, seed=seed)
+
+    def stage(name, function, rows=n):
+        result, output = run_stage(name, n, rows, function, repeat=repeat)
+        results.append(result)
+        return output
+
+    # SCORES DOS KPIS
+    stage(
+        "kpi_faixa",
+        lambda: calculadora_score.calcular_score_batch(
+            inputs["KPI"]["INDISPONIBILIDADE_ATM"].to_numpy(), model="indisponibilidade"
+        ),
+    )
+    stage(
+        "kpi_faixa_lookup",
+        lambda: get_lookup_scorer("ATM").calcular_score_batch(
+            inputs["KPI"]["INDISPONIBILIDADE_ATM"].to_numpy()
+        ),
+    )
+    stage(
+        "kpi_inflexao",
+        lambda: Model_Score_TCX_batch(inputs["AB"]["VOLUME_RECORRENCIA"].to_numpy()),
+    )
+    stage(
+        "kpi_indice",
+        lambda: Model_Score_ICA_batch(
+            indices=inputs["KPI"]["INDICE_AGUA"].to_numpy(), minimo=0, maximo=10
+        ),
+    )
+
+    # AGREGAÇÃO DO TEMA (KPIS DE AA)
+    details_tema = [
+        ScoreDetails(
+            dataframe=inputs["AA"], score_column=score_column, weight=weight, category=kpi
+        )
+        for kpi, score_column, weight in [
+            ("OCORRENCIAS", "SCORE_OCORRENCIAS", 0.2),
+            ("RECORRENCIA", "SCORE_RECORRENCIA", 0.7),
+            ("MTTR", "SCORE_MTTR", 0.1),
+        ]
+    ]
+    stage(
+        "tema_aggregation",
+        lambda: aggregate_scores(
+            details_tema, score_column="SCORE_TEMA", farol_column="FAROL_TEMA"
+        ),
+    )
+
+    # SCORE PILAR PERFORMANCE
+    details_pilar = [
+        ScoreDetails(
+            dataframe=inputs[tema], score_column="SCORE_TEMA", weight=1 / 3, category=tema
+        )
+        for tema in ["AA", "AB", "INFRA_CIVIL"]
+    ]
+    df_pilar = stage(
+        "score_pilar",
+        lambda: ScorePilarPerformance(details_pilar, dia=1, mes=9, ano=2024).score_pilar,
+    )
+
+    # SCORE GLOBAL
+    df_esg = inputs["ESG"].rename(
+        columns={"SCORE_TEMA": "SCORE_PILAR", "FAROL_TEMA": "FAROL_PILAR"}
+    )
+    details_global = [
+        ScoreDetailsGlobal(
+            dataframe=df_esg,
+            score_column="SCORE_PILAR",
+            farol_column="FAROL_PILAR",
+            weight=0.2,
+            category="ESG",
+        ),
+        ScoreDetailsGlobal(
+            dataframe=df_pilar,
+            score_column="SCORE_PILAR",
+            farol_column="FAROL_PILAR",
+            weight=0.8,
+            category="PERFORMANCE",
+        ),
+    ]
+    stage(
+        "score_global",
+        lambda: ScoreGlobalCalculator(details_global, dia=1, mes=9, ano=2024).score_global,
+    )
+
+    # LEITURA E ESCRITA DO RESULTADO DO PILAR EM CADA FORMATO
+    with tempfile.TemporaryDirectory() as dir_temp:
+        for file_format in formats:
+            if file_format == "xlsx" and n > EXCEL_MAX_ROWS:
+                detail = f"O formato xlsx suporta no máximo {EXCEL_MAX_ROWS} linhas"
+                results.append(skip_stage(f"save_{file_format}", n, detail))
+                results.append(skip_stage(f"load_{file_format}", n, detail))
+                continue
+
+            file_path = Path(dir_temp, f"BASE_SCORE_PILAR_PERFORMANCE.{file_format}")
+            stage(
+                f"save_{file_format}",
+                lambda: save_data_auto(dataframe=df_pilar, file_path=file_path),
+            )
+            stage(f"load_{file_format}", lambda: load_data_auto(file_path))
+
+    return results
+
+
+def run_benchmark(sizes, formats, repeat=1, seed=None):
+    """
+    Executa o benchmark para todas as quantidades de agências informadas.
+
+    Args:
+        sizes (list): Quantidades de agências.
+        formats (list): Formatos de arquivo da etapa de leitura/escrita.
+        repeat (int): Quantidade de repetições de cada etapa. Default: 1.
+        seed (int, optional): Semente do gerador aleatório.
+
+    Returns:
+        list: Lista de BenchmarkResult de todos os cenários.
+    """
+    results = []
+    for n in sizes:
+        results.extend(run_scenario(n, formats, repeat=repeat, seed=seed))
+    return results
+
+
+@app.command()
+def main(
+    sizes: List[int] = typer.Option(
+        [10_000, 1_000_000, 10_000_000], help="Quantidades de agências dos cenários."
+    ),
+    formats: List[str] = typer.Option(
+        ["csv", "parquet", "xlsx"], help="Formatos da etapa de leitura/escrita."
+    ),
+    output_file: Optional[Path] = typer.Option(
+        None, help="Arquivo JSON de resultados. Default: benchmarks/results/benchmark_<data>.json"
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None, help="Arquivo JSON de referência para comparação. Default: benchmarks/baseline.json, se existir."
+    ),
+    save_baseline: bool = typer.Option(
+        False, "--save-baseline", help="Gravar os resultados como a nova referência."
+    ),
+    tolerance: float = typer.Option(
+        0.1, help="Variação relativa tolerada na comparação com a referência."
+    ),
+    repeat: int = typer.Option(1, min=1, help="Quantidade de repetições de cada etapa."),
+    seed: Optional[int] = typer.Option(42, help="Semente do gerador aleatório."),
+    fail_on_regression: bool = typer.Option(
+        False, "--fail-on-regression", help="Encerrar com erro se houver regressão."
+    ),
+):
+    results = run_benchmark(sizes, formats, repeat=repeat, seed=seed)
+
+    if output_file is None:
+        output_file = Path(
+            DIR_BENCHMARK, "results", f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+        )
+    save_results(results, output_file)
+
+    for result in results:
+        typer.echo(
+            f"{result.stage:<18} {result.size:>10} "
+            + (
+                f"{result.seconds:>10.3f}s {result.rows_per_second or 0:>14,.0f} linhas/s "
+                f"{result.peak_rss_mb or 0:>10.1f} MB"
+                if result.status == "ok"
+                else f"ignorada: {result.detail}"
+            )
+        )
+
+    baseline = baseline or (DEFAULT_BASELINE if DEFAULT_BASELINE.exists() else None)
+    regressions = []
+    if baseline is not None:
+        comparison = compare_results(results, load_results(baseline), tolerance=tolerance)
+        typer.echo(f"\nComparação com {baseline} (tolerância {tolerance:.0%}):")
+        for item in comparison:
+            typer.echo(
+                f"{item['stage']:<18} {item['size']:>10} vazão x{item['throughput_ratio']} "
+                f"memória x{item['peak_rss_ratio']}"
+                + ("  <-- REGRESSÃO" if item["regression"] else "")
+            )
+        regressions = [item for item in comparison if item["regression"]]
+
+    if save_baseline:
+        save_results(results, DEFAULT_BASELINE)
+
+    if regressions and fail_on_regression:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
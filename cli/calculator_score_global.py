@@ -1,5 +1,6 @@
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 sys.path.append(str(Path(__file__).parent.parent))
 
@@ -9,12 +10,86 @@ from src.models.models_global.score_global.global_calculator import (
     ScoreGlobalCalculator,
 )
 from src.models.models_global.score_global.models import ScoreDetails
-from src.utils.pandas_functions import load_data_auto, save_data_auto
+from src.utils.arrow_functions import (
+    ARROW_OUTPUT_EXTENSIONS,
+    load_data_arrow_parallel,
+    save_data_arrow,
+)
+from src.utils.pandas_functions import (
+    ARROW_EXTENSIONS,
+    DataLoadError,
+    clear_cache,
+    find_data_file,
+    load_data_parallel,
+    save_data_auto,
+    save_data_partitioned,
+)
+
+from src.utils.profile_functions import profiling
+from src.utils.sqlite_functions import SQLITE_EXTENSIONS
 
 app = typer.Typer()
 
+
+def build_details(file_path, chunk_size, arrow=False, query=False, **details_kwargs):
+    # No modo em blocos, o arquivo da categoria deve estar em CSV ou Parquet
+    if chunk_size:
+        file_path = find_data_file(file_path, [".parquet", ".csv"])
+    elif query:
+        # Nas consultas, os formatos colunares permitem empurrar os filtros e as colunas para a leitura
+        file_path = find_data_file(file_path, [".parquet", *ARROW_EXTENSIONS, ".csv", ".xlsx"])
+    elif arrow:
+        # No modo Arrow, os arquivos Arrow/Feather e Parquet são preferidos ao arquivo Excel
+        file_path = find_data_file(file_path, [*ARROW_EXTENSIONS, ".parquet", ".csv", ".xlsx"])
+    return ScoreDetails(file_path=str(file_path), **details_kwargs)
+
+
+def load_details(details_list, workers, use_cache, arrow=False):
+    # Carregando os arquivos de todas as categorias ao mesmo tempo
+    file_paths = {details.category: details.file_path for details in details_list}
+    try:
+        if arrow:
+            dataframes = load_data_arrow_parallel(file_paths, workers=workers)
+        else:
+            dataframes = load_data_parallel(file_paths, workers=workers, use_cache=use_cache)
+    except DataLoadError as error:
+        for category, exception in error.errors.items():
+            typer.echo(f"Erro ao carregar os scores de {category}: {exception}", err=True)
+        raise typer.Exit(code=1)
+
+    return [
+        details.model_copy(update={"dataframe": dataframes[details.category]})
+        for details in details_list
+    ]
+
+
+def run_query(details_list, output_path, workers, use_cache, cd_ponto, ano, mes, dia, categoria, coluna):
+    # Consulta preguiçosa: apenas as linhas, categorias e colunas solicitadas são lidas e calculadas
+    query = ScoreGlobalCalculator.query(details_list)
+    if cd_ponto:
+        query = query.where_agencies(cd_ponto)
+    query = query.where_period(ano=ano, mes=mes, dia=dia)
+    try:
+        if categoria:
+            query = query.where_categories([value.upper() for value in categoria])
+        if coluna:
+            query = query.select([value.upper() for value in coluna])
+        typer.echo(query.explain())
+        dataframe = query.collect(workers=workers, use_cache=use_cache)
+    except DataLoadError as error:
+        for category, exception in error.errors.items():
+            typer.echo(f"Erro ao carregar os scores de {category}: {exception}", err=True)
+        raise typer.Exit(code=1)
+    except ValueError as error:
+        typer.echo(f"Consulta inválida: {error}", err=True)
+        raise typer.Exit(code=1)
+
+    save_data_auto(dataframe=dataframe, file_path=output_path)
+    typer.echo(f"{len(dataframe)} linhas da consulta salvas com sucesso em {output_path}")
+
 @app.command()
 def main(
+    ctx: typer.Context,
     input_dir: Path = typer.Option(
         ...,
         exists=True,
@@ -31,14 +106,81 @@ def main(
     include_performance: bool = typer.Option(True, help="Incluir scores do pilar Performance"),
     weight_esg: float = typer.Option(0.2, help="Peso para scores do pilar ESG"),
     weight_performance: float = typer.Option(0.8, help="Peso para scores do pilar Performance"),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Utilizar o cache colunar dos arquivos Excel"
+    ),
+    clear_cache_files: bool = typer.Option(
+        False, "--clear-cache", help="Remover o cache colunar antes da execução"
+    ),
+    chunk_size: Optional[int] = typer.Option(
+        None,
+        min=1,
+        help="Calcular em blocos com a quantidade de linhas informada (entradas CSV/Parquet ordenadas por CD_PONTO)",
+    ),
+    workers: Optional[int] = typer.Option(
+        None, min=1, help="Quantidade de workers da leitura paralela dos arquivos (default: um por arquivo, limitado às CPUs)"
+    ),
+    partitioned: bool = typer.Option(
+        False,
+        "--partitioned",
+        help="Gravar o resultado particionado por período (ANO=/MES=/DIA=) em <output-dir>/<nome do arquivo>/",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Recalcular apenas as agências alteradas desde a execução anterior (estado gravado ao lado do arquivo de saída)",
+    ),
+    compact: bool = typer.Option(
+        False,
+        "--compact",
+        help="Gravar o resultado no esquema compacto (pesos nos metadados, faróis categóricos e chaves em inteiros menores)",
+    ),
+    arrow: bool = typer.Option(
+        False,
+        "--arrow",
+        help="Calcular em Arrow, sem conversão para pandas (entradas Arrow/Feather ou Parquet; saída .arrow/.feather, .parquet ou .csv)",
+    ),
+    cd_ponto: Optional[List[int]] = typer.Option(
+        None, help="Consultar apenas esta agência, podendo ser repetido (filtro empurrado para a leitura)"
+    ),
+    ano: Optional[int] = typer.Option(None, help="Consultar apenas os períodos deste ano"),
+    mes: Optional[int] = typer.Option(None, min=1, max=12, help="Consultar apenas os períodos deste mês"),
+    dia: Optional[int] = typer.Option(None, min=1, max=31, help="Consultar apenas os períodos deste dia"),
+    categoria: Optional[List[str]] = typer.Option(
+        None, help="Consultar apenas as colunas desta categoria, podendo ser repetido"
+    ),
+    coluna: Optional[List[str]] = typer.Option(
+        None, help="Coluna do resultado da consulta, podendo ser repetido (as colunas chave são sempre mantidas)"
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Medir o tempo, a CPU, as linhas e a memória de cada etapa (linhas JSON no log)",
+    ),
+    profile_output: Optional[Path] = typer.Option(
+        None, dir_okay=False, help="Gravar as medições das etapas neste arquivo (linhas JSON); implica --profile"
+    ),
+    profile_dump: Optional[Path] = typer.Option(
+        None, dir_okay=False, help="Gravar o cProfile da etapa mais lenta neste arquivo (pstats); implica --profile"
+    ),
 ):
+    if profile or profile_output or profile_dump:
+        # A instrumentação permanece ativa até o encerramento do comando
+        ctx.with_resource(profiling(dump_path=profile_dump, output_path=profile_output))
+
     details_list = []
+    query_mode = bool(cd_ponto or ano or mes or dia or categoria or coluna)
+
+    if clear_cache_files:
+        clear_cache(input_dir)
 
     if include_esg:
-        df_esg = load_data_auto(Path(input_dir, "ESG", "BASE_SCORE_TEMA_ESG.xlsx"))
         details_list.append(
-            ScoreDetails(
-                dataframe=df_esg,
+            build_details(
+                Path(input_dir, "ESG", "BASE_SCORE_TEMA_ESG.xlsx"),
+                chunk_size,
+                arrow=arrow,
+                query=query_mode,
                 score_column="SCORE_PILAR",
                 farol_column="FAROL_PILAR",
                 weight=weight_esg,
@@ -47,10 +189,12 @@ def main(
         )
 
     if include_performance:
-        df_performance = load_data_auto(Path(input_dir, "PERFORMANCE", "BASE_SCORE_TEMA_PERFORMANCE.xlsx"))
         details_list.append(
-            ScoreDetails(
-                dataframe=df_performance,
+            build_details(
+                Path(input_dir, "PERFORMANCE", "BASE_SCORE_TEMA_PERFORMANCE.xlsx"),
+                chunk_size,
+                arrow=arrow,
+                query=query_mode,
                 score_column="SCORE_PILAR",
                 farol_column="FAROL_PILAR",
                 weight=weight_performance,
@@ -62,20 +206,92 @@ def main(
         typer.echo("Nenhuma categoria de score foi selecionada. Encerrando execução.")
         raise typer.Exit()
 
-    # Assumindo uniformidade nas datas entre os pilares
-    dia = details_list[0].dataframe["DIA"].iloc[0]
-    mes = details_list[0].dataframe["MES"].iloc[0]
-    ano = details_list[0].dataframe["ANO"].iloc[0]
+    if arrow and (chunk_size or partitioned or incremental or compact):
+        typer.echo(
+            "O modo em blocos, a gravação particionada, o modo incremental e o esquema compacto não são suportados no modo Arrow.",
+            err=True,
+        )
+        raise typer.Exit(code=1)
 
-    # Calculando o score pilar
-    score_calculator = ScoreGlobalCalculator(
-        details_list=details_list, dia=dia, mes=mes, ano=ano
-    )
-    df_score_global = score_calculator.score_global
+    if query_mode:
+        if arrow or chunk_size or partitioned or incremental or compact:
+            typer.echo(
+                "O modo Arrow, o modo em blocos, a gravação particionada, o modo incremental e o esquema compacto não são suportados nas consultas.",
+                err=True,
+            )
+            raise typer.Exit(code=1)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        run_query(
+            details_list, output_dir / output_file, workers, use_cache, cd_ponto, ano, mes, dia, categoria, coluna
+        )
+        raise typer.Exit()
+
+    if not chunk_size:
+        details_list = load_details(details_list, workers, use_cache, arrow=arrow)
 
     output_path = output_dir / output_file
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    if arrow:
+        # O modo Arrow grava arquivos Arrow IPC/Feather (mapeáveis em memória), Parquet ou CSV
+        if output_path.suffix not in ARROW_OUTPUT_EXTENSIONS:
+            output_path = output_path.with_suffix(".arrow")
+
+        table = ScoreGlobalCalculator(details_list=details_list, arrow=True).score_global
+        save_data_arrow(table, output_path)
+        typer.echo(f"{table.num_rows} scores calculados em Arrow e salvos com sucesso em {output_path}")
+        raise typer.Exit()
+
+    if chunk_size:
+        if partitioned or incremental or compact:
+            typer.echo(
+                "A gravação particionada, o esquema compacto e o modo incremental não são suportados no modo em blocos.",
+                err=True,
+            )
+            raise typer.Exit(code=1)
+
+        # O modo em blocos grava arquivos CSV, Parquet ou Excel (em streaming)
+        if output_path.suffix not in [".csv", ".parquet", ".xlsx"]:
+            output_path = output_path.with_suffix(".parquet")
+
+        rows = ScoreGlobalCalculator.calculate_streaming(
+            details_list, output_path=output_path, chunk_size=chunk_size
+        )
+        typer.echo(f"{rows} scores globais calculados em blocos e salvos com sucesso em {output_path}")
+        raise typer.Exit()
+
+    if incremental:
+        if partitioned or compact:
+            typer.echo(
+                "A gravação particionada e o esquema compacto não são suportados no modo incremental.",
+                err=True,
+            )
+            raise typer.Exit(code=1)
+        if output_path.suffix.lower() in SQLITE_EXTENSIONS:
+            # O resultado anterior é relido do arquivo de saída, e não do banco
+            typer.echo("O modo incremental não suporta a gravação em banco SQLite (.db/.sqlite).", err=True)
+            raise typer.Exit(code=1)
+
+        result = ScoreGlobalCalculator.calculate_incremental(details_list, output_path)
+        typer.echo(
+            f"Score global calculado de forma incremental ({result.rows_recomputed} linhas recalculadas, "
+            f"{result.rows_removed} removidas) e salvo com sucesso em {output_path}"
+        )
+        raise typer.Exit()
+
+    # Calculando o score global de cada par (CD_PONTO, período) das entradas
+    score_calculator = ScoreGlobalCalculator(details_list=details_list, compact=compact)
+    df_score_global = score_calculator.score_global
+
+    if partitioned:
+        dir_path = output_dir / output_path.stem
+        files = save_data_partitioned(
+            dataframe=df_score_global, dir_path=dir_path, file_name=output_path.name
+        )
+        typer.echo(f"Score global calculado e salvo com sucesso em {len(files)} períodos em {dir_path}")
+        raise typer.Exit()
+
     save_data_auto(dataframe=df_score_global, file_path=output_path)
 
     typer.echo(f"Score global calculado e salvo com sucesso em {output_path}")
@@ -0,0 +1,158 @@
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import typer
+
+from src.models.models_common.score_hierarchy import get_default_hierarchy
+from src.models.models_common.score_pipeline import run_pipeline
+from src.models.models_pilar.score_pilar_performance.weights import adjust_default_weights
+from src.utils.pandas_functions import DataLoadError, clear_cache
+from src.utils.profile_functions import profiling
+from src.utils.sqlite_functions import load_hierarchy_status
+
+# Instanciando o typer
+app = typer.Typer()
+
+# Definindo o peso default dos temas
+default_weight = 1 / 3
+default_weight_rounded = round(1 / 3, 2)
+
+
+@app.command()
+def main(
+    ctx: typer.Context,
+    input_dir: Path = typer.Option(
+        ...,
+        exists=True,
+        file_okay=False,
+        help="Caminho para o diretório com os arquivos de score dos temas (ex.: data/data_tema).",
+    ),
+    output_dir: Path = typer.Option(
+        ..., file_okay=False, help="Caminho para salvar os arquivos de resultados."
+    ),
+    output_file: Optional[str] = typer.Option(
+        "BASE_SCORE_GLOBAL.xlsx", help="Nome do arquivo de saída do score global."
+    ),
+    save_pilares: bool = typer.Option(
+        False, "--save-pilares/--no-save-pilares", help="Salvar também o score de cada pilar"
+    ),
+    weight_aa: Optional[float] = typer.Option(
+        None, help="Peso para scores de AA no pilar Performance (default: o peso do settings)"
+    ),
+    weight_ab: Optional[float] = typer.Option(
+        None, help="Peso para scores de AB no pilar Performance (default: o peso do settings)"
+    ),
+    weight_infra: Optional[float] = typer.Option(
+        None, help="Peso para scores de Infra Civil no pilar Performance (default: o peso do settings)"
+    ),
+    weight_esg: Optional[float] = typer.Option(None, help="Peso para scores do pilar ESG (default: o peso do settings)"),
+    weight_performance: Optional[float] = typer.Option(
+        None, help="Peso para scores do pilar Performance (default: o peso do settings)"
+    ),
+    status_db: Optional[Path] = typer.Option(
+        None,
+        exists=True,
+        dir_okay=False,
+        help="Banco com as tabelas TBL_PILARES e TBL_TEMAS: pilares e temas desabilitados não são calculados",
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Utilizar o cache colunar dos arquivos Excel"
+    ),
+    clear_cache_files: bool = typer.Option(
+        False, "--clear-cache", help="Remover o cache colunar antes da execução"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, min=1, help="Quantidade de workers da leitura paralela dos arquivos (default: um por arquivo, limitado às CPUs)"
+    ),
+    partitioned: bool = typer.Option(
+        False,
+        "--partitioned",
+        help="Gravar as saídas particionadas por período (ANO=/MES=/DIA=) em diretórios com o nome de cada arquivo",
+    ),
+    compact: bool = typer.Option(
+        False,
+        "--compact",
+        help="Gravar as saídas no esquema compacto (pesos nos metadados, faróis categóricos e chaves em inteiros menores)",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Medir o tempo, a CPU, as linhas e a memória de cada etapa (linhas JSON no log)",
+    ),
+    profile_output: Optional[Path] = typer.Option(
+        None, dir_okay=False, help="Gravar as medições das etapas neste arquivo (linhas JSON); implica --profile"
+    ),
+    profile_dump: Optional[Path] = typer.Option(
+        None, dir_okay=False, help="Gravar o cProfile da etapa mais lenta neste arquivo (pstats); implica --profile"
+    ),
+):
+    if profile or profile_output or profile_dump:
+        # A instrumentação permanece ativa até o encerramento do comando
+        ctx.with_resource(profiling(dump_path=profile_dump, output_path=profile_output))
+
+    if clear_cache_files:
+        clear_cache(input_dir)
+
+    if not output_file and not save_pilares:
+        typer.echo("Nenhuma saída foi selecionada. Encerrando execução.")
+        raise typer.Exit()
+
+    # Pesos informados: substituem apenas os pesos correspondentes da hierarquia do settings
+    weights = {}
+    tema_weights = {"AA": weight_aa, "AB": weight_ab, "INFRA_CIVIL": weight_infra}
+    if None not in tema_weights.values():
+        # Os três pesos default arredondados (0.33) correspondem ao peso default exato
+        adjusted = adjust_default_weights(
+            list(tema_weights.values()), default_weight, default_weight_rounded
+        )
+        tema_weights = dict(zip(tema_weights, adjusted))
+    tema_weights = {name: weight for name, weight in tema_weights.items() if weight is not None}
+    pilar_weights = {
+        name: weight
+        for name, weight in {"ESG": weight_esg, "PERFORMANCE": weight_performance}.items()
+        if weight is not None
+    }
+    if tema_weights:
+        weights["PILAR"] = {"PERFORMANCE": tema_weights}
+    if pilar_weights:
+        weights["GLOBAL"] = {"GLOBAL": pilar_weights}
+
+    try:
+        hierarchy = get_default_hierarchy()
+        if weights:
+            hierarchy = hierarchy.with_weights(weights)
+        if status_db is not None:
+            hierarchy = hierarchy.apply_status(load_hierarchy_status(status_db))
+        hierarchy = hierarchy.prune()
+    except ValueError as error:
+        typer.echo(f"Hierarquia inválida: {error}", err=True)
+        raise typer.Exit(code=1)
+
+    try:
+        run_pipeline(
+            input_dir=input_dir,
+            output_dir=output_dir,
+            hierarchy=hierarchy,
+            output_file=output_file,
+            save_pilares=save_pilares,
+            use_cache=use_cache,
+            workers=workers,
+            partitioned=partitioned,
+            compact=compact,
+        )
+    except DataLoadError as error:
+        for file_path, exception in error.errors.items():
+            typer.echo(f"Erro ao carregar o tema {file_path}: {exception}", err=True)
+        raise typer.Exit(code=1)
+    except ValueError as error:
+        typer.echo(f"Erro ao calcular ou gravar os scores: {error}", err=True)
+        raise typer.Exit(code=1)
+
+    typer.echo(f"Scores dos pilares e score global calculados e salvos com sucesso em {output_dir}")
+
+
+if __name__ == "__main__":
+    app()
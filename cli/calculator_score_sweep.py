@@ -0,0 +1,179 @@
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import typer
+
+from src.models.models_common.score_sweep import build_weight_grid, sample_weights
+from src.models.models_global.score_global.global_calculator import (
+    ScoreGlobalCalculator,
+)
+from src.models.models_global.score_global.models import (
+    ScoreDetails as ScoreDetailsGlobal,
+)
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+from src.utils.pandas_functions import DataLoadError, load_data_parallel, save_data_auto
+
+# Instanciando o typer: um subcomando por nível de score
+app = typer.Typer(help="Análise de sensibilidade dos pesos do score global e do score pilar.")
+
+
+def build_weight_matrix(n_categories, step, samples, seed):
+    # Amostra aleatória de vetores de pesos ou, por padrão, a grade completa
+    try:
+        if samples:
+            return sample_weights(n_categories, samples, seed=seed)
+        return build_weight_grid(n_categories, step=step)
+    except ValueError as error:
+        typer.echo(str(error), err=True)
+        raise typer.Exit(code=1)
+
+
+def load_details(details_list, workers, use_cache):
+    # Carregando os arquivos de todas as categorias ao mesmo tempo
+    try:
+        dataframes = load_data_parallel(
+            {details.category: details.file_path for details in details_list},
+            workers=workers,
+            use_cache=use_cache,
+        )
+    except DataLoadError as error:
+        for category, exception in error.errors.items():
+            typer.echo(f"Erro ao carregar os scores de {category}: {exception}", err=True)
+        raise typer.Exit(code=1)
+
+    return [
+        details.model_copy(update={"dataframe": dataframes[details.category]})
+        for details in details_list
+    ]
+
+
+def run_sweep(calculator, details_list, weight_matrix, output_path):
+    try:
+        start = time.perf_counter()
+        df_sweep = calculator.calculate_sweep(details_list, weight_matrix)
+        elapsed = time.perf_counter() - start
+    except ValueError as error:
+        typer.echo(f"Pesos inválidos: {error}", err=True)
+        raise typer.Exit(code=1)
+
+    save_data_auto(dataframe=df_sweep, file_path=str(output_path))
+    typer.echo(
+        f"{len(df_sweep)} cenários de pesos calculados em {elapsed:.2f}s e salvos com sucesso em {output_path}"
+    )
+
+
+@app.command("global")
+def sweep_global(
+    input_dir: Path = typer.Option(
+        ..., exists=True, file_okay=False, help="Caminho para o diretório com os arquivos de score dos pilares."
+    ),
+    output_dir: Path = typer.Option(
+        ..., file_okay=False, help="Caminho para salvar o arquivo de resultados."
+    ),
+    output_file: str = typer.Option(
+        "SWEEP_SCORE_GLOBAL.xlsx", help="Nome do arquivo de saída (um cenário por linha)."
+    ),
+    weight_esg: float = typer.Option(0.2, help="Peso atual do pilar ESG (referência das mudanças de farol)"),
+    weight_performance: float = typer.Option(
+        0.8, help="Peso atual do pilar Performance (referência das mudanças de farol)"
+    ),
+    step: float = typer.Option(0.1, help="Passo da grade de pesos (ex.: 0.05)"),
+    samples: Optional[int] = typer.Option(
+        None, min=1, help="Sortear a quantidade informada de vetores de pesos em vez da grade"
+    ),
+    seed: Optional[int] = typer.Option(None, help="Semente do sorteio dos vetores de pesos"),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Utilizar o cache colunar dos arquivos Excel"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, min=1, help="Quantidade de workers da leitura paralela dos arquivos (default: um por arquivo, limitado às CPUs)"
+    ),
+):
+    """
+    Calcula o score global para uma grade (ou amostra) de pesos dos pilares.
+    """
+    details_list = load_details(
+        [
+            ScoreDetailsGlobal(
+                file_path=str(Path(input_dir, category, f"BASE_SCORE_TEMA_{category}.xlsx")),
+                score_column="SCORE_PILAR",
+                farol_column="FAROL_PILAR",
+                weight=weight,
+                category=category,
+            )
+            for category, weight in [("ESG", weight_esg), ("PERFORMANCE", weight_performance)]
+        ],
+        workers,
+        use_cache,
+    )
+
+    run_sweep(
+        ScoreGlobalCalculator,
+        details_list,
+        build_weight_matrix(len(details_list), step, samples, seed),
+        output_dir / output_file,
+    )
+
+
+@app.command("pilar")
+def sweep_pilar(
+    input_dir: Path = typer.Option(
+        ..., exists=True, file_okay=False, help="Caminho para o diretório com os arquivos de score dos temas."
+    ),
+    output_dir: Path = typer.Option(
+        ..., file_okay=False, help="Caminho para salvar o arquivo de resultados."
+    ),
+    output_file: str = typer.Option(
+        "SWEEP_SCORE_PILAR_PERFORMANCE.xlsx", help="Nome do arquivo de saída (um cenário por linha)."
+    ),
+    weight_aa: float = typer.Option(1 / 3, help="Peso atual dos scores de AA (referência das mudanças de farol)"),
+    weight_ab: float = typer.Option(1 / 3, help="Peso atual dos scores de AB (referência das mudanças de farol)"),
+    weight_infra: float = typer.Option(
+        1 / 3, help="Peso atual dos scores de Infra Civil (referência das mudanças de farol)"
+    ),
+    step: float = typer.Option(0.1, help="Passo da grade de pesos (ex.: 0.05)"),
+    samples: Optional[int] = typer.Option(
+        None, min=1, help="Sortear a quantidade informada de vetores de pesos em vez da grade"
+    ),
+    seed: Optional[int] = typer.Option(None, help="Semente do sorteio dos vetores de pesos"),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Utilizar o cache colunar dos arquivos Excel"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, min=1, help="Quantidade de workers da leitura paralela dos arquivos (default: um por arquivo, limitado às CPUs)"
+    ),
+):
+    """
+    Calcula o score do pilar Performance para uma grade (ou amostra) de pesos dos temas.
+    """
+    details_list = load_details(
+        [
+            ScoreDetails(
+                file_path=str(Path(input_dir, category, f"BASE_SCORE_{category}.xlsx")),
+                score_column="SCORE_TEMA",
+                weight=weight,
+                category=category,
+            )
+            for category, weight in [("AA", weight_aa), ("AB", weight_ab), ("INFRA_CIVIL", weight_infra)]
+        ],
+        workers,
+        use_cache,
+    )
+
+    run_sweep(
+        ScorePilarPerformance,
+        details_list,
+        build_weight_matrix(len(details_list), step, samples, seed),
+        output_dir / output_file,
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,97 @@
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import typer
+
+from src.utils.faker.generate_faker_dataframe import (
+    TEMA_SPECS,
+    FakerConfig,
+    generate_faker_data,
+)
+
+# Instanciando o typer
+app = typer.Typer()
+
+
+def parse_taxa_ausencia_tema(values):
+    # Taxas de ausência por tema, no formato TEMA=TAXA (ex.: AA=0.05)
+    taxas = {}
+    for value in values:
+        tema, separator, taxa = value.partition("=")
+        try:
+            taxas[tema.strip().upper()] = float(taxa)
+        except ValueError:
+            separator = ""
+        if not separator:
+            typer.echo(f"Taxa de ausência inválida: {value}. Formato esperado: TEMA=TAXA", err=True)
+            raise typer.Exit(code=1)
+    return taxas
+
+
+@app.command()
+def generate(
+    output_dir: Path = typer.Option(
+        ..., file_okay=False, help="Diretório base das bases geradas (<PILAR>/<TEMA>/BASE_SCORE_<TEMA>.<formato>)."
+    ),
+    agencias: int = typer.Option(9999, min=1, help="Quantidade de agências"),
+    periodos: int = typer.Option(1, min=1, help="Quantidade de períodos mensais"),
+    ano_inicio: int = typer.Option(2024, help="Ano do primeiro período"),
+    mes_inicio: int = typer.Option(9, min=1, max=12, help="Mês do primeiro período"),
+    seed: Optional[int] = typer.Option(None, help="Semente da geração (default: sorteada e exibida)"),
+    tema: Optional[List[str]] = typer.Option(
+        None, help=f"Tema gerado, podendo ser repetido (default: {', '.join(TEMA_SPECS)})"
+    ),
+    formato: str = typer.Option("parquet", help="Formato dos arquivos: parquet, csv ou xlsx"),
+    chunk_agencias: int = typer.Option(100_000, min=1, help="Quantidade de agências de cada bloco gravado"),
+    correlacao_periodos: float = typer.Option(
+        0.5, min=0, max=1, help="Correlação entre os períodos de uma mesma agência"
+    ),
+    correlacao_kpis: float = typer.Option(0.3, min=0, max=1, help="Correlação entre os KPIs de um mesmo período"),
+    taxa_ausencia: float = typer.Option(0.0, min=0, max=1, help="Proporção das agências ausentes em cada tema"),
+    taxa_ausencia_tema: Optional[List[str]] = typer.Option(
+        None, help="Proporção das agências ausentes de um tema, no formato TEMA=TAXA (ex.: AA=0.05)"
+    ),
+):
+    """
+    Gera as bases sintéticas de score dos temas para N agências × M períodos.
+    """
+    formato = formato.lower().strip(".")
+    if formato not in ["parquet", "csv", "xlsx"]:
+        typer.echo(f"Formato não suportado: {formato}", err=True)
+        raise typer.Exit(code=1)
+
+    try:
+        config = FakerConfig(
+            agencias=agencias,
+            periodos=periodos,
+            ano_inicio=ano_inicio,
+            mes_inicio=mes_inicio,
+            seed=seed,
+            correlacao_periodos=correlacao_periodos,
+            correlacao_kpis=correlacao_kpis,
+            taxa_ausencia=taxa_ausencia,
+            taxa_ausencia_tema=parse_taxa_ausencia_tema(taxa_ausencia_tema or []),
+        )
+        start = time.perf_counter()
+        paths = generate_faker_data(
+            config,
+            output_dir,
+            temas=[value.upper() for value in tema] if tema else None,
+            formato=formato,
+            chunk_agencias=chunk_agencias,
+        )
+    except ValueError as error:
+        typer.echo(f"Parâmetros inválidos: {error}", err=True)
+        raise typer.Exit(code=1)
+
+    for name, path in paths.items():
+        typer.echo(f"Base do tema {name} salva com sucesso em {path}")
+    typer.echo(f"Bases geradas em {time.perf_counter() - start:.2f}s (seed={config.seed})")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,95 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import typer
+
+from src.models.models_common.score_hierarchy import (
+    calculate_hierarchy,
+    get_default_hierarchy,
+    load_hierarchy,
+)
+from src.models.models_common.score_service import (
+    ScoreService,
+    ScoreSnapshot,
+    ScoringEngine,
+    ServiceConfig,
+)
+from src.models.models_common.score_store import MmapScoreStore
+from src.utils.pandas_functions import DataLoadError
+
+# Instanciando o typer
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    host: Optional[str] = typer.Option(None, help="Endereço TCP do serviço (default: SERVICE.HOST)"),
+    port: Optional[int] = typer.Option(None, help="Porta TCP do serviço (default: SERVICE.PORT)"),
+    unix_socket: Optional[Path] = typer.Option(None, help="Caminho do socket Unix (substitui host e porta)"),
+    store_dir: Optional[Path] = typer.Option(
+        None,
+        exists=True,
+        file_okay=False,
+        help="Repositório mapeado em memória (MmapScoreStore) com os últimos scores das agências.",
+    ),
+    input_dir: Optional[Path] = typer.Option(
+        None,
+        exists=True,
+        file_okay=False,
+        help="Diretório dos arquivos de tema: os últimos scores são calculados na inicialização.",
+    ),
+    batch_window_ms: Optional[float] = typer.Option(None, help="Janela do micro-lote, em milissegundos"),
+    max_batch_size: Optional[int] = typer.Option(None, help="Quantidade máxima de pedidos por micro-lote"),
+    max_pending: Optional[int] = typer.Option(None, help="Quantidade máxima de pedidos na fila"),
+    queue_timeout_ms: Optional[float] = typer.Option(
+        None, help="Espera máxima por espaço na fila antes de recusar o pedido, em milissegundos"
+    ),
+):
+    """
+    Inicia o serviço local de score (HTTP e JSON lines), com micro-lotes.
+    """
+    if store_dir and input_dir:
+        typer.echo("Informe apenas um entre --store-dir e --input-dir.", err=True)
+        raise typer.Exit(code=1)
+
+    try:
+        config = ServiceConfig.from_settings(
+            host=host,
+            port=port,
+            unix_socket=str(unix_socket) if unix_socket else None,
+            batch_window_ms=batch_window_ms,
+            max_batch_size=max_batch_size,
+            max_pending=max_pending,
+            queue_timeout_ms=queue_timeout_ms,
+        )
+    except ValueError as error:
+        typer.echo(f"Parâmetros inválidos: {error}", err=True)
+        raise typer.Exit(code=1)
+
+    # Carregando os últimos scores das agências uma única vez, na inicialização
+    hierarchy = get_default_hierarchy().prune()
+    snapshot = None
+    if store_dir:
+        snapshot = ScoreSnapshot.from_store(MmapScoreStore(store_dir))
+    elif input_dir:
+        try:
+            dataframes = load_hierarchy(hierarchy, input_dir)
+        except DataLoadError as error:
+            for name, exception in error.errors.items():
+                typer.echo(f"Erro ao carregar os scores de {name}: {exception}", err=True)
+            raise typer.Exit(code=1)
+        snapshot = ScoreSnapshot.from_scores(calculate_hierarchy(hierarchy, dataframes))
+
+    service = ScoreService(ScoringEngine(hierarchy=hierarchy, snapshot=snapshot), config)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        typer.echo("Serviço de score encerrado.")
+
+
+if __name__ == "__main__":
+    app()
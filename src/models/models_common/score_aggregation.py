@@ -0,0 +1,473 @@
+"""
+Módulo de Agregação de Scores
+
+Este módulo contém o motor de agregação compartilhado pelos cálculos de score pilar e score global.
+Cada categoria é indexada uma única vez pela chave (CD_PONTO e, quando as entradas possuem as
+colunas de data, o período ANO/MES/DIA) e todas as categorias são alinhadas em um único join N-way,
+sem cópias intermediárias dos DataFrames de entrada. Assim, entradas com vários períodos são
+calculadas em uma única passada vetorizada. O score ponderado e a renormalização pelos pesos
+disponíveis são calculados como uma única operação matricial.
+
+As entradas podem ser DataFrames ou tabelas Arrow (pyarrow.Table): as colunas Arrow numéricas
+sem nulos são lidas sem cópia e, com arrow=True, o resultado é montado diretamente como uma
+pyarrow.Table, sem a conversão intermediária para DataFrame.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from src.utils.farol_functions import CATEGORIAS_FAROL, classificar_farol
+from src.utils.profile_functions import profile_stage
+
+# Colunas de data mantidas no resultado, na ordem de saída
+DATE_COLUMNS = ["DIA", "MES", "ANO"]
+
+# Colunas do período, da mais para a menos significativa (ordem de classificação do resultado)
+PERIOD_COLUMNS = ["ANO", "MES", "DIA"]
+
+
+def _is_arrow(frame):
+    return hasattr(frame, "column_names")
+
+
+def _columns(frame):
+    # Colunas de um DataFrame ou de uma tabela Arrow
+    return frame.column_names if _is_arrow(frame) else frame.columns
+
+
+def _column(frame, column):
+    # Coluna como pd.Series: colunas Arrow numéricas sem nulos são convertidas sem cópia
+    return frame.column(column).to_pandas() if _is_arrow(frame) else frame[column]
+
+
+def _combine_chunks(detail, index_column):
+    """
+    Une em um único bloco as colunas usadas de uma tabela Arrow lida em vários blocos.
+
+    Tabelas lidas de arquivos Parquet possuem um bloco por grupo de linhas; as colunas usadas no
+    cálculo são unidas uma única vez, para que as leituras seguintes não copiem os dados.
+
+    Args:
+        detail (ScoreDetails): Detalhes da categoria.
+        index_column (str): Nome da coluna chave.
+
+    Returns:
+        ScoreDetails: Os mesmos detalhes ou uma cópia com a tabela Arrow em um único bloco.
+    """
+    frame = detail.dataframe
+    if not _is_arrow(frame) or all(column.num_chunks <= 1 for column in frame.columns):
+        return detail
+
+    used = {index_column, *DATE_COLUMNS, detail.score_column, getattr(detail, "farol_column", None)}
+    table = frame.select([column for column in frame.column_names if column in used])
+    return detail.model_copy(update={"dataframe": table.combine_chunks()})
+
+
+def get_key_columns(details_list, index_column="CD_PONTO"):
+    """
+    Obtém as colunas chave do alinhamento das categorias.
+
+    Quando todas as categorias possuem as colunas de data, cada período (ANO, MES, DIA)
+    é calculado separadamente; caso contrário, a chave é apenas a coluna de índice.
+
+    Args:
+        details_list (list): Lista de objetos ScoreDetails.
+        index_column (str): Nome da coluna chave dos DataFrames. Default: 'CD_PONTO'.
+
+    Returns:
+        list: Colunas chave, da mais para a menos significativa.
+    """
+    if all(
+        all(column in _columns(detail.dataframe) for column in DATE_COLUMNS)
+        for detail in details_list
+    ):
+        return [index_column, *PERIOD_COLUMNS]
+    return [index_column]
+
+
+def _encode_keys(frames, key_columns):
+    """
+    Codifica as colunas chave inteiras em um único inteiro de 64 bits, preservando a ordem.
+
+    Cada coluna ocupa uma faixa de valores (do mínimo ao máximo entre todos os DataFrames), de
+    forma que a ordem dos códigos é a ordem lexicográfica das colunas chave.
+
+    Args:
+        frames (list): DataFrames (ou tabelas Arrow) das categorias.
+        key_columns (list): Colunas chave, da mais para a menos significativa.
+
+    Returns:
+        tuple: (códigos de cada DataFrame, mínimos, multiplicadores e amplitudes de cada coluna),
+        ou None se alguma coluna não for inteira ou se os códigos não couberem em 64 bits.
+    """
+    minimos, amplitudes = [], []
+    for column in key_columns:
+        if not all(pd.api.types.is_integer_dtype(_column(frame, column)) for frame in frames):
+            return None
+        valores = [_column(frame, column).to_numpy() for frame in frames if len(frame)]
+        minimo = min((int(v.min()) for v in valores), default=0)
+        maximo = max((int(v.max()) for v in valores), default=0)
+        minimos.append(minimo)
+        amplitudes.append(maximo - minimo + 1)
+
+    # Multiplicadores: a última coluna é a menos significativa
+    multiplicadores = [1] * len(key_columns)
+    for i in range(len(key_columns) - 2, -1, -1):
+        multiplicadores[i] = multiplicadores[i + 1] * amplitudes[i + 1]
+    if multiplicadores[0] * amplitudes[0] >= 2**62:
+        return None
+
+    codes = []
+    for frame in frames:
+        code = np.zeros(len(frame), dtype=np.int64)
+        for column, minimo, multiplicador in zip(key_columns, minimos, multiplicadores):
+            code += (_column(frame, column).to_numpy(dtype=np.int64) - minimo) * multiplicador
+        codes.append(code)
+
+    return codes, minimos, multiplicadores, amplitudes
+
+
+def build_key_indexes(frames, key_columns):
+    """
+    Cria o índice da chave de cada DataFrame, em um espaço de chaves comum a todos eles.
+
+    Colunas chave inteiras são codificadas em um único inteiro de 64 bits (ver _encode_keys);
+    caso contrário, é utilizado um MultiIndex (ou o índice da única coluna chave).
+
+    Args:
+        frames (list): DataFrames (ou tabelas Arrow) com as colunas chave.
+        key_columns (list): Colunas chave, da mais para a menos significativa.
+
+    Returns:
+        tuple: (índices de cada DataFrame, parâmetros da codificação ou None).
+    """
+    encoded = _encode_keys(frames, key_columns) if len(key_columns) > 1 else None
+    if encoded is not None:
+        indexes = [pd.Index(code) for code in encoded[0]]
+    elif len(key_columns) > 1:
+        indexes = [
+            pd.MultiIndex.from_arrays([_column(frame, column).to_numpy() for column in key_columns])
+            for frame in frames
+        ]
+    else:
+        indexes = [pd.Index(_column(frame, key_columns[0])) for frame in frames]
+
+    return indexes, encoded
+
+
+def decode_keys(index, key_columns, encoded, dtypes):
+    """
+    Converte um índice de chaves (ver build_key_indexes) no DataFrame das colunas chave.
+
+    Args:
+        index (Index): Índice de chaves.
+        key_columns (list): Colunas chave.
+        encoded (tuple): Parâmetros da codificação ou None.
+        dtypes (dict): Tipo de cada coluna chave.
+
+    Returns:
+        DataFrame: DataFrame com as colunas chave.
+    """
+    if encoded is not None:
+        _, minimos, multiplicadores, amplitudes = encoded
+        codes = index.to_numpy()
+        return pd.DataFrame(
+            {
+                column: ((codes // multiplicador) % amplitude + minimo).astype(dtypes[column])
+                for column, minimo, multiplicador, amplitude in zip(
+                    key_columns, minimos, multiplicadores, amplitudes
+                )
+            }
+        )
+
+    if len(key_columns) > 1:
+        return pd.DataFrame(
+            {column: index.get_level_values(column_position).to_numpy()
+             for column_position, column in enumerate(key_columns)}
+        )
+
+    return pd.DataFrame({key_columns[0]: index.to_numpy()})
+
+
+def _shares_key_columns(frames, key_columns):
+    """
+    Verifica se todos os DataFrames referenciam a mesma memória nas colunas chave.
+
+    É o caso das categorias lidas de um mesmo MmapScoreStore, que compartilham o índice das
+    agências: as chaves são iguais por construção e o join pode ser dispensado.
+
+    Args:
+        frames (list): DataFrames (ou tabelas Arrow) das categorias.
+        key_columns (list): Colunas chave.
+
+    Returns:
+        bool: True se houver mais de um DataFrame e todos compartilharem as colunas chave.
+    """
+    if len(frames) < 2:
+        return False
+
+    for column in key_columns:
+        first = _column(frames[0], column).to_numpy()
+        for frame in frames[1:]:
+            values = _column(frame, column).to_numpy()
+            if (
+                values.__array_interface__["data"][0] != first.__array_interface__["data"][0]
+                or values.shape != first.shape
+                or values.strides != first.strides
+                or values.dtype != first.dtype
+            ):
+                return False
+    return True
+
+
+def align_scores(details_list, index_column="CD_PONTO", key_columns=None):
+    """
+    Alinha os scores de todas as categorias em uma matriz indexada pela chave.
+
+    Quando todas as categorias compartilham as colunas chave (ver _shares_key_columns), a chave
+    é indexada uma única vez e, se já estiver ordenada, os scores são copiados sem join.
+
+    Args:
+        details_list (list): Lista de objetos ScoreDetails.
+        index_column (str): Nome da coluna chave dos DataFrames. Default: 'CD_PONTO'.
+        key_columns (list, optional): Colunas chave (ver get_key_columns). Default: [index_column].
+
+    Returns:
+        tuple: (keys, positions, score_matrix), em que keys é o DataFrame ordenado com a
+        união das chaves de todas as categorias, positions é a lista com a posição de
+        cada linha de entrada em keys (uma por categoria) e score_matrix é a matriz
+        (chaves x categorias) com os scores alinhados (NaN para chaves ausentes).
+
+    Raises:
+        ValueError: Se alguma categoria possuir chaves duplicadas.
+    """
+    key_columns = key_columns or [index_column]
+    frames = [detail.dataframe for detail in details_list]
+
+    shared = _shares_key_columns(frames, key_columns)
+    indexes, encoded = build_key_indexes(frames[:1] if shared else frames, key_columns)
+    if shared:
+        indexes = indexes * len(frames)
+
+    for detail, index in zip(details_list, indexes):
+        if not index.is_unique:
+            raise ValueError(
+                f"A categoria {detail.category} possui valores duplicados de {', '.join(key_columns)}."
+            )
+
+    if shared and indexes[0].is_monotonic_increasing:
+        # Chaves compartilhadas e ordenadas: a união é a própria chave
+        union = indexes[0]
+        positions = [np.arange(len(union))] * len(frames)
+    else:
+        # União ordenada das chaves de todas as categorias (join N-way)
+        union = reduce(lambda left, right: left.union(right), indexes).sort_values()
+        positions = [union.get_indexer(index) for index in indexes]
+
+    keys = decode_keys(
+        union, key_columns, encoded, {column: _column(frames[0], column).dtype for column in key_columns}
+    )
+
+    score_matrix = np.full((len(keys), len(details_list)), np.nan, dtype=np.float64)
+    for j, (detail, position) in enumerate(zip(details_list, positions)):
+        score_matrix[position, j] = _column(detail.dataframe, detail.score_column).to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+
+    return keys, positions, score_matrix
+
+
+def weighted_score(score_matrix, weights):
+    """
+    Calcula o score ponderado renormalizando pelos pesos das categorias disponíveis.
+
+    Para cada agência, soma os scores ponderados das categorias presentes e divide pela
+    soma dos pesos dessas mesmas categorias, em uma única operação matricial.
+
+    Args:
+        score_matrix (np.ndarray): Matriz (agências x categorias) de scores, com NaN para ausentes.
+        weights (array-like): Peso de cada categoria.
+
+    Returns:
+        np.ndarray: Score ponderado de cada agência (NaN se nenhuma categoria estiver disponível).
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    available = ~np.isnan(score_matrix)
+
+    # Soma por linha (em vez de um produto BLAS), para que o resultado de cada
+    # agência não dependa da quantidade de linhas processadas em conjunto
+    numerator = (np.where(available, score_matrix, 0.0) * weights).sum(axis=1)
+    denominator = (available * weights).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = numerator / denominator
+    scores[denominator == 0] = np.nan
+
+    return scores
+
+
+def _align_farol(detail, keys, position):
+    """
+    Alinha a coluna de farol de uma categoria às chaves do resultado.
+
+    Args:
+        detail (ScoreDetails): Detalhes da categoria, com a coluna de farol.
+        keys (DataFrame): Chaves do resultado.
+        position (np.ndarray): Posição de cada linha da categoria em keys.
+
+    Returns:
+        pd.Categorical: Farol da categoria alinhado às chaves.
+    """
+    farol = pd.Categorical(
+        _column(detail.dataframe, detail.farol_column),
+        categories=CATEGORIAS_FAROL,
+        ordered=True,
+    )
+    codes = np.full(len(keys), -1, dtype=np.int8)
+    codes[position] = farol.codes
+
+    return pd.Categorical.from_codes(codes, categories=CATEGORIAS_FAROL, ordered=True)
+
+
+def _align_dates(details_list, keys, positions):
+    """
+    Alinha as colunas de data às chaves do resultado.
+
+    Utilizado quando alguma categoria não possui as colunas de data: a data de cada agência
+    é obtida da primeira categoria em que ela está presente.
+
+    Args:
+        details_list (list): Lista de objetos ScoreDetails.
+        keys (DataFrame): Chaves do resultado.
+        positions (list): Posição das linhas de cada categoria em keys.
+
+    Returns:
+        dict: Colunas de data alinhadas, por nome.
+    """
+    dates = {}
+    for column in DATE_COLUMNS:
+        sources = [
+            (detail, position)
+            for detail, position in zip(details_list, positions)
+            if column in _columns(detail.dataframe)
+        ]
+        if not sources:
+            continue
+
+        values = np.full(len(keys), np.nan, dtype=np.float64)
+        for detail, position in reversed(sources):
+            values[position] = _column(detail.dataframe, column).to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+
+        # Mantém o tipo original quando todas as agências possuem data
+        dtype = _column(sources[0][0].dataframe, column).dtype
+        if not np.isnan(values).any() and pd.api.types.is_integer_dtype(dtype):
+            values = values.astype(dtype)
+
+        dates[column] = values
+
+    return dates
+
+
+def build_arrow_table(columns):
+    """
+    Monta uma tabela Arrow a partir das colunas do resultado, sem passar por um DataFrame.
+
+    Os arrays numéricos são referenciados sem cópia (NaN é gravado como nulo, como na conversão
+    de um DataFrame) e os faróis são gravados como dicionário, com os códigos do pd.Categorical.
+
+    Args:
+        columns (dict): Colunas do resultado (np.ndarray ou pd.Categorical), por nome.
+
+    Returns:
+        pyarrow.Table: Tabela com as colunas, no mesmo esquema de pyarrow.Table.from_pandas.
+    """
+    import pyarrow as pa
+
+    arrays = {}
+    for name, values in columns.items():
+        if isinstance(values, pd.Categorical):
+            codes = values.codes
+            arrays[name] = pa.DictionaryArray.from_arrays(
+                pa.array(codes, mask=codes < 0),
+                pa.array(values.categories.to_numpy(dtype=object), type=pa.large_string()),
+                ordered=values.ordered,
+            )
+        else:
+            arrays[name] = pa.array(values, from_pandas=values.dtype.kind == "f")
+
+    return pa.table(arrays)
+
+
+def aggregate_scores(details_list, score_column, farol_column, index_column="CD_PONTO", arrow=False):
+    """
+    Agrega os scores de várias categorias em um score ponderado e o seu farol.
+
+    O farol de cada categoria é obtido da coluna de farol informada nos detalhes
+    (ScoreDetails.farol_column) ou, na sua ausência, classificado a partir do score.
+    Os dados das categorias podem ser DataFrames ou tabelas Arrow (pyarrow.Table).
+
+    Args:
+        details_list (list): Lista de objetos ScoreDetails.
+        score_column (str): Nome da coluna do score agregado (ex.: 'SCORE_PILAR').
+        farol_column (str): Nome da coluna do farol agregado (ex.: 'FAROL_PILAR').
+        index_column (str): Nome da coluna chave dos DataFrames. Default: 'CD_PONTO'.
+        arrow (bool): Se True, retorna o resultado como pyarrow.Table (ver build_arrow_table).
+
+    Returns:
+        DataFrame: DataFrame (ou pyarrow.Table, com arrow=True) com as colunas chave, 'DIA', 'MES', 'ANO', scores, pesos,
+        faróis de cada categoria, e o score e farol agregados, com uma linha por agência
+        e período, ordenado por agência e período.
+    """
+    rows_in = sum(len(detail.dataframe) for detail in details_list)
+
+    with profile_stage(f"aggregate_scores:{score_column}", rows_in=rows_in) as stage:
+        details_list = [_combine_chunks(detail, index_column) for detail in details_list]
+        key_columns = get_key_columns(details_list, index_column=index_column)
+        with profile_stage("align_scores", rows_in=rows_in) as align_stage:
+            keys, positions, score_matrix = align_scores(
+                details_list, index_column=index_column, key_columns=key_columns
+            )
+            align_stage.rows_out = len(keys)
+        available = ~np.isnan(score_matrix)
+
+        columns = {index_column: keys[index_column].to_numpy()}
+        if len(key_columns) > 1:
+            # Cada período é uma chave distinta: as datas são obtidas da própria chave
+            columns.update({column: keys[column].to_numpy() for column in DATE_COLUMNS})
+        else:
+            columns.update(_align_dates(details_list, keys, positions))
+
+        with profile_stage("category_columns", rows_in=len(keys)) as category_stage:
+            for j, (detail, position) in enumerate(zip(details_list, positions)):
+                category = detail.category
+
+                columns[f"{category}_SCORE"] = score_matrix[:, j]
+                columns[f"{category}_PESO"] = np.where(available[:, j], detail.weight, np.nan)
+
+                if getattr(detail, "farol_column", None):
+                    columns[f"{category}_FAROL"] = _align_farol(detail, keys, position)
+                else:
+                    columns[f"{category}_FAROL"] = classificar_farol(score_matrix[:, j])
+            category_stage.rows_out = len(keys)
+
+        with profile_stage("weighted_score", rows_in=len(keys)) as weighted_stage:
+            scores = weighted_score(score_matrix, [detail.weight for detail in details_list])
+            columns[score_column] = scores
+            columns[farol_column] = classificar_farol(scores)
+            weighted_stage.rows_out = len(scores)
+
+        with profile_stage("build_dataframe", rows_in=len(keys)) as build_stage:
+            df_score = build_arrow_table(columns) if arrow else pd.DataFrame(columns)
+            build_stage.rows_out = len(df_score)
+
+        stage.rows_out = len(df_score)
+
+    return df_score
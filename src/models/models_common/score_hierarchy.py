@@ -0,0 +1,438 @@
+"""
+Módulo da Hierarquia de Scores (Tema → Pilar → Global)
+
+Este módulo declara a hierarquia dos scores como um grafo (DAG): cada nó de um nível agrega, com os
+seus pesos, nós do nível anterior, e os nós do primeiro nível são lidos dos arquivos de score. A
+hierarquia e os pesos são declarados no bloco HIERARQUIA do settings.toml (ou a partir de uma lista
+de PilarConfig) e o status de cada pilar e tema pode ser obtido das tabelas TBL_PILARES e TBL_TEMAS
+do banco de scores.
+
+Os nós desabilitados são removidos antes da leitura de qualquer arquivo, com a renormalização dos
+pesos dos nós restantes. Os arquivos são lidos ao mesmo tempo, os nós de um mesmo nível são
+calculados ao mesmo tempo e cada resultado intermediário é calculado uma única vez, mesmo quando
+compartilhado por vários nós do nível seguinte. Uma única execução calcula todos os níveis.
+
+Exemplo (settings.toml):
+
+    [default.HIERARQUIA]
+    NIVEIS = ["TEMA", "PILAR", "GLOBAL"]
+
+        [default.HIERARQUIA.TEMA.AA]
+        ARQUIVO = "PERFORMANCE/AA/BASE_SCORE_AA.xlsx"
+
+        [default.HIERARQUIA.PILAR.PERFORMANCE]
+        STATUS = true
+        COMPONENTES = { AA = 0.5, AB = 0.5 }
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import os
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+from config_project.config_app import settings
+from src.models.models_common.score_aggregation import aggregate_scores
+from src.models.models_global.score_global.models import (
+    ScoreDetails as ScoreDetailsGlobal,
+)
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.weights import Weights
+from src.utils.pandas_functions import find_data_file, load_data_parallel
+from src.utils.profile_functions import profile_stage
+
+# Níveis padrão da hierarquia, do primeiro (lido dos arquivos) ao último (raiz)
+DEFAULT_LEVELS = ["TEMA", "PILAR", "GLOBAL"]
+
+
+def normalize_name(name):
+    """
+    Normaliza o nome de um nó para comparação (ex.: 'INFRA CIVIL' e 'INFRA_CIVIL').
+
+    Args:
+        name (str): Nome do nó.
+
+    Returns:
+        str: Nome em maiúsculas, sem acentos e com '_' no lugar de espaços e pontuação.
+    """
+    name = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    return re.sub(r"\W+", "_", name.upper()).strip("_")
+
+
+class HierarchyNode(BaseModel):
+    """
+    Nó da hierarquia de scores.
+
+    Attributes:
+        level (str): Nível do nó (ex.: 'PILAR').
+        name (str): Nome do nó (ex.: 'PERFORMANCE').
+        status (bool): Se False, o nó é desabilitado e removido antes do cálculo. Default: True.
+        file_path (str, optional): Arquivo de scores do nó, relativo ao diretório de entrada
+            (apenas nós do primeiro nível).
+        score_column (str, optional): Coluna de score do arquivo. Default: 'SCORE_<NÍVEL>'.
+        components (dict): Peso de cada nó do nível anterior agregado por este nó.
+    """
+
+    level: str
+    name: str
+    status: bool = True
+    file_path: Optional[str] = None
+    score_column: Optional[str] = None
+    components: Dict[str, float] = {}
+
+
+class ScoreHierarchy(BaseModel):
+    """
+    Hierarquia de scores: níveis e nós de cada nível.
+
+    Attributes:
+        levels (list): Níveis, do primeiro (lido dos arquivos) ao último (raiz).
+        nodes (dict): Nós de cada nível, por nível e nome.
+    """
+
+    levels: List[str]
+    nodes: Dict[str, Dict[str, HierarchyNode]]
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Cria a hierarquia a partir do bloco HIERARQUIA do settings.
+
+        Args:
+            config (dict): Bloco HIERARQUIA, com NIVEIS e um sub-bloco por nível e nó.
+
+        Returns:
+            ScoreHierarchy: A hierarquia validada.
+
+        Raises:
+            ValueError: Se algum nó for inválido (ver validate_nodes).
+        """
+        levels = [level.upper() for level in config.get("NIVEIS", DEFAULT_LEVELS)]
+        nodes = {}
+        for level in levels:
+            nodes[level] = {
+                name: HierarchyNode(
+                    level=level,
+                    name=name,
+                    status=block.get("STATUS", True),
+                    file_path=block.get("ARQUIVO"),
+                    score_column=block.get("COLUNA_SCORE"),
+                    components=dict(block.get("COMPONENTES", {})),
+                )
+                for name, block in config.get(level, {}).items()
+            }
+
+        hierarchy = cls(levels=levels, nodes=nodes)
+        hierarchy.validate_nodes()
+        return hierarchy
+
+    @classmethod
+    def from_pilares(cls, pilares, root="GLOBAL"):
+        """
+        Cria a hierarquia Tema → Pilar → Global a partir de uma lista de PilarConfig.
+
+        Args:
+            pilares (list): Lista de PilarConfig (ver score_pipeline).
+            root (str): Nome do nó raiz. Default: 'GLOBAL'.
+
+        Returns:
+            ScoreHierarchy: A hierarquia validada.
+
+        Raises:
+            ValueError: Se um mesmo tema for declarado com arquivos diferentes.
+        """
+        temas = {}
+        for pilar in pilares:
+            for tema in pilar.temas:
+                node = HierarchyNode(
+                    level="TEMA",
+                    name=tema.category,
+                    file_path=tema.file_path,
+                    score_column=tema.score_column,
+                )
+                if temas.setdefault(tema.category, node) != node:
+                    raise ValueError(f"O tema {tema.category} foi declarado com arquivos diferentes.")
+
+        hierarchy = cls(
+            levels=DEFAULT_LEVELS,
+            nodes={
+                "TEMA": temas,
+                "PILAR": {
+                    pilar.category: HierarchyNode(
+                        level="PILAR",
+                        name=pilar.category,
+                        components={tema.category: tema.weight for tema in pilar.temas},
+                    )
+                    for pilar in pilares
+                },
+                "GLOBAL": {
+                    root: HierarchyNode(
+                        level="GLOBAL",
+                        name=root,
+                        components={pilar.category: pilar.weight for pilar in pilares},
+                    )
+                },
+            },
+        )
+        hierarchy.validate_nodes()
+        return hierarchy
+
+    def validate_nodes(self):
+        """
+        Valida os nós: os do primeiro nível possuem arquivo; os demais agregam nós existentes do
+        nível anterior, com pesos que somam 1.0.
+
+        Raises:
+            ValueError: Se algum nó for inválido.
+        """
+        for position, level in enumerate(self.levels):
+            for name, node in self.nodes.get(level, {}).items():
+                if position == 0:
+                    if not node.file_path:
+                        raise ValueError(f"O nó {level}.{name} deve informar o ARQUIVO de scores.")
+                    continue
+
+                previous = self.nodes.get(self.levels[position - 1], {})
+                missing = [component for component in node.components if component not in previous]
+                if not node.components or missing:
+                    raise ValueError(
+                        f"O nó {level}.{name} deve agregar nós do nível {self.levels[position - 1]}: {missing}"
+                    )
+                try:
+                    Weights(weights=list(node.components.values()))
+                except ValueError as error:
+                    raise ValueError(f"Pesos inválidos do nó {level}.{name}: {error}") from error
+
+    def apply_status(self, status):
+        """
+        Aplica o status dos nós obtido de uma fonte externa (ex.: TBL_PILARES e TBL_TEMAS).
+
+        Os nomes são comparados normalizados (ver normalize_name); os nós ausentes mantêm o status atual.
+
+        Args:
+            status (dict): Status de cada nó, por nível e nome (ex.: {'PILAR': {'ESG': True}}).
+
+        Returns:
+            ScoreHierarchy: Nova hierarquia com o status atualizado.
+        """
+        nodes = {}
+        for level, level_nodes in self.nodes.items():
+            level_status = {normalize_name(name): value for name, value in status.get(level, {}).items()}
+            nodes[level] = {
+                name: node.model_copy(
+                    update={"status": level_status.get(normalize_name(name), node.status)}
+                )
+                for name, node in level_nodes.items()
+            }
+
+        return ScoreHierarchy(levels=self.levels, nodes=nodes)
+
+    def with_weights(self, weights):
+        """
+        Substitui os pesos de componentes de nós da hierarquia (ex.: informados pelas CLIs), mantendo
+        os demais pesos e o status dos nós.
+
+        Args:
+            weights (dict): Pesos dos componentes, por nível e nome do nó
+                (ex.: {'GLOBAL': {'GLOBAL': {'ESG': 0.3, 'PERFORMANCE': 0.7}}}).
+
+        Returns:
+            ScoreHierarchy: Nova hierarquia com os pesos atualizados, validada.
+
+        Raises:
+            ValueError: Se o nó ou algum componente não existir, ou se os pesos de um nó não somarem 1.0.
+        """
+        nodes = {level: dict(level_nodes) for level, level_nodes in self.nodes.items()}
+        for level, level_weights in weights.items():
+            for name, components in level_weights.items():
+                node = nodes.get(level, {}).get(name)
+                if node is None:
+                    raise ValueError(f"O nó {level}.{name} não existe na hierarquia.")
+                missing = [component for component in components if component not in node.components]
+                if missing:
+                    raise ValueError(f"O nó {level}.{name} não agrega os componentes {missing}.")
+                nodes[level][name] = node.model_copy(
+                    update={"components": {**node.components, **components}}
+                )
+
+        hierarchy = ScoreHierarchy(levels=self.levels, nodes=nodes)
+        hierarchy.validate_nodes()
+        return hierarchy
+
+    def prune(self):
+        """
+        Remove os nós desabilitados e os nós que não contribuem para a raiz.
+
+        Os pesos dos componentes restantes de cada nó são renormalizados para somar 1.0. Um nó
+        sem componentes habilitados também é removido.
+
+        Returns:
+            ScoreHierarchy: Nova hierarquia apenas com os nós calculados.
+
+        Raises:
+            ValueError: Se nenhum nó do último nível permanecer habilitado.
+        """
+        # DO PRIMEIRO AO ÚLTIMO NÍVEL: NÓS DESABILITADOS E SEM COMPONENTES HABILITADOS
+        nodes = {}
+        for position, level in enumerate(self.levels):
+            previous = nodes.get(self.levels[position - 1], {}) if position else {}
+            nodes[level] = {}
+
+            for name, node in self.nodes.get(level, {}).items():
+                if not node.status:
+                    logger.info(f"Nó {level}.{name} desabilitado: removido do cálculo")
+                    continue
+                if position == 0:
+                    nodes[level][name] = node
+                    continue
+
+                components = {
+                    component: weight
+                    for component, weight in node.components.items()
+                    if component in previous
+                }
+                total = sum(components.values())
+                if not components or total <= 0:
+                    logger.warning(f"Nó {level}.{name} sem componentes habilitados: removido do cálculo")
+                    continue
+                if components != node.components:
+                    components = {component: weight / total for component, weight in components.items()}
+                    logger.info(f"Pesos do nó {level}.{name} renormalizados: {components}")
+
+                nodes[level][name] = node.model_copy(update={"components": components})
+
+        if not nodes[self.levels[-1]]:
+            raise ValueError(f"Nenhum nó do nível {self.levels[-1]} está habilitado.")
+
+        # DO ÚLTIMO AO PRIMEIRO NÍVEL: NÓS QUE NÃO CONTRIBUEM PARA A RAIZ
+        for position in range(len(self.levels) - 1, 0, -1):
+            used = {
+                component
+                for node in nodes[self.levels[position]].values()
+                for component in node.components
+            }
+            level = self.levels[position - 1]
+            nodes[level] = {name: node for name, node in nodes[level].items() if name in used}
+
+        return ScoreHierarchy(levels=self.levels, nodes=nodes)
+
+    def get_file_paths(self):
+        """
+        Obtém os arquivos de scores dos nós do primeiro nível.
+
+        Returns:
+            dict: Caminho do arquivo (relativo ao diretório de entrada) de cada nó, por nome.
+        """
+        return {name: node.file_path for name, node in self.nodes[self.levels[0]].items()}
+
+
+def get_default_hierarchy():
+    """
+    Obtém a hierarquia declarada no bloco HIERARQUIA do settings.
+
+    Returns:
+        ScoreHierarchy: A hierarquia validada.
+    """
+    return ScoreHierarchy.from_config(settings.get("HIERARQUIA", {}))
+
+
+def load_hierarchy(hierarchy, input_dir, use_cache=False, workers=None):
+    """
+    Carrega, ao mesmo tempo, os arquivos dos nós do primeiro nível da hierarquia.
+
+    Se o arquivo configurado não existir, é utilizada a versão do arquivo em Parquet ou CSV
+    (ex.: as bases geradas por cli/generate_faker_data.py).
+
+    Args:
+        hierarchy (ScoreHierarchy): Hierarquia, já sem os nós desabilitados (ver prune).
+        input_dir (str): Diretório base dos arquivos.
+        use_cache (bool): Se True, utiliza o cache colunar dos arquivos Excel.
+        workers (int, optional): Quantidade de workers da leitura paralela.
+
+    Returns:
+        dict: DataFrames dos nós do primeiro nível, por nome.
+
+    Raises:
+        DataLoadError: Se algum arquivo não puder ser carregado.
+    """
+    file_paths = {}
+    for name, file_path in hierarchy.get_file_paths().items():
+        file_path = Path(input_dir, file_path)
+        try:
+            file_paths[name] = find_data_file(file_path, [file_path.suffix, ".parquet", ".csv"])
+        except FileNotFoundError:
+            # O arquivo ausente é reportado pela leitura, junto com os demais erros
+            file_paths[name] = file_path
+
+    return load_data_parallel(file_paths, workers=workers, use_cache=use_cache)
+
+
+def calculate_hierarchy(hierarchy, dataframes, workers=None):
+    """
+    Calcula todos os nós da hierarquia em memória, nível a nível.
+
+    Os nós de um mesmo nível são calculados ao mesmo tempo e o resultado de cada nó é calculado
+    uma única vez. O score e o farol de cada nó são gravados nas colunas 'SCORE_<NÍVEL>' e
+    'FAROL_<NÍVEL>'. O farol dos componentes calculados é obtido do próprio componente; o dos
+    componentes lidos dos arquivos é classificado a partir do score.
+
+    Args:
+        hierarchy (ScoreHierarchy): Hierarquia, já sem os nós desabilitados (ver prune).
+        dataframes (dict): DataFrames dos nós do primeiro nível, por nome (ver load_hierarchy).
+        workers (int, optional): Quantidade máxima de nós calculados ao mesmo tempo.
+
+    Returns:
+        dict: DataFrames de todos os nós, por nível e nome.
+    """
+    first_level = hierarchy.levels[0]
+    scores = {first_level: {name: dataframes[name] for name in hierarchy.nodes[first_level]}}
+
+    def calculate_node(node, previous_level):
+        if previous_level == first_level:
+            details_list = [
+                ScoreDetails(
+                    dataframe=scores[previous_level][component],
+                    score_column=hierarchy.nodes[previous_level][component].score_column
+                    or f"SCORE_{previous_level}",
+                    weight=weight,
+                    category=component,
+                )
+                for component, weight in node.components.items()
+            ]
+        else:
+            details_list = [
+                ScoreDetailsGlobal(
+                    dataframe=scores[previous_level][component],
+                    score_column=f"SCORE_{previous_level}",
+                    farol_column=f"FAROL_{previous_level}",
+                    weight=weight,
+                    category=component,
+                )
+                for component, weight in node.components.items()
+            ]
+
+        with profile_stage(f"{node.level}.{node.name}") as stage:
+            df_score = aggregate_scores(
+                details_list,
+                score_column=f"SCORE_{node.level}",
+                farol_column=f"FAROL_{node.level}",
+            )
+            stage.rows_out = len(df_score)
+
+        return df_score
+
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        for previous_level, level in zip(hierarchy.levels, hierarchy.levels[1:]):
+            nodes = hierarchy.nodes[level]
+            results = pool.map(lambda node: calculate_node(node, previous_level), nodes.values())
+            scores[level] = dict(zip(nodes, results))
+
+    return scores
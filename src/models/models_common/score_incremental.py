@@ -0,0 +1,352 @@
+"""
+Módulo de Recálculo Incremental de Scores
+
+Este módulo recalcula o score agregado (pilar ou global) apenas para as chaves cujas entradas mudaram
+desde a execução anterior. Junto ao arquivo de saída é mantido um arquivo de estado (Parquet) com a
+impressão digital (hash) do score e do farol de cada chave em cada categoria, e com os pesos das
+categorias nos metadados. A cada execução, são recalculadas apenas as chaves novas, as chaves com
+impressão digital diferente e as chaves das categorias cujo peso mudou; o resultado é combinado com
+as linhas inalteradas do resultado anterior. O estado registra também o tamanho e a data de
+modificação do arquivo de saída gravado: se o arquivo foi sobrescrito por outra execução, o cálculo
+é completo.
+
+Custo: a agregação (alinhamento, ponderação e faróis) fica restrita às chaves alteradas, mas a
+detecção das alterações (leitura e hash das entradas) e a combinação com o resultado anterior
+(leitura, ordenação e regravação do arquivo de saída) percorrem todas as linhas, isto é, O(N).
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import json
+from functools import reduce
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+from pydantic import BaseModel
+
+from src.models.models_common.score_aggregation import (
+    aggregate_scores,
+    build_key_indexes,
+    decode_keys,
+    get_key_columns,
+)
+from src.utils.farol_functions import CATEGORIAS_FAROL
+from src.utils.pandas_functions import load_data_auto, save_data_auto
+from src.utils.sqlite_functions import SQLITE_EXTENSIONS
+
+# Chave dos metadados do arquivo de estado
+STATE_METADATA_KEY = b"score_incremental"
+
+
+class IncrementalResult(BaseModel):
+    """
+    Resultado de um cálculo incremental.
+
+    Attributes:
+        dataframe (Any): DataFrame completo do score agregado.
+        rows_recomputed (int): Quantidade de linhas recalculadas.
+        rows_removed (int): Quantidade de linhas removidas (chaves ausentes nas entradas).
+        full (bool): Indica se o cálculo foi completo (sem estado anterior compatível).
+    """
+
+    dataframe: Any
+    rows_recomputed: int
+    rows_removed: int
+    full: bool
+
+
+def get_state_path(output_path):
+    """
+    Obtém o caminho do arquivo de estado, localizado ao lado do arquivo de saída.
+
+    Args:
+        output_path (str): Caminho do arquivo de saída.
+
+    Returns:
+        Path: Caminho do arquivo de estado (ex.: BASE_SCORE_GLOBAL.state.parquet).
+    """
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.state.parquet")
+
+
+def compute_fingerprints(details_list, indexes):
+    """
+    Calcula a impressão digital do score (e do farol, quando informado) de cada chave em cada categoria.
+
+    Args:
+        details_list (list): Lista de objetos ScoreDetails.
+        indexes (list): Índice da chave de cada categoria (ver build_key_indexes).
+
+    Returns:
+        tuple: (índice ordenado com a união das chaves, matriz uint64 chaves x categorias).
+        As chaves ausentes em uma categoria possuem impressão digital 0.
+
+    Raises:
+        ValueError: Se alguma categoria possuir chaves duplicadas.
+    """
+    for detail, index in zip(details_list, indexes):
+        if not index.is_unique:
+            raise ValueError(f"A categoria {detail.category} possui chaves duplicadas.")
+
+    union = reduce(lambda left, right: left.union(right), indexes).sort_values()
+
+    fingerprints = np.zeros((len(union), len(details_list)), dtype=np.uint64)
+    for j, (detail, index) in enumerate(zip(details_list, indexes)):
+        value_columns = [detail.score_column]
+        if getattr(detail, "farol_column", None):
+            value_columns.append(detail.farol_column)
+
+        fingerprints[union.get_indexer(index), j] = pd.util.hash_pandas_object(
+            detail.dataframe[value_columns], index=False
+        ).to_numpy()
+
+    return union, fingerprints
+
+
+def get_output_fingerprint(output_path):
+    """
+    Obtém a impressão digital do arquivo de saída (tamanho e data de modificação).
+
+    Args:
+        output_path (str): Caminho do arquivo de saída.
+
+    Returns:
+        dict: Tamanho, em bytes, e data de modificação, em nanossegundos, ou None se o arquivo não existir.
+    """
+    output_path = Path(output_path)
+    if not output_path.exists():
+        return None
+
+    stat = output_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def save_state(keys, fingerprints, details_list, state_path, score_column, farol_column, output_path):
+    """
+    Grava o arquivo de estado com as impressões digitais, os pesos das categorias e a impressão
+    digital do arquivo de saída gravado na mesma execução.
+
+    Args:
+        keys (DataFrame): Colunas chave de cada linha das impressões digitais.
+        fingerprints (ndarray): Matriz de impressões digitais (ver compute_fingerprints).
+        details_list (list): Lista de objetos ScoreDetails.
+        state_path (str): Caminho do arquivo de estado.
+        score_column (str): Nome da coluna do score agregado.
+        farol_column (str): Nome da coluna do farol agregado.
+        output_path (str): Caminho do arquivo de saída, já gravado.
+    """
+    metadata = {
+        "score_column": score_column,
+        "farol_column": farol_column,
+        "key_columns": list(keys.columns),
+        "weights": {detail.category: detail.weight for detail in details_list},
+        "output": get_output_fingerprint(output_path),
+    }
+
+    columns = {column: keys[column].to_numpy() for column in keys.columns}
+    for j, detail in enumerate(details_list):
+        columns[f"{detail.category}_FP"] = fingerprints[:, j]
+
+    table = pa.table(columns)
+    table = table.replace_schema_metadata({STATE_METADATA_KEY: json.dumps(metadata)})
+
+    Path(state_path).parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, state_path)
+
+
+def load_state(state_path):
+    """
+    Carrega o arquivo de estado de uma execução anterior.
+
+    Args:
+        state_path (str): Caminho do arquivo de estado.
+
+    Returns:
+        tuple: (DataFrame com as colunas chave e as impressões digitais, metadados) ou None se o
+        estado não existir ou não puder ser lido.
+    """
+    if not Path(state_path).exists():
+        return None
+
+    try:
+        table = pq.read_table(state_path)
+        metadata = json.loads(table.schema.metadata[STATE_METADATA_KEY])
+    except Exception as error:
+        logger.warning(f"Estado incremental inválido em {state_path}: {error}")
+        return None
+
+    return table.to_pandas(), metadata
+
+
+def _restore_farol(dataframe, farol_column):
+    # Os faróis lidos de CSV/Excel voltam como texto: restaura a categoria ordenada
+    for column in dataframe.columns:
+        if column == farol_column or column.endswith("_FAROL"):
+            dataframe[column] = pd.Categorical(
+                dataframe[column], categories=CATEGORIAS_FAROL, ordered=True
+            )
+    return dataframe
+
+
+def incremental_aggregate_scores(
+    details_list,
+    output_path,
+    score_column,
+    farol_column,
+    index_column="CD_PONTO",
+):
+    """
+    Agrega os scores recalculando apenas as chaves alteradas desde a execução anterior.
+
+    O cálculo é completo quando não há estado anterior compatível (arquivo de saída ou de estado
+    ausente, arquivo de saída sobrescrito desde a gravação do estado, ou categorias, colunas chave e
+    colunas de resultado diferentes). Caso contrário, são
+    recalculadas as chaves novas ou com impressão digital diferente em alguma categoria e, para as
+    categorias cujo peso mudou, todas as chaves presentes na categoria. O resultado é idêntico ao do
+    cálculo completo (aggregate_scores), pois o score de cada chave depende apenas das suas linhas.
+
+    Apenas a agregação é restrita às chaves alteradas: o hash das entradas e a leitura, a ordenação
+    e a regravação do resultado anterior custam O(N) (sem alterações, o arquivo não é regravado).
+
+    Args:
+        details_list (list): Lista de objetos ScoreDetails.
+        output_path (str): Caminho do arquivo de saída (resultado anterior e resultado atualizado).
+        score_column (str): Nome da coluna do score agregado (ex.: 'SCORE_PILAR').
+        farol_column (str): Nome da coluna do farol agregado (ex.: 'FAROL_PILAR').
+        index_column (str): Nome da coluna chave dos DataFrames. Default: 'CD_PONTO'.
+
+    Returns:
+        IncrementalResult: Resultado completo e a quantidade de linhas recalculadas e removidas.
+
+    Raises:
+        ValueError: Se o arquivo de saída for um banco SQLite (o resultado anterior não é relido do banco).
+    """
+    output_path = Path(output_path)
+    if output_path.suffix.lower() in SQLITE_EXTENSIONS:
+        raise ValueError(f"O modo incremental não suporta a gravação em banco SQLite: {output_path}")
+    state_path = get_state_path(output_path)
+
+    key_columns = get_key_columns(details_list, index_column=index_column)
+    categories = [f"{detail.category}_FP" for detail in details_list]
+    weights = {detail.category: detail.weight for detail in details_list}
+
+    state = load_state(state_path) if output_path.exists() else None
+    compatible = state is not None and (
+        state[1].get("output") == get_output_fingerprint(output_path)
+        and state[1]["key_columns"] == key_columns
+        and state[1]["score_column"] == score_column
+        and state[1]["farol_column"] == farol_column
+        and list(state[0].columns) == [*key_columns, *categories]
+    )
+    if state is not None and state[1].get("output") != get_output_fingerprint(output_path):
+        logger.info(f"O arquivo {output_path} foi alterado desde o último cálculo incremental: cálculo completo")
+
+    # As chaves das entradas, do estado e do resultado anteriores são indexadas em um espaço comum
+    frames = [detail.dataframe for detail in details_list]
+    if compatible:
+        df_previous = load_data_auto(output_path, raise_errors=True)
+        frames += [state[0], df_previous]
+
+    indexes, encoded = build_key_indexes(frames, key_columns)
+    union, fingerprints = compute_fingerprints(details_list, indexes[: len(details_list)])
+    dtypes = {column: details_list[0].dataframe[column].dtype for column in key_columns}
+
+    if not compatible:
+        df_result = aggregate_scores(
+            details_list,
+            score_column=score_column,
+            farol_column=farol_column,
+            index_column=index_column,
+        )
+        save_data_auto(dataframe=df_result, file_path=str(output_path))
+        save_state(
+            decode_keys(union, key_columns, encoded, dtypes),
+            fingerprints,
+            details_list,
+            state_path,
+            score_column,
+            farol_column,
+            output_path,
+        )
+
+        return IncrementalResult(
+            dataframe=df_result, rows_recomputed=len(df_result), rows_removed=0, full=True
+        )
+
+    df_state, metadata = state
+    state_index, previous_index = indexes[len(details_list):]
+
+    # IDENTIFICANDO AS CHAVES ALTERADAS
+    position = state_index.get_indexer(union)
+    previous = np.zeros_like(fingerprints)
+    previous[position >= 0] = df_state[categories].to_numpy(dtype=np.uint64)[
+        position[position >= 0]
+    ]
+    changed = np.any(fingerprints != previous, axis=1)
+
+    # Peso alterado: todas as chaves presentes na categoria são recalculadas
+    for j, category in enumerate(weights):
+        if metadata["weights"].get(category) != weights[category]:
+            changed |= (fingerprints[:, j] != 0) | (previous[:, j] != 0)
+
+    changed_keys = union[changed]
+    removed_keys = state_index.difference(union)
+
+    if changed_keys.empty and removed_keys.empty:
+        logger.info("Nenhuma chave alterada desde a execução anterior")
+        return IncrementalResult(
+            dataframe=_restore_farol(df_previous, farol_column),
+            rows_recomputed=0,
+            rows_removed=0,
+            full=False,
+        )
+
+    # RECALCULANDO APENAS AS CHAVES ALTERADAS
+    changed_details = [
+        detail.model_copy(update={"dataframe": detail.dataframe[index.isin(changed_keys)]})
+        for detail, index in zip(details_list, indexes)
+    ]
+    df_changed = aggregate_scores(
+        changed_details,
+        score_column=score_column,
+        farol_column=farol_column,
+        index_column=index_column,
+    )
+
+    # COMBINANDO COM AS LINHAS INALTERADAS DO RESULTADO ANTERIOR
+    stale = previous_index.isin(changed_keys.append(removed_keys))
+    df_previous = _restore_farol(df_previous[~stale].copy(), farol_column)
+
+    df_result = pd.concat([df_previous, df_changed], ignore_index=True)
+    df_result = df_result.sort_values(key_columns, kind="stable", ignore_index=True)
+    df_result = df_result[df_changed.columns]
+
+    save_data_auto(dataframe=df_result, file_path=str(output_path))
+    save_state(
+        decode_keys(union, key_columns, encoded, dtypes),
+        fingerprints,
+        details_list,
+        state_path,
+        score_column,
+        farol_column,
+        output_path,
+    )
+
+    logger.info(
+        f"Cálculo incremental: {len(df_changed)} linhas recalculadas e "
+        f"{len(removed_keys)} removidas de {len(df_result)}"
+    )
+
+    return IncrementalResult(
+        dataframe=df_result,
+        rows_recomputed=len(df_changed),
+        rows_removed=len(removed_keys),
+        full=False,
+    )
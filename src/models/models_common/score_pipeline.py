@@ -0,0 +1,279 @@
+"""
+Módulo do Pipeline de Score (Tema → Pilar → Global)
+
+Este módulo calcula, em um único processo, os scores de todos os pilares e o score global a partir
+dos arquivos de tema. Cada arquivo de tema é carregado uma única vez e os DataFrames dos pilares são
+mantidos em memória entre as etapas, sem a gravação e releitura de arquivos intermediários.
+Apenas as saídas solicitadas são gravadas. A hierarquia é a declarada no settings (ver
+score_hierarchy) ou a informada por uma lista de PilarConfig.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+from src.models.models_common.score_hierarchy import (
+    ScoreHierarchy,
+    calculate_hierarchy,
+    get_default_hierarchy,
+    load_hierarchy,
+)
+from src.utils.pandas_functions import save_data_auto, save_data_partitioned
+from src.utils.sqlite_functions import SQLITE_EXTENSIONS, load_hierarchy_status
+
+
+class TemaConfig(BaseModel):
+    """
+    Configuração de um tema de um pilar.
+
+    Attributes:
+        category (str): Nome do tema (ex.: 'AA').
+        file_path (str): Caminho do arquivo de scores do tema, relativo ao diretório de entrada.
+        weight (float): Peso do tema no score pilar.
+        score_column (str): Nome da coluna de score do tema. Default: 'SCORE_TEMA'.
+    """
+
+    category: str
+    file_path: str
+    weight: float
+    score_column: str = "SCORE_TEMA"
+
+
+class PilarConfig(BaseModel):
+    """
+    Configuração de um pilar do score global.
+
+    Attributes:
+        category (str): Nome do pilar (ex.: 'PERFORMANCE').
+        weight (float): Peso do pilar no score global.
+        temas (list): Lista de TemaConfig com os temas do pilar.
+    """
+
+    category: str
+    weight: float
+    temas: List[TemaConfig]
+
+
+class PipelineResult(BaseModel):
+    """
+    Resultado do pipeline de score.
+
+    Attributes:
+        pilares (dict): DataFrames do score de cada pilar, por nome do pilar.
+        score_global (Any): DataFrame do score global.
+        scores (dict): DataFrames de todos os nós da hierarquia, por nível e nome.
+    """
+
+    pilares: Dict[str, Any]
+    score_global: Any
+    scores: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_scores(cls, hierarchy, scores):
+        """
+        Cria o resultado a partir dos DataFrames de todos os nós da hierarquia (ver calculate_hierarchy).
+
+        O penúltimo nível são os pilares e o único nó do último nível é o score global.
+
+        Args:
+            hierarchy (ScoreHierarchy): Hierarquia calculada.
+            scores (dict): DataFrames de todos os nós, por nível e nome.
+
+        Returns:
+            PipelineResult: DataFrames dos pilares, do score global e de todos os nós.
+
+        Raises:
+            ValueError: Se o último nível não tiver exatamente um nó.
+        """
+        roots = scores[hierarchy.levels[-1]]
+        if len(roots) != 1:
+            raise ValueError(f"O nível {hierarchy.levels[-1]} deve ter um único nó: {list(roots)}")
+
+        return cls(
+            pilares=scores[hierarchy.levels[-2]],
+            score_global=next(iter(roots.values())),
+            scores=scores,
+        )
+
+
+def get_default_pilares(
+    weight_aa=1 / 3,
+    weight_ab=1 / 3,
+    weight_infra=1 / 3,
+    weight_esg=0.2,
+    weight_performance=0.8,
+):
+    """
+    Obtém a configuração padrão dos pilares, com a estrutura de diretórios de data/data_tema.
+
+    Args:
+        weight_aa (float): Peso do tema AA no pilar Performance.
+        weight_ab (float): Peso do tema AB no pilar Performance.
+        weight_infra (float): Peso do tema Infra Civil no pilar Performance.
+        weight_esg (float): Peso do pilar ESG no score global.
+        weight_performance (float): Peso do pilar Performance no score global.
+
+    Returns:
+        list: Lista de PilarConfig.
+    """
+    return [
+        PilarConfig(
+            category="ESG",
+            weight=weight_esg,
+            temas=[
+                TemaConfig(
+                    category="ESG", file_path="ESG/ESG/BASE_SCORE_ESG.xlsx", weight=1.0
+                )
+            ],
+        ),
+        PilarConfig(
+            category="PERFORMANCE",
+            weight=weight_performance,
+            temas=[
+                TemaConfig(
+                    category="AA", file_path="PERFORMANCE/AA/BASE_SCORE_AA.xlsx", weight=weight_aa
+                ),
+                TemaConfig(
+                    category="AB", file_path="PERFORMANCE/AB/BASE_SCORE_AB.xlsx", weight=weight_ab
+                ),
+                TemaConfig(
+                    category="INFRA_CIVIL",
+                    file_path="PERFORMANCE/INFRA_CIVIL/BASE_SCORE_INFRA_CIVIL.xlsx",
+                    weight=weight_infra,
+                ),
+            ],
+        ),
+    ]
+
+
+def save_pipeline(
+    result,
+    output_dir,
+    output_file="BASE_SCORE_GLOBAL.xlsx",
+    save_pilares=False,
+    partitioned=False,
+    compact=False,
+):
+    """
+    Grava as saídas solicitadas do pipeline.
+
+    Os pilares são gravados em <output_dir>/<PILAR>/BASE_SCORE_TEMA_<PILAR>, no mesmo formato
+    do arquivo do score global, seguindo a estrutura de data/data_pilar. Quando o score global é
+    gravado em um banco SQLite (.db), os pilares são gravados no mesmo banco. Com partitioned=True,
+    cada saída é gravada como um dataset particionado por período, no diretório com o nome do
+    arquivo (ex.: <output_dir>/BASE_SCORE_GLOBAL/ANO=2024/MES=9/DIA=1/BASE_SCORE_GLOBAL.xlsx).
+
+    Args:
+        result (PipelineResult): Resultado do pipeline.
+        output_dir (str): Diretório de saída.
+        output_file (str, optional): Nome do arquivo do score global. Se None, o score global não é gravado.
+        save_pilares (bool): Se True, grava também o score de cada pilar.
+        partitioned (bool): Se True, grava as saídas particionadas por período.
+        compact (bool): Se True, grava as saídas no esquema compacto (ver save_data_auto).
+
+    Returns:
+        list: Caminhos dos arquivos gravados.
+    """
+    saved = []
+    suffix = Path(output_file).suffix if output_file else ".xlsx"
+
+    def save(dataframe, file_path, category):
+        if suffix in SQLITE_EXTENSIONS:
+            # Banco SQLite: pilares e score global são gravados no mesmo banco, já indexado por período
+            file_path = Path(output_dir, output_file)
+            save_data_auto(dataframe=dataframe, file_path=file_path, category=category)
+            if file_path not in saved:
+                saved.append(file_path)
+            return
+
+        if partitioned:
+            saved.extend(
+                save_data_partitioned(
+                    dataframe=dataframe,
+                    dir_path=file_path.with_suffix(""),
+                    file_name=file_path.name,
+                    compact=compact,
+                )
+            )
+            return
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        save_data_auto(dataframe=dataframe, file_path=file_path, compact=compact)
+        saved.append(file_path)
+
+    if save_pilares:
+        for pilar, df_pilar in result.pilares.items():
+            save(df_pilar, Path(output_dir, pilar, f"BASE_SCORE_TEMA_{pilar}{suffix}"), pilar)
+
+    if output_file:
+        save(result.score_global, Path(output_dir, output_file), "GLOBAL")
+
+    return saved
+
+
+def run_pipeline(
+    input_dir,
+    output_dir=None,
+    pilares: Optional[List[PilarConfig]] = None,
+    output_file="BASE_SCORE_GLOBAL.xlsx",
+    save_pilares=False,
+    use_cache=False,
+    workers=None,
+    partitioned=False,
+    compact=False,
+    hierarchy: Optional[ScoreHierarchy] = None,
+    status_db=None,
+):
+    """
+    Executa o pipeline completo: carrega os temas, calcula os pilares e o score global e grava as saídas.
+
+    Os nós desabilitados da hierarquia (STATUS do settings ou, com status_db, STATUS_PILAR e
+    STATUS_TEMA do banco) são removidos antes da leitura dos arquivos.
+
+    Args:
+        input_dir (str): Diretório base dos arquivos de tema (ex.: data/data_tema).
+        output_dir (str, optional): Diretório de saída. Se None, nenhuma saída é gravada.
+        pilares (list, optional): Lista de PilarConfig. Default: a hierarquia do settings.
+        output_file (str, optional): Nome do arquivo do score global.
+        save_pilares (bool): Se True, grava também o score de cada pilar.
+        use_cache (bool): Se True, utiliza o cache colunar dos arquivos Excel.
+        workers (int, optional): Quantidade de workers da leitura paralela dos temas.
+        partitioned (bool): Se True, grava as saídas particionadas por período.
+        compact (bool): Se True, grava as saídas no esquema compacto (ver save_data_auto).
+        hierarchy (ScoreHierarchy, optional): Hierarquia dos scores, no lugar de pilares.
+            Default: get_default_hierarchy().
+        status_db (str, optional): Banco com as tabelas TBL_PILARES e TBL_TEMAS, cujo status
+            dos pilares e temas é aplicado à hierarquia.
+
+    Returns:
+        PipelineResult: DataFrames dos pilares, do score global e de todos os nós da hierarquia.
+    """
+    if hierarchy is None:
+        hierarchy = ScoreHierarchy.from_pilares(pilares) if pilares else get_default_hierarchy()
+    if status_db is not None:
+        hierarchy = hierarchy.apply_status(load_hierarchy_status(status_db))
+    hierarchy = hierarchy.prune()
+
+    dataframes = load_hierarchy(hierarchy, input_dir, use_cache=use_cache, workers=workers)
+    result = PipelineResult.from_scores(
+        hierarchy, calculate_hierarchy(hierarchy, dataframes, workers=workers)
+    )
+
+    if output_dir is not None:
+        for file_path in save_pipeline(
+            result,
+            output_dir,
+            output_file=output_file,
+            save_pilares=save_pilares,
+            partitioned=partitioned,
+            compact=compact,
+        ):
+            logger.info(f"Saída do pipeline gravada em {file_path}")
+
+    return result
@@ -0,0 +1,343 @@
+"""
+Módulo de Consultas Preguiçosas do Score (filtros e seleção de colunas)
+
+Uma consulta registra filtros de agências (CD_PONTO), de período (DIA, MES, ANO) e de categoria,
+e uma seleção de colunas, sem ler nenhum arquivo. Ao executá-la (collect), o plano é empurrado
+para a leitura: apenas as categorias e as colunas necessárias são lidas e os filtros de linhas
+são aplicados pelo load_data_auto (estatísticas dos grupos de linhas do Parquet, filtro do
+pyarrow em Arrow/Feather e filtro bloco a bloco em CSV). Somente as linhas filtradas passam pelo
+alinhamento e pela ponderação, de forma que uma consulta de poucas agências custa pouco:
+
+    df = (
+        ScoreGlobalCalculator.query(details_list)
+        .where_agencies([1001, 1002])
+        .where_period(ano=2024, mes=9)
+        .select(["SCORE_GLOBAL", "FAROL_GLOBAL"])
+        .collect()
+    )
+
+Sem as colunas do score agregado na seleção, apenas os arquivos das categorias filtradas são
+lidos e o resultado contém as agências presentes nessas categorias.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+from loguru import logger
+from pydantic import BaseModel
+
+from src.models.models_common.score_aggregation import DATE_COLUMNS, aggregate_scores
+from src.utils.pandas_functions import (
+    DataLoadError,
+    filter_dataframe,
+    get_data_columns,
+    load_data_auto,
+)
+from src.utils.profile_functions import profile_stage
+
+
+class QueryPlan(BaseModel):
+    """
+    Plano de execução de uma consulta.
+
+    Attributes:
+        categories (list): Categorias lidas e agregadas.
+        aggregate (bool): Se o score agregado é calculado com todas as categorias.
+        filters (dict): Valores aceitos, por coluna, empurrados para a leitura.
+        read_columns (dict): Colunas lidas de cada categoria (as ausentes do arquivo são ignoradas).
+        output_columns (list, optional): Colunas do resultado (None: todas).
+    """
+
+    categories: List[str]
+    aggregate: bool
+    filters: Dict[str, list]
+    read_columns: Dict[str, List[str]]
+    output_columns: Optional[List[str]] = None
+
+
+def _as_list(values):
+    if values is None:
+        return None
+    if isinstance(values, (str, int)):
+        return [values]
+    return list(values)
+
+
+class ScoreQuery:
+    """
+    Consulta preguiçosa sobre o cálculo de um score agregado (pilar ou global).
+
+    Os métodos where_* e select retornam uma nova consulta; os arquivos são lidos apenas em collect.
+
+    Attributes:
+        details_list (list): Lista de objetos ScoreDetails (com dataframe ou file_path).
+        score_column (str): Nome da coluna do score agregado (ex.: 'SCORE_PILAR').
+        farol_column (str): Nome da coluna do farol agregado (ex.: 'FAROL_PILAR').
+        index_column (str): Nome da coluna chave das agências. Default: 'CD_PONTO'.
+    """
+
+    def __init__(self, details_list, score_column, farol_column, index_column="CD_PONTO"):
+        self.details_list = list(details_list)
+        self.score_column = score_column
+        self.farol_column = farol_column
+        self.index_column = index_column
+
+        self._filters = {}
+        self._categories = None
+        self._columns = None
+
+    def _replace(self, **changes):
+        query = copy.copy(self)
+        for name, value in changes.items():
+            setattr(query, name, value)
+        return query
+
+    def _where(self, column, values):
+        # Filtros repetidos de uma mesma coluna são combinados pela interseção
+        values = _as_list(values)
+        if column in self._filters:
+            accepted = set(values)
+            values = [value for value in self._filters[column] if value in accepted]
+        return self._replace(_filters={**self._filters, column: values})
+
+    def where_agencies(self, cd_pontos) -> "ScoreQuery":
+        """
+        Filtra as agências da consulta.
+
+        Args:
+            cd_pontos (list): Códigos das agências (CD_PONTO).
+
+        Returns:
+            ScoreQuery: Nova consulta com o filtro.
+        """
+        return self._where(self.index_column, [int(cd_ponto) for cd_ponto in _as_list(cd_pontos)])
+
+    def where_period(self, ano=None, mes=None, dia=None) -> "ScoreQuery":
+        """
+        Filtra os períodos da consulta. Cada parte aceita um valor ou uma lista de valores.
+
+        Args:
+            ano (int or list, optional): Ano(s) dos períodos.
+            mes (int or list, optional): Mês(es) dos períodos.
+            dia (int or list, optional): Dia(s) dos períodos.
+
+        Returns:
+            ScoreQuery: Nova consulta com o filtro.
+        """
+        query = self
+        for column, values in zip(["ANO", "MES", "DIA"], [ano, mes, dia]):
+            if values is not None:
+                query = query._where(column, [int(value) for value in _as_list(values)])
+        return query
+
+    def where_categories(self, categories) -> "ScoreQuery":
+        """
+        Filtra as categorias da consulta: apenas as colunas dessas categorias são mantidas e, sem as
+        colunas do score agregado na seleção, apenas os seus arquivos são lidos.
+
+        Args:
+            categories (list): Nomes das categorias (ex.: ['ESG']).
+
+        Returns:
+            ScoreQuery: Nova consulta com o filtro.
+
+        Raises:
+            ValueError: Se alguma categoria não pertencer à consulta.
+        """
+        categories = _as_list(categories)
+        unknown = set(categories) - {detail.category for detail in self.details_list}
+        if unknown:
+            raise ValueError(f"Categorias inexistentes na consulta: {sorted(unknown)}")
+        if self._categories is not None:
+            categories = [category for category in self._categories if category in categories]
+        return self._replace(_categories=categories)
+
+    def select(self, columns) -> "ScoreQuery":
+        """
+        Seleciona as colunas do resultado (as colunas chave são sempre mantidas).
+
+        Args:
+            columns (list): Colunas do resultado (ex.: ['SCORE_GLOBAL', 'ESG_SCORE']).
+
+        Returns:
+            ScoreQuery: Nova consulta com a seleção.
+        """
+        return self._replace(_columns=_as_list(columns))
+
+    def _output_categories(self):
+        """
+        Categorias lidas quando o score agregado não é selecionado: as filtradas e, dentre elas, as
+        referenciadas pelas colunas selecionadas (ex.: 'ESG_SCORE'), se houver.
+        """
+        categories = [detail.category for detail in self.details_list]
+        if self._categories is not None:
+            categories = [category for category in categories if category in self._categories]
+
+        referenced = [
+            category
+            for category in categories
+            if any(column.startswith(f"{category}_") for column in self._columns)
+        ]
+        return referenced or (categories if self._categories is not None else [])
+
+    def _needs_aggregate(self):
+        return self._columns is None or bool({self.score_column, self.farol_column} & set(self._columns))
+
+    def _read_columns(self, detail):
+        """
+        Colunas lidas do arquivo de uma categoria (chave, datas, score e farol).
+        """
+        needed = [self.index_column, *DATE_COLUMNS, detail.score_column]
+        if getattr(detail, "farol_column", None):
+            needed.append(detail.farol_column)
+        return needed
+
+    def plan(self) -> QueryPlan:
+        """
+        Monta o plano da consulta, sem ler os arquivos.
+
+        Returns:
+            QueryPlan: Categorias lidas, filtros e colunas lidas de cada categoria.
+        """
+        aggregate = self._needs_aggregate()
+        categories = (
+            [detail.category for detail in self.details_list] if aggregate else self._output_categories()
+        )
+        if not categories:
+            raise ValueError("A seleção de colunas e categorias não inclui nenhuma categoria.")
+
+        return QueryPlan(
+            categories=categories,
+            aggregate=aggregate,
+            filters=self._filters,
+            read_columns={
+                detail.category: self._read_columns(detail)
+                for detail in self.details_list
+                if detail.category in categories
+            },
+            output_columns=self._columns,
+        )
+
+    def explain(self) -> str:
+        """
+        Descreve o plano da consulta (categorias, arquivos, colunas lidas e filtros empurrados).
+
+        Returns:
+            str: Descrição do plano, uma linha por etapa.
+        """
+        plan = self.plan()
+        lines = [f"AGREGAÇÃO {self.score_column}: {'todas as categorias' if plan.aggregate else 'não calculada'}"]
+        for detail in self.details_list:
+            if detail.category not in plan.categories:
+                lines.append(f"  {detail.category}: não lida")
+                continue
+            source = "DataFrame em memória" if detail.dataframe is not None else detail.file_path
+            lines.append(f"  {detail.category}: {source} colunas={plan.read_columns[detail.category]}")
+        filters = {
+            column: values if len(values) <= 10 else f"{len(values)} valores ({min(values)}..{max(values)})"
+            for column, values in plan.filters.items()
+        }
+        lines.append(f"FILTROS: {filters or 'nenhum'}")
+        lines.append(f"COLUNAS: {plan.output_columns or 'todas'}")
+        return "\n".join(lines)
+
+    def _load(self, detail, plan, use_cache):
+        """
+        Obtém os dados filtrados de uma categoria: lidos do arquivo, com os filtros e as colunas
+        empurrados para a leitura, ou filtrados a partir do DataFrame em memória.
+        """
+        needed = plan.read_columns[detail.category]
+
+        if detail.dataframe is not None:
+            df = detail.dataframe
+            return filter_dataframe(df[[column for column in df.columns if column in needed]], plan.filters)
+
+        file_extension = Path(detail.file_path).suffix.lower()
+        if file_extension in [".xls", ".xlsx"]:
+            # O cache colunar é indexado pelas colunas lidas: com o cache, o arquivo é lido por completo
+            usecols = None if use_cache else (lambda column: column in needed)
+        else:
+            usecols = [column for column in get_data_columns(detail.file_path) if column in needed]
+
+        df = load_data_auto(
+            detail.file_path, usecols=usecols, filters=plan.filters, use_cache=use_cache, raise_errors=True
+        )
+        return df[[column for column in df.columns if column in needed]]
+
+    def collect(self, workers: Optional[int] = None, use_cache: bool = False) -> pd.DataFrame:
+        """
+        Executa a consulta.
+
+        Args:
+            workers (int, optional): Quantidade de threads da leitura. Default: uma por arquivo, limitada às CPUs.
+            use_cache (bool): Se True, utiliza o cache colunar dos arquivos Excel.
+
+        Returns:
+            DataFrame: Resultado do cálculo, restrito às linhas filtradas e às colunas selecionadas.
+
+        Raises:
+            DataLoadError: Se algum arquivo não puder ser carregado.
+            ValueError: Se alguma coluna selecionada não existir no resultado.
+        """
+        plan = self.plan()
+        details_list = [detail for detail in self.details_list if detail.category in plan.categories]
+
+        with profile_stage(f"score_query:{self.score_column}") as stage:
+            workers = max(1, min(workers or os.cpu_count() or 1, len(details_list)))
+            dataframes, errors = {}, {}
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    detail.category: pool.submit(self._load, detail, plan, use_cache) for detail in details_list
+                }
+                for category, future in futures.items():
+                    try:
+                        dataframes[category] = future.result()
+                    except Exception as e:
+                        logger.error(f"Erro ao carregar os scores de {category}: {e}")
+                        errors[category] = e
+            if errors:
+                raise DataLoadError(errors)
+
+            stage.rows_in = sum(len(df) for df in dataframes.values())
+            df_score = aggregate_scores(
+                [detail.model_copy(update={"dataframe": dataframes[detail.category]}) for detail in details_list],
+                score_column=self.score_column,
+                farol_column=self.farol_column,
+                index_column=self.index_column,
+            )
+
+            # As categorias sem as colunas filtradas (ex.: sem as datas) são filtradas no resultado
+            df_score = filter_dataframe(df_score, plan.filters)
+            df_score = df_score[self._output_columns(df_score)]
+            stage.rows_out = len(df_score)
+
+        return df_score
+
+    def _output_columns(self, df_score):
+        """
+        Colunas do resultado: chaves, colunas das categorias filtradas e colunas selecionadas.
+        """
+        keys = [column for column in [self.index_column, *DATE_COLUMNS] if column in df_score.columns]
+        if self._columns is not None:
+            missing = [column for column in self._columns if column not in df_score.columns]
+            if missing:
+                raise ValueError(f"Colunas inexistentes no resultado: {missing}")
+            columns = [column for column in df_score.columns if column in self._columns]
+        else:
+            columns = list(df_score.columns)
+
+        if self._categories is not None:
+            other = {detail.category for detail in self.details_list} - set(self._categories)
+            columns = [
+                column for column in columns if not any(column.startswith(f"{category}_") for category in other)
+            ]
+
+        return keys + [column for column in columns if column not in keys]
@@ -0,0 +1,818 @@
+"""
+Módulo do Serviço de Score (asyncio, com micro-lotes)
+
+Serviço local e de longa duração para o cálculo de scores sob demanda (ex.: "qual o score de TCX
+para 3 reinicializações" ou "qual o score global da agência X com estes KPIs"). O processo é
+iniciado uma única vez: os modelos compilados dos KPIs (registro e tabelas de consulta), os pesos
+da hierarquia e os últimos scores de cada agência ficam em memória, sem o custo de importação e
+leitura da CLI a cada consulta.
+
+As requisições concorrentes são reunidas em micro-lotes: o primeiro pedido abre uma janela de
+BATCH_WINDOW_MS e o lote é calculado, de forma vetorizada, ao fim da janela ou ao atingir
+MAX_BATCH_SIZE pedidos. A fila é limitada a MAX_PENDING pedidos (backpressure): quando cheia, o
+pedido aguarda até QUEUE_TIMEOUT_MS e, em seguida, é recusado (HTTP 503).
+
+Protocolos (na mesma porta TCP ou socket Unix):
+
+    HTTP/1.1:    POST /score (um pedido ou uma lista), GET /stats e GET /health
+    JSON lines:  um pedido por linha, respondido na mesma ordem
+
+Pedidos:
+
+    {"kpi": "TCX", "valor": 3}
+    {"cd_ponto": 1001, "kpis": {"TCX": 3, "GUIA": 99.8}, "temas": {"AA": 7.5}}
+
+No segundo caso, os scores dos temas informados (diretamente ou ponderando os scores dos seus KPIs
+pelo PESO de cada KPI no settings) substituem os últimos scores da agência e os níveis seguintes da
+hierarquia são recalculados com os pesos do settings. Os KPIs informados devem cobrir todos os KPIs
+do tema: o score de um tema não é calculado com parte dos seus KPIs. Os demais nós mantêm os
+últimos scores carregados (ver ScoreSnapshot).
+
+Configuração (settings.toml):
+
+    [default.SERVICE]
+    HOST = "127.0.0.1"
+    PORT = 8765
+    BATCH_WINDOW_MS = 2.0
+    MAX_BATCH_SIZE = 512
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from pydantic import BaseModel, Field, ValidationError
+
+from config_project.config_app import settings
+from src.models.models_common.score_aggregation import DATE_COLUMNS, weighted_score
+from src.models.models_common.score_hierarchy import (
+    ScoreHierarchy,
+    get_default_hierarchy,
+    normalize_name,
+)
+from src.models.models_kpi.lookup import get_lookup_scorer
+from src.models.models_kpi.registry import get_registry
+from src.models.models_pilar.score_pilar_performance.weights import Weights
+from src.utils.farol_functions import CATEGORIAS_FAROL, classificar_farol
+
+# Mensagens de status das respostas HTTP
+HTTP_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+# Tamanho máximo do corpo de um pedido HTTP
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+class ServiceConfig(BaseModel):
+    """
+    Configuração do serviço de score.
+
+    Attributes:
+        host (str): Endereço TCP do serviço. Default: '127.0.0.1'.
+        port (int): Porta TCP do serviço (0: porta livre escolhida pelo sistema). Default: 8765.
+        unix_socket (str, optional): Caminho do socket Unix (substitui host e porta).
+        batch_window_ms (float): Janela de espera do micro-lote, a partir do primeiro pedido.
+        max_batch_size (int): Quantidade máxima de pedidos de um micro-lote.
+        max_pending (int): Quantidade máxima de pedidos na fila (backpressure).
+        queue_timeout_ms (float): Espera máxima por espaço na fila antes de recusar o pedido.
+        latency_window (int): Quantidade de latências mantidas para os percentis.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = Field(default=8765, ge=0, le=65535)
+    unix_socket: Optional[str] = None
+    batch_window_ms: float = Field(default=2.0, ge=0)
+    max_batch_size: int = Field(default=512, ge=1)
+    max_pending: int = Field(default=10_000, ge=1)
+    queue_timeout_ms: float = Field(default=100.0, ge=0)
+    latency_window: int = Field(default=10_000, ge=1)
+
+    @classmethod
+    def from_settings(cls, **overrides) -> "ServiceConfig":
+        """
+        Cria a configuração a partir do bloco SERVICE do settings.
+
+        Args:
+            overrides: Valores que substituem os do settings (os valores None são ignorados).
+
+        Returns:
+            ServiceConfig: A configuração validada.
+        """
+        config = {str(key).lower(): value for key, value in settings.get("SERVICE", {}).items()}
+        config.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**config)
+
+
+class KPIRequest(BaseModel):
+    """
+    Pedido do score de um valor de KPI.
+
+    Attributes:
+        kpi (str): Nome do KPI no registro (ex.: 'TCX').
+        valor (float): Valor do KPI.
+    """
+
+    kpi: str
+    valor: float
+
+
+class AgencyRequest(BaseModel):
+    """
+    Pedido dos scores de uma agência, com os temas e KPIs informados.
+
+    Attributes:
+        cd_ponto (int, optional): Código da agência (sem ele, apenas os valores informados são usados).
+        kpis (dict): Valores dos KPIs, por nome (o score do tema é a média dos scores dos seus KPIs,
+            ponderada pelos pesos do settings; todos os KPIs do tema devem ser informados).
+        temas (dict): Scores dos temas, por nome (prevalecem sobre os calculados pelos KPIs).
+    """
+
+    cd_ponto: Optional[int] = None
+    kpis: Dict[str, float] = {}
+    temas: Dict[str, float] = {}
+
+
+class ServiceStats(BaseModel):
+    """
+    Estatísticas do serviço de score.
+
+    Attributes:
+        requests (int): Pedidos calculados.
+        errors (int): Pedidos com erro de validação ou de cálculo.
+        rejected (int): Pedidos recusados com a fila cheia.
+        batches (int): Micro-lotes calculados.
+        mean_batch_size (float): Quantidade média de pedidos por micro-lote.
+        pending (int): Pedidos na fila.
+        latency_ms (dict): Percentis (p50, p95, p99) e máximo da latência, da fila à resposta.
+    """
+
+    requests: int
+    errors: int
+    rejected: int
+    batches: int
+    mean_batch_size: float
+    pending: int
+    latency_ms: Dict[str, float]
+
+
+class ServiceOverloaded(Exception):
+    """
+    Exceção lançada quando a fila do serviço está cheia.
+    """
+
+
+def parse_request(payload: dict) -> Union[KPIRequest, AgencyRequest]:
+    """
+    Valida um pedido: pedidos com a chave 'kpi' são de KPI; os demais, de agência.
+
+    Args:
+        payload (dict): Pedido decodificado do JSON.
+
+    Returns:
+        KPIRequest ou AgencyRequest: O pedido validado.
+
+    Raises:
+        ValueError: Se o pedido for inválido.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("O pedido deve ser um objeto JSON.")
+    try:
+        return KPIRequest(**payload) if "kpi" in payload else AgencyRequest(**payload)
+    except ValidationError as error:
+        raise ValueError(f"Pedido inválido: {error}") from error
+
+
+def _to_json_value(value):
+    # Scores nulos (NaN) são respondidos como null
+    return None if value is None or (isinstance(value, float) and math.isnan(value)) else value
+
+
+def _farol_labels(scores: np.ndarray) -> np.ndarray:
+    """
+    Classifica os scores (de qualquer formato) no farol, em uma única chamada.
+
+    Returns:
+        np.ndarray: Array de objetos com as categorias do farol (None para score nulo).
+    """
+    codes = classificar_farol(scores.ravel()).codes.reshape(scores.shape)
+    # O código -1 (score nulo) indexa o último elemento: None
+    return np.array(CATEGORIAS_FAROL + [None], dtype=object)[codes]
+
+
+class ScoreSnapshot:
+    """
+    Últimos scores de cada agência, por nível e nó da hierarquia, alinhados a um índice ordenado.
+
+    Attributes:
+        agencies (np.ndarray): Índice ordenado das agências.
+        values (dict): Scores de cada nó (arrays alinhados a agencies), por nível e nome.
+    """
+
+    def __init__(self, agencies: np.ndarray, values: Dict[str, Dict[str, np.ndarray]]):
+        self.agencies = np.asarray(agencies, dtype=np.int64)
+        self.values = values
+
+    @classmethod
+    def empty(cls) -> "ScoreSnapshot":
+        return cls(np.empty(0, dtype=np.int64), {})
+
+    @classmethod
+    def from_store(cls, store) -> "ScoreSnapshot":
+        """
+        Cria o snapshot a partir de um MmapScoreStore, sem cópia: as colunas SCORE_<NÍVEL> de cada
+        categoria permanecem mapeadas em memória.
+
+        Args:
+            store (MmapScoreStore): Repositório com os scores dos temas e/ou dos pilares.
+
+        Returns:
+            ScoreSnapshot: Os scores do repositório.
+        """
+        values = {}
+        for score_column, category in store.columns():
+            if score_column.startswith("SCORE_"):
+                level = score_column[len("SCORE_"):]
+                values.setdefault(level, {})[category] = store.read_scores(category, score_column)
+        return cls(np.asarray(store.agencies), values)
+
+    @classmethod
+    def from_scores(cls, scores: Dict[str, Dict[str, pd.DataFrame]], index_column="CD_PONTO") -> "ScoreSnapshot":
+        """
+        Cria o snapshot a partir dos DataFrames de cada nó (ex.: o resultado de calculate_hierarchy).
+
+        Com vários períodos, é mantido o último período de cada agência.
+
+        Args:
+            scores (dict): DataFrames de cada nó, por nível e nome, com a coluna 'SCORE_<NÍVEL>'.
+            index_column (str): Coluna chave das agências. Default: 'CD_PONTO'.
+
+        Returns:
+            ScoreSnapshot: Os últimos scores de cada agência.
+        """
+        series = {}
+        for level, nodes in scores.items():
+            for name, df in nodes.items():
+                score_column = f"SCORE_{level}"
+                if score_column not in df.columns:
+                    continue
+                date_columns = [column for column in DATE_COLUMNS[::-1] if column in df.columns]
+                if date_columns:
+                    df = df.sort_values(date_columns, kind="stable")
+                df = df.drop_duplicates(index_column, keep="last")
+                series.setdefault(level, {})[name] = pd.Series(
+                    df[score_column].to_numpy(dtype=np.float64, na_value=np.nan),
+                    index=df[index_column].to_numpy(dtype=np.int64),
+                )
+
+        indexes = [s.index for nodes in series.values() for s in nodes.values()]
+        agencies = np.unique(np.concatenate([index.to_numpy() for index in indexes])) if indexes else []
+        values = {
+            level: {name: s.reindex(agencies).to_numpy() for name, s in nodes.items()}
+            for level, nodes in series.items()
+        }
+        return cls(np.asarray(agencies, dtype=np.int64), values)
+
+    def lookup(self, level: str, names: List[str], cd_pontos: np.ndarray) -> np.ndarray:
+        """
+        Obtém os últimos scores das agências em uma matriz (agências x nós), com NaN se ausentes.
+
+        Args:
+            level (str): Nível da hierarquia.
+            names (list): Nós do nível.
+            cd_pontos (np.ndarray): Códigos das agências (-1: sem agência).
+
+        Returns:
+            np.ndarray: Matriz de scores.
+        """
+        matrix = np.full((len(cd_pontos), len(names)), np.nan)
+        level_values = self.values.get(level, {})
+        if not len(self.agencies) or not level_values:
+            return matrix
+
+        rows = np.minimum(np.searchsorted(self.agencies, cd_pontos), len(self.agencies) - 1)
+        found = self.agencies[rows] == cd_pontos
+        for position, name in enumerate(names):
+            if name in level_values:
+                matrix[found, position] = level_values[name][rows[found]]
+        return matrix
+
+
+class ScoringEngine:
+    """
+    Cálculo vetorizado dos lotes de pedidos, sobre os modelos e os scores mantidos em memória.
+
+    Attributes:
+        hierarchy (ScoreHierarchy): Hierarquia (já sem os nós desabilitados) e pesos dos nós.
+        snapshot (ScoreSnapshot): Últimos scores de cada agência.
+        tema_kpis (dict): Pesos dos KPIs de cada tema (apenas os temas com todos os pesos no settings).
+    """
+
+    def __init__(self, hierarchy: Optional[ScoreHierarchy] = None, snapshot: Optional[ScoreSnapshot] = None):
+        self.hierarchy = hierarchy or get_default_hierarchy().prune()
+        self.snapshot = snapshot or ScoreSnapshot.empty()
+
+        # Tema de cada KPI do registro, quando o tema pertence ao primeiro nível da hierarquia
+        first_level = {normalize_name(name): name for name in self.hierarchy.nodes[self.hierarchy.levels[0]]}
+        registry = get_registry()
+        self.kpi_temas = {
+            name: first_level[normalize_name(registry.get_config(name).tema)]
+            for name in registry
+            if registry.get_config(name).tema and normalize_name(registry.get_config(name).tema) in first_level
+        }
+
+        # Pesos dos KPIs de cada tema: sem o PESO de algum KPI, o tema não é calculado pelos KPIs
+        kpi_weights = {}
+        for name, tema in self.kpi_temas.items():
+            kpi_weights.setdefault(tema, {})[name] = registry.get_config(name).peso
+        self.tema_kpis = {}
+        for tema, weights in kpi_weights.items():
+            if any(weight is None for weight in weights.values()):
+                logger.warning(f"O tema {tema} possui KPIs sem PESO no settings: não é calculado pelos KPIs")
+                continue
+            try:
+                Weights(weights=list(weights.values()))
+            except ValueError as error:
+                raise ValueError(f"Pesos inválidos dos KPIs do tema {tema}: {error}") from error
+            self.tema_kpis[tema] = weights
+
+        # As tabelas de consulta são criadas na inicialização, e não no primeiro pedido
+        for name in registry:
+            get_lookup_scorer(name)
+
+    def update_snapshot(self, snapshot: ScoreSnapshot) -> None:
+        """
+        Substitui os últimos scores das agências (ex.: após um novo cálculo do pipeline).
+        """
+        self.snapshot = snapshot
+
+    def score_kpis(self, requests: List[KPIRequest]) -> List[Union[dict, Exception]]:
+        """
+        Calcula os scores de pedidos de KPI, com uma chamada vetorizada por KPI.
+        """
+        results = [None] * len(requests)
+        groups = {}
+        for position, request in enumerate(requests):
+            groups.setdefault(request.kpi, []).append(position)
+
+        for kpi, positions in groups.items():
+            try:
+                scorer = get_lookup_scorer(kpi)
+            except KeyError as error:
+                for position in positions:
+                    results[position] = ValueError(error.args[0])
+                continue
+
+            scores = scorer.calcular_score_batch([requests[position].valor for position in positions])
+            farois = _farol_labels(scores)
+            for position, score, farol in zip(positions, scores.tolist(), farois.tolist()):
+                results[position] = {
+                    "kpi": kpi,
+                    "valor": requests[position].valor,
+                    "score": _to_json_value(score),
+                    "farol": farol,
+                }
+        return results
+
+    def score_agencies(self, requests: List[AgencyRequest]) -> List[Union[dict, Exception]]:
+        """
+        Calcula os scores de pedidos de agência, nível a nível, para o lote inteiro.
+
+        Os temas informados (ou calculados pelos KPIs, com os pesos do settings) substituem os
+        últimos scores da agência e marcam os nós que os agregam para recálculo; os demais nós
+        mantêm os últimos scores. Os pedidos com parte dos KPIs de um tema são recusados.
+        """
+        levels = self.hierarchy.levels
+        names = {level: list(self.hierarchy.nodes[level]) for level in levels}
+        first_position = {name: position for position, name in enumerate(names[levels[0]])}
+
+        results = [None] * len(requests)
+        valid = []
+        for position, request in enumerate(requests):
+            unknown = [kpi for kpi in request.kpis if kpi not in self.kpi_temas]
+            unknown += [tema for tema in request.temas if tema not in first_position]
+            if unknown:
+                results[position] = ValueError(f"KPIs ou temas desconhecidos: {unknown}")
+                continue
+
+            # O score de um tema é calculado apenas com todos os seus KPIs e os respectivos pesos
+            temas = sorted({self.kpi_temas[kpi] for kpi in request.kpis})
+            without_weights = [tema for tema in temas if tema not in self.tema_kpis]
+            missing = {
+                tema: sorted(set(self.tema_kpis[tema]) - set(request.kpis))
+                for tema in temas
+                if tema in self.tema_kpis and set(self.tema_kpis[tema]) - set(request.kpis)
+            }
+            if without_weights:
+                results[position] = ValueError(f"Temas sem os pesos dos KPIs no settings: {without_weights}")
+            elif missing:
+                results[position] = ValueError(f"KPIs ausentes dos temas: {missing}")
+            else:
+                valid.append(position)
+        if not valid:
+            return results
+
+        batch = [requests[position] for position in valid]
+        cd_pontos = np.array([-1 if r.cd_ponto is None else r.cd_ponto for r in batch], dtype=np.int64)
+
+        # TEMAS: MÉDIA DOS SCORES DOS KPIS, PONDERADA PELOS PESOS DO SETTINGS, E SCORES INFORMADOS
+        kpi_values = {}
+        for row, request in enumerate(batch):
+            for kpi, valor in request.kpis.items():
+                kpi_values.setdefault(kpi, ([], []))
+                kpi_values[kpi][0].append(row)
+                kpi_values[kpi][1].append(valor)
+        kpi_scores = {}
+        for kpi, (rows, valores) in kpi_values.items():
+            kpi_scores[kpi] = np.full(len(batch), np.nan)
+            kpi_scores[kpi][rows] = get_lookup_scorer(kpi).calcular_score_batch(valores)
+
+        matrix = self.snapshot.lookup(levels[0], names[levels[0]], cd_pontos)
+        dirty = np.zeros(matrix.shape, dtype=bool)
+        for tema, weights in self.tema_kpis.items():
+            # Os pedidos válidos informam todos os KPIs do tema ou nenhum deles
+            if not all(kpi in kpi_scores for kpi in weights):
+                continue
+            rows = np.zeros(len(batch), dtype=bool)
+            rows[kpi_values[next(iter(weights))][0]] = True
+            kpi_matrix = np.column_stack([kpi_scores[kpi][rows] for kpi in weights])
+            column = first_position[tema]
+            matrix[rows, column] = weighted_score(kpi_matrix, list(weights.values()))
+            dirty[rows, column] = True
+        for row, request in enumerate(batch):
+            for tema, score in request.temas.items():
+                matrix[row, first_position[tema]] = score
+                dirty[row, first_position[tema]] = True
+
+        levels_scores = {levels[0]: (matrix, dirty)}
+
+        # NÍVEIS SEGUINTES: RECÁLCULO DOS NÓS COM COMPONENTES ALTERADOS OU SEM ÚLTIMO SCORE
+        for previous_level, level in zip(levels, levels[1:]):
+            previous_matrix, previous_dirty = levels_scores[previous_level]
+            previous_position = {name: position for position, name in enumerate(names[previous_level])}
+            matrix = self.snapshot.lookup(level, names[level], cd_pontos)
+            dirty = np.zeros(matrix.shape, dtype=bool)
+
+            for position, name in enumerate(names[level]):
+                components = self.hierarchy.nodes[level][name].components
+                columns = [previous_position[component] for component in components]
+                recalculate = previous_dirty[:, columns].any(axis=1) | np.isnan(matrix[:, position])
+                if recalculate.any():
+                    matrix[recalculate, position] = weighted_score(
+                        previous_matrix[recalculate][:, columns], list(components.values())
+                    )
+                dirty[:, position] = recalculate & previous_dirty[:, columns].any(axis=1)
+
+            levels_scores[level] = (matrix, dirty)
+
+        # RESPOSTAS: SCORES E FARÓIS DE CADA NÍVEL, CLASSIFICADOS PARA O LOTE INTEIRO
+        scores = {level: levels_scores[level][0].tolist() for level in levels}
+        farois = {level: _farol_labels(levels_scores[level][0]).tolist() for level in levels}
+        for row, position in enumerate(valid):
+            results[position] = {
+                "cd_ponto": batch[row].cd_ponto,
+                "scores": {
+                    level: dict(zip(names[level], map(_to_json_value, scores[level][row]))) for level in levels
+                },
+                "farois": {level: dict(zip(names[level], farois[level][row])) for level in levels},
+            }
+        return results
+
+    def score_batch(self, requests: List[Union[KPIRequest, AgencyRequest]]) -> List[Union[dict, Exception]]:
+        """
+        Calcula um micro-lote de pedidos.
+
+        Args:
+            requests (list): Pedidos validados (KPIRequest ou AgencyRequest).
+
+        Returns:
+            list: Resultado de cada pedido, na mesma ordem (dict ou a exceção do pedido).
+        """
+        results = [None] * len(requests)
+        for request_type, score in [(KPIRequest, self.score_kpis), (AgencyRequest, self.score_agencies)]:
+            positions = [position for position, request in enumerate(requests) if isinstance(request, request_type)]
+            if positions:
+                for position, result in zip(positions, score([requests[position] for position in positions])):
+                    results[position] = result
+        return results
+
+
+class ScoreService:
+    """
+    Serviço asyncio de score: fila limitada, micro-lotes e servidor HTTP / JSON lines.
+
+    Exemplo:
+        service = ScoreService(ScoringEngine(snapshot=ScoreSnapshot.from_store(store)))
+        asyncio.run(service.serve_forever())
+    """
+
+    def __init__(self, engine: ScoringEngine, config: Optional[ServiceConfig] = None):
+        self.engine = engine
+        self.config = config or ServiceConfig.from_settings()
+
+        self._queue = None
+        self._worker = None
+        self._server = None
+        self._latencies = deque(maxlen=self.config.latency_window)
+        self._requests = self._errors = self._rejected = self._batches = self._batched = 0
+
+    # FILA E MICRO-LOTES
+
+    async def start(self) -> None:
+        """
+        Inicia o worker dos micro-lotes e o servidor (TCP ou socket Unix).
+        """
+        self._queue = asyncio.Queue(maxsize=self.config.max_pending)
+        self._worker = asyncio.create_task(self._run_batches())
+
+        if self.config.unix_socket:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.config.unix_socket)
+            address = self.config.unix_socket
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, self.config.host, self.config.port)
+            address = "{}:{}".format(*self._server.sockets[0].getsockname()[:2])
+        logger.info(f"Serviço de score iniciado em {address}")
+
+    @property
+    def port(self) -> Optional[int]:
+        """
+        Porta TCP em uso (útil com port=0).
+        """
+        if self._server is None or self.config.unix_socket:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """
+        Inicia o serviço e o mantém em execução até o cancelamento.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """
+        Encerra o servidor e o worker dos micro-lotes.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    async def enqueue(self, payload: dict) -> asyncio.Future:
+        """
+        Enfileira um pedido, aguardando espaço na fila por até queue_timeout_ms.
+
+        Args:
+            payload (dict): Pedido decodificado do JSON.
+
+        Returns:
+            asyncio.Future: Futuro com o resultado do pedido (ou a exceção do pedido).
+
+        Raises:
+            ValueError: Se o pedido for inválido.
+            ServiceOverloaded: Se a fila permanecer cheia por mais de queue_timeout_ms.
+        """
+        try:
+            request = parse_request(payload)
+        except ValueError:
+            self._errors += 1
+            raise
+
+        future = asyncio.get_running_loop().create_future()
+        item = (request, future, time.perf_counter())
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(item), self.config.queue_timeout_ms / 1000)
+            except asyncio.TimeoutError:
+                self._rejected += 1
+                raise ServiceOverloaded(f"Fila do serviço cheia ({self.config.max_pending} pedidos).")
+
+        return future
+
+    async def submit(self, payload: dict) -> dict:
+        """
+        Enfileira um pedido e aguarda o seu resultado (ver enqueue).
+
+        Args:
+            payload (dict): Pedido decodificado do JSON.
+
+        Returns:
+            dict: Resultado do pedido.
+        """
+        return await (await self.enqueue(payload))
+
+    async def _collect_batch(self) -> list:
+        # O primeiro pedido abre a janela do micro-lote
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.config.batch_window_ms / 1000
+
+        while len(batch) < self.config.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_batches(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            requests = [request for request, _, _ in batch]
+            try:
+                results = self.engine.score_batch(requests)
+            except Exception as error:
+                logger.exception(f"Erro no cálculo de um lote de {len(batch)} pedidos")
+                results = [error] * len(batch)
+
+            self._batches += 1
+            self._batched += len(batch)
+            finished = time.perf_counter()
+            for (_, future, started), result in zip(batch, results):
+                self._latencies.append((finished - started) * 1000)
+                if isinstance(result, Exception):
+                    self._errors += 1
+                    if not future.done():
+                        future.set_exception(result)
+                else:
+                    self._requests += 1
+                    if not future.done():
+                        future.set_result(result)
+
+    def get_stats(self) -> ServiceStats:
+        """
+        Obtém as estatísticas do serviço.
+
+        Returns:
+            ServiceStats: Contadores, tamanho médio dos lotes e percentis da latência.
+        """
+        latencies = np.asarray(self._latencies, dtype=np.float64)
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            latency_ms = {"p50": p50, "p95": p95, "p99": p99, "max": latencies.max()}
+        else:
+            latency_ms = {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+        return ServiceStats(
+            requests=self._requests,
+            errors=self._errors,
+            rejected=self._rejected,
+            batches=self._batches,
+            mean_batch_size=self._batched / self._batches if self._batches else 0.0,
+            pending=self._queue.qsize() if self._queue is not None else 0,
+            latency_ms={key: round(float(value), 3) for key, value in latency_ms.items()},
+        )
+
+    # PROTOCOLOS: HTTP/1.1 E JSON LINES
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            first_line = await reader.readline()
+            if first_line.split(b" ", 1)[0] in (b"GET", b"POST"):
+                await self._handle_http(first_line, reader, writer)
+            else:
+                await self._handle_json_lines(first_line, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _answer(self, payload) -> tuple:
+        """
+        Calcula um pedido (ou uma lista de pedidos) e monta a resposta.
+
+        Returns:
+            tuple: (status HTTP, corpo da resposta).
+        """
+        if isinstance(payload, list):
+            answers = await asyncio.gather(*(self._answer(item) for item in payload))
+            return 200, [body for _, body in answers]
+        try:
+            return 200, await self.submit(payload)
+        except ServiceOverloaded as error:
+            return 503, {"error": str(error)}
+        except Exception as error:
+            return 400, {"error": str(error)}
+
+    async def _handle_json_lines(self, first_line, reader, writer) -> None:
+        # Os pedidos de uma conexão são calculados ao mesmo tempo e respondidos na ordem recebida.
+        # Com max_batch_size pedidos pendentes, a conexão deixa de ser lida (backpressure pelo TCP)
+        responses = asyncio.Queue(maxsize=self.config.max_batch_size)
+
+        async def write_responses():
+            while True:
+                response = await responses.get()
+                if response is None:
+                    return
+                if isinstance(response, asyncio.Future):
+                    try:
+                        response = await response
+                    except Exception as error:
+                        response = {"error": str(error)}
+                if isinstance(response, tuple):
+                    response = response[1]
+                writer.write(json.dumps(response).encode() + b"\n")
+                if responses.empty():
+                    await writer.drain()
+
+        responder = asyncio.create_task(write_responses())
+        line = first_line
+        while line:
+            if line.strip():
+                try:
+                    payload = json.loads(line)
+                    if isinstance(payload, list):
+                        response = asyncio.ensure_future(self._answer(payload))
+                    else:
+                        response = await self.enqueue(payload)
+                except ValueError as error:
+                    response = {"error": f"Pedido inválido: {error}"}
+                except ServiceOverloaded as error:
+                    response = {"error": str(error)}
+                await responses.put(response)
+            line = await reader.readline()
+        await responses.put(None)
+        await responder
+
+    async def _handle_http(self, first_line, reader, writer) -> None:
+        while first_line:
+            request_line = first_line.decode("latin-1").split()
+            malformed = len(request_line) < 2
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, separator, value = line.decode("latin-1").partition(":")
+                if not separator or not key.strip():
+                    malformed = True
+                headers[key.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get("content-length", 0))
+            except ValueError:
+                length = -1
+
+            if malformed or length < 0:
+                # Pedido ilegível: o corpo não pode ser delimitado e a conexão é encerrada
+                status, body = 400, {"error": "Requisição HTTP inválida."}
+            elif length > MAX_BODY_BYTES:
+                status, body = 413, {"error": "Corpo do pedido acima do limite."}
+            else:
+                method, path = request_line[:2]
+                data = await reader.readexactly(length) if length else b""
+                if method == "GET" and path == "/stats":
+                    status, body = 200, self.get_stats().model_dump()
+                elif method == "GET" and path == "/health":
+                    status, body = 200, {"status": "ok"}
+                elif method == "POST" and path == "/score":
+                    try:
+                        payload = json.loads(data)
+                    except ValueError as error:
+                        status, body = 400, {"error": f"JSON inválido: {error}"}
+                    else:
+                        status, body = await self._answer(payload)
+                else:
+                    status, body = 404, {"error": f"Rota não encontrada: {method} {path}"}
+
+            content = json.dumps(body).encode()
+            keep_alive = (
+                not malformed
+                and 0 <= length <= MAX_BODY_BYTES
+                and headers.get("connection", "").lower() != "close"
+            )
+            writer.write(
+                f"HTTP/1.1 {status} {HTTP_STATUS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(content)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                + content
+            )
+            await writer.drain()
+
+            if not keep_alive:
+                return
+            first_line = await reader.readline()
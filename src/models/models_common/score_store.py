@@ -0,0 +1,282 @@
+"""
+Módulo do Repositório de Scores Mapeado em Memória
+
+Mantém os scores de um período em um diretório, alinhados por agência:
+
+    <diretório>/
+        CD_PONTO.npy                 índice denso das agências (CD_PONTO -> linha), ordenado
+        SCORE_TEMA__AA.npy           um array float64 por score e categoria (NaN: agência ausente)
+        SCORE_PILAR__PERFORMANCE.npy
+        metadata.json                período (DIA, MES, ANO) dos scores
+
+Os arrays são arquivos .npy mapeados em memória (np.memmap): a gravação atualiza a coluna no
+próprio arquivo e a leitura não faz parsing nem join. As calculadoras recebem tabelas Arrow que
+referenciam diretamente a memória mapeada e compartilham as colunas chave, de forma que o
+recálculo do score após uma mudança de pesos é uma única passada sobre os arrays mapeados:
+
+    store = MmapScoreStore("data/db/mmap/2024_09_01")
+    store.write_scores(df_score_pilar, category="PERFORMANCE", score_column="SCORE_PILAR")
+    details_list = store.get_details({"ESG": 0.2, "PERFORMANCE": 0.8}, score_column="SCORE_PILAR")
+    df_score_global = ScoreGlobalCalculator(details_list).score_global
+
+O índice é reescrito apenas quando a gravação inclui agências novas. O repositório supõe um
+único processo gravando por vez; os leitores podem mapear os arquivos ao mesmo tempo.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from config_project.config_app import settings
+from src.models.models_common.score_aggregation import DATE_COLUMNS
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+
+# Arquivo do índice das agências e arquivo dos metadados do repositório
+INDEX_FILE = "CD_PONTO.npy"
+METADATA_FILE = "metadata.json"
+
+# Separador entre o score e a categoria no nome dos arquivos (ex.: SCORE_TEMA__AA.npy)
+COLUMN_SEPARATOR = "__"
+
+
+def get_default_store_path() -> Path:
+    """
+    Obtém o diretório padrão do repositório mapeado, definido em DATABASE.MMAP_STORE_PATH do settings.
+
+    :return: Diretório do repositório.
+    """
+    return Path(
+        Path(__file__).absolute().parents[3],
+        settings.get("DATABASE.MMAP_STORE_PATH", "data/db/mmap"),
+    )
+
+
+class MmapScoreStore:
+    """
+    Repositório dos scores de um período em arrays mapeados em memória, alinhados por agência.
+
+    Attributes:
+        store_dir (Path): Diretório do repositório.
+        periodo (dict, optional): Período dos scores ({'DIA': ..., 'MES': ..., 'ANO': ...}).
+    """
+
+    def __init__(self, store_dir: Optional[Union[str, Path]] = None):
+        """
+        Abre (ou cria) o repositório.
+
+        :param store_dir: Diretório do repositório. Default: get_default_store_path().
+        """
+        self.store_dir = Path(store_dir or get_default_store_path())
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        metadata_path = self.store_dir / METADATA_FILE
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8")) if metadata_path.exists() else {}
+        self.periodo = metadata.get("PERIODO")
+
+        self._index = None
+        self._key_arrays = None
+        self._load_index()
+
+    def _column_path(self, category: str, score_column: str) -> Path:
+        return self.store_dir / f"{score_column}{COLUMN_SEPARATOR}{category}.npy"
+
+    def _load_index(self):
+        index_path = self.store_dir / INDEX_FILE
+        self._index = np.load(index_path, mmap_mode="r") if index_path.exists() else np.empty(0, dtype=np.int64)
+        self._key_arrays = None
+
+    @property
+    def agencies(self) -> np.ndarray:
+        """
+        Índice denso das agências: a linha i de cada coluna corresponde a agencies[i].
+        """
+        return self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def columns(self) -> List[tuple]:
+        """
+        Lista as colunas gravadas no repositório.
+
+        :return: Pares (score_column, category), em ordem alfabética.
+        """
+        return sorted(
+            tuple(path.stem.split(COLUMN_SEPARATOR, 1))
+            for path in self.store_dir.glob(f"*{COLUMN_SEPARATOR}*.npy")
+        )
+
+    def _save_metadata(self):
+        (self.store_dir / METADATA_FILE).write_text(
+            json.dumps({"PERIODO": self.periodo}, indent=2), encoding="utf-8"
+        )
+
+    def _check_period(self, dataframe: pd.DataFrame):
+        """
+        Verifica se o DataFrame contém um único período, igual ao do repositório.
+        """
+        if not all(column in dataframe.columns for column in DATE_COLUMNS) or dataframe.empty:
+            return
+
+        periodos = dataframe[DATE_COLUMNS].drop_duplicates()
+        if len(periodos) > 1:
+            raise ValueError("O repositório mapeado armazena um único período por diretório.")
+
+        periodo = {column: int(periodos[column].iloc[0]) for column in DATE_COLUMNS}
+        if self.periodo is None:
+            self.periodo = periodo
+            self._save_metadata()
+        elif periodo != self.periodo:
+            raise ValueError(f"O período {periodo} difere do período do repositório {self.periodo}.")
+
+    def _grow_index(self, new_agencies: np.ndarray):
+        """
+        Inclui agências novas no índice, reescrevendo as colunas no novo alinhamento.
+
+        Cada arquivo é gravado em um arquivo temporário e substituído ao final, de forma que
+        leitores que já mapearam a versão anterior não são afetados.
+        """
+        old_index = np.asarray(self._index)
+        # Os dois conjuntos não possuem repetições: a ordenação da concatenação já é a união
+        index = np.sort(np.concatenate([old_index, new_agencies]).astype(np.int64))
+        rows = np.searchsorted(index, old_index)
+
+        for score_column, category in self.columns():
+            path = self._column_path(category, score_column)
+            old_values = np.load(path, mmap_mode="r")
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            values = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float64, shape=(len(index),))
+            values[:] = np.nan
+            values[rows] = old_values
+            values.flush()
+            del values, old_values
+            os.replace(tmp_path, path)
+
+        tmp_path = self.store_dir / f"{INDEX_FILE}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.save(file, index)
+        os.replace(tmp_path, self.store_dir / INDEX_FILE)
+        self._load_index()
+
+        logger.info(f"Índice do repositório {self.store_dir} ampliado para {len(index)} agências")
+
+    def write_scores(
+        self,
+        dataframe: pd.DataFrame,
+        category: str,
+        score_column: str = "SCORE_TEMA",
+        index_column: str = "CD_PONTO",
+        replace: bool = True,
+    ) -> int:
+        """
+        Grava a coluna de score de uma categoria, atualizando o arquivo mapeado no próprio lugar.
+
+        :param dataframe: DataFrame com a coluna chave e a coluna de score (ex.: a base de um tema
+            ou o resultado do score pilar).
+        :param category: Nome da categoria (ex.: 'AA', 'PERFORMANCE').
+        :param score_column: Coluna de score gravada (ex.: 'SCORE_TEMA', 'SCORE_PILAR').
+        :param index_column: Coluna chave das agências. Default: 'CD_PONTO'.
+        :param replace: Se True, as agências ausentes do DataFrame ficam sem score (NaN) na
+            categoria; se False, apenas as agências do DataFrame são atualizadas.
+        :return: Quantidade de agências gravadas.
+        :raises ValueError: Se houver agências duplicadas ou mais de um período.
+        """
+        if dataframe.empty and not len(self._index):
+            return 0
+        self._check_period(dataframe)
+
+        agencies = dataframe[index_column].to_numpy(dtype=np.int64)
+        sorted_agencies = np.sort(agencies)
+        if (sorted_agencies[1:] == sorted_agencies[:-1]).any():
+            raise ValueError(f"A categoria {category} possui valores duplicados de {index_column}.")
+
+        new_agencies = np.setdiff1d(sorted_agencies, self._index, assume_unique=True)
+        if len(new_agencies):
+            self._grow_index(new_agencies)
+
+        rows = np.searchsorted(self._index, agencies)
+        path = self._column_path(category, score_column)
+        mode = "r+" if path.exists() else "w+"
+        values = (
+            np.load(path, mmap_mode="r+")
+            if mode == "r+"
+            else np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(len(self._index),))
+        )
+
+        if replace or mode == "w+":
+            values[:] = np.nan
+        values[rows] = dataframe[score_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        values.flush()
+
+        logger.info(f"{len(rows)} scores de {category} ({score_column}) gravados em {path}")
+        return len(rows)
+
+    def read_scores(self, category: str, score_column: str = "SCORE_TEMA") -> np.ndarray:
+        """
+        Obtém a coluna de score de uma categoria, mapeada em memória (somente leitura).
+
+        :param category: Nome da categoria.
+        :param score_column: Coluna de score.
+        :return: Array alinhado a agencies (NaN: agência sem score na categoria).
+        :raises FileNotFoundError: Se a coluna não estiver gravada no repositório.
+        """
+        path = self._column_path(category, score_column)
+        if not path.exists():
+            raise FileNotFoundError(f"A coluna {score_column} da categoria {category} não existe em {self.store_dir}")
+        return np.load(path, mmap_mode="r")
+
+    def get_table(self, category: str, score_column: str = "SCORE_TEMA"):
+        """
+        Obtém os scores de uma categoria como pyarrow.Table, sem cópia da memória mapeada.
+
+        As colunas chave (CD_PONTO e, se houver, DIA, MES e ANO) são os mesmos arrays em todas as
+        tabelas do repositório: o cálculo do score dispensa o join das categorias.
+
+        :param category: Nome da categoria.
+        :param score_column: Coluna de score.
+        :return: Tabela com as colunas chave e a coluna de score.
+        """
+        import pyarrow as pa
+
+        if self._key_arrays is None:
+            n = len(self._index)
+            self._key_arrays = {"CD_PONTO": pa.array(np.asarray(self._index))}
+            if self.periodo is not None:
+                self._key_arrays.update(
+                    {column: pa.array(np.full(n, self.periodo[column], dtype=np.int64)) for column in DATE_COLUMNS}
+                )
+
+        return pa.table({**self._key_arrays, score_column: pa.array(self.read_scores(category, score_column))})
+
+    def get_details(self, weights: Dict[str, float], score_column: str = "SCORE_TEMA") -> List[ScoreDetails]:
+        """
+        Monta os detalhes das categorias para as calculadoras, com os scores lidos da memória mapeada.
+
+        As tabelas cobrem todo o índice do repositório: uma agência sem score em nenhuma das
+        categorias escolhidas resulta em uma linha com score nulo.
+
+        Exemplo:
+            ScorePilarPerformance(store.get_details({"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3}))
+
+        :param weights: Peso de cada categoria, por nome.
+        :param score_column: Coluna de score das categorias (ex.: 'SCORE_TEMA', 'SCORE_PILAR').
+        :return: Lista de ScoreDetails, na ordem de weights.
+        """
+        return [
+            ScoreDetails(
+                dataframe=self.get_table(category, score_column),
+                score_column=score_column,
+                weight=weight,
+                category=category,
+            )
+            for category, weight in weights.items()
+        ]
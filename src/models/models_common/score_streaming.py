@@ -0,0 +1,232 @@
+"""
+Módulo de Agregação de Scores em Streaming
+
+Este módulo calcula o score agregado (pilar ou global) lendo as entradas em blocos de tamanho fixo.
+As entradas devem estar ordenadas pela coluna chave (CD_PONTO); os blocos de todas as categorias
+são combinados por um merge ordenado e cada bloco de resultado é gravado diretamente no arquivo
+de saída, de forma que a memória utilizada é limitada pelo tamanho do bloco.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.models.models_common.score_aggregation import DATE_COLUMNS, aggregate_scores
+from src.utils.farol_functions import CATEGORIAS_FAROL
+from src.utils.pandas_functions import DataChunkWriter, iter_data_chunks
+
+
+class _ChunkSource:
+    """
+    Fonte de blocos de uma categoria, ordenada pela coluna chave.
+
+    Attributes:
+        detail (ScoreDetails): Detalhes da categoria (com file_path).
+        buffer (DataFrame): Linhas lidas e ainda não processadas.
+        exhausted (bool): Indica se o arquivo já foi lido por completo.
+    """
+
+    def __init__(self, detail, chunk_size, index_column):
+        self.detail = detail
+        self.index_column = index_column
+        self.buffer = None
+        self.exhausted = False
+        self._last_key = None
+
+        usecols = [index_column, *DATE_COLUMNS, detail.score_column]
+        if getattr(detail, "farol_column", None):
+            usecols.append(detail.farol_column)
+
+        self._chunks = iter_data_chunks(detail.file_path, chunk_size, usecols=usecols)
+
+    def _read_chunk(self):
+        """
+        Lê o próximo bloco não vazio do arquivo, validando a ordenação pela coluna chave.
+
+        Returns:
+            DataFrame: O bloco lido ou None se o arquivo já foi lido por completo.
+
+        Raises:
+            ValueError: Se o arquivo não estiver ordenado pela coluna chave.
+        """
+        for chunk in self._chunks:
+            if chunk.empty:
+                continue
+
+            keys = chunk[self.index_column].to_numpy()
+            if np.any(keys[1:] < keys[:-1]) or (
+                self._last_key is not None and keys[0] < self._last_key
+            ):
+                raise ValueError(
+                    f"O arquivo {self.detail.file_path} deve estar ordenado por {self.index_column}."
+                )
+            self._last_key = keys[-1]
+
+            return chunk.reset_index(drop=True)
+
+        self.exhausted = True
+        return None
+
+    def refill(self):
+        """
+        Lê o próximo bloco do arquivo quando o buffer estiver vazio.
+        """
+        if not self.has_rows and not self.exhausted:
+            self.buffer = self._read_chunk()
+
+    def extend(self):
+        """
+        Acrescenta o próximo bloco do arquivo ao buffer.
+
+        Utilizado quando todas as linhas do buffer possuem a mesma chave (ex.: vários
+        períodos da mesma agência), que pode continuar no bloco seguinte.
+        """
+        chunk = self._read_chunk()
+        if chunk is not None:
+            self.buffer = pd.concat([self.buffer, chunk], ignore_index=True)
+
+    @property
+    def has_rows(self):
+        return self.buffer is not None and not self.buffer.empty
+
+    def last_key(self):
+        return self.buffer[self.index_column].iloc[-1]
+
+    def take_before(self, frontier):
+        """
+        Remove do buffer e retorna as linhas com chave menor que a fronteira.
+
+        Args:
+            frontier: Chave de fronteira (None retorna todo o buffer).
+
+        Returns:
+            DataFrame: Linhas retiradas do buffer.
+        """
+        if not self.has_rows:
+            return None
+
+        if frontier is None:
+            position = len(self.buffer)
+        else:
+            position = np.searchsorted(
+                self.buffer[self.index_column].to_numpy(), frontier, side="left"
+            )
+
+        rows = self.buffer.iloc[:position]
+        self.buffer = self.buffer.iloc[position:]
+
+        return rows
+
+
+def stream_aggregate_scores(
+    details_list,
+    output_path,
+    score_column,
+    farol_column,
+    chunk_size,
+    index_column="CD_PONTO",
+):
+    """
+    Agrega, em blocos, os scores de várias categorias e grava o resultado no arquivo de saída.
+
+    A cada iteração, são processadas todas as chaves menores que a menor das últimas chaves
+    disponíveis entre as categorias ainda não lidas por completo. Assim, cada chave (com todos os
+    seus períodos) é agregada uma única vez com as linhas de todas as categorias, produzindo
+    exatamente o mesmo resultado do cálculo em memória (aggregate_scores).
+
+    Args:
+        details_list (list): Lista de objetos ScoreDetails com o caminho (file_path) de cada categoria.
+        output_path (str): Caminho do arquivo de saída (CSV ou Parquet).
+        score_column (str): Nome da coluna do score agregado (ex.: 'SCORE_PILAR').
+        farol_column (str): Nome da coluna do farol agregado (ex.: 'FAROL_PILAR').
+        chunk_size (int): Quantidade máxima de linhas lidas por bloco de cada categoria.
+        index_column (str): Nome da coluna chave dos arquivos. Default: 'CD_PONTO'.
+
+    Returns:
+        int: Quantidade de linhas gravadas no arquivo de saída.
+    """
+    sources = [_ChunkSource(detail, chunk_size, index_column) for detail in details_list]
+
+    with DataChunkWriter(output_path) as writer:
+        while True:
+            for source in sources:
+                source.refill()
+
+            if not any(source.has_rows for source in sources):
+                break
+
+            # Fronteira: menor última chave entre as categorias que ainda possuem blocos a ler.
+            # As linhas com chave igual à fronteira podem continuar no próximo bloco (ex.: outros
+            # períodos da mesma agência) e só são processadas quando a chave estiver completa
+            pending = [
+                source.last_key()
+                for source in sources
+                if source.has_rows and not source.exhausted
+            ]
+            frontier = min(pending) if pending else None
+
+            chunk_details = []
+            for source in sources:
+                rows = source.take_before(frontier)
+                if rows is not None and not rows.empty:
+                    chunk_details.append(
+                        source.detail.model_copy(update={"dataframe": rows})
+                    )
+
+            if not chunk_details:
+                # Nenhuma chave completa: amplia o buffer das categorias que terminam na fronteira
+                for source in sources:
+                    if source.has_rows and not source.exhausted and source.last_key() == frontier:
+                        source.extend()
+                continue
+
+            df_chunk = aggregate_scores(
+                chunk_details,
+                score_column=score_column,
+                farol_column=farol_column,
+                index_column=index_column,
+            )
+
+            # Mantém todas as colunas de categoria, inclusive as ausentes no bloco
+            df_chunk = _complete_columns(
+                df_chunk, details_list, score_column, farol_column, index_column
+            )
+            writer.write(df_chunk)
+
+    return writer.rows_written
+
+
+def _complete_columns(df_chunk, details_list, score_column, farol_column, index_column):
+    """
+    Garante que o bloco possua as colunas de todas as categorias, na ordem do cálculo em memória.
+
+    Args:
+        df_chunk (DataFrame): Bloco agregado.
+        details_list (list): Lista completa de objetos ScoreDetails.
+        score_column (str): Nome da coluna do score agregado.
+        farol_column (str): Nome da coluna do farol agregado.
+        index_column (str): Nome da coluna chave.
+
+    Returns:
+        DataFrame: Bloco com todas as colunas.
+    """
+    columns = [index_column, *[c for c in DATE_COLUMNS if c in df_chunk.columns]]
+    for detail in details_list:
+        columns += [f"{detail.category}_{suffix}" for suffix in ("SCORE", "PESO", "FAROL")]
+    columns += [score_column, farol_column]
+
+    missing = [column for column in columns if column not in df_chunk.columns]
+    for column in missing:
+        if column.endswith("_FAROL"):
+            df_chunk[column] = pd.Categorical.from_codes(
+                np.full(len(df_chunk), -1, dtype=np.int8),
+                categories=CATEGORIAS_FAROL,
+                ordered=True,
+            )
+        else:
+            df_chunk[column] = np.nan
+
+    return df_chunk[columns]
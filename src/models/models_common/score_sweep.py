@@ -0,0 +1,185 @@
+"""
+Módulo de Análise de Sensibilidade dos Pesos
+
+Este módulo calcula o score agregado (pilar ou global) de todas as agências para vários vetores de
+pesos (cenários) de uma só vez. Os scores das categorias são alinhados uma única vez e o score de
+todos os cenários é obtido por um único produto matricial (agências x categorias) x (categorias x
+cenários), com a renormalização pelos pesos das categorias disponíveis. Para cada cenário, são
+reportados a distribuição dos faróis e a quantidade de agências que mudaram de farol em relação
+aos pesos atuais.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from src.models.models_common.score_aggregation import align_scores, get_key_columns
+from src.utils.farol_functions import CATEGORIAS_FAROL, get_limites_farol
+
+# Quantidade máxima de células (agências x cenários) calculadas por bloco
+SWEEP_BLOCK_CELLS = 4_000_000
+
+
+def build_weight_grid(n_categories, step=0.1):
+    """
+    Cria a grade de todos os vetores de pesos múltiplos de step que somam 1.0.
+
+    Args:
+        n_categories (int): Quantidade de categorias.
+        step (float): Passo da grade (ex.: 0.1 gera os pesos 0.0, 0.1, ..., 1.0). Default: 0.1.
+
+    Returns:
+        np.ndarray: Matriz (cenários x categorias) de pesos.
+
+    Raises:
+        ValueError: Se 1.0 não for múltiplo do passo.
+    """
+    units = round(1 / step)
+    if units < 1 or not np.isclose(units * step, 1.0):
+        raise ValueError(f"O passo da grade deve dividir 1.0 em partes iguais: {step}")
+
+    # Cada vetor de pesos é uma composição de 'units' em n_categories partes (stars and bars)
+    grid = []
+    for bars in combinations(range(units + n_categories - 1), n_categories - 1):
+        limits = (-1, *bars, units + n_categories - 1)
+        grid.append([limits[i + 1] - limits[i] - 1 for i in range(n_categories)])
+
+    return np.asarray(grid, dtype=np.float64).reshape(-1, n_categories) / units
+
+
+def sample_weights(n_categories, n_scenarios, seed=None):
+    """
+    Sorteia vetores de pesos uniformemente entre todos os vetores que somam 1.0 (Dirichlet).
+
+    Args:
+        n_categories (int): Quantidade de categorias.
+        n_scenarios (int): Quantidade de cenários.
+        seed (int, optional): Semente do gerador aleatório.
+
+    Returns:
+        np.ndarray: Matriz (cenários x categorias) de pesos.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.ones(n_categories), size=n_scenarios)
+
+
+def sweep_scores(details_list, weight_matrix, score_column, index_column="CD_PONTO"):
+    """
+    Calcula o score agregado de todas as agências para cada vetor de pesos.
+
+    O score de cada cenário é a soma dos scores ponderados das categorias disponíveis dividida
+    pela soma dos pesos dessas categorias. Os cenários são calculados em blocos de até
+    SWEEP_BLOCK_CELLS células, com um produto matricial por bloco, e o score de cada cenário é
+    idêntico ao do cálculo completo (aggregate_scores) com os mesmos pesos. A referência das
+    mudanças de farol são os pesos atuais das categorias (ScoreDetails.weight).
+
+    Args:
+        details_list (list): Lista de objetos ScoreDetails, com os pesos atuais.
+        weight_matrix (array-like): Matriz (cenários x categorias) de pesos, na ordem de details_list.
+        score_column (str): Nome da coluna do score agregado (ex.: 'SCORE_GLOBAL').
+        index_column (str): Nome da coluna chave dos DataFrames. Default: 'CD_PONTO'.
+
+    Returns:
+        DataFrame: Uma linha por cenário, com os pesos de cada categoria (PESO_<CAT>), a média do
+        score agregado (<score_column>_MEDIO), a quantidade de linhas (agência e período) em cada
+        farol (QTD_<FAROL>) e a quantidade de linhas que mudaram de farol (QTD_MUDANCA_FAROL).
+
+    Raises:
+        ValueError: Se a matriz de pesos não tiver uma coluna por categoria.
+    """
+    weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=np.float64))
+    if weight_matrix.shape[1] != len(details_list):
+        raise ValueError(
+            f"A matriz de pesos deve ter {len(details_list)} colunas (uma por categoria)."
+        )
+
+    key_columns = get_key_columns(details_list, index_column=index_column)
+    _, _, score_matrix = align_scores(
+        details_list, index_column=index_column, key_columns=key_columns
+    )
+    n_categories = len(details_list)
+
+    # As linhas são agrupadas pelo padrão de categorias disponíveis: em cada grupo, a soma dos
+    # pesos disponíveis é a mesma para todas as linhas (um vetor por cenário)
+    available = ~np.isnan(score_matrix)
+    pattern = available @ (1 << np.arange(n_categories))
+    order = np.argsort(pattern, kind="stable")
+    available, pattern = available[order], pattern[order]
+    scores_filled = np.where(available, score_matrix[order], 0.0)
+    starts = np.r_[0, np.flatnonzero(np.diff(pattern)) + 1]
+    groups = [
+        (start, stop, available[start])
+        for start, stop in zip(starts, np.r_[starts[1:], len(pattern)])
+    ]
+    limite_vermelho, limite_amarelo = get_limites_farol()
+
+    def aggregate(weights):
+        # Produto (agências x categorias) x (categorias x cenários) acumulado categoria a categoria,
+        # na mesma ordem da soma de weighted_score: cada cenário é idêntico ao cálculo completo
+        scores = np.zeros((len(scores_filled), len(weights)))
+        product = np.empty_like(scores)
+        for j in range(n_categories):
+            np.multiply(scores_filled[:, j, None], weights[:, j], out=product)
+            scores += product
+
+        for start, stop, categories in groups:
+            denominator = np.zeros(len(weights))
+            for j in np.flatnonzero(categories):
+                denominator += weights[:, j]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                scores[start:stop] /= denominator
+            scores[start:stop, denominator == 0] = np.nan
+
+        return scores
+
+    def classify(scores):
+        # Códigos do farol: 0 (sem score), 1 (VERMELHO), 2 (AMARELO) e 3 (VERDE), com os mesmos
+        # limites de classificar_farol (scores iguais ao limite ficam no farol inferior)
+        valid = ~np.isnan(scores)
+        codes = valid.astype(np.int8)
+        with np.errstate(invalid="ignore"):
+            codes += scores > limite_vermelho
+            codes += scores > limite_amarelo
+        return codes, valid
+
+    # FAROL DOS PESOS ATUAIS (REFERÊNCIA DAS MUDANÇAS)
+    baseline, _ = classify(aggregate(np.asarray([[detail.weight for detail in details_list]])))
+
+    n_rows, n_scenarios = len(score_matrix), len(weight_matrix)
+    block = max(1, SWEEP_BLOCK_CELLS // max(n_rows, 1))
+
+    means = np.full(n_scenarios, np.nan)
+    counts = np.zeros((n_scenarios, len(CATEGORIAS_FAROL)), dtype=np.int64)
+    changes = np.zeros(n_scenarios, dtype=np.int64)
+
+    # CALCULANDO OS CENÁRIOS EM BLOCOS
+    for start in range(0, n_scenarios, block):
+        stop = min(start + block, n_scenarios)
+        scores = aggregate(weight_matrix[start:stop])
+        codes, valid = classify(scores)
+
+        for code in range(len(CATEGORIAS_FAROL)):
+            counts[start:stop, code] = (codes == code + 1).sum(axis=0)
+        changes[start:stop] = (codes != baseline).sum(axis=0)
+
+        scores[~valid] = 0.0
+        n_valid = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[start:stop] = np.where(n_valid > 0, scores.sum(axis=0) / n_valid, np.nan)
+
+    columns = {"CENARIO": np.arange(1, n_scenarios + 1)}
+    columns.update(
+        {f"PESO_{detail.category}": weight_matrix[:, j] for j, detail in enumerate(details_list)}
+    )
+    columns[f"{score_column}_MEDIO"] = means
+    columns.update(
+        {f"QTD_{farol}": counts[:, code] for code, farol in enumerate(CATEGORIAS_FAROL)}
+    )
+    columns["QTD_MUDANCA_FAROL"] = changes
+
+    return pd.DataFrame(columns)
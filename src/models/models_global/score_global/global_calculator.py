@@ -1,4 +1,10 @@
-import pandas as pd
+from src.models.models_common.score_aggregation import aggregate_scores
+from src.models.models_common.score_incremental import incremental_aggregate_scores
+from src.models.models_common.score_query import ScoreQuery
+from src.models.models_common.score_streaming import stream_aggregate_scores
+from src.models.models_common.score_sweep import sweep_scores
+from src.utils.farol_functions import definir_farol
+from src.utils.schema_functions import compact_dataframe
 from .weights import Weights
 
 
@@ -8,106 +14,162 @@ class ScoreGlobalCalculator:
 
     Attributes:
         details_list (list): Lista de objetos ScoreDetails contendo dados e metadata de cada categoria.
-        dia (int): Dia associado aos dados.
-        mes (int): Mês associado aos dados.
-        ano (int): Ano associado aos dados.
+        dia (int, optional): Dia associado aos dados.
+        mes (int, optional): Mês associado aos dados.
+        ano (int, optional): Ano associado aos dados.
+        compact (bool): Indica se o resultado é mantido no esquema compacto.
+        arrow (bool): Indica se o resultado é mantido como pyarrow.Table.
         score_global (DataFrame): DataFrame contendo o score global calculado.
     """
 
-    def __init__(self, details_list, dia, mes, ano):
+    def __init__(
+        self, details_list, dia=None, mes=None, ano=None, compact=False, float32=False, arrow=False
+    ):
         """
         Inicializa a classe com detalhes das categorias e a data dos dados.
 
+        As datas do resultado são obtidas das colunas 'DIA', 'MES' e 'ANO' das categorias, que
+        podem conter vários períodos: cada par (CD_PONTO, período) gera uma linha do resultado.
+
         Args:
             details_list (list): Lista de objetos ScoreDetails.
-            dia (int): Dia da data referente aos dados.
-            mes (int): Mês da data referente aos dados.
-            ano (int): Ano da data referente aos dados.
+            dia (int, optional): Dia da data referente aos dados.
+            mes (int, optional): Mês da data referente aos dados.
+            ano (int, optional): Ano da data referente aos dados.
+            compact (bool): Se True, mantém o resultado no esquema compacto: pesos nos metadados
+                (DataFrame.attrs), faróis categóricos e colunas chave no menor tipo inteiro.
+            float32 (bool): Se True (com compact=True), mantém os scores em float32.
+            arrow (bool): Se True, o resultado é calculado e mantido como pyarrow.Table, sem a
+                conversão para DataFrame. Os dados das categorias podem ser DataFrames ou tabelas Arrow.
+
+        Raises:
+            ValueError: Se compact e arrow forem informados ao mesmo tempo.
         """
         Weights(weights=[details.weight for details in details_list])  # Valida os pesos
+        if compact and arrow:
+            raise ValueError("O esquema compacto não é suportado no resultado em Arrow.")
+
         self.details_list = details_list
         self.dia = dia
         self.mes = mes
         self.ano = ano
+        self.compact = compact
+        self.arrow = arrow
         self.score_global = self.calculate_score_global()
 
+        if compact:
+            self.score_global = compact_dataframe(self.score_global, float32=float32)
+
     def calculate_score_global(self):
         """
         Calcula o score global combinado de todas os pilares.
 
         Returns:
-            DataFrame: DataFrame com as colunas 'CD_PONTO', 'DIA', 'MES', 'ANO', scores, pesos,
-            faróis de cada categoria, e o score e farol global.
+            DataFrame: DataFrame (ou pyarrow.Table, com arrow=True) com as colunas 'CD_PONTO', 'DIA',
+            'MES', 'ANO', scores, pesos, faróis de cada categoria, e o score e farol global, com uma
+            linha por agência e período.
+        """
+        return aggregate_scores(
+            self.details_list,
+            score_column="SCORE_GLOBAL",
+            farol_column="FAROL_GLOBAL",
+            arrow=self.arrow,
+        )
+
+    @staticmethod
+    def query(details_list):
+        """
+        Cria uma consulta preguiçosa sobre o score global, com filtros de agências, período e categoria
+        e seleção de colunas empurrados para a leitura dos arquivos (ver score_query).
+
+        Exemplo:
+            ScoreGlobalCalculator.query(details_list).where_agencies([1001]).select(["SCORE_GLOBAL"]).collect()
+
+        Args:
+            details_list (list): Lista de objetos ScoreDetails, com o DataFrame ou o caminho do arquivo
+                (ScoreDetails.file_path) de cada categoria.
+
+        Returns:
+            ScoreQuery: A consulta, executada por collect().
+        """
+        Weights(weights=[details.weight for details in details_list])  # Valida os pesos
+
+        return ScoreQuery(details_list, score_column="SCORE_GLOBAL", farol_column="FAROL_GLOBAL")
+
+    @staticmethod
+    def calculate_streaming(details_list, output_path, chunk_size):
+        """
+        Calcula o score global em blocos, gravando cada bloco do resultado no arquivo de saída.
+
+        As entradas (ScoreDetails.file_path) devem ser arquivos CSV ou Parquet ordenados por
+        CD_PONTO. Os vários períodos de uma agência são agregados juntos, mesmo quando ocupam
+        mais de um bloco. A memória utilizada é limitada pelo tamanho do bloco e o resultado é
+        idêntico ao do cálculo em memória.
+
+        Args:
+            details_list (list): Lista de objetos ScoreDetails com o caminho do arquivo de cada categoria.
+            output_path (str): Caminho do arquivo de saída (CSV ou Parquet).
+            chunk_size (int): Quantidade máxima de linhas lidas por bloco de cada categoria.
+
+        Returns:
+            int: Quantidade de linhas gravadas no arquivo de saída.
         """
-        df_final = pd.DataFrame()
-
-        for detail in self.details_list:
-            df = detail.dataframe.copy()
-            category = detail.category
-
-            # Nomeando as colunas conforme a categoria para clareza e prevenção de sobreposição
-            score_col = f"{category}_SCORE"
-            peso_col = f"{category}_PESO"
-            farol_col = f"{category}_FAROL"
-
-            # Renomeando a coluna de score e farol
-            df.rename(
-                columns={
-                    detail.score_column: score_col,
-                    detail.farol_column: farol_col,
-                },
-                inplace=True,
-            )
-
-            # Obtendo o peso do pilar
-            df[peso_col] = detail.weight
-
-            # Primeira categoria inicializa o df_final, as subsequentes são mescladas
-            if df_final.empty:
-                df_final = df[
-                    ["CD_PONTO", "DIA", "MES", "ANO", score_col, peso_col, farol_col]
-                ]
-            else:
-                df_final = df_final.merge(
-                    df[["CD_PONTO", score_col, peso_col, farol_col]],
-                    on="CD_PONTO",
-                    how="outer",
-                )
-
-        # Calcular o score global ponderado e o farol correspondente
+        Weights(weights=[details.weight for details in details_list])  # Valida os pesos
+
+        return stream_aggregate_scores(
+            details_list,
+            output_path=output_path,
+            score_column="SCORE_GLOBAL",
+            farol_column="FAROL_GLOBAL",
+            chunk_size=chunk_size,
+        )
+
+    @staticmethod
+    def calculate_incremental(details_list, output_path):
         """
-        1)
-        Iteração: A expressão itera sobre todas as colunas do DataFrame 
-        df_final que contêm a substring "_SCORE" no nome. 
-        Cada col nesse loop é o nome de uma coluna de score de um pilar específico.
-        
-        2)
-        Ponderação: Para cada coluna de score identificada, 
-        a expressão col.replace("_SCORE", "_PESO") gera o nome 
-        correspondente da coluna de peso. 
-        Por exemplo, se col é "ESG_SCORE", a expressão gerará "ESG_PESO".
-        
-        3)
-        Multiplicação: Cada score individual em df_final[col] é 
-        multiplicado pelo seu peso correspondente em 
-        df_final[col.replace("_SCORE", "_PESO")]. 
-        Isso pondera cada score pelo seu respectivo peso.
-        
-        4)
-        Soma: A função sum() agrega todos esses scores ponderados 
-        para cada linha, resultando na soma dos 
-        scores ponderados para cada agência.
+        Calcula o score global recalculando apenas as agências alteradas desde a execução anterior.
+
+        As impressões digitais das entradas e os pesos da execução anterior são mantidos em um
+        arquivo de estado ao lado do arquivo de saída. As linhas alteradas são recalculadas e
+        combinadas com o resultado anterior, gravado novamente no arquivo de saída.
+
+        Args:
+            details_list (list): Lista de objetos ScoreDetails.
+            output_path (str): Caminho do arquivo de saída.
+
+        Returns:
+            IncrementalResult: Resultado completo e a quantidade de linhas recalculadas e removidas.
+        """
+        Weights(weights=[details.weight for details in details_list])  # Valida os pesos
+
+        return incremental_aggregate_scores(
+            details_list,
+            output_path=output_path,
+            score_column="SCORE_GLOBAL",
+            farol_column="FAROL_GLOBAL",
+        )
+
+    @staticmethod
+    def calculate_sweep(details_list, weight_matrix):
         """
+        Calcula o score global de todas as agências para vários vetores de pesos (análise de sensibilidade).
+
+        Cada vetor de pesos é validado pelo modelo Weights. As mudanças de farol são contadas em
+        relação aos pesos atuais das categorias (ScoreDetails.weight).
 
-        df_final["SCORE_GLOBAL"] = sum(
-            df_final[col] * df_final[col.replace("_SCORE", "_PESO")]
-            for col in df_final.columns
-            if "_SCORE" in col
-        ) / df_final[[col for col in df_final.columns if "_PESO" in col]].sum(axis=1)
+        Args:
+            details_list (list): Lista de objetos ScoreDetails, com os pesos atuais.
+            weight_matrix (array-like): Matriz (cenários x categorias) de pesos, na ordem de details_list.
 
-        df_final["FAROL_GLOBAL"] = df_final["SCORE_GLOBAL"].apply(self.definir_farol)
+        Returns:
+            DataFrame: Uma linha por cenário, com os pesos, a média do score, a distribuição dos
+            faróis e a quantidade de agências que mudaram de farol.
+        """
+        Weights(weights=[details.weight for details in details_list])  # Valida os pesos atuais
+        for weights in weight_matrix:
+            Weights(weights=list(weights))  # Valida os pesos de cada cenário
 
-        return df_final
+        return sweep_scores(details_list, weight_matrix, score_column="SCORE_GLOBAL")
 
     @staticmethod
     def definir_farol(score):
@@ -120,9 +182,4 @@ class ScoreGlobalCalculator:
         Returns:
             str: Retorna 'VERMELHO', 'AMARELO' ou 'VERDE' com base no valor do score.
         """
-        if score <= 4:
-            return "VERMELHO"
-        elif score <= 8:
-            return "AMARELO"
-        else:
-            return "VERDE"
+        return definir_farol(score)
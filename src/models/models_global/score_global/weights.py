@@ -9,8 +9,13 @@ Versão: 1.0.0
 Data de Atualização: 26/09/2024
 """
 
+import math
+
 from pydantic import BaseModel, validator
 
+# Tolerância da soma dos pesos (erros de arredondamento de ponto flutuante)
+WEIGHTS_SUM_TOLERANCE = 1e-9
+
 
 class Weights(BaseModel):
     """
@@ -27,6 +32,9 @@ class Weights(BaseModel):
         """
         Valida se a soma dos pesos na lista é igual a 1.0.
 
+        A comparação tolera os erros de arredondamento de ponto flutuante (ex.: pesos 0.3, 0.3 e 0.4,
+        ou pesos amostrados em uma análise de sensibilidade), até WEIGHTS_SUM_TOLERANCE.
+
         Arguments:
             v (list): Lista de pesos a ser validada.
 
@@ -36,6 +44,6 @@ class Weights(BaseModel):
         Raises:
             ValueError: Se a soma dos pesos não for igual a 1.0.
         """
-        if sum(v) != 1.0:
+        if not math.isclose(sum(v), 1.0, rel_tol=0.0, abs_tol=WEIGHTS_SUM_TOLERANCE):
             raise ValueError("A soma dos pesos deve ser igual a 1.0")
         return v
@@ -1,6 +1,5 @@
-from config_project.config_app import settings
-
 from src.models.models_kpi.model_score.modelo_score_indice import IndiceConsumo
+from src.models.models_kpi.registry import get_registry
 
 
 class ICA(IndiceConsumo):
@@ -17,10 +16,10 @@ class ICA(IndiceConsumo):
         indice (float, optional): O Índice de Consumo de Água (ICA).
         percentual_acima (float, optional): O percentual acima do consumo ideal de água.
         """
-        ponto_a = settings.get("ICA.MODEL.PONTO_A")  # Ponto específico para ICA
-        ponto_b = settings.get("ICA.MODEL.PONTO_B")  # Ponto específico para ICA
+        # Pontos específicos para ICA, obtidos do registro compilado do settings
+        config = get_registry().get_config("ICA").model
         super().__init__(
-            ponto_a, ponto_b, indice=indice, percentual_acima=percentual_acima
+            config.ponto_a, config.ponto_b, indice=indice, percentual_acima=percentual_acima
         )
 
 
@@ -44,3 +43,34 @@ def Model_Score_ICA(indice, minimo, maximo, casas_decimais):
     )
 
     return score
+
+
+def Model_Score_ICA_batch(
+    indices=None, minimo=None, maximo=None, casas_decimais=2, percentuais_acima=None
+):
+    """
+    Realiza o cálculo do score para ICA sobre colunas inteiras.
+
+    A regra 'indice' ou 'percentual_acima' é validada uma única vez por coluna
+    e o cálculo é feito de forma vetorizada.
+
+    Parameters:
+    indices (Union[np.ndarray, pd.Series, list], optional): Os valores do índice de consumo de água.
+    minimo (float, optional): O valor mínimo permitido para o score.
+    maximo (float, optional): O valor máximo permitido para o score.
+    casas_decimais (int): O número de casas decimais para o arredondamento do score.
+    percentuais_acima (Union[np.ndarray, pd.Series, list], optional): Os percentuais acima do consumo ideal.
+
+    Returns:
+    Union[np.ndarray, pd.Series]: Os scores calculados.
+    """
+
+    # INSTANCIANDO A CLASSE ICA COM AS COLUNAS
+    ica = ICA(indice=indices, percentual_acima=percentuais_acima)
+
+    # CALCULANDO OS SCORES
+    scores = ica.calcular_score_batch(
+        minimo=minimo, maximo=maximo, casas_decimais=casas_decimais
+    )
+
+    return scores
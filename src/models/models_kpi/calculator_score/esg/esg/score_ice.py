@@ -1,4 +1,5 @@
 from src.models.models_kpi.model_score.modelo_score_indice import IndiceConsumo
+from src.models.models_kpi.registry import get_registry
 
 
 class ICE(IndiceConsumo):
@@ -15,10 +16,10 @@ class ICE(IndiceConsumo):
         indice (float, optional): O Índice de Consumo de Energia (ICE).
         percentual_acima (float, optional): O percentual acima do consumo ideal de energia.
         """
-        ponto_a = (1.0, 9.0)  # Ponto específico para ICE
-        ponto_b = (1.3, 7.0)  # Ponto específico para ICE
+        # Pontos específicos para ICE, obtidos do registro compilado do settings
+        config = get_registry().get_config("ICE").model
         super().__init__(
-            ponto_a, ponto_b, indice=indice, percentual_acima=percentual_acima
+            config.ponto_a, config.ponto_b, indice=indice, percentual_acima=percentual_acima
         )
 
 def Model_Score_ICE(indice, minimo, maximo, casas_decimais):
@@ -40,4 +41,35 @@ def Model_Score_ICE(indice, minimo, maximo, casas_decimais):
         minimo=minimo, maximo=maximo, casas_decimais=casas_decimais
     )
 
-    return score
\ No newline at end of file
+    return score
+
+
+def Model_Score_ICE_batch(
+    indices=None, minimo=None, maximo=None, casas_decimais=2, percentuais_acima=None
+):
+    """
+    Realiza o cálculo do score para ICE sobre colunas inteiras.
+
+    A regra 'indice' ou 'percentual_acima' é validada uma única vez por coluna
+    e o cálculo é feito de forma vetorizada.
+
+    Parameters:
+    indices (Union[np.ndarray, pd.Series, list], optional): Os valores do índice de consumo de energia.
+    minimo (float, optional): O valor mínimo permitido para o score.
+    maximo (float, optional): O valor máximo permitido para o score.
+    casas_decimais (int): O número de casas decimais para o arredondamento do score.
+    percentuais_acima (Union[np.ndarray, pd.Series, list], optional): Os percentuais acima do consumo ideal.
+
+    Returns:
+    Union[np.ndarray, pd.Series]: Os scores calculados.
+    """
+
+    # INSTANCIANDO A CLASSE ICE COM AS COLUNAS
+    ice = ICE(indice=indices, percentual_acima=percentuais_acima)
+
+    # CALCULANDO OS SCORES
+    scores = ice.calcular_score_batch(
+        minimo=minimo, maximo=maximo, casas_decimais=casas_decimais
+    )
+
+    return scores
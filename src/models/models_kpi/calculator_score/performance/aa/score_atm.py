@@ -1,26 +1,19 @@
 import numpy as np
 
-from src.models.models_kpi.model_score.modelo_score_faixa import FaixaScore, ScorePorFaixa
+from src.models.models_kpi.registry import get_registry
 
-# Faixas do Score de ATM
-faixas_score = [
-    FaixaScore(
-        limite_inferior=0, limite_superior=4, score_min=9, score_max=10
-    ),
-    FaixaScore(
-        limite_inferior=4.01, limite_superior=8, score_min=7, score_max=9
-    ),
-    FaixaScore(
-        limite_inferior=8.01, limite_superior=100, score_min=0, score_max=7
-    ),
-]
+# Faixas do Score de ATM (bloco ATM.MODEL do settings)
+faixas_score = get_registry().get_config("ATM").model.faixas
 
-# Instanciando a calculadora genérica do Score por faixa
-calculadora_score = ScorePorFaixa(faixas=faixas_score)
+# Calculadora do Score por faixa, compilada pelo registro dos modelos
+calculadora_score = get_registry()["ATM"].model
 
-# INICIANDO A LISTA DE PARÂMETROS
-# Gera os valores de entrada de 0 a 10 com steps de 0.1
-list_params = np.arange(0, 100, 0.1)
-for entrada in list_params:
-    score = calculadora_score.calcular_score(entrada, model="indisponibilidade")
-    print(f"Entrada: {entrada} -> Score calculado: {score}")
\ No newline at end of file
+if __name__ == "__main__":
+    # INICIANDO A LISTA DE PARÂMETROS
+    # Gera os valores de entrada de 0 a 100 com steps de 0.1
+    list_params = np.arange(0, 100, 0.1)
+
+    # Calculando todos os scores em uma única chamada vetorizada
+    scores = calculadora_score.calcular_score_batch(list_params, model="indisponibilidade")
+    for entrada, score in zip(list_params, scores):
+        print(f"Entrada: {entrada} -> Score calculado: {score}")
@@ -1,5 +1,8 @@
-from config_project.config_app import settings
+from functools import lru_cache
+
+from src.models.models_kpi.lookup import get_lookup_scorer
 from src.models.models_kpi.model_score.modelo_score_inflexao import Score_Inflexao
+from src.models.models_kpi.registry import get_inflexao_params, get_registry
 
 
 class TCX(Score_Inflexao):
@@ -14,22 +17,25 @@ class TCX(Score_Inflexao):
 
         Parameters:
         """
-        # Obtendo o ponto central do modelo a partir das configurações
-        ponto_central = settings.get("TCX.MODEL.PONTO_A")  # Ponto central (x1, y1)
+        # Obtendo o modelo (ponto central, direção e limites) do registro compilado do settings
+        config = get_registry().get_config("TCX").model
 
-        # Definimos qual será o comportamento do score, após o ponto central (x > ponto central)
-        direcao = "decrescente"
+        # Inicializando a classe pai com os pontos
+        super().__init__(**get_inflexao_params(config))
 
-        # Valor maximo de reinicializações
-        limite_superior = 5
-        # Valor minimo de reinicializações
-        limite_inferior = 0
 
-        # Inicializando a classe pai com os pontos
-        super().__init__(ponto_central=ponto_central,
-                         direcao=direcao,
-                         limite_superior=limite_superior,
-                         limite_inferior=limite_inferior)
+@lru_cache(maxsize=None)
+def get_model_tcx():
+    """
+    Retorna a instância compartilhada do modelo TCX.
+
+    A curva (declives e interceptos) não depende da entrada,
+    portanto é construída uma única vez e reutilizada em todos os cálculos.
+
+    Returns:
+    TCX: A instância do modelo TCX.
+    """
+    return TCX()
 
 
 def Model_Score_TCX(reinicializacoes):
@@ -42,10 +48,30 @@ def Model_Score_TCX(reinicializacoes):
     Returns:
     float: O score calculado.
     """
-    # Instanciando a classe TCX
-    tcx = TCX()
+    # Obtendo a instância da classe TCX
+    tcx = get_model_tcx()
 
     # Calculando o score
     score = tcx.calcular_score(valor_x=reinicializacoes)
 
     return score
+
+
+def Model_Score_TCX_batch(reinicializacoes, casas_decimais=2):
+    """
+    Realiza o cálculo do score para TCX sobre uma coluna inteira de reinicializações.
+
+    Parameters:
+    reinicializacoes (Union[np.ndarray, pd.Series, list]): Número de reinicializações de cada equipamento.
+    casas_decimais (int): O número de casas decimais para o arredondamento do score.
+
+    Returns:
+    Union[np.ndarray, pd.Series]: Os scores calculados.
+    """
+    # Obtendo a tabela de consulta do TCX (valores fora da grade usam o scorer compilado)
+    scorer = get_lookup_scorer("TCX")
+
+    # Calculando os scores em uma única passada
+    scores = scorer.calcular_score_batch(reinicializacoes, casas_decimais=casas_decimais)
+
+    return scores
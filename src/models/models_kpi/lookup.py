@@ -0,0 +1,278 @@
+"""
+Módulo de Tabelas de Consulta dos Scores dos KPIs
+
+Muitos KPIs assumem poucos valores distintos (ex.: reinicializações de TCX são inteiros pequenos e
+percentuais de disponibilidade possuem duas casas decimais). Este módulo evita recalcular a curva do
+KPI para cada linha: o score é pré-calculado em uma grade de valores (modo GRADE) ou memorizado por
+valor distinto, até um tamanho máximo, com remoção dos valores menos usados (modo LRU). O cálculo em
+lote é feito por indexação de arrays e os valores fora da grade usam o cálculo exato do scorer
+compilado. A taxa de acerto de cada tabela é acompanhada para o ajuste da grade.
+
+Os scores obtidos da tabela são idênticos aos do cálculo exato: a grade é calculada pelo próprio
+scorer, sobre os mesmos valores de ponto flutuante que ela atende.
+
+Configuração (opcional, default: modo LRU):
+
+    [default.<KPI>.LOOKUP]
+    MODO = "GRADE" | "LRU"
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from src.models.models_kpi.registry import KPIScorer, LookupConfig, get_registry
+
+# Tabelas de consulta compartilhadas, criadas sob demanda (uma por KPI)
+_LOOKUPS = {}
+_LOOKUPS_LOCK = threading.Lock()
+
+
+class LookupStats(BaseModel):
+    """
+    Estatísticas de uso de uma tabela de consulta.
+
+    Attributes:
+        kpi (str): Nome do KPI.
+        modo (str): 'GRADE' ou 'LRU'.
+        lookups (int): Quantidade de valores consultados.
+        hits (int): Valores atendidos pela tabela (grade ou memória).
+        misses (int): Valores calculados pelo cálculo exato.
+        evictions (int): Valores removidos da memória (modo LRU).
+        size (int): Quantidade de valores na tabela.
+        hit_rate (float): Proporção dos valores atendidos pela tabela.
+    """
+
+    kpi: str
+    modo: str
+    lookups: int
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    hit_rate: float
+
+
+class LookupScorer:
+    """
+    Tabela de consulta do score de um KPI, sobre o scorer compilado do registro.
+
+    Attributes:
+        scorer (KPIScorer): Scorer compilado do KPI (cálculo exato).
+        config (LookupConfig): Configuração da tabela.
+        casas_decimais (int): Casas decimais dos scores da tabela.
+    """
+
+    def __init__(self, scorer: KPIScorer, config: Optional[LookupConfig] = None, casas_decimais: int = 2):
+        """
+        Cria a tabela de consulta, pré-calculando a grade no modo GRADE.
+
+        Parameters:
+        scorer (KPIScorer): Scorer compilado do KPI.
+        config (LookupConfig, optional): Configuração da tabela. Default: a do KPI ou o modo LRU.
+        casas_decimais (int, optional): Casas decimais dos scores da tabela. Default é 2.
+        """
+        self.scorer = scorer
+        self.config = config or scorer.config.lookup or LookupConfig()
+        self.casas_decimais = casas_decimais
+
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._lookups = self._hits = self._evictions = 0
+
+        if self.config.modo == "GRADE":
+            # A grade são os valores k / 10^casas entre o mínimo e o máximo
+            self._scale = 10.0 ** self.config.casas_decimais
+            self._first = int(np.ceil(round(self.config.minimo * self._scale, 6)))
+            self._last = int(np.floor(round(self.config.maximo * self._scale, 6)))
+            grid = np.arange(self._first, self._last + 1) / self._scale
+            self._table = np.asarray(self._exact(grid), dtype=np.float64)
+            self._table.flags.writeable = False
+
+    def _exact(self, values: np.ndarray) -> np.ndarray:
+        return np.asarray(
+            self.scorer.calcular_score_batch(values, casas_decimais=self.casas_decimais),
+            dtype=np.float64,
+        )
+
+    def _lookup_grid(self, values: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Obtém da grade os scores dos valores que pertencem a ela.
+
+        Returns:
+        tuple: (máscara dos valores com score obtido, máscara dos acertos da tabela). Na grade, as
+        duas máscaras são iguais.
+        """
+        with np.errstate(invalid="ignore"):
+            keys = np.rint(values * self._scale)
+            on_grid = (keys / self._scale == values) & (keys >= self._first) & (keys <= self._last)
+
+        scores[on_grid] = self._table[keys[on_grid].astype(np.intp) - self._first]
+        return on_grid, on_grid
+
+    def _lookup_lru(self, values: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Obtém da memória os scores dos valores já calculados e memoriza os novos valores.
+
+        Returns:
+        tuple: (máscara dos valores com score obtido, isto é, todos os valores finitos, incluindo os
+        recém-memorizados; máscara dos valores já presentes na memória, usada nas estatísticas).
+        """
+        finite = np.isfinite(values)
+        distinct, inverse = np.unique(values[finite], return_inverse=True)
+        distinct_scores = np.empty(len(distinct))
+        cached = np.zeros(len(distinct), dtype=bool)
+
+        with self._lock:
+            for i, value in enumerate(distinct.tolist()):
+                if value in self._cache:
+                    self._cache.move_to_end(value)
+                    distinct_scores[i] = self._cache[value]
+                    cached[i] = True
+
+        # Os valores novos são calculados em uma única chamada ao cálculo exato
+        if not cached.all():
+            distinct_scores[~cached] = self._exact(distinct[~cached])
+            with self._lock:
+                for value, score in zip(distinct[~cached].tolist(), distinct_scores[~cached].tolist()):
+                    self._cache[value] = score
+                while len(self._cache) > self.config.tamanho_maximo:
+                    self._cache.popitem(last=False)
+                    self._evictions += 1
+
+        hits = np.zeros(len(values), dtype=bool)
+        scores[finite] = distinct_scores[inverse]
+        hits[finite] = cached[inverse]
+        return finite, hits
+
+    def calcular_score_batch(
+        self, valores: Union[np.ndarray, pd.Series, list], casas_decimais: Optional[int] = None
+    ) -> Union[np.ndarray, pd.Series]:
+        """
+        Calcula os scores de um conjunto de valores do KPI pela tabela de consulta.
+
+        Os valores fora da grade (ou não finitos) usam o cálculo exato. Com casas decimais
+        diferentes das da tabela, todos os valores usam o cálculo exato.
+
+        Parameters:
+        valores (Union[np.ndarray, pd.Series, list]): Os valores do KPI.
+        casas_decimais (int, optional): Número de casas decimais dos scores. Default: as da tabela.
+
+        Returns:
+        Union[np.ndarray, pd.Series]: Os scores calculados. Se a entrada for uma
+        pd.Series, o retorno preserva o seu índice.
+        """
+        if casas_decimais is not None and casas_decimais != self.casas_decimais:
+            return self.scorer.calcular_score_batch(valores, casas_decimais=casas_decimais)
+
+        values = np.asarray(valores, dtype=np.float64)
+        scores = np.empty(len(values), dtype=np.float64)
+
+        if self.config.modo == "GRADE":
+            served, hits = self._lookup_grid(values, scores)
+        else:
+            served, hits = self._lookup_lru(values, scores)
+
+        # CÁLCULO EXATO DOS VALORES SEM SCORE OBTIDO PELA TABELA
+        pending = ~served
+        if pending.any():
+            scores[pending] = self._exact(values[pending])
+
+        with self._lock:
+            self._lookups += len(values)
+            self._hits += int(hits.sum())
+
+        if isinstance(valores, pd.Series):
+            return pd.Series(scores, index=valores.index, name=valores.name)
+        return scores
+
+    def calcular_score(self, valor: float) -> Optional[float]:
+        """
+        Calcula o score de um único valor do KPI pela tabela de consulta.
+
+        Parameters:
+        valor (float): O valor do KPI.
+
+        Returns:
+        Optional[float]: O score calculado ou None se o valor estiver fora do domínio do modelo.
+        """
+        score = self.calcular_score_batch([valor])[0]
+        return None if np.isnan(score) else float(score)
+
+    def get_stats(self) -> LookupStats:
+        """
+        Obtém as estatísticas de uso da tabela.
+
+        Returns:
+        LookupStats: Consultas, acertos, falhas, remoções, tamanho e taxa de acerto.
+        """
+        with self._lock:
+            size = len(self._table) if self.config.modo == "GRADE" else len(self._cache)
+            return LookupStats(
+                kpi=self.scorer.name,
+                modo=self.config.modo,
+                lookups=self._lookups,
+                hits=self._hits,
+                misses=self._lookups - self._hits,
+                evictions=self._evictions,
+                size=size,
+                hit_rate=self._hits / self._lookups if self._lookups else 0.0,
+            )
+
+    def reset_stats(self) -> None:
+        """
+        Zera as estatísticas de uso (a grade e a memória são mantidas).
+        """
+        with self._lock:
+            self._lookups = self._hits = self._evictions = 0
+
+    def __repr__(self):
+        return f"LookupScorer(kpi={self.scorer.name!r}, modo={self.config.modo!r})"
+
+
+def get_lookup_scorer(name: str) -> LookupScorer:
+    """
+    Retorna a tabela de consulta compartilhada de um KPI, criada uma única vez a partir do registro.
+
+    Parameters:
+    name (str): Nome do KPI (ex.: 'TCX').
+
+    Returns:
+    LookupScorer: A tabela de consulta do KPI.
+    """
+    with _LOOKUPS_LOCK:
+        if name not in _LOOKUPS:
+            _LOOKUPS[name] = LookupScorer(get_registry()[name])
+        return _LOOKUPS[name]
+
+
+def get_lookup_stats() -> pd.DataFrame:
+    """
+    Obtém as estatísticas de uso de todas as tabelas de consulta já criadas.
+
+    Returns:
+    DataFrame: Uma linha por KPI, com os campos de LookupStats.
+    """
+    with _LOOKUPS_LOCK:
+        lookups = list(_LOOKUPS.values())
+
+    return pd.DataFrame(
+        [lookup.get_stats().model_dump() for lookup in lookups],
+        columns=list(LookupStats.model_fields),
+    )
+
+
+def clear_lookups() -> None:
+    """
+    Descarta as tabelas de consulta criadas (ex.: após alterar a configuração dos KPIs).
+    """
+    with _LOOKUPS_LOCK:
+        _LOOKUPS.clear()
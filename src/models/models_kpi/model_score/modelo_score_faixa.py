@@ -1,11 +1,17 @@
-from pydantic import BaseModel, root_validator
+from pydantic import BaseModel, ConfigDict, root_validator
 from typing import Optional, List, Union
 
+import numpy as np
+import pandas as pd
+
 
 class FaixaScore(BaseModel):
     """
-    Modelo genérico para definição de faixas com limites e scores associados.
+    Modelo genérico para definição de faixas com limites e scores associados (imutável).
     """
+
+    model_config = ConfigDict(frozen=True)
+
     limite_inferior: float
     limite_superior: float
     score_min: float
@@ -37,6 +43,31 @@ class ScorePorFaixa:
         """
         self.faixas = sorted(faixas, key=lambda faixa: faixa.limite_inferior)
 
+        # Compilando os limites e scores das faixas em arrays contíguos,
+        # utilizados pelo cálculo vetorizado (calcular_score_batch)
+        self._compilar_faixas()
+
+    def _compilar_faixas(self):
+        """
+        Compila as faixas ordenadas em arrays contíguos de limites e scores.
+
+        Os arrays são usados na busca ordenada (np.searchsorted) do cálculo em lote.
+        """
+        self._limites_inferiores = np.ascontiguousarray(
+            [faixa.limite_inferior for faixa in self.faixas], dtype=np.float64
+        )
+        self._limites_superiores = np.ascontiguousarray(
+            [faixa.limite_superior for faixa in self.faixas], dtype=np.float64
+        )
+        self._scores_min = np.ascontiguousarray(
+            [faixa.score_min for faixa in self.faixas], dtype=np.float64
+        )
+        self._scores_max = np.ascontiguousarray(
+            [faixa.score_max for faixa in self.faixas], dtype=np.float64
+        )
+        self._larguras = self._limites_superiores - self._limites_inferiores
+        self._amplitudes = self._scores_max - self._scores_min
+
     def calcular_score(
         self, entrada: float,
             arredondar: Optional[int] = 2,
@@ -75,3 +106,89 @@ class ScorePorFaixa:
                     return round(score,
                                  arredondar) if arredondar is not None else score
             return None
+
+    def _localizar_faixas(self, entradas: np.ndarray) -> tuple:
+        """
+        Localiza, para cada entrada, o índice da faixa que a contém.
+
+        A busca é feita sobre os limites superiores: a primeira faixa cujo limite
+        superior é maior ou igual à entrada é a mesma que a varredura do cálculo
+        escalar encontraria, inclusive quando duas faixas compartilham o limite.
+
+        Parameters:
+        entradas (np.ndarray): Valores de entrada a serem avaliados.
+
+        Returns:
+        tuple: Índice da faixa de cada entrada e a máscara das entradas que
+        pertencem a alguma faixa.
+        """
+        if np.any(np.diff(self._limites_superiores) < 0):
+            raise ValueError("As faixas não podem estar sobrepostas.")
+
+        idx = np.searchsorted(self._limites_superiores, entradas, side="left")
+
+        # Entradas acima da última faixa (ou NaN) não pertencem a nenhuma faixa
+        np.minimum(idx, len(self.faixas) - 1, out=idx)
+        dentro = entradas >= self._limites_inferiores.take(idx)
+        dentro &= entradas <= self._limites_superiores[-1]
+
+        return idx, dentro
+
+    def calcular_score_batch(
+        self,
+        entradas: Union[np.ndarray, pd.Series, list],
+        arredondar: Optional[int] = 2,
+        model="indisponibilidade",
+    ) -> Union[np.ndarray, pd.Series]:
+        """
+        Calcula, de forma vetorizada, o score associado a um conjunto de entradas.
+
+        Equivalente a aplicar calcular_score em cada entrada, porém em uma única
+        passada sobre arrays. Entradas fora das faixas definidas
+        (ex.: entre 4.0 e 4.01) retornam NaN em vez de None.
+
+        Parameters:
+        entradas (Union[np.ndarray, pd.Series, list]): Os valores de entrada a serem avaliados.
+        arredondar (Optional[int]): Número de casas decimais para arredondar o resultado. Default: 2.
+        model (str): "indisponibilidade" ou "disponibilidade".
+
+        Returns:
+        Union[np.ndarray, pd.Series]: Os scores calculados. Se a entrada for uma
+        pd.Series, o retorno preserva o seu índice.
+        """
+        if model not in ("indisponibilidade", "disponibilidade"):
+            raise ValueError(
+                "O modelo deve ser 'indisponibilidade' ou 'disponibilidade'."
+            )
+
+        valores = np.asarray(entradas, dtype=np.float64)
+
+        idx, dentro = self._localizar_faixas(valores)
+
+        # Proporção da entrada dentro da sua faixa
+        proporcao = valores - self._limites_inferiores.take(idx)
+        proporcao /= self._larguras.take(idx)
+        proporcao *= self._amplitudes.take(idx)
+
+        if model == "indisponibilidade":
+            scores = self._scores_max.take(idx)
+            scores -= proporcao
+        else:
+            scores = self._scores_min.take(idx)
+            scores += proporcao
+
+        if arredondar is not None:
+            scores = np.round(scores, arredondar)
+
+        if model == "disponibilidade":
+            # No limite superior da faixa, retorna o score máximo sem arredondamento
+            score_max = self._scores_max.take(idx)
+            no_limite = valores == self._limites_superiores.take(idx)
+            no_limite &= self._amplitudes.take(idx) > 0
+            np.copyto(scores, score_max, where=no_limite)
+
+        scores[~dentro] = np.nan
+
+        if isinstance(entradas, pd.Series):
+            return pd.Series(scores, index=entradas.index, name=entradas.name)
+        return scores
@@ -1,5 +1,8 @@
 from pydantic import BaseModel, root_validator, ValidationError
-from typing import Optional
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
 
 
 class IndiceConsumoBase:
@@ -106,6 +109,31 @@ class ConsumoModel(BaseModel):
         return values
 
 
+class ConsumoBatchModel(ConsumoModel):
+    """
+    Modelo de validação de dados para consumo (ICA, ICE) em lote.
+
+    Aplica a mesma regra do ConsumoModel ('indice' ou 'percentual_acima', não ambos),
+    porém uma única vez por coluna, em vez de uma vez por linha.
+    """
+
+    indice: Any = None
+    percentual_acima: Any = None
+
+
+def is_batch(valor):
+    """
+    Verifica se o valor recebido é uma coluna de valores (lista, array ou Series).
+
+    Parameters:
+    valor: O valor a ser verificado.
+
+    Returns:
+    bool: True se o valor for uma coluna de valores.
+    """
+    return isinstance(valor, (list, tuple, np.ndarray, pd.Series))
+
+
 class IndiceConsumo(IndiceConsumoBase):
     """
     Classe principal para cálculo do score de consumo, estendida da base IndiceConsumoBase.
@@ -125,8 +153,12 @@ class IndiceConsumo(IndiceConsumoBase):
         # CRIANDO A EQUAÇÃO
         super().__init__(ponto_a, ponto_b)
 
-        # VALIDANDO OS DADOS
-        model = ConsumoModel(indice=indice, percentual_acima=percentual_acima)
+        # VALIDANDO OS DADOS (UMA VEZ POR COLUNA, QUANDO RECEBIDOS EM LOTE)
+        self.batch = is_batch(indice) or is_batch(percentual_acima)
+        if self.batch:
+            model = ConsumoBatchModel(indice=indice, percentual_acima=percentual_acima)
+        else:
+            model = ConsumoModel(indice=indice, percentual_acima=percentual_acima)
 
         # INICIANDO AS VARIÁVEIS
         self.indice = model.indice
@@ -179,6 +211,86 @@ class IndiceConsumo(IndiceConsumoBase):
             return round(self.score, casas_decimais)
         return None
 
+    def calcular_percentual_batch(self) -> Union[np.ndarray, pd.Series]:
+        """
+        Calcula, de forma vetorizada, o percentual acima do ideal de cada índice de consumo.
+
+        Returns:
+        Union[np.ndarray, pd.Series]: O percentual acima do ideal de cada índice (0 para índices menores que 1).
+        """
+        indices = np.asarray(self.indice, dtype=np.float64)
+        percentuais = np.where(indices >= 1, (indices - 1) * 100, 0.0)
+        percentuais[np.isnan(indices)] = np.nan
+
+        return self._retornar_batch(percentuais, self.indice)
+
+    def calcular_indice_batch(self) -> Union[np.ndarray, pd.Series]:
+        """
+        Calcula, de forma vetorizada, o índice de consumo de cada percentual acima do ideal.
+
+        Returns:
+        Union[np.ndarray, pd.Series]: O índice de consumo de cada percentual.
+        """
+        percentuais = np.asarray(self.percentual_acima, dtype=np.float64)
+        indices = (percentuais / 100) + 1
+
+        return self._retornar_batch(indices, self.percentual_acima)
+
+    def calcular_score_batch(
+        self, minimo=None, maximo=None, casas_decimais=2
+    ) -> Union[np.ndarray, pd.Series]:
+        """
+        Calcula, de forma vetorizada, o score de uma coluna de índices (ou percentuais) de consumo.
+
+        Quando a instância recebe percentuais acima do ideal, eles são convertidos em índices
+        antes do cálculo. O score não é armazenado na instância.
+
+        Parameters:
+        minimo (float, optional): O valor mínimo que o score pode assumir.
+        maximo (float, optional): O valor máximo que o score pode assumir.
+        casas_decimais (int, optional): O número de casas decimais para arredondamento. Default é 2.
+
+        Returns:
+        Union[np.ndarray, pd.Series]: Os scores calculados, ajustados para a escala mínima e máxima, e arredondados.
+        """
+        if self.indice is not None:
+            origem = self.indice
+            indices = np.asarray(self.indice, dtype=np.float64)
+        else:
+            origem = self.percentual_acima
+            indices = np.asarray(self.calcular_indice_batch(), dtype=np.float64)
+
+        scores = self.declive * indices
+        scores += self.intercepto
+
+        # Normaliza o score para a escala mínima e máxima, se fornecida
+        if minimo is not None and maximo is not None:
+            np.clip(scores, minimo, maximo, out=scores)
+        else:
+            # Garante que o score esteja entre 0 e 10
+            np.clip(scores, 0, 10, out=scores)
+
+        # Arredonda o score para o número especificado de casas decimais
+        scores = np.round(scores, casas_decimais)
+
+        return self._retornar_batch(scores, origem)
+
+    @staticmethod
+    def _retornar_batch(valores, origem):
+        """
+        Retorna os valores calculados no mesmo formato da coluna de origem.
+
+        Parameters:
+        valores (np.ndarray): Os valores calculados.
+        origem: A coluna de origem (pd.Series preserva o índice).
+
+        Returns:
+        Union[np.ndarray, pd.Series]: Os valores calculados.
+        """
+        if isinstance(origem, pd.Series):
+            return pd.Series(valores, index=origem.index, name=origem.name)
+        return valores
+
     def __str__(self):
         """Retorna a mensagem formatada ao converter a instância em string."""
 
@@ -1,5 +1,7 @@
-from typing import Tuple
+from typing import Tuple, Union
+
 import numpy as np
+import pandas as pd
 
 
 class Score_Inflexao:
@@ -49,6 +51,9 @@ class Score_Inflexao:
         # Declives das retas (antes e depois do ponto central)
         self._calcular_declives()
 
+        # Interceptos das retas, calculados uma única vez por instância
+        self._calcular_interceptos()
+
     def _calcular_declives(self):
         """
         Calcula os declives para as duas regiões da função linear.
@@ -70,6 +75,26 @@ class Score_Inflexao:
             # Depois do ponto central (crescendo para max_score)
             self.declive_depois = (self.max_score - score_central) / (self.limite_superior - x_central)
 
+    def _calcular_interceptos(self):
+        """
+        Calcula os interceptos para as duas regiões da função linear.
+
+        A reta anterior ao ponto central parte do limite inferior
+        (com score máximo no caso decrescente e score mínimo no caso crescente);
+        a reta posterior passa pelo ponto central.
+        """
+        x_central, score_central = self.ponto_central
+
+        if self.direcao == "decrescente":
+            ponto_inicial = (self.limite_inferior, self.max_score)
+        else:
+            ponto_inicial = (self.limite_inferior, self.min_score)
+
+        self.intercepto_antes = self._calcular_intercepto(self.declive_antes, ponto_inicial)
+        self.intercepto_depois = self._calcular_intercepto(
+            self.declive_depois, (x_central, score_central)
+        )
+
     def _calcular_intercepto(self, declive: float, ponto: Tuple[float, float]) -> float:
         """
         Calcula o intercepto da linha com base no declive e em um ponto.
@@ -100,11 +125,11 @@ class Score_Inflexao:
         if valor_x < x_central:
             # Antes ou no ponto central
             declive = self.declive_antes
-            intercepto = self._calcular_intercepto(declive, (self.limite_inferior, self.max_score))
+            intercepto = self.intercepto_antes
         else:
             # Depois do ponto central
             declive = self.declive_depois
-            intercepto = self._calcular_intercepto(declive, (x_central, score_central))
+            intercepto = self.intercepto_depois
 
         # Calcula o score
         score = declive * valor_x + intercepto
@@ -114,6 +139,44 @@ class Score_Inflexao:
 
         return round(score, casas_decimais)
 
+    def calcular_score_batch(
+        self,
+        valores_x: Union[np.ndarray, pd.Series, list],
+        casas_decimais: int = 2,
+    ) -> Union[np.ndarray, pd.Series]:
+        """
+        Calcula, de forma vetorizada, o score para um conjunto de valores de X.
+
+        Avalia a curva de dois segmentos em uma única passada, aplicando o
+        limite de score (mínimo e máximo) e o arredondamento como operações de array.
+
+        Parameters:
+        valores_x (Union[np.ndarray, pd.Series, list]): Os valores de X.
+        casas_decimais (int, optional): Número de casas decimais para arredondamento. Default é 2.
+
+        Returns:
+        Union[np.ndarray, pd.Series]: Os scores calculados. Se a entrada for uma
+        pd.Series, o retorno preserva o seu índice.
+        """
+        valores = np.asarray(valores_x, dtype=np.float64)
+
+        # Seleciona o segmento da curva (antes ou depois do ponto central)
+        antes = valores < self.ponto_central[0]
+        declives = np.where(antes, self.declive_antes, self.declive_depois)
+        interceptos = np.where(antes, self.intercepto_antes, self.intercepto_depois)
+
+        # Calcula o score
+        scores = declives * valores
+        scores += interceptos
+
+        # Garante que o score está no intervalo permitido
+        np.clip(scores, self.min_score, self.max_score, out=scores)
+        scores = np.round(scores, casas_decimais)
+
+        if isinstance(valores_x, pd.Series):
+            return pd.Series(scores, index=valores_x.index, name=valores_x.name)
+        return scores
+
     def __str__(self):
         """
         Representação amigável da configuração da classe.
@@ -0,0 +1,413 @@
+"""
+Módulo de Registro dos Modelos de Score dos KPIs
+
+Este módulo lê uma única vez os blocos de modelo dos KPIs em config_project/settings.toml, valida cada
+bloco e o compila em um scorer imutável, com os coeficientes (declives, interceptos e faixas) já
+calculados. A configuração é congelada e o modelo compilado é somente leitura (atributos protegidos
+e arrays sem escrita). Os scorers são obtidos pelo nome do KPI (ex.: registry["TCX"]) e podem ser
+compartilhados entre threads, pois o cálculo não altera o seu estado nem consulta o Dynaconf.
+
+Um novo KPI precisa apenas de um bloco de configuração com um dos modelos suportados:
+
+    [default.<KPI>.MODEL]
+    MODEL = "INDICE" | "INFLEXAO" | "FAIXA"
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Literal, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from config_project.config_app import settings
+from src.models.models_kpi.model_score.modelo_score_faixa import FaixaScore, ScorePorFaixa
+from src.models.models_kpi.model_score.modelo_score_indice import IndiceConsumoBase
+from src.models.models_kpi.model_score.modelo_score_inflexao import Score_Inflexao
+
+
+class ModeloIndiceConfig(BaseModel):
+    """
+    Configuração do modelo INDICE: reta que passa pelos pontos A e B, limitada ao intervalo do score.
+
+    Attributes:
+        model (str): 'INDICE'.
+        ponto_a (tuple): O primeiro ponto (x1, y1).
+        ponto_b (tuple): O segundo ponto (x2, y2).
+        minimo (float): O valor mínimo do score. Default: 0.
+        maximo (float): O valor máximo do score. Default: 10.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    model: Literal["INDICE"]
+    ponto_a: Tuple[float, float]
+    ponto_b: Tuple[float, float]
+    minimo: float = 0.0
+    maximo: float = 10.0
+
+
+class ModeloInflexaoConfig(BaseModel):
+    """
+    Configuração do modelo INFLEXAO: curva de dois segmentos com um ponto central.
+
+    Attributes:
+        model (str): 'INFLEXAO'.
+        ponto_a (tuple): O ponto central (x, score).
+        ponto_b (tuple): O ponto inicial da curva (limite inferior de X, score no limite inferior).
+        direcao (str): 'crescente' ou 'decrescente'. Default: 'decrescente'.
+        limite_superior (float, optional): Limite superior de X.
+        min_score (float): Score mínimo (caso decrescente). Default: 0.
+        max_score (float): Score máximo (caso crescente). Default: 10.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    model: Literal["INFLEXAO"]
+    ponto_a: Tuple[float, float]
+    ponto_b: Tuple[float, float]
+    direcao: Literal["crescente", "decrescente"] = "decrescente"
+    limite_superior: Optional[float] = None
+    min_score: float = 0.0
+    max_score: float = 10.0
+
+
+class ModeloFaixaConfig(BaseModel):
+    """
+    Configuração do modelo FAIXA: interpolação linear dentro de faixas de valores.
+
+    Attributes:
+        model (str): 'FAIXA'.
+        tipo (str): 'indisponibilidade' ou 'disponibilidade'.
+        faixas (tuple): Faixas (FaixaScore).
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    model: Literal["FAIXA"]
+    tipo: Literal["indisponibilidade", "disponibilidade"] = "indisponibilidade"
+    faixas: Tuple[FaixaScore, ...]
+
+
+class LookupConfig(BaseModel):
+    """
+    Configuração da tabela de consulta do KPI (bloco <KPI>.LOOKUP do settings, ver lookup.py).
+
+    Attributes:
+        modo (str): 'GRADE' (curva pré-calculada em uma grade de valores) ou 'LRU' (memorização
+            por valor distinto, com remoção dos menos usados). Default: 'LRU'.
+        minimo (float): Menor valor da grade. Default: 0.
+        maximo (float): Maior valor da grade. Default: 100.
+        casas_decimais (int): Resolução da grade (ex.: 2 para percentuais com duas casas). Default: 2.
+        tamanho_maximo (int): Quantidade máxima de valores memorizados no modo LRU. Default: 4096.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    modo: Literal["GRADE", "LRU"] = "LRU"
+    minimo: float = 0.0
+    maximo: float = 100.0
+    casas_decimais: int = Field(default=2, ge=0, le=6)
+    tamanho_maximo: int = Field(default=4096, ge=1)
+
+
+class KPIConfig(BaseModel):
+    """
+    Configuração de um KPI (bloco de settings.toml).
+
+    Attributes:
+        name (str): Nome do KPI no settings.toml (ex.: 'TCX').
+        pilar (str, optional): Pilar do KPI.
+        tema (str, optional): Tema do KPI.
+        kpi (str, optional): Descrição do KPI.
+        indicador (str, optional): Indicador medido.
+        peso (float, optional): Peso do KPI no score do tema (os pesos dos KPIs de um tema somam 1).
+        model: Configuração do modelo de score.
+        lookup (LookupConfig, optional): Configuração da tabela de consulta do KPI.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    pilar: Optional[str] = None
+    tema: Optional[str] = None
+    kpi: Optional[str] = None
+    indicador: Optional[str] = None
+    peso: Optional[float] = Field(default=None, ge=0)
+    model: Union[ModeloIndiceConfig, ModeloInflexaoConfig, ModeloFaixaConfig] = Field(
+        discriminator="model"
+    )
+    lookup: Optional[LookupConfig] = None
+
+
+class KPIScorer:
+    """
+    Scorer imutável de um KPI, compilado a partir da sua configuração.
+
+    Attributes:
+        name (str): Nome do KPI.
+        config (KPIConfig): Configuração validada do KPI.
+        model: Modelo compilado (IndiceConsumoBase, Score_Inflexao ou ScorePorFaixa).
+    """
+
+    __slots__ = ("name", "config", "model")
+
+    def __init__(self, config: KPIConfig):
+        """
+        Compila o modelo do KPI a partir da configuração.
+
+        Parameters:
+        config (KPIConfig): Configuração validada do KPI.
+        """
+        object.__setattr__(self, "name", config.name)
+        object.__setattr__(self, "config", config)
+        object.__setattr__(self, "model", MODEL_BUILDERS[config.model.model](config.model))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"O scorer {self.name} é imutável.")
+
+    def calcular_score_batch(
+        self, valores: Union[np.ndarray, pd.Series, list], casas_decimais: int = 2
+    ) -> Union[np.ndarray, pd.Series]:
+        """
+        Calcula, de forma vetorizada, o score de um conjunto de valores do KPI.
+
+        Parameters:
+        valores (Union[np.ndarray, pd.Series, list]): Os valores do KPI.
+        casas_decimais (int, optional): Número de casas decimais para arredondamento. Default é 2.
+
+        Returns:
+        Union[np.ndarray, pd.Series]: Os scores calculados. Se a entrada for uma
+        pd.Series, o retorno preserva o seu índice.
+        """
+        config = self.config.model
+
+        if config.model == "INFLEXAO":
+            return self.model.calcular_score_batch(valores, casas_decimais=casas_decimais)
+
+        if config.model == "FAIXA":
+            return self.model.calcular_score_batch(
+                valores, arredondar=casas_decimais, model=config.tipo
+            )
+
+        # Modelo INDICE
+        scores = self.model.declive * np.asarray(valores, dtype=np.float64)
+        scores += self.model.intercepto
+        np.clip(scores, config.minimo, config.maximo, out=scores)
+        scores = np.round(scores, casas_decimais)
+
+        if isinstance(valores, pd.Series):
+            return pd.Series(scores, index=valores.index, name=valores.name)
+        return scores
+
+    def calcular_score(self, valor: float, casas_decimais: int = 2) -> Optional[float]:
+        """
+        Calcula o score de um único valor do KPI.
+
+        Parameters:
+        valor (float): O valor do KPI.
+        casas_decimais (int, optional): Número de casas decimais para arredondamento. Default é 2.
+
+        Returns:
+        Optional[float]: O score calculado ou None se o valor estiver fora do domínio do modelo.
+        """
+        score = self.calcular_score_batch([valor], casas_decimais=casas_decimais)[0]
+        return None if np.isnan(score) else float(score)
+
+    def __repr__(self):
+        return f"KPIScorer(name={self.name!r}, model={self.config.model.model!r})"
+
+
+class _FrozenModel:
+    """
+    Impede a alteração dos atributos de um modelo compilado após _freeze.
+    """
+
+    _frozen = False
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError(f"O modelo compilado {type(self).__name__} é somente leitura.")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if self._frozen:
+            raise AttributeError(f"O modelo compilado {type(self).__name__} é somente leitura.")
+        super().__delattr__(name)
+
+    def _freeze(self):
+        """
+        Torna o modelo somente leitura: os arrays compilados deixam de aceitar escrita, as listas
+        são convertidas em tuplas e a atribuição de atributos passa a levantar AttributeError.
+        """
+        for name, attribute in vars(self).items():
+            if isinstance(attribute, np.ndarray):
+                attribute.flags.writeable = False
+            elif isinstance(attribute, list):
+                self.__dict__[name] = tuple(attribute)
+        object.__setattr__(self, "_frozen", True)
+        return self
+
+
+class FrozenIndiceConsumo(_FrozenModel, IndiceConsumoBase):
+    """Modelo INDICE compilado pelo registro (somente leitura)."""
+
+
+class FrozenScoreInflexao(_FrozenModel, Score_Inflexao):
+    """Modelo INFLEXAO compilado pelo registro (somente leitura)."""
+
+
+class FrozenScorePorFaixa(_FrozenModel, ScorePorFaixa):
+    """Modelo FAIXA compilado pelo registro (somente leitura)."""
+
+
+def _build_indice(config: ModeloIndiceConfig) -> IndiceConsumoBase:
+    return FrozenIndiceConsumo(config.ponto_a, config.ponto_b)._freeze()
+
+
+def get_inflexao_params(config: ModeloInflexaoConfig) -> dict:
+    """
+    Converte a configuração do modelo INFLEXAO nos parâmetros da classe Score_Inflexao.
+
+    O ponto B define o limite inferior de X e o score nesse limite (score máximo no caso
+    decrescente e score mínimo no caso crescente).
+
+    Parameters:
+    config (ModeloInflexaoConfig): Configuração do modelo.
+
+    Returns:
+    dict: Parâmetros de inicialização da classe Score_Inflexao.
+    """
+    limite_inferior, score_inicial = config.ponto_b
+    return dict(
+        ponto_central=config.ponto_a,
+        max_score=score_inicial if config.direcao == "decrescente" else config.max_score,
+        min_score=score_inicial if config.direcao == "crescente" else config.min_score,
+        direcao=config.direcao,
+        limite_superior=config.limite_superior,
+        limite_inferior=limite_inferior,
+    )
+
+
+def _build_inflexao(config: ModeloInflexaoConfig) -> Score_Inflexao:
+    return FrozenScoreInflexao(**get_inflexao_params(config))._freeze()
+
+
+def _build_faixa(config: ModeloFaixaConfig) -> ScorePorFaixa:
+    return FrozenScorePorFaixa(faixas=list(config.faixas))._freeze()
+
+
+# Construtores dos modelos suportados, pelo tipo informado em MODEL
+MODEL_BUILDERS = {
+    "INDICE": _build_indice,
+    "INFLEXAO": _build_inflexao,
+    "FAIXA": _build_faixa,
+}
+
+
+def _lower_keys(value):
+    """
+    Converte recursivamente as chaves dos dicionários para minúsculas.
+
+    Parameters:
+    value: Valor lido do settings (dict, list ou escalar).
+
+    Returns:
+    O valor com as chaves dos dicionários em minúsculas.
+    """
+    if isinstance(value, dict):
+        return {str(key).lower(): _lower_keys(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_lower_keys(item) for item in value]
+    return value
+
+
+class ScoreRegistry:
+    """
+    Registro imutável dos scorers dos KPIs, indexado pelo nome do KPI.
+
+    Exemplo:
+        registry = get_registry()
+        scores = registry["TCX"].calcular_score_batch(reinicializacoes)
+    """
+
+    def __init__(self, scorers: dict):
+        """
+        Inicializa o registro com os scorers compilados.
+
+        Parameters:
+        scorers (dict): Scorers (KPIScorer) por nome do KPI.
+        """
+        self._scorers = MappingProxyType(dict(scorers))
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ScoreRegistry":
+        """
+        Cria o registro a partir de um dicionário de configuração (ex.: settings.as_dict()).
+
+        São considerados KPIs os blocos que possuem um sub-bloco MODEL.
+
+        Parameters:
+        config (dict): Dicionário de configuração.
+
+        Returns:
+        ScoreRegistry: O registro com os scorers compilados.
+
+        Raises:
+        ValueError: Se algum bloco de modelo for inválido.
+        """
+        scorers = {}
+        for name, block in config.items():
+            if not (isinstance(block, dict) and isinstance(block.get("MODEL"), dict)):
+                continue
+            try:
+                kpi_config = KPIConfig(name=name, **_lower_keys(block))
+            except ValidationError as error:
+                raise ValueError(f"Configuração inválida do modelo do KPI {name}: {error}")
+            scorers[name] = KPIScorer(kpi_config)
+        return cls(scorers)
+
+    def __getitem__(self, name: str) -> KPIScorer:
+        try:
+            return self._scorers[name]
+        except KeyError:
+            raise KeyError(
+                f"KPI {name} não encontrado. KPIs disponíveis: {sorted(self._scorers)}"
+            )
+
+    def __contains__(self, name):
+        return name in self._scorers
+
+    def __iter__(self):
+        return iter(self._scorers)
+
+    def __len__(self):
+        return len(self._scorers)
+
+    def get_config(self, name: str) -> KPIConfig:
+        """
+        Obtém a configuração validada de um KPI.
+
+        Parameters:
+        name (str): Nome do KPI.
+
+        Returns:
+        KPIConfig: A configuração do KPI.
+        """
+        return self[name].config
+
+
+@lru_cache(maxsize=None)
+def get_registry() -> ScoreRegistry:
+    """
+    Retorna o registro compartilhado dos scorers, construído uma única vez a partir do settings.toml.
+
+    Returns:
+    ScoreRegistry: O registro dos scorers dos KPIs.
+    """
+    return ScoreRegistry.from_config(settings.as_dict())
@@ -10,7 +10,7 @@ Data de Atualização: 26/09/2024
 """
 
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, Optional
 
 
 class ScoreDetails(BaseModel):
@@ -20,13 +20,15 @@ class ScoreDetails(BaseModel):
     Attributes:
         dataframe (Any): DataFrame contendo os dados necessários para o cálculo.
         score_column (str): Nome da coluna no DataFrame que contém os scores a serem ponderados.
+        file_path (str, optional): Caminho do arquivo da categoria, utilizado na leitura e no cálculo em streaming.
         weight (float): Peso aplicado ao score durante o cálculo do score pilar.
     """
 
-    dataframe: Any
+    dataframe: Any = None
     score_column: str
     weight: float
     category: str
+    file_path: Optional[str] = None
 
 
 class BaseScore:
@@ -2,15 +2,21 @@
 Módulo de Validação de Pesos
 
 Este módulo contém a classe Weights, que é usada para validar a soma dos pesos em diversas partes do sistema,
-assegurando que a soma dos pesos seja exatamente 1.0, conforme necessário para o cálculo proporcional correto dos scores.
+assegurando que a soma dos pesos seja exatamente 1.0, conforme necessário para o cálculo proporcional correto dos scores,
+e o ajuste dos pesos default dos temas informados pelas CLIs.
 
 Autor: Emerson V. Rafael (emervin)
 Versão: 1.0.0
 Data de Atualização: 26/09/2024
 """
 
+import math
+
 from pydantic import BaseModel, validator
 
+# Tolerância da soma dos pesos (erros de arredondamento de ponto flutuante)
+WEIGHTS_SUM_TOLERANCE = 1e-9
+
 
 class Weights(BaseModel):
     """
@@ -27,6 +33,9 @@ class Weights(BaseModel):
         """
         Valida se a soma dos pesos na lista é igual a 1.0.
 
+        A comparação tolera os erros de arredondamento de ponto flutuante (ex.: pesos 0.3, 0.3 e 0.4,
+        ou pesos amostrados em uma análise de sensibilidade), até WEIGHTS_SUM_TOLERANCE.
+
         Arguments:
             v (list): Lista de pesos a ser validada.
 
@@ -36,6 +45,26 @@ class Weights(BaseModel):
         Raises:
             ValueError: Se a soma dos pesos não for igual a 1.0.
         """
-        if sum(v) != 1.0:
+        if not math.isclose(sum(v), 1.0, rel_tol=0.0, abs_tol=WEIGHTS_SUM_TOLERANCE):
             raise ValueError("A soma dos pesos deve ser igual a 1.0")
         return v
+
+
+def adjust_default_weights(weights, default_weight, default_weight_rounded):
+    """
+    Substitui os pesos default arredondados (ex.: 0.33) pelo peso default exato (ex.: 1/3).
+
+    Arguments:
+        weights (list): Pesos informados.
+        default_weight (float): Peso default exato.
+        default_weight_rounded (float): Peso default arredondado, exibido nas CLIs.
+
+    Returns:
+        tuple or list: Os pesos default exatos, se todos os pesos forem iguais ao peso default
+        arredondado, ou os pesos informados.
+    """
+    # Verifica se todos os pesos são iguais ao peso padrão arredondado
+    if all(weight == default_weight_rounded for weight in weights):
+        # Define todos os pesos para o valor padrão não arredondado
+        return (default_weight,) * len(weights)
+    return weights
@@ -62,15 +62,8 @@ def main_execute_score_performance():
         ),
     ]
 
-    # Extraindo uma data comum dos dados, assumindo uniformidade
-    dia = df_tema_esg["DIA"].iloc[0]
-    mes = df_tema_esg["MES"].iloc[0]
-    ano = df_tema_esg["ANO"].iloc[0]
-
-    # Calculando o score pilar
-    score_calculator = ScoreGlobalCalculator(
-        details_list=details_list, dia=dia, mes=mes, ano=ano
-    )
+    # Calculando o score global (uma linha por agência e período dos dados)
+    score_calculator = ScoreGlobalCalculator(details_list=details_list)
     df_score_global = score_calculator.score_global
 
     save_data_auto(
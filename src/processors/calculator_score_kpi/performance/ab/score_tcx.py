@@ -1,6 +1,8 @@
 import numpy as np
 
-from src.models.models_kpi.calculator_score.performance.ab.score_tcx import Model_Score_TCX
+from src.models.models_kpi.calculator_score.performance.ab.score_tcx import (
+    Model_Score_TCX_batch,
+)
 
 def execute_calc_score_tcx():
     """
@@ -11,12 +13,11 @@ def execute_calc_score_tcx():
     # Gera os valores de entrada de 0 a 10 com steps de 0.1
     list_params = np.arange(0, 10.1, 0.1)
 
-    # PERCORRENDO A LISTA DE PARÂMETROS
-    for parameters in list_params:
-
-        # CHAMANDO A FUNÇAO PARA CALCULAR O SCORE ICA
-        score = Model_Score_TCX(parameters)
+    # CHAMANDO A FUNÇAO PARA CALCULAR O SCORE TCX DE TODOS OS PARÂMETROS
+    scores = Model_Score_TCX_batch(list_params)
 
+    # PERCORRENDO A LISTA DE PARÂMETROS
+    for parameters, score in zip(list_params, scores):
         print("VALOR DE ENTRADA: {} --> SCORE: {}".format(parameters, score))
 
 
@@ -65,15 +65,8 @@ def main_execute_score_performance():
         ),
     ]
 
-    # Extraindo uma data comum dos dados, assumindo uniformidade
-    dia = df_aa["DIA"].iloc[0]
-    mes = df_aa["MES"].iloc[0]
-    ano = df_aa["ANO"].iloc[0]
-
-    # Calculando o score pilar
-    score_calculator = ScorePilarPerformance(
-        details_list=details_list, dia=dia, mes=mes, ano=ano
-    )
+    # Calculando o score pilar (uma linha por agência e período dos dados)
+    score_calculator = ScorePilarPerformance(details_list=details_list)
     score_pilar_df = score_calculator.score_pilar
 
     # Salvando os dados após a aplicação do engine do score
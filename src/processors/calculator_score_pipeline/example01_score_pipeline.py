@@ -0,0 +1,56 @@
+"""
+Módulo de Cálculo do Pipeline de Score
+
+Este módulo calcula os scores dos pilares e o score global em um único processo, a partir dos arquivos de tema,
+sem gravar e reler os arquivos intermediários dos pilares.
+
+"""
+
+__author__ = "Emerson V. Rafael (emervin)"
+__version__ = "1.0.0"
+__data_atualizacao__ = "26/09/2024"
+
+from pathlib import Path
+from loguru import logger
+
+from src.models.models_common.score_pipeline import get_default_pilares, run_pipeline
+
+
+def main_execute_score_pipeline():
+    """
+    Executa o pipeline de score: temas → pilares → score global.
+
+    Este script realiza as seguintes etapas:
+    - Carrega uma única vez os arquivos de tema de todos os pilares.
+    - Calcula o score de cada pilar e o score global em memória.
+    - Salva o score global e, opcionalmente, o score de cada pilar.
+
+    Arguments:
+        None
+
+    Returns:
+        None
+    """
+    dir_root = Path(Path(__file__).parent.parent.parent.parent)
+
+    pilares = get_default_pilares(
+        weight_aa=0.3,
+        weight_ab=0.5,
+        weight_infra=0.2,
+        weight_esg=0.7,
+        weight_performance=0.3,
+    )
+
+    run_pipeline(
+        input_dir=Path(dir_root, "data/data_tema"),
+        output_dir=Path(dir_root, "data/data_global"),
+        pilares=pilares,
+        output_file="BASE_SCORE_GLOBAL.xlsx",
+        save_pilares=False,
+    )
+
+    logger.info("Processo realizado com sucesso")
+
+
+if __name__ == "__main__":
+    main_execute_score_pipeline()
@@ -0,0 +1,187 @@
+"""
+Módulo de Leitura e Gravação de Dados em Arrow
+
+Caminho de dados nativo em Arrow: os arquivos são lidos como pyarrow.Table (ou em blocos de
+RecordBatches), entregues diretamente às calculadoras (ver aggregate_scores com arrow=True) e os
+resultados são gravados sem a conversão de ida e volta para DataFrames do pandas.
+
+Os arquivos Arrow IPC/Feather (.arrow, .feather, .ipc) são gravados sem compressão, de forma que
+outros processos podem mapeá-los em memória (memory_map) e ler as colunas sem cópia.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from loguru import logger
+
+from src.utils.pandas_functions import ARROW_EXTENSIONS, DataLoadError, load_data_auto
+from src.utils.profile_functions import profile_stage
+
+# Extensões gravadas por save_data_arrow
+ARROW_OUTPUT_EXTENSIONS = ARROW_EXTENSIONS + [".parquet", ".csv"]
+
+
+def load_data_arrow(
+    file_path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    memory_map: bool = True,
+) -> pa.Table:
+    """
+    Carrega um arquivo como pyarrow.Table, sem a conversão para DataFrame.
+
+    Arquivos Arrow IPC/Feather sem compressão são mapeados em memória: as colunas referenciam
+    as páginas do arquivo, sem cópia. Arquivos Excel são lidos pelo load_data_auto e convertidos.
+
+    :param file_path: Caminho completo para o arquivo de dados (Arrow, Parquet, CSV ou Excel).
+    :param columns: Colunas a serem lidas. Default: todas.
+    :param memory_map: Se deve mapear o arquivo em memória (Arrow IPC/Feather e Parquet).
+    :return: Tabela carregada do arquivo.
+    """
+    file_extension = Path(file_path).suffix.lower()
+
+    with profile_stage("load_data_arrow") as stage:
+        if file_extension in ARROW_EXTENSIONS:
+            source = pa.memory_map(str(file_path)) if memory_map else pa.OSFile(str(file_path))
+            table = pa.ipc.open_file(source).read_all()
+            if columns is not None:
+                table = table.select(columns)
+        elif file_extension == ".parquet":
+            table = pq.read_table(file_path, columns=columns, memory_map=memory_map)
+        elif file_extension == ".csv":
+            table = pa_csv.read_csv(
+                file_path, convert_options=pa_csv.ConvertOptions(include_columns=columns)
+            )
+        elif file_extension in [".xls", ".xlsx"]:
+            table = pa.Table.from_pandas(
+                load_data_auto(file_path, usecols=columns, raise_errors=True), preserve_index=False
+            )
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+
+        stage.rows_out = table.num_rows
+
+    logger.info(f"Tabela Arrow carregada com sucesso de {file_path}")
+    return table
+
+
+def iter_arrow_batches(
+    file_path: Union[str, Path],
+    batch_size: int,
+    columns: Optional[List[str]] = None,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Lê um arquivo Arrow IPC/Feather, Parquet ou CSV em blocos (RecordBatches).
+
+    :param file_path: Caminho completo para o arquivo de dados.
+    :param batch_size: Quantidade máxima de linhas por bloco.
+    :param columns: Colunas a serem lidas. Default: todas.
+    :return: Iterador de RecordBatches, na ordem do arquivo.
+    """
+    file_extension = Path(file_path).suffix.lower()
+
+    if file_extension in ARROW_EXTENSIONS:
+        reader = pa.ipc.open_file(pa.memory_map(str(file_path)))
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            # Fatias de um RecordBatch não copiam os dados
+            for start in range(0, batch.num_rows, batch_size):
+                yield batch.slice(start, batch_size)
+    elif file_extension == ".parquet":
+        yield from pq.ParquetFile(file_path, memory_map=True).iter_batches(
+            batch_size=batch_size, columns=columns
+        )
+    elif file_extension == ".csv":
+        reader = pa_csv.open_csv(
+            file_path,
+            convert_options=pa_csv.ConvertOptions(include_columns=columns),
+        )
+        for batch in reader:
+            for start in range(0, batch.num_rows, batch_size):
+                yield batch.slice(start, batch_size)
+    else:
+        raise ValueError(f"Unsupported file format for batch reading: {file_extension}")
+
+
+def load_data_arrow_parallel(
+    file_paths: dict,
+    workers: Optional[int] = None,
+    **load_kwargs,
+) -> dict:
+    """
+    Carrega vários arquivos como pyarrow.Table ao mesmo tempo, em um pool de threads.
+
+    A leitura do pyarrow libera o GIL e as tabelas (mapeadas em memória) não são copiadas entre
+    processos, por isso são utilizadas threads. Os erros são reportados por arquivo (DataLoadError).
+
+    :param file_paths: Caminhos dos arquivos, por chave (ex.: {"AA": "BASE_SCORE_AA.arrow"}).
+    :param workers: Quantidade máxima de threads. Default: quantidade de arquivos, limitada à de CPUs.
+    :param load_kwargs: Argumentos adicionais de load_data_arrow (ex.: columns).
+    :return: Tabelas carregadas, pelas mesmas chaves de file_paths.
+    :raises DataLoadError: Se algum arquivo não puder ser carregado.
+    """
+    if workers is None:
+        workers = min(len(file_paths), os.cpu_count() or 1)
+    workers = max(1, min(workers, len(file_paths) or 1))
+
+    tables, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            key: pool.submit(load_data_arrow, file_path, **load_kwargs)
+            for key, file_path in file_paths.items()
+        }
+        for key, future in futures.items():
+            try:
+                tables[key] = future.result()
+            except Exception as e:
+                logger.error(f"Erro ao carregar o arquivo {file_paths[key]}: {e}")
+                errors[key] = e
+
+    if errors:
+        raise DataLoadError(errors)
+
+    return tables
+
+
+def save_data_arrow(table: Union[pa.Table, pd.DataFrame], file_path: Union[str, Path]) -> None:
+    """
+    Salva uma pyarrow.Table em Arrow IPC/Feather, Parquet ou CSV, criando diretórios se não existirem.
+
+    Os arquivos Arrow IPC/Feather são gravados sem compressão, para que possam ser mapeados em
+    memória por outros processos (ver load_data_arrow).
+
+    :param table: Tabela a ser salva (DataFrames são convertidos para pyarrow.Table).
+    :param file_path: Caminho completo para o arquivo de destino.
+    """
+    if isinstance(table, pd.DataFrame):
+        table = pa.Table.from_pandas(table, preserve_index=False)
+
+    with profile_stage("save_data_arrow", rows_in=table.num_rows) as stage:
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+
+        file_extension = Path(file_path).suffix.lower()
+        if file_extension in ARROW_EXTENSIONS:
+            with pa.OSFile(str(file_path), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        elif file_extension == ".parquet":
+            pq.write_table(table, file_path)
+        elif file_extension == ".csv":
+            pa_csv.write_csv(table, file_path)
+        else:
+            raise ValueError(f"Unsupported file format for Arrow writing: {file_extension}")
+
+        stage.rows_out = table.num_rows
+
+    logger.info(f"Tabela Arrow salva com sucesso em {file_path}")
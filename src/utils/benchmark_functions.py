@@ -0,0 +1,214 @@
+import json
+import os
+import platform
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from pydantic import BaseModel
+
+from src.utils.memory_functions import PeakRSSMonitor
+
+# Versão do formato do arquivo de resultados
+RESULTS_VERSION = 1
+
+# Conversão de bytes para megabytes
+BYTES_PER_MB = 1024 * 1024
+
+
+class BenchmarkResult(BaseModel):
+    """
+    Resultado da execução de uma etapa do benchmark.
+
+    Attributes:
+        stage (str): Nome da etapa (ex.: 'score_pilar').
+        size (int): Quantidade de agências do cenário.
+        rows (int): Quantidade de linhas processadas pela etapa.
+        seconds (float): Menor tempo de execução entre as repetições, em segundos.
+        rows_per_second (float): Vazão da etapa (linhas por segundo).
+        peak_rss_mb (float): Pico de memória residente do processo durante a etapa, em MB.
+        peak_rss_delta_mb (float): Acréscimo do pico de memória em relação ao início da etapa, em MB.
+        status (str): 'ok' ou 'skipped'.
+        detail (str): Observação sobre a execução (ex.: motivo de a etapa ter sido ignorada).
+    """
+
+    stage: str
+    size: int
+    rows: int = 0
+    seconds: Optional[float] = None
+    rows_per_second: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+    peak_rss_delta_mb: Optional[float] = None
+    status: str = "ok"
+    detail: Optional[str] = None
+
+
+def _to_mb(value: Optional[int]) -> Optional[float]:
+    return None if value is None else round(value / BYTES_PER_MB, 2)
+
+
+def run_stage(
+    stage: str, size: int, rows: int, function: Callable, repeat: int = 1
+) -> Tuple[BenchmarkResult, object]:
+    """
+    Executa uma etapa do benchmark, medindo o tempo e o pico de memória residente.
+
+    Quando a etapa é repetida, são mantidos o menor tempo e o maior pico de memória.
+
+    :param stage: Nome da etapa.
+    :param size: Quantidade de agências do cenário.
+    :param rows: Quantidade de linhas processadas pela etapa (base da vazão).
+    :param function: Função sem argumentos que executa a etapa.
+    :param repeat: Quantidade de repetições da etapa. Default: 1.
+    :return: Tupla com o resultado da etapa e o retorno da última execução da função.
+    """
+    best_seconds = None
+    peak_rss = None
+    peak_rss_delta = None
+    output = None
+
+    for _ in range(max(1, repeat)):
+        with PeakRSSMonitor() as monitor:
+            start = time.perf_counter()
+            output = function()
+            seconds = time.perf_counter() - start
+
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+        if monitor.peak_rss is not None:
+            peak_rss = max(peak_rss or 0, monitor.peak_rss)
+            peak_rss_delta = max(peak_rss_delta or 0, monitor.peak_rss_delta)
+
+    result = BenchmarkResult(
+        stage=stage,
+        size=size,
+        rows=rows,
+        seconds=round(best_seconds, 6),
+        rows_per_second=round(rows / best_seconds, 2) if best_seconds > 0 else None,
+        peak_rss_mb=_to_mb(peak_rss),
+        peak_rss_delta_mb=_to_mb(peak_rss_delta),
+    )
+
+    logger.info(
+        f"{stage} ({size} agências): {result.seconds:.3f}s, "
+        f"{result.rows_per_second} linhas/s, pico RSS {result.peak_rss_mb} MB"
+    )
+
+    return result, output
+
+
+def skip_stage(stage: str, size: int, detail: str) -> BenchmarkResult:
+    """
+    Registra uma etapa ignorada no cenário.
+
+    :param stage: Nome da etapa.
+    :param size: Quantidade de agências do cenário.
+    :param detail: Motivo de a etapa ter sido ignorada.
+    :return: Resultado da etapa com status 'skipped'.
+    """
+    logger.warning(f"{stage} ({size} agências) ignorada: {detail}")
+    return BenchmarkResult(stage=stage, size=size, status="skipped", detail=detail)
+
+
+def get_environment_metadata() -> dict:
+    """
+    Obtém os metadados do ambiente de execução, gravados junto aos resultados.
+
+    :return: Dicionário com data, plataforma e versões das bibliotecas.
+    """
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def save_results(
+    results: List[BenchmarkResult], file_path: Union[str, Path], metadata: Optional[dict] = None
+) -> Path:
+    """
+    Salva os resultados do benchmark em um arquivo JSON.
+
+    :param results: Lista de resultados das etapas.
+    :param file_path: Caminho do arquivo JSON de destino.
+    :param metadata: Metadados do ambiente. Default: get_environment_metadata().
+    :return: Caminho do arquivo gravado.
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    content = {
+        "version": RESULTS_VERSION,
+        "metadata": metadata if metadata is not None else get_environment_metadata(),
+        "results": [result.model_dump() for result in results],
+    }
+    file_path.write_text(json.dumps(content, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    logger.info(f"Resultados do benchmark salvos em {file_path}")
+    return file_path
+
+
+def load_results(file_path: Union[str, Path]) -> List[BenchmarkResult]:
+    """
+    Carrega os resultados de um arquivo JSON gravado por save_results.
+
+    :param file_path: Caminho do arquivo JSON.
+    :return: Lista de resultados das etapas.
+    """
+    content = json.loads(Path(file_path).read_text(encoding="utf-8"))
+    return [BenchmarkResult(**result) for result in content["results"]]
+
+
+def compare_results(
+    results: List[BenchmarkResult], baseline: List[BenchmarkResult], tolerance: float = 0.1
+) -> List[dict]:
+    """
+    Compara os resultados com uma execução de referência (baseline).
+
+    Uma etapa é considerada regressão quando a vazão cai, ou o pico de memória aumenta,
+    mais do que a tolerância em relação à referência.
+
+    :param results: Resultados da execução atual.
+    :param baseline: Resultados da execução de referência.
+    :param tolerance: Variação relativa tolerada. Default: 0.1 (10%).
+    :return: Lista com a comparação de cada etapa presente nas duas execuções.
+    """
+    baseline_by_key = {
+        (result.stage, result.size): result for result in baseline if result.status == "ok"
+    }
+
+    comparison = []
+    for result in results:
+        reference = baseline_by_key.get((result.stage, result.size))
+        if result.status != "ok" or reference is None:
+            continue
+
+        throughput_ratio = None
+        if result.rows_per_second and reference.rows_per_second:
+            throughput_ratio = round(result.rows_per_second / reference.rows_per_second, 4)
+
+        memory_ratio = None
+        if result.peak_rss_mb and reference.peak_rss_mb:
+            memory_ratio = round(result.peak_rss_mb / reference.peak_rss_mb, 4)
+
+        comparison.append(
+            {
+                "stage": result.stage,
+                "size": result.size,
+                "throughput_ratio": throughput_ratio,
+                "peak_rss_ratio": memory_ratio,
+                "regression": (
+                    throughput_ratio is not None and throughput_ratio < 1 - tolerance
+                )
+                or (memory_ratio is not None and memory_ratio > 1 + tolerance),
+            }
+        )
+
+    return comparison
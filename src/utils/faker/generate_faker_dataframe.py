@@ -0,0 +1,309 @@
+"""
+Módulo de Geração de Dados Sintéticos dos Temas
+
+Gera as bases de score de todos os temas (AA, AB, INFRA_CIVIL e ESG) para N agências × M períodos
+mensais, com o mesmo layout das bases reais: colunas chave, valores dos KPIs, score, farol e peso de
+cada KPI e o score e o farol do tema.
+
+A geração é reprodutível e paralelizável por bloco: cada bloco de BLOCO_AGENCIAS agências de cada
+tema usa um fluxo aleatório independente, derivado da semente por np.random.SeedSequence. Assim, os
+dados gerados dependem apenas da semente e dos parâmetros, e não da ordem de geração ou do tamanho
+dos blocos gravados.
+
+As correlações são geradas por uma cópula de mistura, que preserva a distribuição uniforme dos KPIs:
+
+    - cada agência possui um fator latente, compartilhado por todos os temas e períodos;
+    - o fator de cada período é o fator da agência com probabilidade correlacao_periodos
+      (ou um novo sorteio, caso contrário);
+    - cada KPI é o fator do período com probabilidade correlacao_kpis (ou um novo sorteio).
+
+Assim, a correlação entre dois KPIs de um período é correlacao_kpis² e a de um KPI em dois
+períodos da agência é correlacao_kpis² × correlacao_periodos².
+
+Uma agência ausente em um tema (taxa_ausencia) não possui nenhuma linha no tema.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from src.utils.farol_functions import classificar_farol
+from src.utils.pandas_functions import DataChunkWriter
+
+# Quantidade de agências de cada fluxo aleatório independente
+BLOCO_AGENCIAS = 10_000
+
+# Fluxo aleatório do fator latente das agências (os temas usam os fluxos 1, 2, ...)
+FLUXO_AGENCIAS = 0
+
+
+class KPISpec(BaseModel):
+    """
+    Especificação de um KPI sintético.
+
+    Attributes:
+        nome (str): Sufixo das colunas SCORE_, FAROL_ e PESO_ do KPI (ex.: 'OCORRENCIAS').
+        coluna (str): Coluna do valor do KPI (ex.: 'VOLUME_OCORRENCIAS').
+        maximo (float): Valor máximo do KPI (score 0).
+        inteiro (bool): Se True, o KPI assume valores inteiros de 0 a maximo.
+        peso (float): Peso do KPI no score do tema.
+    """
+
+    nome: str
+    coluna: str
+    maximo: float = Field(gt=0)
+    inteiro: bool = False
+    peso: float = Field(ge=0)
+
+
+class TemaSpec(BaseModel):
+    """
+    Especificação de um tema sintético.
+
+    Attributes:
+        pilar (str): Pilar do tema (diretório da base).
+        kpis (list): KPIs do tema (KPISpec), na ordem das colunas.
+    """
+
+    pilar: str
+    kpis: List[KPISpec]
+
+
+def _kpis_performance(pesos):
+    return [
+        KPISpec(nome="OCORRENCIAS", coluna="VOLUME_OCORRENCIAS", maximo=100, inteiro=True, peso=pesos[0]),
+        KPISpec(nome="RECORRENCIA", coluna="VOLUME_RECORRENCIA", maximo=50, inteiro=True, peso=pesos[1]),
+        KPISpec(nome="MTTR", coluna="MTTR", maximo=48, peso=pesos[2]),
+    ]
+
+
+# Especificação dos temas, na ordem dos fluxos aleatórios
+TEMA_SPECS: Dict[str, TemaSpec] = {
+    "AA": TemaSpec(pilar="PERFORMANCE", kpis=_kpis_performance([0.2, 0.7, 0.1])),
+    "AB": TemaSpec(pilar="PERFORMANCE", kpis=_kpis_performance([0.2, 0.7, 0.1])),
+    "INFRA_CIVIL": TemaSpec(pilar="PERFORMANCE", kpis=_kpis_performance([0.4, 0.6, 0.0])),
+    "ESG": TemaSpec(
+        pilar="ESG",
+        kpis=[
+            KPISpec(nome="AGUA", coluna="CONSUMO_AGUA", maximo=5000, peso=0.2),
+            KPISpec(nome="ENERGIA", coluna="CONSUMO_ENERGIA", maximo=10000, peso=0.2),
+            KPISpec(nome="FLUIDOS", coluna="EMISSAO_FLUIDOS", maximo=100, peso=0.6),
+        ],
+    ),
+}
+
+
+class FakerConfig(BaseModel):
+    """
+    Parâmetros da geração dos dados sintéticos.
+
+    Attributes:
+        agencias (int): Quantidade de agências (CD_PONTO de 1 a agencias).
+        periodos (int): Quantidade de períodos mensais.
+        ano_inicio (int): Ano do primeiro período.
+        mes_inicio (int): Mês do primeiro período.
+        seed (int, optional): Semente dos fluxos aleatórios. Se None, uma semente é sorteada
+            (e registrada no atributo, para a reprodução dos dados).
+        correlacao_periodos (float): Probabilidade de o fator de um período ser o fator da agência.
+        correlacao_kpis (float): Probabilidade de um KPI ser o fator do período.
+        taxa_ausencia (float): Proporção das agências ausentes em cada tema.
+        taxa_ausencia_tema (dict): Proporção das agências ausentes, por tema (sobrepõe taxa_ausencia).
+    """
+
+    agencias: int = Field(ge=1)
+    periodos: int = Field(default=1, ge=1)
+    ano_inicio: int = 2024
+    mes_inicio: int = Field(default=9, ge=1, le=12)
+    seed: Optional[int] = None
+    correlacao_periodos: float = Field(default=0.5, ge=0, le=1)
+    correlacao_kpis: float = Field(default=0.3, ge=0, le=1)
+    taxa_ausencia: float = Field(default=0.0, ge=0, lt=1)
+    taxa_ausencia_tema: Dict[str, float] = {}
+
+    @field_validator("taxa_ausencia_tema")
+    @classmethod
+    def check_taxa_ausencia_tema(cls, value):
+        for tema, taxa in value.items():
+            if tema not in TEMA_SPECS:
+                raise ValueError(f"Tema desconhecido: {tema}. Temas disponíveis: {list(TEMA_SPECS)}")
+            if not 0 <= taxa < 1:
+                raise ValueError(f"A taxa de ausência do tema {tema} deve estar em [0, 1): {taxa}")
+        return value
+
+    @model_validator(mode="after")
+    def resolve_seed(self):
+        if self.seed is None:
+            self.seed = int(np.random.SeedSequence().entropy)
+        return self
+
+    def get_taxa_ausencia(self, tema: str) -> float:
+        return self.taxa_ausencia_tema.get(tema, self.taxa_ausencia)
+
+
+def calcular_score(valores, maximo):
+    """
+    Calcula o score dos valores de um KPI: 10 para o valor 0 e 0 para valores a partir do máximo.
+    """
+    return np.maximum(0, 10 - (valores / maximo) * 10)
+
+
+def _rng(config: FakerConfig, fluxo: int, bloco: int) -> np.random.Generator:
+    # Fluxo independente de cada (fluxo, bloco), derivado da semente
+    return np.random.default_rng(np.random.SeedSequence(entropy=config.seed, spawn_key=(fluxo, bloco)))
+
+
+def _misturar(rng, fator, probabilidade):
+    # Cópula de mistura: mantém o fator com a probabilidade informada, sorteando um novo valor caso contrário
+    novo = rng.random(fator.shape)
+    return np.where(rng.random(fator.shape) < probabilidade, fator, novo)
+
+
+def _generate_block(config: FakerConfig, tema: str, bloco: int) -> pd.DataFrame:
+    """
+    Gera as linhas de um bloco de agências de um tema.
+
+    Parameters:
+    config (FakerConfig): Parâmetros da geração.
+    tema (str): Nome do tema.
+    bloco (int): Índice do bloco (agências bloco * BLOCO_AGENCIAS + 1, ...).
+
+    Returns:
+    DataFrame: Linhas do bloco, ordenadas por agência e período.
+    """
+    spec = TEMA_SPECS[tema]
+    inicio = bloco * BLOCO_AGENCIAS
+    n = min(BLOCO_AGENCIAS, config.agencias - inicio)
+    shape = (n, config.periodos)
+
+    # FATORES LATENTES: o da agência é compartilhado por todos os temas
+    fator_agencia = _rng(config, FLUXO_AGENCIAS, bloco).random(n)
+
+    rng = _rng(config, list(TEMA_SPECS).index(tema) + 1, bloco)
+    presente = rng.random(n) >= config.get_taxa_ausencia(tema)
+    fator_periodo = _misturar(rng, np.broadcast_to(fator_agencia[:, None], shape), config.correlacao_periodos)
+
+    # CHAVES: agências e períodos mensais a partir do período inicial
+    meses = config.mes_inicio - 1 + np.arange(config.periodos)
+    data = {
+        "CD_PONTO": np.repeat(np.arange(inicio + 1, inicio + n + 1)[presente], config.periodos),
+        "DIA": 1,
+        "MES": np.tile(meses % 12 + 1, presente.sum()),
+        "ANO": np.tile(config.ano_inicio + meses // 12, presente.sum()),
+    }
+
+    # CALCULANDO OS VALORES, SCORES E FARÓIS DOS KPIS
+    scores = []
+    for kpi in spec.kpis:
+        u = _misturar(rng, fator_periodo, config.correlacao_kpis)[presente].ravel()
+        if kpi.inteiro:
+            valores = np.minimum(np.floor(u * (kpi.maximo + 1)), kpi.maximo).astype(np.int64)
+        else:
+            valores = u * kpi.maximo
+
+        score = calcular_score(valores, kpi.maximo)
+        scores.append(score)
+
+        data[kpi.coluna] = valores
+        data[f"SCORE_{kpi.nome}"] = score
+        data[f"FAROL_{kpi.nome}"] = classificar_farol(score)
+        data[f"PESO_{kpi.nome}"] = kpi.peso
+
+    # CALCULANDO O SCORE DO TEMA
+    pesos = np.array([kpi.peso for kpi in spec.kpis])
+    score_tema = np.vstack(scores).T @ (pesos / pesos.sum()) if scores[0].size else np.empty(0)
+    data["SCORE_TEMA"] = score_tema
+    data["FAROL_TEMA"] = classificar_farol(score_tema)
+
+    return pd.DataFrame(data)
+
+
+def iter_tema_chunks(config: FakerConfig, tema: str, chunk_agencias: int = BLOCO_AGENCIAS) -> Iterator[pd.DataFrame]:
+    """
+    Gera a base de um tema bloco a bloco.
+
+    Parameters:
+    config (FakerConfig): Parâmetros da geração.
+    tema (str): Nome do tema ('AA', 'AB', 'INFRA_CIVIL' ou 'ESG').
+    chunk_agencias (int): Quantidade de agências de cada bloco retornado, arredondada para um
+        múltiplo de BLOCO_AGENCIAS. Não altera os dados gerados.
+
+    Returns:
+    Iterator[DataFrame]: Blocos da base, na ordem das agências.
+    """
+    if tema not in TEMA_SPECS:
+        raise ValueError(f"Tema desconhecido: {tema}. Temas disponíveis: {list(TEMA_SPECS)}")
+
+    blocos_por_chunk = max(1, round(chunk_agencias / BLOCO_AGENCIAS))
+    total_blocos = -(-config.agencias // BLOCO_AGENCIAS)
+
+    for primeiro in range(0, total_blocos, blocos_por_chunk):
+        yield pd.concat(
+            [
+                _generate_block(config, tema, bloco)
+                for bloco in range(primeiro, min(primeiro + blocos_por_chunk, total_blocos))
+            ],
+            ignore_index=True,
+        )
+
+
+def generate_tema_dataframe(config: FakerConfig, tema: str) -> pd.DataFrame:
+    """
+    Gera, em memória, a base completa de um tema.
+
+    Parameters:
+    config (FakerConfig): Parâmetros da geração.
+    tema (str): Nome do tema ('AA', 'AB', 'INFRA_CIVIL' ou 'ESG').
+
+    Returns:
+    DataFrame: A base do tema.
+    """
+    return pd.concat(list(iter_tema_chunks(config, tema, chunk_agencias=config.agencias)), ignore_index=True)
+
+
+def get_tema_path(output_dir: Union[str, Path], tema: str, formato: str = "parquet") -> Path:
+    """
+    Obtém o caminho da base de um tema: <output_dir>/<PILAR>/<TEMA>/BASE_SCORE_<TEMA>.<formato>.
+    """
+    return Path(output_dir, TEMA_SPECS[tema].pilar, tema, f"BASE_SCORE_{tema}.{formato}")
+
+
+def generate_faker_data(
+    config: FakerConfig,
+    output_dir: Union[str, Path],
+    temas: Optional[List[str]] = None,
+    formato: str = "parquet",
+    chunk_agencias: int = 100_000,
+) -> Dict[str, Path]:
+    """
+    Gera e grava, bloco a bloco, as bases dos temas.
+
+    A memória utilizada é limitada pelo tamanho dos blocos e não pela quantidade total de linhas.
+
+    Parameters:
+    config (FakerConfig): Parâmetros da geração.
+    output_dir (Union[str, Path]): Diretório base das bases geradas.
+    temas (list, optional): Temas gerados. Default: todos os temas.
+    formato (str): Formato dos arquivos ('parquet', 'csv' ou 'xlsx'). Default: 'parquet'.
+    chunk_agencias (int): Quantidade de agências de cada bloco gravado. Default: 100.000.
+
+    Returns:
+    dict: Caminho do arquivo gravado, por tema.
+    """
+    paths = {}
+    for tema in temas or list(TEMA_SPECS):
+        if tema not in TEMA_SPECS:
+            raise ValueError(f"Tema desconhecido: {tema}. Temas disponíveis: {list(TEMA_SPECS)}")
+
+        paths[tema] = get_tema_path(output_dir, tema, formato)
+        with DataChunkWriter(paths[tema]) as writer:
+            for chunk in iter_tema_chunks(config, tema, chunk_agencias=chunk_agencias):
+                writer.write(chunk)
+
+    return paths
@@ -0,0 +1,82 @@
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from config_project.config_app import settings
+
+# Categorias do farol, ordenadas do pior para o melhor score
+CATEGORIAS_FAROL = ["VERMELHO", "AMARELO", "VERDE"]
+
+
+@lru_cache(maxsize=None)
+def get_limites_farol() -> Tuple[float, float]:
+    """
+    Obtém os limites do farol definidos no settings.toml (lidos uma única vez).
+
+    :return: Tupla (limite_vermelho, limite_amarelo). Scores menores ou iguais ao
+             limite vermelho são VERMELHO, menores ou iguais ao limite amarelo são
+             AMARELO e os demais são VERDE.
+    """
+    limite_vermelho = float(settings.get("FAROL.LIMITE_VERMELHO", 4.0))
+    limite_amarelo = float(settings.get("FAROL.LIMITE_AMARELO", 8.0))
+
+    if limite_vermelho > limite_amarelo:
+        raise ValueError(
+            "O limite do farol VERMELHO deve ser menor ou igual ao limite do farol AMARELO."
+        )
+
+    return limite_vermelho, limite_amarelo
+
+
+def classificar_farol(
+    scores: Union[np.ndarray, pd.Series, list],
+    limites: Optional[Tuple[float, float]] = None,
+) -> Union[pd.Categorical, pd.Series]:
+    """
+    Classifica, de forma vetorizada, os scores nas categorias do farol.
+
+    A classificação é feita por busca ordenada dos scores nos limites do farol,
+    em uma única operação de array. Scores nulos resultam em farol nulo.
+
+    :param scores: Scores a serem classificados.
+    :param limites: Limites (vermelho, amarelo). Default: limites do settings.toml.
+    :return: pd.Categorical ordenado com as categorias VERMELHO, AMARELO e VERDE.
+             Se os scores forem uma pd.Series, retorna uma pd.Series categórica
+             com o mesmo índice.
+    """
+    if limites is None:
+        limites = get_limites_farol()
+
+    valores = np.asarray(scores, dtype=np.float64)
+
+    # Scores <= limite vermelho -> 0, <= limite amarelo -> 1, demais -> 2
+    codigos = np.searchsorted(
+        np.asarray(limites, dtype=np.float64), valores, side="left"
+    ).astype(np.int8)
+    codigos[np.isnan(valores)] = -1
+
+    farol = pd.Categorical.from_codes(
+        codigos, categories=CATEGORIAS_FAROL, ordered=True
+    )
+
+    if isinstance(scores, pd.Series):
+        return pd.Series(farol, index=scores.index, name=scores.name)
+    return farol
+
+
+def definir_farol(
+    score: float, limites: Optional[Tuple[float, float]] = None
+) -> Optional[str]:
+    """
+    Define o farol de um único score.
+
+    :param score: Score calculado para uma categoria ou para o pilar.
+    :param limites: Limites (vermelho, amarelo). Default: limites do settings.toml.
+    :return: 'VERMELHO', 'AMARELO' ou 'VERDE' com base no valor do score
+             (None para score nulo).
+    """
+    farol = classificar_farol([score], limites=limites)[0]
+
+    return farol if isinstance(farol, str) else None
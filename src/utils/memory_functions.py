@@ -0,0 +1,100 @@
+import os
+import threading
+from typing import Optional
+
+from loguru import logger
+
+
+def get_current_rss() -> Optional[int]:
+    """
+    Obtém a memória residente (RSS) atual do processo, em bytes.
+
+    Utiliza o psutil quando instalado; caso contrário, lê /proc/self/statm (Linux)
+    ou, como última alternativa, o pico informado por resource.getrusage.
+
+    :return: RSS atual em bytes, ou None se não for possível obtê-lo.
+    """
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+        import sys
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss é informado em bytes no macOS e em kilobytes nos demais sistemas
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+    except ImportError:
+        logger.warning("Não foi possível obter a memória residente do processo")
+        return None
+
+
+class PeakRSSMonitor:
+    """
+    Mede o pico de memória residente (RSS) do processo durante um bloco de código.
+
+    Uma thread auxiliar amostra o RSS em intervalos regulares enquanto o bloco é executado.
+
+    Exemplo:
+        with PeakRSSMonitor() as monitor:
+            executar_etapa()
+        print(monitor.peak_rss, monitor.peak_rss_delta)
+
+    Attributes:
+        interval (float): Intervalo entre as amostras, em segundos.
+        start_rss (int): RSS no início do bloco, em bytes.
+        peak_rss (int): Maior RSS observado durante o bloco, em bytes.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Inicializa o monitor.
+
+        :param interval: Intervalo entre as amostras, em segundos. Default: 0.005.
+        """
+        self.interval = interval
+        self.start_rss = None
+        self.peak_rss = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def peak_rss_delta(self) -> Optional[int]:
+        """
+        Acréscimo de memória do pico em relação ao início do bloco, em bytes.
+        """
+        if self.start_rss is None or self.peak_rss is None:
+            return None
+        return max(0, self.peak_rss - self.start_rss)
+
+    def _sample(self):
+        rss = get_current_rss()
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.start_rss = get_current_rss()
+        self.peak_rss = self.start_rss
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop_event.set()
+        self._thread.join()
+        self._sample()
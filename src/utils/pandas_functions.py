@@ -1,10 +1,353 @@
+import hashlib
+import html
 import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
+from config_project.config_app import settings
+from src.utils.schema_functions import (
+    SCHEMA_METADATA_KEY,
+    compact_dataframe,
+    expand_dataframe,
+    get_schema,
+    get_schema_path,
+    load_schema,
+    save_schema,
+)
+from src.utils.profile_functions import profile_stage
+from src.utils.sqlite_functions import SQLITE_EXTENSIONS, save_data_sqlite
+
+# Extensões cujos arquivos podem ser armazenados no cache colunar
+CACHEABLE_EXTENSIONS = [".xls", ".xlsx"]
+
+# Extensões dos arquivos Arrow IPC/Feather (ver arrow_functions)
+ARROW_EXTENSIONS = [".arrow", ".feather", ".ipc"]
+
+# Quantidade de linhas convertidas por bloco na gravação de Excel em streaming
+EXCEL_CHUNK_ROWS = 50_000
+
+# Nível de compressão dos arquivos xlsx gravados em blocos (1: mais rápido)
+EXCEL_COMPRESS_LEVEL = 1
+
+# Caracteres de controle não permitidos no XML das planilhas
+_XML_ILLEGAL_CHARACTERS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F]")
+
+# Nomes definidos da pasta de trabalho que registram a continuação de um Excel gravado em streaming
+EXCEL_ROLLOVER_SHEETS = "SCORE_ROLLOVER_SHEETS"
+EXCEL_ROLLOVER_NEXT = "SCORE_ROLLOVER_NEXT"
+
+# Argumentos do to_excel suportados pela gravação de Excel em streaming (ver save_data_auto)
+EXCEL_STREAMING_KWARGS = {"sheet_name"}
+
+# Quantidade de linhas lidas por bloco de um CSV com filtros de linhas (ver load_data_auto)
+CSV_FILTER_CHUNK_ROWS = 500_000
+
+
+def get_cache_dir(file_path: str) -> Path:
+    """
+    Obtém o diretório de cache colunar, localizado ao lado do arquivo de dados.
+
+    :param file_path: Caminho completo para o arquivo de dados.
+    :return: Caminho do diretório de cache.
+    """
+    return Path(file_path).absolute().parent / settings.get(
+        "CACHE.DIR_NAME", ".cache_score"
+    )
+
+
+def _hash_file_content(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Calcula o hash do conteúdo de um arquivo, lendo-o em blocos.
+
+    :param file_path: Caminho completo para o arquivo.
+    :param chunk_size: Tamanho de cada bloco lido, em bytes.
+    :return: Hash hexadecimal do conteúdo.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cache_path(file_path: str, sheet_name, **read_kwargs) -> Path:
+    """
+    Obtém o caminho da cópia colunar (Parquet) de um arquivo de dados.
+
+    O nome do arquivo de cache combina uma chave da leitura (caminho, aba e
+    argumentos de leitura) e uma chave da versão do arquivo (tamanho, data de
+    modificação e hash do conteúdo). Qualquer alteração no arquivo gera uma nova
+    chave de versão, invalidando automaticamente a cópia anterior.
+
+    :param file_path: Caminho completo para o arquivo de dados.
+    :param sheet_name: Nome ou índice da folha para arquivos Excel.
+    :param read_kwargs: Demais argumentos de leitura.
+    :return: Caminho do arquivo de cache.
+    """
+    path = Path(file_path).absolute()
+    stat = path.stat()
+
+    read_key = hashlib.blake2b(
+        repr((str(path), sheet_name, sorted(read_kwargs.items()))).encode(),
+        digest_size=8,
+    ).hexdigest()
+    version_key = hashlib.blake2b(
+        repr((stat.st_size, stat.st_mtime_ns, _hash_file_content(path))).encode(),
+        digest_size=8,
+    ).hexdigest()
+
+    return get_cache_dir(path) / f"{path.stem}__{read_key}__{version_key}.parquet"
+
+
+def evict_cache(cache_dir: Union[str, Path], max_size_bytes: Optional[int] = None) -> int:
+    """
+    Remove as cópias menos usadas do cache até que o seu tamanho total respeite o limite.
+
+    :param cache_dir: Diretório de cache.
+    :param max_size_bytes: Tamanho máximo do cache, em bytes. Default: CACHE.MAX_SIZE_MB do settings.toml.
+    :return: Quantidade de arquivos removidos.
+    """
+    if max_size_bytes is None:
+        max_size_bytes = int(settings.get("CACHE.MAX_SIZE_MB", 1024)) * 1024 * 1024
+
+    # Arquivos ordenados do mais recentemente usado para o menos usado
+    files = sorted(
+        Path(cache_dir).glob("*.parquet"),
+        key=lambda file: file.stat().st_mtime,
+        reverse=True,
+    )
+
+    total_size = 0
+    removed = 0
+    for file in files:
+        total_size += file.stat().st_size
+        if total_size > max_size_bytes:
+            file.unlink(missing_ok=True)
+            removed += 1
+
+    return removed
+
+
+def clear_cache(file_path: Union[str, Path]) -> int:
+    """
+    Remove todas as cópias do cache colunar de um arquivo (ou de um diretório de dados).
+
+    :param file_path: Caminho do arquivo de dados ou do diretório que contém os arquivos.
+    :return: Quantidade de arquivos removidos.
+    """
+    path = Path(file_path)
+    if path.is_dir():
+        cache_dirs = [
+            cache_dir
+            for cache_dir in path.rglob(settings.get("CACHE.DIR_NAME", ".cache_score"))
+            if cache_dir.is_dir()
+        ]
+        pattern = "*.parquet"
+    else:
+        cache_dirs = [get_cache_dir(path)]
+        pattern = f"{path.stem}__*.parquet"
+
+    removed = 0
+    for cache_dir in cache_dirs:
+        for file in cache_dir.glob(pattern):
+            file.unlink(missing_ok=True)
+            removed += 1
+
+    logger.info(f"Cache removido: {removed} arquivo(s) em {file_path}")
+    return removed
+
+
+def _load_from_cache(file_path: str, read_function, sheet_name, **read_kwargs) -> pd.DataFrame:
+    """
+    Carrega um arquivo por meio do cache colunar, criando a cópia na primeira leitura.
+
+    :param file_path: Caminho completo para o arquivo de dados.
+    :param read_function: Função que lê o arquivo original e retorna o DataFrame.
+    :param sheet_name: Nome ou índice da folha para arquivos Excel.
+    :param read_kwargs: Demais argumentos de leitura (compõem a chave do cache).
+    :return: DataFrame carregado.
+    """
+    cache_path = get_cache_path(file_path, sheet_name, **read_kwargs)
+
+    if cache_path.exists():
+        df = pd.read_parquet(cache_path, engine="pyarrow")
+
+        # Marca a cópia como usada recentemente (utilizado na remoção por tamanho)
+        os.utime(cache_path)
+        logger.info(f"DataFrame carregado do cache {cache_path}")
+        return df
+
+    df = read_function()
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Remove as cópias de versões anteriores do mesmo arquivo
+        read_key = cache_path.stem.split("__")[1]
+        for old_file in cache_path.parent.glob(
+            f"{Path(file_path).stem}__{read_key}__*.parquet"
+        ):
+            old_file.unlink(missing_ok=True)
+
+        df.to_parquet(cache_path, index=False, engine="pyarrow")
+        evict_cache(cache_path.parent)
+    except Exception as e:
+        logger.warning(f"Não foi possível armazenar o cache de {file_path}: {e}")
+        if cache_path.exists():
+            cache_path.unlink(missing_ok=True)
+
+    return df
+
+
+def get_data_columns(file_path: Union[str, Path]) -> list:
+    """
+    Obtém os nomes das colunas de um arquivo de dados, sem ler as linhas (exceto em Excel).
+
+    :param file_path: Caminho completo para o arquivo de dados.
+    :return: Nomes das colunas, na ordem do arquivo.
+    """
+    file_extension = Path(file_path).suffix.lower()
+
+    if file_extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(file_path).names
+    if file_extension in ARROW_EXTENSIONS:
+        import pyarrow as pa
+
+        with pa.memory_map(str(file_path)) as source:
+            return pa.ipc.open_file(source).schema.names
+    if file_extension == ".csv":
+        return pd.read_csv(file_path, nrows=0).columns.tolist()
+    if file_extension in [".xls", ".xlsx"]:
+        return pd.read_excel(file_path, nrows=0, engine="openpyxl").columns.tolist()
+    raise ValueError(f"Unsupported file format: {file_extension}")
+
+
+def filter_dataframe(df: pd.DataFrame, filters: Optional[dict]) -> pd.DataFrame:
+    """
+    Mantém as linhas cujos valores pertencem aos valores aceitos de cada coluna filtrada.
+
+    :param df: DataFrame a ser filtrado.
+    :param filters: Valores aceitos, por coluna (ex.: {"CD_PONTO": [1001, 1002], "MES": [9]}).
+        As colunas ausentes do DataFrame são ignoradas.
+    :return: DataFrame filtrado (o próprio DataFrame, se nenhuma linha for removida).
+    """
+    if not filters or df.empty:
+        return df
+
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in filters.items():
+        if column in df.columns:
+            mask &= df[column].isin(list(values)).to_numpy()
+
+    return df if mask.all() else df.loc[mask].reset_index(drop=True)
+
+
+def get_excel_rollover(file_path: Union[str, Path]) -> tuple:
+    """
+    Obtém a continuação de um Excel gravado pelo ExcelChunkWriter: a quantidade de planilhas com
+    dados e o próximo arquivo (rollover='file'). Lê apenas o workbook.xml do pacote.
+
+    :param file_path: Caminho completo para o arquivo Excel.
+    :return: (quantidade de planilhas, caminho do próximo arquivo ou None). Arquivos sem continuação
+        registrada retornam (1, None).
+    """
+    try:
+        with zipfile.ZipFile(file_path) as package:
+            workbook = package.read("xl/workbook.xml").decode("utf-8")
+    except (zipfile.BadZipFile, KeyError):
+        return 1, None
+
+    names = dict(re.findall(r'<definedName name="(SCORE_ROLLOVER_\w+)"[^>]*>([^<]*)</definedName>', workbook))
+    sheets = int(names.get(EXCEL_ROLLOVER_SHEETS, 1))
+    next_file = names.get(EXCEL_ROLLOVER_NEXT)
+    if next_file:
+        next_file = str(Path(file_path).with_name(html.unescape(next_file).strip('"')))
+    return sheets, next_file
+
+
+def _read_excel_rollover(file_path, **read_kwargs) -> pd.DataFrame:
+    """
+    Lê a primeira planilha de um Excel e, se o arquivo foi gravado em streaming com continuação,
+    as demais planilhas e os arquivos seguintes, concatenados.
+    """
+    parts = []
+    current = str(file_path)
+    while current:
+        sheets, next_file = get_excel_rollover(current)
+        workbook = pd.read_excel(current, sheet_name=list(range(sheets)), engine="openpyxl", **read_kwargs)
+        parts.extend(workbook.values())
+        current = next_file
+    return parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+
+
+def _usecols_with_filters(usecols, filters, read_columns) -> tuple:
+    """
+    Inclui as colunas filtradas nas colunas lidas de um CSV ou Excel, para que os filtros sejam
+    aplicados mesmo quando as colunas não foram selecionadas em usecols (como no pyarrow).
+
+    :param usecols: Colunas a serem lidas (lista de nomes ou função).
+    :param filters: Valores aceitos, por coluna.
+    :param read_columns: Função que retorna as colunas do arquivo (lida só se necessário).
+    :return: (colunas a serem lidas, colunas a serem removidas após o filtro). As colunas filtradas
+        ausentes do arquivo são ignoradas; posições e intervalos do Excel (ex.: "A:C") não são alterados.
+    """
+    if not filters or usecols is None or isinstance(usecols, str):
+        return usecols, []
+
+    if callable(usecols):
+        extra = [column for column in filters if not usecols(column)]
+        if not extra:
+            return usecols, []
+        return (lambda column: usecols(column) or column in filters), extra
+
+    if not all(isinstance(column, str) for column in usecols):
+        return usecols, []
+    extra = [column for column in filters if column not in usecols]
+    if extra:
+        columns = read_columns()
+        extra = [column for column in extra if column in columns]
+    return [*usecols, *extra], extra
+
+
+def _read_csv_filtered(file_path, filters, **read_kwargs) -> pd.DataFrame:
+    """
+    Lê um CSV em blocos, filtrando as linhas de cada bloco antes da concatenação.
+    """
+    with pd.read_csv(file_path, chunksize=CSV_FILTER_CHUNK_ROWS, **read_kwargs) as reader:
+        chunks = [filter_dataframe(chunk, filters) for chunk in reader]
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.read_csv(file_path, nrows=0, **read_kwargs)
+
+
+def _read_arrow_filtered(file_path, file_format, usecols, filters) -> pd.DataFrame:
+    """
+    Lê um arquivo Parquet ou Arrow IPC/Feather com os filtros aplicados pelo pyarrow: no Parquet,
+    os grupos de linhas cujas estatísticas (mínimo e máximo) excluem os valores não são lidos.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(file_path, format=file_format)
+    expression = None
+    for column, values in filters.items():
+        if column in dataset.schema.names:
+            values = list(values)
+            condition = ds.field(column).isin(values)
+            if values:
+                # O intervalo dos valores permite o descarte dos grupos de linhas pelas estatísticas
+                condition = (ds.field(column) >= min(values)) & (ds.field(column) <= max(values)) & condition
+            expression = condition if expression is None else expression & condition
+
+    return dataset.to_table(columns=usecols, filter=expression).to_pandas()
+
 
 def load_data_auto(
     file_path: str,
@@ -14,9 +357,30 @@ def load_data_auto(
     nrows: Optional[int] = None,
     dtype: Optional[dict] = None,
     parse_dates: Optional[Union[bool, list, dict]] = False,
+    use_cache: bool = False,
+    raise_errors: bool = False,
+    expand: bool = True,
+    filters: Optional[dict] = None,
 ) -> pd.DataFrame:
     """
-    Carrega um DataFrame automaticamente baseado no tipo de arquivo (Excel, CSV, Parquet).
+    Carrega um DataFrame automaticamente baseado no tipo de arquivo (Excel, CSV, Parquet, Arrow/Feather).
+
+    Com use_cache=True, arquivos Excel são lidos uma única vez e armazenados em uma
+    cópia colunar (Parquet) ao lado do arquivo; as leituras seguintes usam essa cópia
+    enquanto o arquivo não for alterado.
+
+    Resultados gravados no esquema compacto (ver schema_functions) são expandidos para o
+    layout original, a menos que expand=False.
+
+    Os filtros de linhas são aplicados na leitura sempre que o formato permite: em Parquet e
+    Arrow/Feather pelo pyarrow (com o descarte dos grupos de linhas pelas estatísticas do
+    Parquet) e em CSV bloco a bloco. Em Excel, o arquivo é lido por completo e filtrado em seguida.
+    Em todos os formatos, as colunas filtradas são lidas mesmo fora de usecols e removidas após o
+    filtro.
+
+    Um Excel gravado em streaming com várias planilhas (ou arquivos, ver ExcelChunkWriter) é lido
+    por completo, com as planilhas e os arquivos da continuação concatenados (sheet_name=0, sem
+    skiprows e nrows).
 
     :param file_path: Caminho completo para o arquivo de dados.
     :param sheet_name: Nome ou índice da folha para arquivos Excel.
@@ -25,70 +389,762 @@ def load_data_auto(
     :param nrows: Número de linhas para ler.
     :param dtype: Tipos de dados para as colunas.
     :param parse_dates: Analisar colunas como datas.
+    :param use_cache: Se deve utilizar o cache colunar para arquivos Excel.
+    :param raise_errors: Se True, propaga o erro de leitura em vez de retornar um DataFrame vazio.
+    :param expand: Se True, expande os resultados no esquema compacto. Se False, os metadados
+        do esquema são mantidos em DataFrame.attrs.
+    :param filters: Valores aceitos, por coluna (ex.: {"CD_PONTO": [1001, 1002]}). As colunas
+        ausentes do arquivo são ignoradas (ver filter_dataframe).
     :return: DataFrame carregado do arquivo.
     """
     # Determina o tipo do arquivo pela extensão
     file_extension = Path(file_path).suffix.lower()
 
-    try:
-        if file_extension in [".xls", ".xlsx"]:
-            df = pd.read_excel(
-                file_path,
-                sheet_name=sheet_name,
-                usecols=usecols,
-                skiprows=skiprows,
-                nrows=nrows,
-                dtype=dtype,
-                parse_dates=parse_dates,
-                engine="openpyxl",
-            )
-        elif file_extension == ".csv":
-            df = pd.read_csv(
-                file_path,
-                usecols=usecols,
-                skiprows=skiprows,
-                nrows=nrows,
-                dtype=dtype,
-                parse_dates=parse_dates,
-            )
-        elif file_extension == ".parquet":
-            df = pd.read_parquet(file_path, columns=usecols, engine="pyarrow")
+    with profile_stage("load_data_auto") as stage:
+        try:
+            filter_columns = []
+            if file_extension in [".xls", ".xlsx"]:
+                usecols, filter_columns = _usecols_with_filters(
+                    usecols,
+                    filters,
+                    lambda: pd.read_excel(
+                        file_path, sheet_name=sheet_name, nrows=0, engine="openpyxl"
+                    ).columns.tolist(),
+                )
+                read_kwargs = dict(
+                    usecols=usecols,
+                    skiprows=skiprows,
+                    nrows=nrows,
+                    dtype=dtype,
+                    parse_dates=parse_dates,
+                )
+
+                def read_excel():
+                    if sheet_name == 0 and skiprows is None and nrows is None:
+                        # Resultados gravados em streaming: todas as planilhas e arquivos da continuação
+                        return _read_excel_rollover(file_path, **read_kwargs)
+                    return pd.read_excel(
+                        file_path, sheet_name=sheet_name, engine="openpyxl", **read_kwargs
+                    )
+
+                if use_cache:
+                    df = _load_from_cache(file_path, read_excel, sheet_name, **read_kwargs)
+                else:
+                    df = read_excel()
+                df = filter_dataframe(df, filters)
+            elif file_extension == ".csv":
+                usecols, filter_columns = _usecols_with_filters(
+                    usecols, filters, lambda: get_data_columns(file_path)
+                )
+                read_kwargs = dict(
+                    usecols=usecols,
+                    skiprows=skiprows,
+                    nrows=nrows,
+                    dtype=dtype,
+                    parse_dates=parse_dates,
+                )
+                if filters:
+                    df = _read_csv_filtered(file_path, filters, **read_kwargs)
+                else:
+                    df = pd.read_csv(file_path, **read_kwargs)
+            elif file_extension == ".parquet":
+                if filters:
+                    df = _read_arrow_filtered(file_path, "parquet", usecols, filters)
+                else:
+                    df = pd.read_parquet(file_path, columns=usecols, engine="pyarrow")
+            elif file_extension in ARROW_EXTENSIONS:
+                if filters:
+                    df = _read_arrow_filtered(file_path, "ipc", usecols, filters)
+                else:
+                    df = pd.read_feather(file_path, columns=usecols)
+            else:
+                raise ValueError(f"Unsupported file format: {file_extension}")
+
+            if filter_columns:
+                # Colunas lidas apenas para o filtro
+                df = df.drop(columns=[column for column in filter_columns if column in df.columns])
+
+            # Esquema compacto: restaura o layout original ou mantém os metadados
+            schema = load_schema(file_path)
+            if schema is not None:
+                df.attrs[SCHEMA_METADATA_KEY] = schema
+                if expand:
+                    df = expand_dataframe(df, schema)
+
+            stage.rows_out = len(df)
+            logger.info(f"DataFrame carregado com sucesso de {file_path}")
+            return df
+
+        except Exception as e:
+            logger.error(f"Erro ao carregar o arquivo {file_path}: {e}")
+            if raise_errors:
+                raise
+            return pd.DataFrame()  # Retorna um DataFrame vazio em caso de erro
+
+
+class DataLoadError(Exception):
+    """
+    Erro na leitura de um ou mais arquivos carregados por load_data_parallel.
+
+    Attributes:
+        errors (dict): Erro de cada arquivo que não pôde ser carregado, por chave do arquivo.
+    """
+
+    def __init__(self, errors: dict):
+        self.errors = errors
+        details = "; ".join(f"{key}: {error}" for key, error in errors.items())
+        super().__init__(f"Erro ao carregar {len(errors)} arquivo(s): {details}")
+
+
+def load_data_parallel(
+    file_paths: dict,
+    workers: Optional[int] = None,
+    executor: str = "process",
+    **load_kwargs,
+) -> dict:
+    """
+    Carrega vários arquivos ao mesmo tempo, em um pool de workers.
+
+    Cada arquivo é carregado por load_data_auto em um worker; o tempo total de leitura fica
+    próximo ao do arquivo mais lento. Os erros são reportados por arquivo (DataLoadError),
+    em vez de retornar DataFrames vazios.
+
+    :param file_paths: Caminhos dos arquivos, por chave (ex.: {"AA": "BASE_SCORE_AA.xlsx"}).
+    :param workers: Quantidade máxima de workers. Default: quantidade de arquivos, limitada à de CPUs.
+    :param executor: 'process' (leitura de Excel, limitada pela CPU) ou 'thread'. Default: 'process'.
+    :param load_kwargs: Argumentos adicionais de load_data_auto (ex.: use_cache=True).
+    :return: DataFrames carregados, pelas mesmas chaves de file_paths.
+    :raises DataLoadError: Se algum arquivo não puder ser carregado.
+    """
+    if workers is None:
+        workers = min(len(file_paths), os.cpu_count() or 1)
+    workers = max(1, min(workers, len(file_paths) or 1))
+
+    with profile_stage("load_data_parallel") as stage:
+        load_kwargs["raise_errors"] = True
+        dataframes, errors = {}, {}
+
+        if workers == 1:
+            # Sem paralelismo, os arquivos são carregados no próprio processo
+            for key, file_path in file_paths.items():
+                try:
+                    dataframes[key] = load_data_auto(file_path, **load_kwargs)
+                except Exception as e:
+                    errors[key] = e
         else:
-            raise ValueError(f"Unsupported file format: {file_extension}")
+            if executor == "process":
+                pool_class = ProcessPoolExecutor
+            elif executor == "thread":
+                pool_class = ThreadPoolExecutor
+            else:
+                raise ValueError(f"Unsupported executor: {executor}")
 
-        logger.info(f"DataFrame carregado com sucesso de {file_path}")
-        return df
+            with pool_class(max_workers=workers) as pool:
+                futures = {
+                    key: pool.submit(load_data_auto, file_path, **load_kwargs)
+                    for key, file_path in file_paths.items()
+                }
+                for key, future in futures.items():
+                    try:
+                        dataframes[key] = future.result()
+                    except Exception as e:
+                        errors[key] = e
 
-    except Exception as e:
-        logger.error(f"Erro ao carregar o arquivo {file_path}: {e}")
-        return pd.DataFrame()  # Retorna um DataFrame vazio em caso de erro
+        stage.rows_out = sum(len(df) for df in dataframes.values())
+        if errors:
+            raise DataLoadError(errors)
+
+    return dataframes
 
 
 def save_data_auto(
-    dataframe: pd.DataFrame, file_path: str, index: bool = False, **kwargs
+    dataframe: pd.DataFrame,
+    file_path: str,
+    index: bool = False,
+    compact: bool = False,
+    float32: bool = False,
+    **kwargs,
 ) -> None:
     """
     Salva um DataFrame em um arquivo especificado, criando diretórios se não existirem.
 
+    Arquivos .db/.sqlite são gravados nas tabelas de score do banco SQLite (ver save_data_sqlite).
+    Arquivos .arrow/.feather/.ipc são gravados em Arrow IPC sem compressão (mapeáveis em memória).
+    Arquivos xlsx a partir de EXCEL.STREAMING_MIN_ROWS linhas são gravados em streaming, com
+    memória constante e uma nova planilha a cada limite de linhas do Excel (ver ExcelChunkWriter).
+    O streaming aceita apenas os argumentos do to_excel em EXCEL_STREAMING_KWARGS (ex.: sheet_name,
+    o nome base das planilhas); com outros argumentos, o arquivo é gravado pelo to_excel.
+
+    Com compact=True (ou um DataFrame já compacto), o resultado é gravado no esquema compacto
+    (ver schema_functions): os pesos das categorias ficam nos metadados do Parquet ou, em CSV e
+    Excel, no arquivo <nome>.<extensão>.schema.json ao lado do arquivo. O banco SQLite recebe o
+    layout original.
+
     :param dataframe: DataFrame a ser salvo.
     :param file_path: Caminho completo para o arquivo de destino.
     :param index: Se deve incluir o índice do DataFrame na saída.
+    :param compact: Se deve gravar o resultado no esquema compacto.
+    :param float32: Se deve gravar os scores em float32 (com compact=True).
     :param kwargs: Argumentos adicionais específicos para cada tipo de arquivo.
     """
-    # Cria o diretório se não existir
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with profile_stage("save_data_auto", rows_in=len(dataframe)) as stage:
+        # Cria o diretório se não existir
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-    # Determina o tipo do arquivo pela extensão
-    file_extension = Path(file_path).suffix.lower().strip(".")
-
-    # Mapeia a extensão para o método de salvamento adequado
-    if file_extension == "csv":
-        dataframe.to_csv(file_path, index=index, **kwargs)
-    elif file_extension == "xlsx":
-        dataframe.to_excel(file_path, index=index, engine="openpyxl", **kwargs)
-    elif file_extension == "parquet":
-        dataframe.to_parquet(file_path, index=index, engine="pyarrow", **kwargs)
+        # Determina o tipo do arquivo pela extensão
+        file_extension = Path(file_path).suffix.lower().strip(".")
+
+        if compact:
+            dataframe = compact_dataframe(dataframe, float32=float32)
+        schema = get_schema(dataframe)
+
+        # Mapeia a extensão para o método de salvamento adequado
+        if file_extension == "csv":
+            dataframe.to_csv(file_path, index=index, **kwargs)
+        elif (
+            file_extension == "xlsx"
+            and not index
+            and set(kwargs) <= EXCEL_STREAMING_KWARGS
+            and len(dataframe) >= settings.get("EXCEL.STREAMING_MIN_ROWS", 100_000)
+        ):
+            # Resultados grandes: gravação em streaming, com nova planilha a cada limite do Excel
+            with ExcelChunkWriter(file_path, **kwargs) as writer:
+                for start in range(0, len(dataframe), EXCEL_CHUNK_ROWS):
+                    writer.write(dataframe.iloc[start : start + EXCEL_CHUNK_ROWS])
+        elif file_extension == "xlsx":
+            if len(dataframe) >= settings.get("EXCEL.STREAMING_MIN_ROWS", 100_000):
+                logger.warning(
+                    f"Argumentos não suportados pelo streaming ({sorted(set(kwargs) - EXCEL_STREAMING_KWARGS)} "
+                    f"ou index=True): {file_path} é gravado pelo to_excel, com a pasta de trabalho em memória"
+                )
+            dataframe.to_excel(file_path, index=index, engine="openpyxl", **kwargs)
+        elif file_extension == "parquet" and schema is not None:
+            import json
+
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Os metadados do esquema compacto são gravados no próprio arquivo
+            table = pa.Table.from_pandas(dataframe, preserve_index=index)
+            table = table.replace_schema_metadata(
+                {**table.schema.metadata, SCHEMA_METADATA_KEY.encode(): json.dumps(schema)}
+            )
+            pq.write_table(table, file_path, **kwargs)
+        elif file_extension == "parquet":
+            dataframe.to_parquet(file_path, index=index, engine="pyarrow", **kwargs)
+        elif f".{file_extension}" in ARROW_EXTENSIONS:
+            dataframe.to_feather(file_path, compression="uncompressed", **kwargs)
+        elif f".{file_extension}" in SQLITE_EXTENSIONS:
+            # Banco SQLite: aceita os argumentos level e category (ver save_data_sqlite)
+            save_data_sqlite(expand_dataframe(dataframe), file_path, **kwargs)
+        else:
+            raise ValueError(f"Unsupported file format for extension {file_extension}")
+
+        # CSV, Excel e Arrow: os metadados do esquema compacto ficam em um arquivo ao lado do arquivo de dados
+        if file_extension in ["csv", "xlsx"] or f".{file_extension}" in ARROW_EXTENSIONS:
+            if schema is not None:
+                save_schema(schema, file_path)
+            else:
+                get_schema_path(file_path).unlink(missing_ok=True)
+
+        logger.info(f"DataFrame salvo com sucesso em {file_path}")
+        stage.rows_out = len(dataframe)
+
+
+def save_data_partitioned(
+    dataframe: pd.DataFrame,
+    dir_path: Union[str, Path],
+    file_name: str,
+    partition_columns: Optional[list] = None,
+    **kwargs,
+) -> list:
+    """
+    Salva um DataFrame particionado por período, com um arquivo por partição.
+
+    Os diretórios seguem o padrão hive (ex.: ANO=2024/MES=9/DIA=1/<file_name>). As colunas de
+    partição são mantidas nos arquivos, permitindo a leitura isolada de cada partição.
+
+    :param dataframe: DataFrame a ser salvo.
+    :param dir_path: Diretório base do dataset particionado.
+    :param file_name: Nome do arquivo de cada partição (a extensão define o formato).
+    :param partition_columns: Colunas de partição. Default: ['ANO', 'MES', 'DIA'].
+    :param kwargs: Argumentos adicionais repassados para save_data_auto.
+    :return: Lista com os caminhos dos arquivos gravados.
+    """
+    partition_columns = partition_columns or ["ANO", "MES", "DIA"]
+
+    saved = []
+    for values, df_partition in dataframe.groupby(partition_columns, sort=True, observed=True):
+        values = values if isinstance(values, tuple) else (values,)
+        partition_dir = Path(
+            dir_path,
+            *[f"{column}={value}" for column, value in zip(partition_columns, values)],
+        )
+        file_path = Path(partition_dir, file_name)
+        save_data_auto(dataframe=df_partition, file_path=str(file_path), **kwargs)
+        saved.append(file_path)
+
+    return saved
+
+
+def load_data_partitioned(dir_path: Union[str, Path], **kwargs) -> pd.DataFrame:
+    """
+    Carrega um dataset particionado por período (ver save_data_partitioned) em um único DataFrame.
+
+    As colunas de partição ausentes nos arquivos são obtidas dos nomes dos diretórios.
+
+    :param dir_path: Diretório base do dataset particionado.
+    :param kwargs: Argumentos adicionais repassados para load_data_auto.
+    :return: DataFrame com os dados de todas as partições.
+    """
+    frames = []
+    for file_path in sorted(Path(dir_path).rglob("*")):
+        parts = file_path.relative_to(dir_path).parent.parts
+
+        # Ignora os diretórios ocultos (ex.: cache colunar) e os arquivos que não são de dados
+        if (
+            not file_path.is_file()
+            or file_path.suffix.lower() not in (".csv", ".xlsx", ".parquet")
+            or any(part.startswith(".") for part in parts)
+        ):
+            continue
+
+        df = load_data_auto(file_path, raise_errors=True, **kwargs)
+        for part in parts:
+            column, separator, value = part.partition("=")
+            if separator and column not in df.columns:
+                df[column] = int(value) if value.lstrip("-").isdigit() else value
+        frames.append(df)
+
+    if not frames:
+        raise FileNotFoundError(f"Nenhum arquivo encontrado no dataset particionado {dir_path}")
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def iter_data_chunks(
+    file_path: str, chunk_size: int, usecols: Optional[list] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Lê um arquivo de dados (CSV ou Parquet) em blocos de tamanho fixo.
+
+    :param file_path: Caminho completo para o arquivo de dados.
+    :param chunk_size: Quantidade máxima de linhas de cada bloco.
+    :param usecols: Colunas a serem lidas.
+    :return: Iterador de DataFrames, um por bloco.
+    """
+    file_extension = Path(file_path).suffix.lower()
+
+    if file_extension == ".csv":
+        with pd.read_csv(file_path, usecols=usecols, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                yield chunk
+    elif file_extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=usecols):
+            yield batch.to_pandas()
     else:
-        raise ValueError(f"Unsupported file format for extension {file_extension}")
+        raise ValueError(
+            f"Unsupported file format for chunked reading: {file_extension}"
+        )
+
+
+def _excel_column_letter(position: int) -> str:
+    """
+    Converte a posição de uma coluna (0, 1, ...) na letra da coluna no Excel (A, B, ..., AA, ...).
+
+    :param position: Posição da coluna, iniciando em 0.
+    :return: Letra da coluna.
+    """
+    letters = ""
+    position += 1
+    while position:
+        position, remainder = divmod(position - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _rollover_sheet_name(sheet_name: Optional[str], position: int) -> str:
+    """
+    Obtém o nome da planilha de uma posição (1, 2, ...) de um arquivo gravado pelo ExcelChunkWriter.
+
+    :param sheet_name: Nome base das planilhas (None: Sheet1, Sheet2, ...).
+    :param position: Posição da planilha no arquivo, iniciando em 1.
+    :return: Nome da planilha (ex.: 'Dados' e 'Dados_2').
+    """
+    if sheet_name is None:
+        return f"Sheet{position}"
+    return sheet_name if position == 1 else f"{sheet_name}_{position}"
+
+
+def _escape_xml_text(value: str) -> str:
+    value = _XML_ILLEGAL_CHARACTERS.sub("", value)
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def _escape_xml(values: pd.Series) -> pd.Series:
+    # Os caracteres de controle não permitidos no XML são removidos, como no openpyxl
+    return (
+        values.str.replace(_XML_ILLEGAL_CHARACTERS, "", regex=True)
+        .str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+    )
+
+
+# Partes fixas do pacote xlsx (SpreadsheetML)
+_XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_XLSX_SHEET_END = "</sheetData></worksheet>"
+_XLSX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+)
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+
+
+class ExcelChunkWriter:
+    """
+    Escreve um arquivo Excel (xlsx) bloco a bloco, com memória constante.
+
+    O XML de cada planilha é gerado de forma vetorizada, bloco a bloco, e gravado diretamente
+    no pacote zip do arquivo, sem manter a pasta de trabalho em memória. Quando a planilha atinge
+    o limite de linhas do Excel, a gravação continua em uma nova planilha (rollover='sheet') ou em
+    um novo arquivo (rollover='file', ex.: BASE_SCORE_GLOBAL_2.xlsx), repetindo o cabeçalho.
+
+    Attributes:
+        file_path (str): Caminho completo para o arquivo de destino.
+        files (list): Caminhos dos arquivos gravados.
+        rows_written (int): Quantidade de linhas já gravadas.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        max_rows: Optional[int] = None,
+        rollover: Optional[str] = None,
+        sheet_name: Optional[str] = None,
+    ):
+        """
+        Inicializa o escritor.
+
+        :param file_path: Caminho completo para o arquivo de destino.
+        :param max_rows: Quantidade máxima de linhas de dados por planilha. Default: EXCEL.MAX_ROWS do settings.
+        :param rollover: 'sheet' (nova planilha) ou 'file' (novo arquivo). Default: EXCEL.ROLLOVER do settings.
+        :param sheet_name: Nome base das planilhas (Dados, Dados_2, ...). Default: Sheet1, Sheet2, ...
+        """
+        self.file_path = str(file_path)
+        self.sheet_name = sheet_name
+        self.max_rows = max_rows or settings.get("EXCEL.MAX_ROWS", 1_048_575)
+        self.rollover = rollover or settings.get("EXCEL.ROLLOVER", "sheet")
+        self.files = []
+        self.rows_written = 0
+        self._zip = None
+        self._sheets = 0
+        self._stream = None
+        self._sheet_rows = 0
+        self._columns = None
+
+        if self.rollover not in ["sheet", "file"]:
+            raise ValueError(f"Rollover inválido: {self.rollover}. Opções: 'sheet' ou 'file'")
+
+    def _new_sheet(self):
+        self._close_sheet()
+
+        if self._zip is None or self.rollover == "file":
+            path = Path(self.file_path)
+            next_file = (
+                str(path.with_name(f"{path.stem}_{len(self.files) + 1}{path.suffix}"))
+                if self.files
+                else self.file_path
+            )
+            self._close_file(next_file=next_file)
+            self.files.append(next_file)
+            self._zip = zipfile.ZipFile(
+                self.files[-1],
+                "w",
+                compression=zipfile.ZIP_DEFLATED,
+                compresslevel=EXCEL_COMPRESS_LEVEL,
+                allowZip64=True,
+            )
+            self._sheets = 0
+
+        self._sheets += 1
+        self._stream = self._zip.open(
+            f"xl/worksheets/sheet{self._sheets}.xml", "w", force_zip64=True
+        )
+        self._stream.write(_XLSX_SHEET_START.encode("utf-8"))
+        self._sheet_rows = 0
+
+        # Cabeçalho
+        self._write_rows(pd.DataFrame([self._columns], columns=self._columns, dtype=object))
+
+    def _close_sheet(self):
+        if self._stream is not None:
+            self._stream.write(_XLSX_SHEET_END.encode("utf-8"))
+            self._stream.close()
+            self._stream = None
+
+    def _close_file(self, next_file: Optional[str] = None):
+        """
+        Grava as partes fixas do pacote (workbook, relacionamentos e estilos) e fecha o arquivo.
+
+        Com mais de uma planilha ou um próximo arquivo, a continuação é registrada nos nomes
+        definidos da pasta de trabalho (ver get_excel_rollover), lidos pelo load_data_auto.
+
+        :param next_file: Caminho do próximo arquivo (rollover='file'), se houver.
+        """
+        if self._zip is None:
+            return
+
+        sheets = range(1, self._sheets + 1)
+        defined_names = []
+        if self._sheets > 1:
+            defined_names.append(f'<definedName name="{EXCEL_ROLLOVER_SHEETS}">{self._sheets}</definedName>')
+        if next_file:
+            name = _escape_xml_text(f'"{Path(next_file).name}"')
+            defined_names.append(f'<definedName name="{EXCEL_ROLLOVER_NEXT}">{name}</definedName>')
+        self._zip.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in sheets
+            )
+            + "</Types>",
+        )
+        self._zip.writestr("_rels/.rels", _XLSX_RELS)
+        self._zip.writestr(
+            "xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(
+                f'<sheet name="{_escape_xml_text(_rollover_sheet_name(self.sheet_name, i))}" sheetId="{i}" r:id="rId{i}"/>'
+                for i in sheets
+            )
+            + "</sheets>"
+            + (f"<definedNames>{''.join(defined_names)}</definedNames>" if defined_names else "")
+            + "</workbook>",
+        )
+        self._zip.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/'
+                f'2006/relationships/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in sheets
+            )
+            + f'<Relationship Id="rId{self._sheets + 1}" Type="http://schemas.openxmlformats.org/'
+            'officeDocument/2006/relationships/styles" Target="styles.xml"/></Relationships>',
+        )
+        self._zip.writestr("xl/styles.xml", _XLSX_STYLES)
+        self._zip.close()
+        self._zip = None
+
+    def _write_rows(self, dataframe: pd.DataFrame):
+        """
+        Gera o XML das linhas de forma vetorizada (coluna a coluna) e o grava na planilha atual.
+
+        :param dataframe: Linhas a serem gravadas (cabeçalho incluso, quando for o caso).
+        """
+        rows = np.arange(self._sheet_rows + 1, self._sheet_rows + len(dataframe) + 1).astype(str)
+        rows = rows.tolist()
+
+        parts = [[f'<row r="{row}">' for row in rows]]
+        for position, column in enumerate(dataframe.columns):
+            letter = _excel_column_letter(position)
+            values = dataframe[column]
+
+            if pd.api.types.is_bool_dtype(values):
+                missing = values.isna().to_numpy()
+                text = values.fillna(False).to_numpy(dtype=int).astype(str).tolist()
+                cells = [f'<c r="{letter}{row}" t="b"><v>{v}</v></c>' for row, v in zip(rows, text)]
+            elif pd.api.types.is_numeric_dtype(values):
+                numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                missing = ~np.isfinite(numbers)
+                if pd.api.types.is_integer_dtype(values):
+                    text = list(map(str, values.tolist()))
+                else:
+                    text = list(map(repr, numbers.tolist()))
+                cells = [f'<c r="{letter}{row}"><v>{v}</v></c>' for row, v in zip(rows, text)]
+            else:
+                missing = values.isna().to_numpy()
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    # Cada categoria é convertida uma única vez
+                    categories = _escape_xml(values.cat.categories.astype(str).to_series())
+                    text = np.append(categories.to_numpy(dtype=object), "")
+                    text = text[values.cat.codes.to_numpy()].tolist()
+                else:
+                    text = _escape_xml(values.astype(object).astype(str)).tolist()
+                cells = [
+                    f'<c r="{letter}{row}" t="inlineStr"><is><t xml:space="preserve">{v}</t></is></c>'
+                    for row, v in zip(rows, text)
+                ]
+
+            for i in np.flatnonzero(missing):
+                cells[i] = ""
+            parts.append(cells)
+        parts.append(["</row>"] * len(dataframe))
+
+        self._stream.write("".join(chain.from_iterable(zip(*parts))).encode("utf-8"))
+        self._sheet_rows += len(dataframe)
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        """
+        Grava um bloco do resultado, trocando de planilha (ou arquivo) ao atingir o limite de linhas.
+
+        :param dataframe: Bloco a ser gravado.
+        """
+        if self._columns is None:
+            self._columns = [str(column) for column in dataframe.columns]
+
+        start = 0
+        while start < len(dataframe):
+            # O limite considera a linha do cabeçalho de cada planilha
+            if self._stream is None or self._sheet_rows == self.max_rows + 1:
+                self._new_sheet()
+
+            count = min(len(dataframe) - start, self.max_rows + 1 - self._sheet_rows)
+            self._write_rows(dataframe.iloc[start : start + count])
+            self.rows_written += count
+            start += count
+
+    def close(self) -> None:
+        """
+        Finaliza os arquivos de destino.
+        """
+        if self._columns is not None and self._zip is None:
+            self._new_sheet()
+        self._close_sheet()
+        self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class DataChunkWriter:
+    """
+    Escreve um DataFrame em um arquivo (CSV, Parquet ou Excel) bloco a bloco.
+
+    Cada bloco é gravado assim que recebido, de forma que a memória utilizada
+    é limitada pelo tamanho do bloco e não pelo tamanho total do resultado.
+
+    Attributes:
+        file_path (str): Caminho completo para o arquivo de destino.
+        rows_written (int): Quantidade de linhas já gravadas.
+    """
+
+    def __init__(self, file_path: str, **excel_kwargs):
+        """
+        Inicializa o escritor, criando o diretório de destino se não existir.
+
+        :param file_path: Caminho completo para o arquivo de destino.
+        :param excel_kwargs: Argumentos do ExcelChunkWriter (max_rows, rollover) para arquivos xlsx.
+        """
+        self.file_path = str(file_path)
+        self.file_extension = Path(file_path).suffix.lower().strip(".")
+        self.rows_written = 0
+        self._writer = None
+        self._schema = None
+
+        if self.file_extension not in ["csv", "parquet", "xlsx"]:
+            raise ValueError(
+                f"Unsupported file format for chunked writing: {self.file_extension}"
+            )
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+
+        if self.file_extension == "xlsx":
+            self._writer = ExcelChunkWriter(self.file_path, **excel_kwargs)
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        """
+        Grava um bloco do resultado no arquivo de destino.
+
+        :param dataframe: Bloco a ser gravado.
+        """
+        if self.file_extension == "csv":
+            dataframe.to_csv(
+                self.file_path,
+                index=False,
+                mode="w" if self.rows_written == 0 else "a",
+                header=self.rows_written == 0,
+            )
+        elif self.file_extension == "xlsx":
+            self._writer.write(dataframe)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(
+                dataframe, schema=self._schema, preserve_index=False
+            )
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self.file_path, self._schema)
+            self._writer.write_table(table)
+
+        self.rows_written += len(dataframe)
+
+    def close(self) -> None:
+        """
+        Finaliza o arquivo de destino.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        logger.info(
+            f"DataFrame salvo com sucesso em {self.file_path} ({self.rows_written} linhas)"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def find_data_file(file_path: str, extensions: list) -> Path:
+    """
+    Localiza a versão de um arquivo de dados em uma das extensões informadas.
+
+    :param file_path: Caminho do arquivo de dados (a extensão é ignorada).
+    :param extensions: Extensões aceitas, em ordem de preferência (ex.: [".parquet", ".csv"]).
+    :return: Caminho do primeiro arquivo existente.
+    """
+    for extension in extensions:
+        candidate = Path(file_path).with_suffix(extension)
+        if candidate.exists():
+            return candidate
 
-    logger.info(f"DataFrame salvo com sucesso em {file_path}")
+    raise FileNotFoundError(
+        f"Nenhum arquivo {Path(file_path).stem} encontrado com as extensões {extensions}"
+    )
@@ -0,0 +1,269 @@
+"""
+Módulo de Instrumentação das Etapas do Cálculo de Score
+
+Mede, para cada etapa instrumentada (leitura, alinhamento, ponderação, faróis, gravação, ...), o tempo
+de relógio, o tempo de CPU, as linhas de entrada e de saída e o pico e a variação da memória residente
+(RSS). Cada medição é emitida como uma linha JSON pelo loguru e, opcionalmente, a etapa mais lenta é
+perfilada com o cProfile.
+
+A instrumentação é habilitada pela flag --profile das CLIs ou pela API:
+
+    with profiling(dump_path="score.prof") as profiler:
+        ScorePilarPerformance(details_list)
+    print(profiler.stages)
+
+Com a instrumentação desabilitada (padrão), profile_stage retorna um contexto vazio compartilhado:
+o custo é o de uma chamada de função por etapa.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import cProfile
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Union
+
+from loguru import logger
+from pydantic import BaseModel
+
+from src.utils.memory_functions import PeakRSSMonitor, get_current_rss
+
+# Conversão de bytes para megabytes
+BYTES_PER_MB = 1024 * 1024
+
+
+class StageProfile(BaseModel):
+    """
+    Medição de uma etapa instrumentada.
+
+    Attributes:
+        stage (str): Nome da etapa (ex.: 'align_scores').
+        parent (str, optional): Etapa que contém esta etapa.
+        wall_seconds (float): Tempo de relógio, em segundos.
+        cpu_seconds (float): Tempo de CPU do processo durante a etapa, em segundos.
+        rows_in (int, optional): Linhas de entrada da etapa.
+        rows_out (int, optional): Linhas de saída da etapa.
+        peak_rss_mb (float, optional): Pico de memória residente durante a etapa, em MB.
+        peak_rss_delta_mb (float, optional): Acréscimo do pico em relação ao início da etapa, em MB.
+        rss_delta_mb (float, optional): Variação da memória residente do início ao fim da etapa, em MB.
+    """
+
+    stage: str
+    parent: Optional[str] = None
+    wall_seconds: float
+    cpu_seconds: float
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    peak_rss_mb: Optional[float] = None
+    peak_rss_delta_mb: Optional[float] = None
+    rss_delta_mb: Optional[float] = None
+
+
+def _to_mb(value: Optional[int]) -> Optional[float]:
+    return None if value is None else round(value / BYTES_PER_MB, 2)
+
+
+class StageRecord:
+    """
+    Etapa em execução: permite informar as linhas de saída dentro do bloco.
+
+    Attributes:
+        rows_in (int, optional): Linhas de entrada da etapa.
+        rows_out (int, optional): Linhas de saída da etapa.
+    """
+
+    __slots__ = ("rows_in", "rows_out")
+
+    def __init__(self, rows_in: Optional[int] = None):
+        self.rows_in = rows_in
+        self.rows_out = None
+
+
+class _NullStage:
+    """
+    Contexto vazio das etapas com a instrumentação desabilitada.
+    """
+
+    __slots__ = ()
+
+    rows_in = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        # As linhas de saída informadas pelas etapas são descartadas
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Profiler:
+    """
+    Coleta as medições das etapas instrumentadas.
+
+    Attributes:
+        dump_path (Path, optional): Arquivo do cProfile da etapa mais lenta (pstats).
+        stages (list): Medições das etapas concluídas (StageProfile), na ordem de conclusão.
+    """
+
+    def __init__(self, dump_path: Optional[Union[str, Path]] = None):
+        """
+        Inicializa o coletor.
+
+        :param dump_path: Se informado, cada etapa de primeiro nível é perfilada com o cProfile
+            e as estatísticas da mais lenta são gravadas neste arquivo (ver dump).
+        """
+        self.dump_path = Path(dump_path) if dump_path else None
+        self.stages: List[StageProfile] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._hot_stage = None
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None):
+        """
+        Mede uma etapa.
+
+        :param name: Nome da etapa.
+        :param rows_in: Linhas de entrada da etapa.
+        :return: Contexto que fornece o StageRecord da etapa (para informar rows_out).
+        """
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        record = StageRecord(rows_in)
+
+        # O cProfile é aplicado às etapas de primeiro nível da thread principal (um perfilador por vez)
+        profile = None
+        if self.dump_path is not None and parent is None and threading.current_thread() is threading.main_thread():
+            profile = cProfile.Profile()
+
+        stack.append(name)
+        try:
+            with PeakRSSMonitor() as monitor:
+                start_wall, start_cpu = time.perf_counter(), time.process_time()
+                if profile is not None:
+                    profile.enable()
+                try:
+                    yield record
+                finally:
+                    if profile is not None:
+                        profile.disable()
+                    wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+            end_rss = get_current_rss()
+        finally:
+            stack.pop()
+
+        result = StageProfile(
+            stage=name,
+            parent=parent,
+            wall_seconds=round(wall, 6),
+            cpu_seconds=round(cpu, 6),
+            rows_in=record.rows_in,
+            rows_out=record.rows_out,
+            peak_rss_mb=_to_mb(monitor.peak_rss),
+            peak_rss_delta_mb=_to_mb(monitor.peak_rss_delta),
+            rss_delta_mb=(
+                None
+                if end_rss is None or monitor.start_rss is None
+                else round((end_rss - monitor.start_rss) / BYTES_PER_MB, 2)
+            ),
+        )
+
+        with self._lock:
+            self.stages.append(result)
+            if profile is not None and (self._hot_stage is None or wall > self._hot_stage[0]):
+                self._hot_stage = (wall, name, profile)
+
+        logger.bind(profile=result.model_dump()).info(json.dumps(result.model_dump()))
+
+    def dump(self) -> Optional[Path]:
+        """
+        Grava as estatísticas do cProfile da etapa mais lenta em dump_path.
+
+        :return: Caminho do arquivo gravado, ou None se nenhuma etapa foi perfilada.
+        """
+        if self._hot_stage is None:
+            return None
+
+        _, name, profile = self._hot_stage
+        self.dump_path.parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(self.dump_path))
+        logger.info(f"cProfile da etapa {name} gravado em {self.dump_path}")
+        return self.dump_path
+
+
+# Coletor ativo (None: instrumentação desabilitada)
+_active_profiler: Optional[Profiler] = None
+
+
+def profile_stage(name: str, rows_in: Optional[int] = None):
+    """
+    Mede uma etapa com o coletor ativo; sem coletor ativo, retorna um contexto vazio.
+
+    Exemplo:
+        with profile_stage("align_scores", rows_in=len(df)) as stage:
+            df_out = alinhar(df)
+            stage.rows_out = len(df_out)
+
+    :param name: Nome da etapa.
+    :param rows_in: Linhas de entrada da etapa.
+    :return: Contexto que fornece o registro da etapa.
+    """
+    if _active_profiler is None:
+        return _NULL_STAGE
+    return _active_profiler.stage(name, rows_in=rows_in)
+
+
+def get_profiler() -> Optional[Profiler]:
+    """
+    Obtém o coletor ativo.
+
+    :return: O coletor ativo ou None se a instrumentação estiver desabilitada.
+    """
+    return _active_profiler
+
+
+@contextmanager
+def profiling(dump_path: Optional[Union[str, Path]] = None, output_path: Optional[Union[str, Path]] = None):
+    """
+    Habilita a instrumentação das etapas durante o bloco.
+
+    :param dump_path: Arquivo do cProfile da etapa mais lenta (ex.: 'score.prof', lido com pstats ou snakeviz).
+    :param output_path: Arquivo em que as medições são gravadas como linhas JSON, além do log.
+    :return: Contexto que fornece o Profiler com as medições.
+    """
+    global _active_profiler
+
+    previous = _active_profiler
+    profiler = Profiler(dump_path=dump_path)
+    sink_id = None
+    if output_path is not None:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        sink_id = logger.add(
+            str(output_path), format="{message}", filter=lambda record: "profile" in record["extra"]
+        )
+
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous
+        if sink_id is not None:
+            logger.remove(sink_id)
+        if dump_path is not None:
+            profiler.dump()
@@ -0,0 +1,178 @@
+"""
+Módulo do Esquema Compacto dos Resultados de Score
+
+Os resultados de score pilar e score global repetem, em cada linha, o peso constante de cada
+categoria (<CAT>_PESO), e mantêm as colunas chave em inteiros de 64 bits. O esquema compacto
+remove as colunas de peso (os pesos são mantidos nos metadados do DataFrame e do arquivo),
+armazena os faróis como categorias, reduz as colunas chave ao menor tipo inteiro que comporta os
+valores e, opcionalmente, armazena os scores em float32. A expansão restaura o layout original.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import json
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.utils.farol_functions import CATEGORIAS_FAROL
+
+# Chave dos metadados do esquema compacto (DataFrame.attrs e metadados do Parquet)
+SCHEMA_METADATA_KEY = "score_schema"
+
+# Colunas chave reduzidas ao menor tipo inteiro
+KEY_COLUMNS = ["CD_PONTO", "DIA", "MES", "ANO"]
+
+
+def is_farol_column(column: str) -> bool:
+    return column.endswith("_FAROL") or column.startswith("FAROL_")
+
+
+def is_score_column(column: str) -> bool:
+    return column.endswith("_SCORE") or column.startswith("SCORE_")
+
+
+def get_schema(dataframe: pd.DataFrame) -> Optional[dict]:
+    """
+    Obtém os metadados do esquema compacto de um DataFrame.
+
+    :param dataframe: DataFrame de scores.
+    :return: Metadados do esquema (pesos e tipos originais) ou None se o DataFrame não for compacto.
+    """
+    return dataframe.attrs.get(SCHEMA_METADATA_KEY)
+
+
+def get_schema_path(file_path: Union[str, Path]) -> Path:
+    """
+    Obtém o caminho do arquivo de metadados dos formatos sem metadados próprios (CSV e Excel).
+
+    O nome inclui a extensão do arquivo de dados: arquivos de mesmo nome em formatos diferentes
+    (ex.: BASE_SCORE_GLOBAL.csv e BASE_SCORE_GLOBAL.xlsx) têm metadados independentes.
+
+    :param file_path: Caminho do arquivo de dados.
+    :return: Caminho do arquivo de metadados (ex.: BASE_SCORE_GLOBAL.xlsx.schema.json).
+    """
+    file_path = Path(file_path)
+    return file_path.with_name(f"{file_path.name}.schema.json")
+
+
+def compact_dataframe(dataframe: pd.DataFrame, float32: bool = False) -> pd.DataFrame:
+    """
+    Converte um resultado de score para o esquema compacto.
+
+    As colunas <CAT>_PESO constantes (peso da categoria nas linhas em que o score está presente)
+    são removidas e os pesos são mantidos nos metadados (DataFrame.attrs). As colunas de peso
+    variáveis são mantidas.
+
+    :param dataframe: DataFrame no formato das calculadoras.
+    :param float32: Se True, armazena os scores em float32 (precisão de ~7 dígitos).
+    :return: DataFrame no esquema compacto.
+    """
+    if get_schema(dataframe) is not None:
+        return dataframe
+
+    schema = {
+        "weights": {},
+        "dtypes": {column: str(dtype) for column, dtype in dataframe.dtypes.items()},
+    }
+    columns = {}
+
+    for column in dataframe.columns:
+        values = dataframe[column]
+
+        # Peso constante da categoria: mantido apenas nos metadados
+        if column.endswith("_PESO") and f"{column[:-5]}_SCORE" in dataframe.columns:
+            weights = values.dropna().unique()
+            present = dataframe[f"{column[:-5]}_SCORE"].notna()
+            if len(weights) <= 1 and values.notna().equals(present):
+                schema["weights"][column[:-5]] = float(weights[0]) if len(weights) else None
+                continue
+
+        if is_farol_column(column):
+            if values.dropna().isin(CATEGORIAS_FAROL).all():
+                values = pd.Categorical(values, categories=CATEGORIAS_FAROL, ordered=True)
+            else:
+                values = values.astype("category")
+        elif column in KEY_COLUMNS and pd.api.types.is_integer_dtype(values):
+            values = pd.to_numeric(values, downcast="integer")
+        elif float32 and is_score_column(column) and pd.api.types.is_float_dtype(values):
+            values = values.astype(np.float32)
+
+        columns[column] = values
+
+    df_compact = pd.DataFrame(columns, index=dataframe.index)
+    df_compact.attrs[SCHEMA_METADATA_KEY] = schema
+
+    return df_compact
+
+
+def expand_dataframe(dataframe: pd.DataFrame, schema: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Restaura o layout original de um resultado de score no esquema compacto.
+
+    As colunas de peso são recriadas ao lado do score da categoria (com o peso nas linhas em que
+    o score está presente) e as colunas chave e de score voltam aos tipos originais.
+
+    :param dataframe: DataFrame no esquema compacto (ou com colunas selecionadas dele).
+    :param schema: Metadados do esquema. Default: obtidos de DataFrame.attrs.
+    :return: DataFrame no formato das calculadoras (o próprio DataFrame, se não for compacto).
+    """
+    schema = schema or get_schema(dataframe)
+    if schema is None:
+        return dataframe
+
+    columns = {}
+    for column in dataframe.columns:
+        values = dataframe[column]
+        dtype = schema["dtypes"].get(column)
+
+        if dtype and (column in KEY_COLUMNS or is_score_column(column)) and str(values.dtype) != dtype:
+            values = values.astype(dtype)
+        columns[column] = values
+
+        # Peso da categoria, logo após o seu score
+        category = column[:-6] if column.endswith("_SCORE") else None
+        if category in schema["weights"]:
+            weight = schema["weights"][category]
+            columns[f"{category}_PESO"] = np.where(
+                values.notna(), np.nan if weight is None else weight, np.nan
+            )
+
+    return pd.DataFrame(columns, index=dataframe.index)
+
+
+def save_schema(schema: dict, file_path: Union[str, Path]) -> None:
+    """
+    Grava os metadados do esquema compacto ao lado de um arquivo CSV ou Excel.
+
+    :param schema: Metadados do esquema.
+    :param file_path: Caminho do arquivo de dados.
+    """
+    get_schema_path(file_path).write_text(json.dumps(schema), encoding="utf-8")
+
+
+def load_schema(file_path: Union[str, Path]) -> Optional[dict]:
+    """
+    Carrega os metadados do esquema compacto de um arquivo de dados.
+
+    Arquivos Parquet armazenam os metadados no próprio arquivo; os demais formatos, no arquivo
+    de metadados ao lado do arquivo de dados (ver get_schema_path).
+
+    :param file_path: Caminho do arquivo de dados.
+    :return: Metadados do esquema ou None se o arquivo não for compacto.
+    """
+    if Path(file_path).suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        metadata = pq.read_schema(file_path).metadata or {}
+        schema = metadata.get(SCHEMA_METADATA_KEY.encode())
+        return json.loads(schema) if schema else None
+
+    schema_path = get_schema_path(file_path)
+    if schema_path.exists():
+        return json.loads(schema_path.read_text(encoding="utf-8"))
+    return None
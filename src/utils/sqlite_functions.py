@@ -0,0 +1,362 @@
+"""
+Módulo de Persistência dos Scores em SQLite
+
+Este módulo grava os scores de tema, pilar e score global em tabelas indexadas do banco SQLite
+(data/db/sql/DB_SCORE_AGENCIAS.db), no formato longo: uma linha por agência, período e categoria.
+A gravação é feita em lote, em uma única transação, com upserts preparados e o banco em modo WAL.
+A leitura do histórico de uma agência ou dos resultados de um período utiliza os índices das tabelas.
+
+Autor: Emerson V. Rafael (emervin)
+Versão: 1.0.0
+Data de Atualização: 26/09/2024
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from config_project.config_app import settings
+
+# Extensões de arquivo tratadas como banco SQLite
+SQLITE_EXTENSIONS = [".db", ".sqlite"]
+
+# Tabela de cada nível de score
+SCORE_TABLES = {
+    "TEMA": "TBL_SCORE_TEMA",
+    "PILAR": "TBL_SCORE_PILAR",
+    "GLOBAL": "TBL_SCORE_GLOBAL",
+}
+
+# Nível das categorias que compõem cada nível de score (ex.: os temas compõem o pilar)
+COMPONENT_LEVELS = {"PILAR": "TEMA", "GLOBAL": "PILAR"}
+
+# Colunas das tabelas de score, na ordem de gravação
+SCORE_COLUMNS = ["CD_PONTO", "ANO", "MES", "DIA", "CATEGORIA", "SCORE", "PESO", "FAROL"]
+
+# Tabela, coluna do nome e coluna do status do cadastro de cada nível da hierarquia
+STATUS_TABLES = {
+    "PILAR": ("TBL_PILARES", "NOME_PILAR", "STATUS_PILAR"),
+    "TEMA": ("TBL_TEMAS", "NOME_TEMA", "STATUS_TEMA"),
+}
+
+# Quantidade de linhas enviadas por chamada ao executemany
+BATCH_SIZE = 100_000
+
+
+def get_default_db_path() -> Path:
+    """
+    Obtém o caminho padrão do banco de scores, definido em DATABASE.SQLITE_PATH do settings.
+
+    :return: Caminho do banco SQLite.
+    """
+    return Path(
+        Path(__file__).absolute().parents[2],
+        settings.get("DATABASE.SQLITE_PATH", "data/db/sql/DB_SCORE_AGENCIAS.db"),
+    )
+
+
+class SQLiteScoreStore:
+    """
+    Repositório dos scores em SQLite.
+
+    Exemplo:
+        with SQLiteScoreStore("data/db/sql/DB_SCORE_AGENCIAS.db") as store:
+            store.save_result(df_score_global, level="GLOBAL")
+            df_historico = store.get_agency_history(1001, level="GLOBAL")
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        """
+        Abre (ou cria) o banco, habilitando o modo WAL e criando as tabelas de score.
+
+        :param db_path: Caminho do banco SQLite. Default: get_default_db_path().
+        """
+        self.db_path = Path(db_path or get_default_db_path())
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA temp_store=MEMORY")
+        self.create_tables()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Fecha a conexão com o banco.
+        """
+        self.connection.close()
+
+    def create_tables(self):
+        """
+        Cria as tabelas de score e os índices, caso não existam.
+
+        A chave primária (CD_PONTO, ANO, MES, DIA, CATEGORIA) atende à consulta do histórico de uma
+        agência e o índice (ANO, MES, DIA, CATEGORIA) atende à consulta dos resultados de um período.
+        """
+        with self.connection:
+            for table in SCORE_TABLES.values():
+                self.connection.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        CD_PONTO INTEGER NOT NULL,
+                        ANO INTEGER NOT NULL,
+                        MES INTEGER NOT NULL,
+                        DIA INTEGER NOT NULL,
+                        CATEGORIA TEXT NOT NULL,
+                        SCORE REAL,
+                        PESO REAL,
+                        FAROL TEXT,
+                        PRIMARY KEY (CD_PONTO, ANO, MES, DIA, CATEGORIA)
+                    ) WITHOUT ROWID
+                    """
+                )
+                self._create_period_index(table)
+
+    def _create_period_index(self, table):
+        self.connection.execute(
+            f"CREATE INDEX IF NOT EXISTS IDX_{table}_PERIODO ON {table} (ANO, MES, DIA, CATEGORIA)"
+        )
+
+    @staticmethod
+    def _iter_batches(dataframe: pd.DataFrame):
+        """
+        Converte o DataFrame, em lotes de BATCH_SIZE linhas, nas tuplas de parâmetros do upsert.
+
+        :param dataframe: DataFrame com as colunas de SCORE_COLUMNS (PESO e FAROL são opcionais).
+        :return: Iterador de listas de tuplas.
+        """
+        for start in range(0, len(dataframe), BATCH_SIZE):
+            batch = dataframe.iloc[start : start + BATCH_SIZE]
+
+            columns = []
+            for column in SCORE_COLUMNS:
+                if column not in batch.columns:
+                    columns.append([None] * len(batch))
+                elif column in ["CD_PONTO", "ANO", "MES", "DIA"]:
+                    columns.append(batch[column].to_numpy(dtype=np.int64).tolist())
+                elif column in ["SCORE", "PESO"]:
+                    values = batch[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                    columns.append(np.where(np.isnan(values), None, values).tolist())
+                else:
+                    values = batch[column].astype(object)
+                    columns.append(values.where(values.notna(), None).tolist())
+
+            yield list(zip(*columns))
+
+    def upsert_scores(self, dataframe: pd.DataFrame, level: str) -> int:
+        """
+        Grava, em lote e em uma única transação, os scores no formato longo de um nível.
+
+        As linhas já existentes (mesma agência, período e categoria) são atualizadas. Na carga de
+        uma tabela vazia, o índice do período é criado após a inserção, em uma única ordenação.
+
+        :param dataframe: DataFrame com as colunas de SCORE_COLUMNS (PESO e FAROL são opcionais).
+        :param level: Nível do score ('TEMA', 'PILAR' ou 'GLOBAL').
+        :return: Quantidade de linhas gravadas.
+        """
+        table = SCORE_TABLES[level]
+        sql = (
+            f"INSERT INTO {table} ({', '.join(SCORE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(SCORE_COLUMNS))}) "
+            "ON CONFLICT (CD_PONTO, ANO, MES, DIA, CATEGORIA) DO UPDATE SET "
+            "SCORE = excluded.SCORE, PESO = excluded.PESO, FAROL = excluded.FAROL"
+        )
+
+        # Inserção ordenada pela chave primária
+        dataframe = dataframe.sort_values(["CD_PONTO", "ANO", "MES", "DIA", "CATEGORIA"])
+        empty = self.connection.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None
+
+        with self.connection:
+            if empty:
+                self.connection.execute(f"DROP INDEX IF EXISTS IDX_{table}_PERIODO")
+
+            for rows in self._iter_batches(dataframe):
+                self.connection.executemany(sql, rows)
+
+            if empty:
+                self._create_period_index(table)
+
+        return len(dataframe)
+
+    def save_result(
+        self,
+        dataframe: pd.DataFrame,
+        level: str,
+        category: Optional[str] = None,
+        score_column: Optional[str] = None,
+        farol_column: Optional[str] = None,
+    ) -> int:
+        """
+        Grava um resultado de score (formato das calculadoras) no banco.
+
+        O score agregado é gravado na tabela do nível e os scores das categorias que o compõem
+        (colunas <CATEGORIA>_SCORE, <CATEGORIA>_PESO e <CATEGORIA>_FAROL) na tabela do nível
+        inferior (ex.: os temas de um resultado de pilar em TBL_SCORE_TEMA).
+
+        :param dataframe: DataFrame com CD_PONTO, DIA, MES, ANO e as colunas de score.
+        :param level: Nível do resultado ('TEMA', 'PILAR' ou 'GLOBAL').
+        :param category: Categoria do score agregado (ex.: 'PERFORMANCE'). Obrigatória no nível
+                         'TEMA'; nos demais níveis, o default é o nível.
+        :param score_column: Coluna do score agregado. Default: 'SCORE_<NÍVEL>'.
+        :param farol_column: Coluna do farol agregado. Default: 'FAROL_<NÍVEL>'.
+        :return: Quantidade de linhas gravadas.
+        :raises ValueError: Se o nível for inválido ou se a categoria de um tema não for informada.
+        """
+        if level not in SCORE_TABLES:
+            raise ValueError(f"Nível de score inválido: {level}. Níveis: {list(SCORE_TABLES)}")
+        if level == "TEMA" and not category:
+            # Temas distintos gravados com a mesma categoria se sobrescreveriam no upsert
+            raise ValueError("Informe a categoria (nome do tema) para gravar um score de tema.")
+
+        category = category or level
+        score_column = score_column or f"SCORE_{level}"
+        farol_column = farol_column or f"FAROL_{level}"
+        keys = dataframe[["CD_PONTO", "ANO", "MES", "DIA"]]
+
+        rows = self.upsert_scores(
+            keys.assign(
+                CATEGORIA=category,
+                SCORE=dataframe[score_column],
+                FAROL=dataframe.get(farol_column),
+            ),
+            level=level,
+        )
+
+        component_level = COMPONENT_LEVELS.get(level)
+        components = [
+            column[: -len("_SCORE")]
+            for column in dataframe.columns
+            if column.endswith("_SCORE") and f"{column[: -len('_SCORE')]}_PESO" in dataframe.columns
+        ]
+        if component_level and components:
+            df_components = pd.concat(
+                [
+                    keys.assign(
+                        CATEGORIA=component,
+                        SCORE=dataframe[f"{component}_SCORE"],
+                        PESO=dataframe[f"{component}_PESO"],
+                        FAROL=dataframe.get(f"{component}_FAROL"),
+                    ).dropna(subset=["SCORE"])
+                    for component in components
+                ],
+                ignore_index=True,
+            )
+            rows += self.upsert_scores(df_components, level=component_level)
+
+        logger.info(f"{rows} scores gravados com sucesso em {self.db_path}")
+        return rows
+
+    def _query(self, level: str, where: str, params: list, category: Optional[str]):
+        sql = f"SELECT {', '.join(SCORE_COLUMNS)} FROM {SCORE_TABLES[level]} WHERE {where}"
+        if category is not None:
+            sql += " AND CATEGORIA = ?"
+            params = [*params, category]
+        sql += " ORDER BY CD_PONTO, ANO, MES, DIA, CATEGORIA"
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def get_agency_history(
+        self, cd_ponto: int, level: str, category: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Obtém o histórico de scores de uma agência, pela chave primária.
+
+        :param cd_ponto: Código da agência.
+        :param level: Nível do score ('TEMA', 'PILAR' ou 'GLOBAL').
+        :param category: Categoria (opcional).
+        :return: DataFrame com os scores da agência, ordenado por período.
+        """
+        return self._query(level, "CD_PONTO = ?", [int(cd_ponto)], category)
+
+    def get_period(
+        self, ano: int, mes: int, dia: int, level: str, category: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Obtém os scores de todas as agências em um período, pelo índice do período.
+
+        :param ano: Ano do período.
+        :param mes: Mês do período.
+        :param dia: Dia do período.
+        :param level: Nível do score ('TEMA', 'PILAR' ou 'GLOBAL').
+        :param category: Categoria (opcional).
+        :return: DataFrame com os scores do período, ordenado por agência.
+        """
+        return self._query(
+            level, "ANO = ? AND MES = ? AND DIA = ?", [int(ano), int(mes), int(dia)], category
+        )
+
+
+def get_score_level(dataframe: pd.DataFrame) -> str:
+    """
+    Identifica o nível de um resultado de score pela coluna do score agregado (ex.: SCORE_PILAR).
+
+    :param dataframe: DataFrame do resultado.
+    :return: Nível do score ('TEMA', 'PILAR' ou 'GLOBAL').
+    """
+    for level in ["GLOBAL", "PILAR", "TEMA"]:
+        if f"SCORE_{level}" in dataframe.columns:
+            return level
+    raise ValueError("O DataFrame não possui uma coluna SCORE_TEMA, SCORE_PILAR ou SCORE_GLOBAL.")
+
+
+def save_data_sqlite(
+    dataframe: pd.DataFrame,
+    file_path: Union[str, Path],
+    level: Optional[str] = None,
+    category: Optional[str] = None,
+) -> int:
+    """
+    Grava um resultado de score no banco SQLite informado.
+
+    :param dataframe: DataFrame do resultado.
+    :param file_path: Caminho do banco SQLite.
+    :param level: Nível do score. Default: identificado pela coluna do score agregado.
+    :param category: Categoria do score agregado (ex.: 'PERFORMANCE' ou o nome do tema).
+                     Obrigatória no nível 'TEMA'; nos demais níveis, o default é o nível.
+    :return: Quantidade de linhas gravadas.
+    """
+    with SQLiteScoreStore(file_path) as store:
+        return store.save_result(
+            dataframe, level=level or get_score_level(dataframe), category=category
+        )
+
+
+def load_hierarchy_status(db_path: Optional[Union[str, Path]] = None) -> dict:
+    """
+    Obtém o status (habilitado ou não) dos pilares e temas cadastrados em TBL_PILARES e TBL_TEMAS.
+
+    Os status são gravados como booleanos, inteiros ou textos ('True'/'False'). As tabelas
+    ausentes no banco são ignoradas.
+
+    :param db_path: Caminho do banco SQLite. Default: get_default_db_path().
+    :return: Status de cada pilar e tema, por nível e nome (ex.: {'PILAR': {'ESG': True}}).
+    """
+    db_path = Path(db_path or get_default_db_path())
+    if not db_path.exists():
+        raise FileNotFoundError(f"Banco de scores não encontrado: {db_path}")
+
+    status = {}
+    connection = sqlite3.connect(db_path)
+    try:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        for level, (table, name_column, status_column) in STATUS_TABLES.items():
+            if table not in tables:
+                logger.warning(f"Tabela {table} não encontrada em {db_path}: status de {level} ignorado")
+                continue
+            status[level] = {
+                name: str(value).strip().lower() in ("1", "true")
+                for name, value in connection.execute(f"SELECT {name_column}, {status_column} FROM {table}")
+            }
+    finally:
+        connection.close()
+
+    return status
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.models.models_global.score_global.global_calculator import ScoreGlobalCalculator
+from src.models.models_global.score_global.models import ScoreDetails as ScoreDetailsGlobal
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+from src.utils.arrow_functions import iter_arrow_batches, load_data_arrow, save_data_arrow
+from src.utils.farol_functions import classificar_farol
+from src.utils.pandas_functions import load_data_auto, save_data_auto
+
+
+@pytest.fixture
+def dataframes():
+    rng = np.random.default_rng(22)
+    dataframes = {}
+    for seed, category in enumerate(["AA", "AB", "INFRA_CIVIL"]):
+        df = pd.DataFrame(
+            {
+                "CD_PONTO": np.repeat(np.arange(1, 201), 2),
+                "DIA": 1,
+                "MES": np.tile([9, 10], 200),
+                "ANO": 2024,
+                "SCORE_TEMA": np.round(rng.uniform(0, 10, size=400), 2),
+            }
+        ).sample(frac=0.8, random_state=seed).sort_values(["CD_PONTO", "MES"], ignore_index=True)
+        df.loc[df.index[:5], "SCORE_TEMA"] = np.nan
+        dataframes[category] = df
+    return dataframes
+
+
+def to_arrow(df, chunks=3):
+    # Tabela Arrow em vários blocos, como a lida de um Parquet com vários grupos de linhas
+    bounds = np.linspace(0, len(df), chunks + 1).astype(int)
+    return pa.concat_tables(
+        pa.Table.from_pandas(df.iloc[start:stop], preserve_index=False)
+        for start, stop in zip(bounds[:-1], bounds[1:])
+    )
+
+
+def test_calculo_em_arrow_igual_ao_calculo_em_pandas(dataframes):
+    """
+    Testa se os scores pilar e global calculados a partir de tabelas Arrow, com resultado em Arrow,
+    são iguais aos calculados em pandas (no esquema de pyarrow.Table.from_pandas).
+    """
+    weights = {"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3}
+
+    def pilar(frames, arrow):
+        return ScorePilarPerformance(
+            [
+                ScoreDetails(dataframe=frames[category], score_column="SCORE_TEMA", weight=weight, category=category)
+                for category, weight in weights.items()
+            ],
+            arrow=arrow,
+        ).score_pilar
+
+    df_pilar = pilar(dataframes, arrow=False)
+    table_pilar = pilar({category: to_arrow(df) for category, df in dataframes.items()}, arrow=True)
+
+    assert isinstance(table_pilar, pa.Table)
+    assert table_pilar.equals(pa.Table.from_pandas(df_pilar, preserve_index=False).replace_schema_metadata(None))
+
+    # O score global recebe o farol do pilar em Arrow (dicionário)
+    def score_global(frames, arrow):
+        return ScoreGlobalCalculator(
+            [
+                ScoreDetailsGlobal(
+                    dataframe=frame,
+                    score_column="SCORE_PILAR",
+                    farol_column="FAROL_PILAR",
+                    weight=weight,
+                    category=category,
+                )
+                for category, frame, weight in [("PERFORMANCE", frames[0], 0.8), ("ESG", frames[1], 0.2)]
+            ],
+            arrow=arrow,
+        ).score_global
+
+    df_esg = df_pilar.assign(SCORE_PILAR=10 - df_pilar["SCORE_PILAR"])
+    df_esg["FAROL_PILAR"] = classificar_farol(df_esg["SCORE_PILAR"])
+    df_global = score_global([df_pilar, df_esg], arrow=False)
+    table_global = score_global([table_pilar, pa.Table.from_pandas(df_esg, preserve_index=False)], arrow=True)
+
+    pd.testing.assert_frame_equal(table_global.to_pandas(), df_global)
+
+    with pytest.raises(ValueError):
+        ScorePilarPerformance(
+            [ScoreDetails(dataframe=dataframes["AA"], score_column="SCORE_TEMA", weight=1.0, category="AA")],
+            compact=True,
+            arrow=True,
+        )
+
+
+@pytest.mark.parametrize("extension", [".arrow", ".parquet", ".csv"])
+def test_gravacao_e_leitura_em_arrow(tmp_path, dataframes, extension):
+    """
+    Testa a gravação e a leitura (completa e em blocos) das tabelas Arrow em cada formato.
+    """
+    table = to_arrow(dataframes["AA"])
+    file_path = tmp_path / "resultado" / f"BASE_SCORE{extension}"
+
+    save_data_arrow(table, file_path)
+
+    loaded = load_data_arrow(file_path, columns=["CD_PONTO", "SCORE_TEMA"])
+    assert loaded.column_names == ["CD_PONTO", "SCORE_TEMA"]
+    assert loaded.column("SCORE_TEMA").to_pylist() == table.column("SCORE_TEMA").to_pylist()
+
+    batches = list(iter_arrow_batches(file_path, batch_size=100))
+    assert sum(batch.num_rows for batch in batches) == table.num_rows
+    assert max(batch.num_rows for batch in batches) <= 100
+
+
+def test_feather_mapeado_em_memoria(tmp_path, dataframes):
+    """
+    Testa se o arquivo Feather gravado pelo save_data_auto é lido pelo load_data_auto e mapeado em
+    memória, sem cópia, pelo load_data_arrow.
+    """
+    file_path = tmp_path / "BASE_SCORE_AA.feather"
+    save_data_auto(dataframes["AA"], str(file_path))
+
+    pd.testing.assert_frame_equal(load_data_auto(str(file_path)), dataframes["AA"])
+
+    # As colunas referenciam as páginas do arquivo: nenhuma memória é alocada pelo pyarrow
+    allocated = pa.total_allocated_bytes()
+    table = load_data_arrow(file_path)
+    assert pa.total_allocated_bytes() == allocated
+    assert table.column("CD_PONTO").to_pylist() == dataframes["AA"]["CD_PONTO"].tolist()
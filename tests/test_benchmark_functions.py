@@ -0,0 +1,71 @@
+from benchmarks.benchmark_score import run_scenario
+from src.utils.benchmark_functions import (
+    BenchmarkResult,
+    compare_results,
+    load_results,
+    run_stage,
+    save_results,
+)
+
+
+def test_run_stage_mede_tempo_vazao_e_memoria():
+    """
+    Testa se a execução de uma etapa retorna o resultado da função e as métricas da etapa.
+    """
+    result, output = run_stage("soma", size=1000, rows=1000, function=lambda: sum(range(1000)))
+
+    assert output == sum(range(1000))
+    assert result.status == "ok"
+    assert result.seconds > 0
+    assert result.rows_per_second > 0
+    assert result.peak_rss_mb > 0
+
+
+def test_compare_results_detecta_regressao():
+    """
+    Testa a comparação com a referência, considerando a tolerância de vazão e de memória.
+    """
+    baseline = [
+        BenchmarkResult(stage="score_pilar", size=10, rows=10, rows_per_second=100.0, peak_rss_mb=100.0),
+        BenchmarkResult(stage="score_global", size=10, rows=10, rows_per_second=100.0, peak_rss_mb=100.0),
+        BenchmarkResult(stage="kpi_faixa", size=10, rows=10, rows_per_second=100.0, peak_rss_mb=100.0),
+    ]
+    results = [
+        BenchmarkResult(stage="score_pilar", size=10, rows=10, rows_per_second=95.0, peak_rss_mb=105.0),
+        BenchmarkResult(stage="score_global", size=10, rows=10, rows_per_second=80.0, peak_rss_mb=100.0),
+        BenchmarkResult(stage="kpi_faixa", size=10, rows=10, rows_per_second=100.0, peak_rss_mb=120.0),
+        BenchmarkResult(stage="save_xlsx", size=10, status="skipped"),
+    ]
+
+    comparison = compare_results(results, baseline, tolerance=0.1)
+
+    assert [(item["stage"], item["regression"]) for item in comparison] == [
+        ("score_pilar", False),
+        ("score_global", True),
+        ("kpi_faixa", True),
+    ]
+
+
+def test_run_scenario_salva_e_carrega_resultados(tmp_path):
+    """
+    Testa a execução de um cenário pequeno com todas as etapas e a gravação dos resultados.
+    """
+    results = run_scenario(200, formats=["csv", "parquet"], seed=1)
+
+    assert [result.stage for result in results] == [
+        "kpi_faixa",
+        "kpi_faixa_lookup",
+        "kpi_inflexao",
+        "kpi_indice",
+        "tema_aggregation",
+        "score_pilar",
+        "score_global",
+        "save_csv",
+        "load_csv",
+        "save_parquet",
+        "load_parquet",
+    ]
+    assert all(result.rows == 200 for result in results)
+
+    file_path = save_results(results, tmp_path / "benchmark.json")
+    assert load_results(file_path) == results
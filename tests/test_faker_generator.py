@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.faker.generate_faker_dataframe import (
+    BLOCO_AGENCIAS,
+    FakerConfig,
+    generate_faker_data,
+    generate_tema_dataframe,
+)
+from src.utils.farol_functions import classificar_farol
+
+
+def test_geracao_reprodutivel_e_vetorizada():
+    """
+    Testa a quantidade de linhas (N agências × M períodos), a reprodução pela semente, a
+    independência dos temas e o cálculo dos scores e faróis.
+    """
+    config = FakerConfig(agencias=500, periodos=3, seed=42)
+
+    df = generate_tema_dataframe(config, "AA")
+
+    assert len(df) == 1500
+    assert df["CD_PONTO"].tolist()[:4] == [1, 1, 1, 2]
+    assert list(zip(df["MES"], df["ANO"]))[:3] == [(9, 2024), (10, 2024), (11, 2024)]
+    assert df["VOLUME_OCORRENCIAS"].between(0, 100).all()
+    assert df["MTTR"].between(0, 48).all()
+    pd.testing.assert_frame_equal(df, generate_tema_dataframe(FakerConfig(agencias=500, periodos=3, seed=42), "AA"))
+    assert not df["MTTR"].equals(generate_tema_dataframe(config, "AB")["MTTR"])
+
+    score_tema = 0.2 * df["SCORE_OCORRENCIAS"] + 0.7 * df["SCORE_RECORRENCIA"] + 0.1 * df["SCORE_MTTR"]
+    assert df["SCORE_TEMA"].to_numpy() == pytest.approx(score_tema.to_numpy())
+    assert df["SCORE_MTTR"].to_numpy() == pytest.approx(10 - df["MTTR"].to_numpy() / 48 * 10)
+    assert (df["FAROL_TEMA"] == classificar_farol(df["SCORE_TEMA"])).all()
+
+
+def test_correlacoes_e_ausencias():
+    """
+    Testa a correlação entre os períodos de uma agência e entre os KPIs, e a taxa de ausência por tema.
+    """
+    config = FakerConfig(
+        agencias=20_000,
+        periodos=2,
+        seed=1,
+        correlacao_periodos=0.8,
+        correlacao_kpis=0.9,
+        taxa_ausencia_tema={"ESG": 0.25},
+    )
+
+    df = generate_tema_dataframe(config, "ESG")
+    agencias = df["CD_PONTO"].unique()
+
+    # Uma agência ausente não possui nenhum período
+    assert len(df) == 2 * len(agencias)
+    assert len(agencias) / config.agencias == pytest.approx(0.75, abs=0.02)
+    assert len(generate_tema_dataframe(config, "AA")) == 2 * config.agencias
+
+    agua = df["CONSUMO_AGUA"].to_numpy().reshape(-1, 2)
+    assert np.corrcoef(agua[:, 0], agua[:, 1])[0, 1] == pytest.approx(0.9**2 * 0.8**2, abs=0.03)
+    assert np.corrcoef(df["CONSUMO_AGUA"], df["EMISSAO_FLUIDOS"])[0, 1] == pytest.approx(0.81, abs=0.03)
+
+    independente = generate_tema_dataframe(config.model_copy(update={"correlacao_kpis": 0.0}), "ESG")
+    assert abs(np.corrcoef(independente["CONSUMO_AGUA"], independente["EMISSAO_FLUIDOS"])[0, 1]) < 0.03
+
+
+@pytest.mark.parametrize("formato", ["parquet", "csv"])
+def test_gravacao_em_blocos_igual_a_geracao_em_memoria(tmp_path, formato):
+    """
+    Testa se as bases gravadas bloco a bloco são iguais às geradas em memória, no layout dos temas.
+    """
+    config = FakerConfig(agencias=2 * BLOCO_AGENCIAS + 123, periodos=2, seed=3, taxa_ausencia=0.1)
+
+    paths = generate_faker_data(
+        config, tmp_path, temas=["INFRA_CIVIL", "ESG"], formato=formato, chunk_agencias=BLOCO_AGENCIAS
+    )
+
+    assert paths["ESG"] == tmp_path / "ESG" / "ESG" / f"BASE_SCORE_ESG.{formato}"
+    for tema, path in paths.items():
+        df_file = pd.read_parquet(path) if formato == "parquet" else pd.read_csv(path)
+        df = generate_tema_dataframe(config, tema)
+
+        assert df_file["CD_PONTO"].tolist() == df["CD_PONTO"].tolist()
+        assert df_file["SCORE_TEMA"].to_numpy() == pytest.approx(df["SCORE_TEMA"].to_numpy())
+        assert df_file["FAROL_TEMA"].astype(str).tolist() == df["FAROL_TEMA"].astype(str).tolist()
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.farol_functions import classificar_farol, definir_farol
+
+
+@pytest.mark.parametrize(
+    "score, farol_esperado",
+    [
+        (0.0, "VERMELHO"),
+        (4.0, "VERMELHO"),  # Limite do farol vermelho
+        (4.01, "AMARELO"),
+        (8.0, "AMARELO"),  # Limite do farol amarelo
+        (8.01, "VERDE"),
+        (10.0, "VERDE"),
+        (np.nan, None),  # Score nulo
+    ],
+)
+def test_definir_farol(score, farol_esperado):
+    """
+    Testa a classificação do farol de um único score com os limites do settings.toml.
+
+    Parameters:
+    score (float): O score a ser classificado.
+    farol_esperado (str): O farol esperado.
+    """
+    assert definir_farol(score) == farol_esperado
+
+
+def test_classificar_farol_series_categorica():
+    """
+    Testa se a classificação vetorizada retorna uma pd.Series categórica
+    com o mesmo índice dos scores.
+    """
+    scores = pd.Series([1.0, 5.0, 9.0, np.nan], index=[3, 2, 1, 0])
+
+    farol = classificar_farol(scores)
+
+    assert isinstance(farol.dtype, pd.CategoricalDtype)
+    assert list(farol.cat.categories) == ["VERMELHO", "AMARELO", "VERDE"]
+    assert list(farol.index) == [3, 2, 1, 0]
+    assert farol.iloc[:3].tolist() == ["VERMELHO", "AMARELO", "VERDE"]
+    assert pd.isna(farol.iloc[3])
+
+
+def test_classificar_farol_limites_customizados():
+    """
+    Testa a classificação vetorizada com limites informados explicitamente.
+    """
+    farol = classificar_farol(np.array([2.0, 3.0, 6.0]), limites=(2.0, 5.0))
+
+    assert isinstance(farol, pd.Categorical)
+    assert list(farol) == ["VERMELHO", "AMARELO", "VERDE"]
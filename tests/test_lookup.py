@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_kpi.calculator_score.performance.ab.score_tcx import (
+    Model_Score_TCX_batch,
+)
+from src.models.models_kpi.lookup import LookupScorer, get_lookup_scorer, get_lookup_stats
+from src.models.models_kpi.registry import LookupConfig, get_registry
+
+
+@pytest.mark.parametrize("name", ["TCX", "ATM", "GUIA"])
+def test_grade_igual_ao_calculo_exato(name):
+    """
+    Testa se os scores da grade (e do cálculo exato dos valores fora dela) são idênticos aos do scorer.
+    """
+    rng = np.random.default_rng(7)
+    values = np.r_[
+        np.round(rng.uniform(0, 100, size=5000), 2),
+        rng.integers(0, 10, size=1000),
+        [2.5, 3.333, 99.995, 150.0, -1.0, np.nan],
+    ]
+    lookup = LookupScorer(get_registry()[name])
+
+    scores = lookup.calcular_score_batch(values)
+
+    np.testing.assert_array_equal(scores, get_registry()[name].calcular_score_batch(values))
+    config = get_registry().get_config(name).lookup
+    grid = np.arange(0, 100 * 10**config.casas_decimais + 1) / 10**config.casas_decimais
+    misses = int((~np.isin(values, grid)).sum())
+
+    stats = lookup.get_stats()
+    assert stats.modo == "GRADE"
+    assert stats.lookups == len(values)
+    assert stats.misses == misses >= 4
+    assert stats.hit_rate == pytest.approx((len(values) - misses) / len(values))
+
+
+def test_lru_remove_valores_menos_usados():
+    """
+    Testa a memorização por valor distinto, a remoção dos menos usados e as estatísticas.
+    """
+    scorer = get_registry()["ICA"]
+    lookup = LookupScorer(scorer, config=LookupConfig(modo="LRU", tamanho_maximo=3))
+
+    values = np.array([1.0, 1.0, 1.1, 1.2, 1.3, np.nan])
+    np.testing.assert_array_equal(
+        lookup.calcular_score_batch(values), scorer.calcular_score_batch(values)
+    )
+    stats = lookup.get_stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (0, 6, 1, 3)
+
+    # 1.0 foi removido (menos usado); 1.3 continua memorizado
+    lookup.reset_stats()
+    lookup.calcular_score_batch([1.3, 1.3, 1.0])
+    assert (lookup.get_stats().hits, lookup.get_stats().misses) == (2, 1)
+
+
+def test_lru_calcula_cada_valor_distinto_uma_unica_vez(monkeypatch):
+    """
+    Testa se, com a memória vazia, o cálculo exato recebe apenas os valores distintos (e os não finitos).
+    """
+    scorer = get_registry()["TCX"]
+    lookup = LookupScorer(scorer, config=LookupConfig(modo="LRU"))
+    calls = []
+    exact = lookup._exact
+    monkeypatch.setattr(lookup, "_exact", lambda values: calls.append(len(values)) or exact(values))
+
+    values = np.r_[np.tile(np.arange(10.0), 10_000), [np.nan, np.inf]]
+    np.testing.assert_array_equal(lookup.calcular_score_batch(values), scorer.calcular_score_batch(values))
+    assert calls == [10, 2]
+    assert lookup.get_stats().hits == 0
+
+
+def test_lookup_preserva_indice_e_casas_decimais():
+    """
+    Testa o retorno como Series, o cálculo exato com outras casas decimais e o uso pelo TCX.
+    """
+    series = pd.Series([0, 1, 2, 3, 4, 5], index=list("abcdef"), name="REINICIALIZACOES")
+    lookup = get_lookup_scorer("TCX")
+
+    scores = Model_Score_TCX_batch(series)
+
+    pd.testing.assert_series_equal(scores, get_registry()["TCX"].calcular_score_batch(series))
+    np.testing.assert_array_equal(
+        lookup.calcular_score_batch(series.to_numpy(), casas_decimais=4),
+        get_registry()["TCX"].calcular_score_batch(series.to_numpy(), casas_decimais=4),
+    )
+    assert "TCX" in get_lookup_stats()["kpi"].tolist()
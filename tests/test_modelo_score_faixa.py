@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_kpi.calculator_score.performance.aa.score_atm import (
+    calculadora_score as calculadora_atm,
+)
+from src.models.models_kpi.calculator_score.performance.ab.score_guia import (
+    calculadora_score as calculadora_guia,
+)
+
+
+@pytest.mark.parametrize(
+    "calculadora, model",
+    [
+        (calculadora_atm, "indisponibilidade"),
+        (calculadora_guia, "disponibilidade"),
+    ],
+)
+def test_score_faixa_batch_igual_escalar(calculadora, model):
+    """
+    Testa se o cálculo em lote retorna os mesmos scores do cálculo escalar,
+    inclusive nos limites das faixas e fora delas (None -> NaN).
+
+    Parameters:
+    calculadora (ScorePorFaixa): A calculadora de score por faixa.
+    model (str): O modelo de cálculo ("indisponibilidade" ou "disponibilidade").
+    """
+    entradas = np.concatenate(
+        [np.arange(-1, 101, 0.01), [4.0, 4.005, 8.0, 8.01, 99.5, 99.505, 100.0]]
+    )
+
+    scores = calculadora.calcular_score_batch(entradas, model=model)
+
+    for entrada, score in zip(entradas, scores):
+        score_esperado = calculadora.calcular_score(entrada, model=model)
+        if score_esperado is None:
+            assert np.isnan(score)
+        else:
+            assert score == score_esperado
+
+
+def test_score_faixa_batch_series():
+    """
+    Testa se o cálculo em lote preserva o índice de uma pd.Series
+    e retorna NaN para valores nulos ou entre faixas.
+    """
+    entradas = pd.Series([0.0, 4.005, np.nan, 50.0], index=[10, 20, 30, 40])
+
+    scores = calculadora_atm.calcular_score_batch(entradas)
+
+    assert list(scores.index) == [10, 20, 30, 40]
+    assert scores[10] == 10.0
+    assert np.isnan(scores[20])
+    assert np.isnan(scores[30])
+    assert scores[40] == calculadora_atm.calcular_score(50.0)
+
+
+def test_score_faixa_batch_modelo_invalido():
+    """
+    Testa se um modelo de cálculo inválido gera erro.
+    """
+    with pytest.raises(ValueError):
+        calculadora_atm.calcular_score_batch([1.0], model="invalido")
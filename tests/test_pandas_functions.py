@@ -0,0 +1,288 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config_project.config_app import settings
+from src.utils.pandas_functions import (
+    DataLoadError,
+    ExcelChunkWriter,
+    clear_cache,
+    evict_cache,
+    get_cache_dir,
+    get_data_columns,
+    load_data_auto,
+    load_data_parallel,
+    load_data_partitioned,
+    save_data_auto,
+    save_data_partitioned,
+)
+
+
+def build_excel(file_path, n=10):
+    """
+    Cria um arquivo Excel de scores para os testes.
+
+    Parameters:
+    file_path (Path): Caminho do arquivo a ser criado.
+    n (int): Quantidade de linhas.
+
+    Returns:
+    DataFrame: O DataFrame salvo no arquivo.
+    """
+    df = pd.DataFrame({"CD_PONTO": range(1, n + 1), "SCORE_TEMA": [5.5] * n})
+    df.to_excel(file_path, index=False, engine="openpyxl")
+    return df
+
+
+def test_load_data_auto_cache_reutiliza_copia(tmp_path):
+    """
+    Testa se a segunda leitura de um Excel com cache utiliza a cópia colunar.
+    """
+    file_path = tmp_path / "BASE_SCORE_AA.xlsx"
+    df = build_excel(file_path)
+
+    df_primeira = load_data_auto(file_path, use_cache=True)
+    cache_files = list(get_cache_dir(file_path).glob("*.parquet"))
+    df_segunda = load_data_auto(file_path, use_cache=True)
+
+    assert len(cache_files) == 1
+    pd.testing.assert_frame_equal(df_primeira, df)
+    pd.testing.assert_frame_equal(df_segunda, df)
+
+
+def test_load_data_auto_cache_invalida_quando_arquivo_muda(tmp_path):
+    """
+    Testa se a alteração do Excel invalida a cópia colunar anterior.
+    """
+    file_path = tmp_path / "BASE_SCORE_AA.xlsx"
+    build_excel(file_path, n=10)
+    load_data_auto(file_path, use_cache=True)
+
+    df_alterado = build_excel(file_path, n=20)
+    df = load_data_auto(file_path, use_cache=True)
+
+    assert len(df) == 20
+    pd.testing.assert_frame_equal(df, df_alterado)
+    assert len(list(get_cache_dir(file_path).glob("*.parquet"))) == 1
+
+
+def test_evict_e_clear_cache(tmp_path):
+    """
+    Testa a remoção do cache por tamanho total e a limpeza completa do cache.
+    """
+    for nome in ["BASE_SCORE_AA.xlsx", "BASE_SCORE_AB.xlsx"]:
+        build_excel(tmp_path / nome)
+        load_data_auto(tmp_path / nome, use_cache=True)
+
+    cache_dir = get_cache_dir(tmp_path / "BASE_SCORE_AA.xlsx")
+    tamanho_arquivo = max(file.stat().st_size for file in cache_dir.glob("*.parquet"))
+
+    assert evict_cache(cache_dir, max_size_bytes=tamanho_arquivo) == 1
+    assert len(list(cache_dir.glob("*.parquet"))) == 1
+
+    assert clear_cache(tmp_path) == 1
+    assert list(cache_dir.glob("*.parquet")) == []
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_load_data_parallel_carrega_todos_os_arquivos(tmp_path, executor):
+    """
+    Testa a leitura paralela de vários arquivos, mantendo as chaves informadas.
+    """
+    esperados = {}
+    for nome, n in [("AA", 5), ("AB", 10), ("INFRA_CIVIL", 15)]:
+        esperados[nome] = build_excel(tmp_path / f"BASE_SCORE_{nome}.xlsx", n=n)
+
+    dataframes = load_data_parallel(
+        {nome: tmp_path / f"BASE_SCORE_{nome}.xlsx" for nome in esperados},
+        workers=3,
+        executor=executor,
+    )
+
+    assert list(dataframes) == ["AA", "AB", "INFRA_CIVIL"]
+    for nome, df in esperados.items():
+        pd.testing.assert_frame_equal(dataframes[nome], df)
+
+
+def test_load_data_parallel_reporta_erros_por_arquivo(tmp_path):
+    """
+    Testa se os erros de leitura são reportados por arquivo, em vez de DataFrames vazios.
+    """
+    build_excel(tmp_path / "BASE_SCORE_AA.xlsx")
+    (tmp_path / "BASE_SCORE_AB.txt").write_text("CD_PONTO")
+
+    with pytest.raises(DataLoadError) as error:
+        load_data_parallel(
+            {
+                "AA": tmp_path / "BASE_SCORE_AA.xlsx",
+                "AB": tmp_path / "BASE_SCORE_AB.txt",
+                "INFRA_CIVIL": tmp_path / "NAO_EXISTE.xlsx",
+            },
+            workers=2,
+        )
+
+    assert set(error.value.errors) == {"AB", "INFRA_CIVIL"}
+    assert isinstance(error.value.errors["INFRA_CIVIL"], FileNotFoundError)
+    assert load_data_auto(tmp_path / "NAO_EXISTE.xlsx").empty
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet"])
+def test_save_e_load_data_partitioned(tmp_path, extension):
+    """
+    Testa a gravação particionada por período e a leitura do dataset completo.
+    """
+    df = pd.DataFrame(
+        {
+            "CD_PONTO": [1, 2, 1, 2],
+            "DIA": 1,
+            "MES": [8, 8, 9, 9],
+            "ANO": 2024,
+            "SCORE_PILAR": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+
+    files = save_data_partitioned(df, tmp_path / "BASE_SCORE", f"BASE_SCORE{extension}")
+
+    assert [file.relative_to(tmp_path).as_posix() for file in files] == [
+        f"BASE_SCORE/ANO=2024/MES=8/DIA=1/BASE_SCORE{extension}",
+        f"BASE_SCORE/ANO=2024/MES=9/DIA=1/BASE_SCORE{extension}",
+    ]
+
+    df_loaded = load_data_partitioned(tmp_path / "BASE_SCORE")
+    pd.testing.assert_frame_equal(df_loaded[df.columns], df)
+
+
+def build_score_global(n):
+    """
+    Cria um resultado de score global para os testes do Excel em streaming.
+
+    Parameters:
+    n (int): Quantidade de linhas.
+
+    Returns:
+    DataFrame: DataFrame no formato das calculadoras.
+    """
+    return pd.DataFrame(
+        {
+            "CD_PONTO": np.arange(1, n + 1),
+            "DIA": 1,
+            "MES": 9,
+            "ANO": 2024,
+            "SCORE_GLOBAL": np.r_[np.linspace(0, 10, n - 1), np.nan],
+            "FAROL_GLOBAL": pd.Categorical(["VERDE", "A & <B>"] * (n // 2) + [None] * (n % 2)),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "rollover, files, sheets", [("sheet", 1, ["Sheet1", "Sheet2", "Sheet3"]), ("file", 3, ["Sheet1"])]
+)
+def test_excel_chunk_writer_rollover(tmp_path, rollover, files, sheets):
+    """
+    Testa se o limite de linhas cria novas planilhas (ou arquivos) com cabeçalho e sem perda de linhas.
+    """
+    df = build_score_global(25)
+
+    with ExcelChunkWriter(tmp_path / "BASE_SCORE_GLOBAL.xlsx", max_rows=10, rollover=rollover) as writer:
+        for start in range(0, len(df), 7):
+            writer.write(df.iloc[start : start + 7])
+
+    assert len(writer.files) == files
+    assert writer.files[-1].endswith(f"BASE_SCORE_GLOBAL{'_3' if files == 3 else ''}.xlsx")
+
+    # O load_data_auto lê todas as planilhas e arquivos da continuação
+    pd.testing.assert_frame_equal(
+        load_data_auto(writer.file_path), df, check_dtype=False, check_categorical=False
+    )
+
+    sheets_loaded = [pd.read_excel(file, sheet_name=None) for file in writer.files]
+    assert list(sheets_loaded[0]) == sheets
+    df_loaded = pd.concat(
+        [df_sheet for workbook in sheets_loaded for df_sheet in workbook.values()],
+        ignore_index=True,
+    )
+    pd.testing.assert_frame_equal(df_loaded, df, check_dtype=False, check_categorical=False)
+
+
+def test_excel_chunk_writer_remove_caracteres_de_controle(tmp_path):
+    """
+    Testa se os caracteres de controle não permitidos no XML são removidos, mantendo o arquivo válido.
+    """
+    df = pd.DataFrame({"NOME\x02": ["bad\x01x", "tab\tok", None], "FAROL": pd.Categorical(["A\x1fB", "C", "C"])})
+
+    with ExcelChunkWriter(tmp_path / "BASE.xlsx") as writer:
+        writer.write(df)
+
+    df_loaded = pd.read_excel(tmp_path / "BASE.xlsx")
+    assert list(df_loaded.columns) == ["NOME", "FAROL"]
+    assert df_loaded["NOME"].tolist()[:2] == ["badx", "tab\tok"]
+    assert df_loaded["FAROL"].tolist() == ["AB", "C", "C"]
+
+
+def test_save_data_auto_excel_em_streaming(tmp_path, monkeypatch):
+    """
+    Testa se o save_data_auto grava um Excel acima do limite de streaming com o mesmo conteúdo do to_excel.
+    """
+    monkeypatch.setattr(settings, "EXCEL", {"MAX_ROWS": 40, "ROLLOVER": "sheet", "STREAMING_MIN_ROWS": 50})
+    df = build_score_global(101)
+
+    save_data_auto(dataframe=df, file_path=str(tmp_path / "BASE_SCORE_GLOBAL.xlsx"))
+
+    sheets = pd.read_excel(tmp_path / "BASE_SCORE_GLOBAL.xlsx", sheet_name=None)
+    assert [len(df_sheet) for df_sheet in sheets.values()] == [40, 40, 21]
+    pd.testing.assert_frame_equal(
+        pd.concat(sheets.values(), ignore_index=True), df, check_dtype=False, check_categorical=False
+    )
+
+    # Os argumentos do to_excel têm o mesmo efeito acima e abaixo do limite de streaming
+    for rows in [101, 10]:
+        file_path = tmp_path / f"BASE_SCORE_GLOBAL_{rows}.xlsx"
+        save_data_auto(dataframe=df.head(rows), file_path=str(file_path), sheet_name="Dados")
+        sheets = pd.read_excel(file_path, sheet_name=None)
+        assert list(sheets)[0] == "Dados"
+        assert sum(len(df_sheet) for df_sheet in sheets.values()) == rows
+    assert list(sheets) == ["Dados"]
+    assert list(pd.read_excel(tmp_path / "BASE_SCORE_GLOBAL_101.xlsx", sheet_name=None)) == ["Dados", "Dados_2", "Dados_3"]
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather", ".csv", ".xlsx"])
+def test_load_data_auto_com_filtros(tmp_path, monkeypatch, extension):
+    """
+    Testa se os filtros de linhas aplicados na leitura resultam nas mesmas linhas do filtro em memória.
+    """
+    import src.utils.pandas_functions as pandas_functions
+
+    # Blocos pequenos: o CSV é filtrado em vários blocos
+    monkeypatch.setattr(pandas_functions, "CSV_FILTER_CHUNK_ROWS", 7)
+
+    df = pd.DataFrame(
+        {
+            "CD_PONTO": np.repeat(np.arange(1, 21), 2),
+            "MES": np.tile([9, 10], 20),
+            "SCORE_TEMA": np.linspace(0, 10, 40),
+        }
+    )
+    file_path = tmp_path / f"BASE_SCORE{extension}"
+    if extension == ".parquet":
+        # Vários grupos de linhas, descartados pelas estatísticas
+        df.to_parquet(file_path, row_group_size=8, index=False)
+    else:
+        save_data_auto(df, str(file_path))
+
+    filters = {"CD_PONTO": [3, 4, 15], "MES": [10], "DIA": [1]}
+    loaded = load_data_auto(str(file_path), usecols=["CD_PONTO", "MES", "SCORE_TEMA"], filters=filters)
+
+    expected = df[df["CD_PONTO"].isin([3, 4, 15]) & (df["MES"] == 10)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+    assert get_data_columns(file_path) == ["CD_PONTO", "MES", "SCORE_TEMA"]
+
+    # Colunas filtradas fora de usecols: filtradas e removidas do resultado, como no pyarrow
+    usecols_cases = [["SCORE_TEMA"]]
+    if extension in [".csv", ".xlsx"]:
+        usecols_cases.append(lambda column: column == "SCORE_TEMA")
+    for usecols in usecols_cases:
+        loaded = load_data_auto(str(file_path), usecols=usecols, filters={"CD_PONTO": [1, 2]})
+        pd.testing.assert_frame_equal(
+            loaded, df.loc[df["CD_PONTO"].isin([1, 2]), ["SCORE_TEMA"]], check_dtype=False
+        )
+
@@ -0,0 +1,64 @@
+import json
+import pstats
+
+import numpy as np
+import pandas as pd
+
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+from src.utils.pandas_functions import save_data_auto
+from src.utils.profile_functions import get_profiler, profile_stage, profiling
+
+
+def build_details_list():
+    rng = np.random.default_rng(5)
+    return [
+        ScoreDetails(
+            dataframe=pd.DataFrame(
+                {"CD_PONTO": np.arange(1, 1001), "SCORE_TEMA": rng.uniform(0, 10, size=1000)}
+            ),
+            score_column="SCORE_TEMA",
+            weight=weight,
+            category=category,
+        )
+        for category, weight in [("AA", 0.5), ("AB", 0.5)]
+    ]
+
+
+def test_profiling_mede_as_etapas(tmp_path):
+    """
+    Testa a medição das etapas do cálculo e da gravação, as linhas JSON e o cProfile da etapa mais lenta.
+    """
+    output_path = tmp_path / "profile.jsonl"
+    dump_path = tmp_path / "score.prof"
+
+    with profiling(dump_path=dump_path, output_path=output_path) as profiler:
+        df_score = ScorePilarPerformance(build_details_list()).score_pilar
+        save_data_auto(dataframe=df_score, file_path=str(tmp_path / "BASE_SCORE_PILAR.csv"))
+
+    stages = {stage.stage: stage for stage in profiler.stages}
+    assert {"align_scores", "weighted_score", "aggregate_scores:SCORE_PILAR", "save_data_auto"} <= set(stages)
+    assert stages["align_scores"].parent == "aggregate_scores:SCORE_PILAR"
+    assert stages["align_scores"].rows_in == 2000
+    assert stages["aggregate_scores:SCORE_PILAR"].rows_out == 1000
+    assert stages["save_data_auto"].wall_seconds >= 0
+    assert stages["save_data_auto"].cpu_seconds >= 0
+
+    records = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert [record["stage"] for record in records] == [stage.stage for stage in profiler.stages]
+
+    assert pstats.Stats(str(dump_path)).total_calls > 0
+    assert get_profiler() is None
+
+
+def test_profiling_desabilitado():
+    """
+    Testa se, sem o profiling ativo, as etapas usam o contexto vazio compartilhado.
+    """
+    with profile_stage("etapa", rows_in=10) as stage:
+        stage.rows_out = 10
+
+    assert profile_stage("outra") is stage
+    assert stage.rows_in is None
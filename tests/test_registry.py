@@ -0,0 +1,128 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from config_project.config_app import settings
+from src.models.models_kpi.calculator_score.esg.esg.score_ica import ICA
+from src.models.models_kpi.calculator_score.performance.ab.score_tcx import (
+    Model_Score_TCX,
+    Model_Score_TCX_batch,
+)
+from src.models.models_kpi.model_score.modelo_score_faixa import FaixaScore, ScorePorFaixa
+from src.models.models_kpi.model_score.modelo_score_inflexao import Score_Inflexao
+from src.models.models_kpi.registry import ScoreRegistry, get_registry
+
+
+def test_registry_compila_todos_os_kpis_do_settings():
+    """
+    Testa se todos os blocos de modelo do settings são compilados no registro.
+    """
+    registry = get_registry()
+
+    assert {"ICA", "ICE", "TCX", "ATM", "GUIA"} <= set(registry)
+    assert "FAROL" not in registry
+    assert registry.get_config("TCX").model.model == "INFLEXAO"
+
+
+def test_registry_igual_aos_calculos_existentes():
+    """
+    Testa se os scorers do registro produzem os mesmos scores dos cálculos existentes.
+    """
+    registry = get_registry()
+    valores = np.arange(0, 10, 0.05)
+
+    assert list(registry["TCX"].calcular_score_batch(valores)) == [
+        Model_Score_TCX(valor) for valor in valores
+    ]
+    assert list(registry["ICA"].calcular_score_batch(valores)) == [
+        ICA(indice=valor).calcular_score() for valor in valores
+    ]
+
+    faixas_atm = [
+        FaixaScore(limite_inferior=0, limite_superior=4, score_min=9, score_max=10),
+        FaixaScore(limite_inferior=4.01, limite_superior=8, score_min=7, score_max=9),
+        FaixaScore(limite_inferior=8.01, limite_superior=100, score_min=0, score_max=7),
+    ]
+    np.testing.assert_array_equal(
+        registry["ATM"].calcular_score_batch(valores),
+        ScorePorFaixa(faixas_atm).calcular_score_batch(valores),
+    )
+
+
+def test_scorer_imutavel():
+    """
+    Testa se os scorers e os seus coeficientes compilados não podem ser alterados.
+    """
+    scorer = get_registry()["ATM"]
+
+    with pytest.raises(AttributeError):
+        scorer.model = None
+    with pytest.raises(ValueError):
+        scorer.model._limites_superiores[0] = 0
+
+    # Os coeficientes dos modelos compartilhados pelo registro e a configuração são somente leitura
+    tcx = get_registry()["TCX"]
+    with pytest.raises(AttributeError):
+        tcx.model.declive_antes = 0
+    with pytest.raises(AttributeError):
+        get_registry()["ICA"].model.intercepto = 0
+    with pytest.raises(TypeError):
+        scorer.model.faixas[0] = None
+    with pytest.raises(ValidationError):
+        scorer.model.faixas[0].score_max = 0
+    with pytest.raises(ValidationError):
+        tcx.config.model.ponto_a = (0.0, 0.0)
+    assert isinstance(tcx.model, Score_Inflexao)
+
+
+def test_registry_novo_kpi_apenas_com_configuracao():
+    """
+    Testa a criação de um KPI novo apenas com o bloco de configuração e a validação do bloco.
+    """
+    registry = ScoreRegistry.from_config(
+        {
+            "NOVO": {
+                "KPI": "NOVO KPI",
+                "MODEL": {"MODEL": "INDICE", "PONTO_A": [0.0, 0.0], "PONTO_B": [1.0, 10.0]},
+            }
+        }
+    )
+
+    assert registry["NOVO"].calcular_score(0.55) == 5.5
+    assert registry["NOVO"].calcular_score(2.0) == 10.0
+    with pytest.raises(KeyError):
+        registry["TCX"]
+    with pytest.raises(ValueError):
+        ScoreRegistry.from_config({"NOVO": {"MODEL": {"MODEL": "DESCONHECIDO"}}})
+
+
+def test_calculo_nao_consulta_settings(monkeypatch):
+    """
+    Testa se o cálculo dos scores não consulta o Dynaconf após a compilação do registro.
+    """
+    get_registry()
+
+    def settings_get(*args, **kwargs):
+        raise AssertionError("O settings não deve ser consultado no cálculo do score")
+
+    monkeypatch.setattr(settings, "get", settings_get)
+
+    Model_Score_TCX_batch([1, 2, 3])
+    ICA(indice=1.1).calcular_score()
+
+
+def test_registry_compartilhado_entre_threads():
+    """
+    Testa se o mesmo scorer produz resultados idênticos quando usado por várias threads.
+    """
+    scorer = get_registry()["TCX"]
+    valores = np.random.default_rng(0).uniform(0, 6, 100_000)
+    esperado = scorer.calcular_score_batch(valores)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        resultados = list(executor.map(scorer.calcular_score_batch, [valores] * 16))
+
+    for resultado in resultados:
+        np.testing.assert_array_equal(resultado, esperado)
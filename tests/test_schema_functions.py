@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+from src.utils.pandas_functions import load_data_auto, save_data_auto
+from src.utils.schema_functions import (
+    compact_dataframe,
+    expand_dataframe,
+    get_schema,
+    get_schema_path,
+)
+
+
+@pytest.fixture
+def details_list():
+    rng = np.random.default_rng(3)
+    return [
+        ScoreDetails(
+            dataframe=pd.DataFrame(
+                {
+                    "CD_PONTO": np.arange(1, 101),
+                    "DIA": 1,
+                    "MES": 9,
+                    "ANO": 2024,
+                    "SCORE_TEMA": np.round(rng.uniform(0, 10, size=100), 2),
+                }
+            ).sample(frac=0.8, random_state=seed).sort_values("CD_PONTO", ignore_index=True),
+            score_column="SCORE_TEMA",
+            weight=weight,
+            category=category,
+        )
+        for seed, (category, weight) in enumerate([("AA", 0.2), ("AB", 0.5), ("INFRA_CIVIL", 0.3)])
+    ]
+
+
+def test_calculo_compacto_e_expansao(details_list):
+    """
+    Testa se o resultado compacto remove os pesos e reduz os tipos, e se a expansão restaura o original.
+    """
+    df_score = ScorePilarPerformance(details_list).score_pilar
+    df_compact = ScorePilarPerformance(details_list, compact=True, float32=True).score_pilar
+
+    assert not any(column.endswith("_PESO") for column in df_compact.columns)
+    assert get_schema(df_compact)["weights"] == {"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3}
+    assert df_compact["CD_PONTO"].dtype == np.int8
+    assert df_compact["ANO"].dtype == np.int16
+    assert df_compact["SCORE_PILAR"].dtype == np.float32
+    assert isinstance(df_compact["AA_FAROL"].dtype, pd.CategoricalDtype)
+    assert df_compact.memory_usage(deep=True).sum() < df_score.memory_usage(deep=True).sum() / 2
+
+    df_expanded = expand_dataframe(df_compact)
+    pd.testing.assert_frame_equal(df_expanded, df_score, rtol=1e-6)
+    assert list(df_expanded.columns) == list(df_score.columns)
+
+
+def test_compacto_mantem_peso_variavel():
+    """
+    Testa se uma coluna de peso com valores diferentes é mantida no resultado compacto.
+    """
+    df = pd.DataFrame(
+        {
+            "CD_PONTO": [1, 2],
+            "AA_SCORE": [5.0, 6.0],
+            "AA_PESO": [0.5, 0.4],
+            "SCORE_PILAR": [5.0, 6.0],
+        }
+    )
+
+    df_compact = compact_dataframe(df)
+
+    assert "AA_PESO" in df_compact.columns
+    assert get_schema(df_compact)["weights"] == {}
+    pd.testing.assert_frame_equal(expand_dataframe(df_compact), df)
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".csv", ".xlsx"])
+def test_save_e_load_esquema_compacto(tmp_path, details_list, extension):
+    """
+    Testa a gravação no esquema compacto e a leitura expandida (default) ou compacta.
+    """
+    df_score = ScorePilarPerformance(details_list).score_pilar
+    file_path = tmp_path / f"BASE_SCORE_PILAR{extension}"
+
+    save_data_auto(dataframe=df_score, file_path=str(file_path))
+    df_original = load_data_auto(file_path)
+
+    save_data_auto(dataframe=df_score, file_path=str(file_path), compact=True)
+    assert get_schema_path(file_path).exists() == (extension != ".parquet")
+
+    pd.testing.assert_frame_equal(
+        load_data_auto(file_path), df_original, check_categorical=False
+    )
+
+    df_compact = load_data_auto(file_path, expand=False)
+    assert "AA_PESO" not in df_compact.columns
+    assert get_schema(df_compact)["weights"]["AB"] == 0.5
+
+    # A regravação no layout original remove os metadados do esquema compacto
+    save_data_auto(dataframe=df_score, file_path=str(file_path))
+    assert not get_schema_path(file_path).exists()
+    assert "AA_PESO" in load_data_auto(file_path, expand=False).columns
+
+
+def test_esquema_compacto_por_formato(tmp_path, details_list):
+    """
+    Testa se arquivos de mesmo nome em formatos diferentes mantêm metadados independentes.
+    """
+    df_score = ScorePilarPerformance(details_list).score_pilar
+    csv_path = tmp_path / "BASE_SCORE_PILAR.csv"
+    xlsx_path = tmp_path / "BASE_SCORE_PILAR.xlsx"
+
+    save_data_auto(dataframe=df_score, file_path=str(csv_path), compact=True)
+    save_data_auto(dataframe=df_score, file_path=str(xlsx_path))
+
+    assert get_schema_path(xlsx_path).name == "BASE_SCORE_PILAR.xlsx.schema.json"
+    assert get_schema_path(csv_path).exists()
+    assert "AA_PESO" not in load_data_auto(csv_path, expand=False).columns
+    assert get_schema(load_data_auto(xlsx_path, expand=False)) is None
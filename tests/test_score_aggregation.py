@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_global.score_global.global_calculator import (
+    ScoreGlobalCalculator,
+)
+from src.models.models_global.score_global.models import (
+    ScoreDetails as ScoreDetailsGlobal,
+)
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+
+
+def build_dataframe(cd_ponto, scores, score_column="SCORE_TEMA", **extra_columns):
+    """
+    Cria um DataFrame de scores de uma categoria para os testes.
+
+    Parameters:
+    cd_ponto (list): Códigos das agências.
+    scores (list): Scores das agências.
+    score_column (str): Nome da coluna de score.
+    extra_columns (dict): Colunas adicionais.
+
+    Returns:
+    DataFrame: DataFrame com CD_PONTO, DIA, MES, ANO e a coluna de score.
+    """
+    return pd.DataFrame(
+        {
+            "CD_PONTO": cd_ponto,
+            "DIA": 1,
+            "MES": 9,
+            "ANO": 2024,
+            score_column: scores,
+            **extra_columns,
+        }
+    )
+
+
+def test_score_pilar_layout_e_ponderacao():
+    """
+    Testa o layout do resultado e o score ponderado do pilar com todas as categorias presentes.
+    """
+    details_list = [
+        ScoreDetails(
+            dataframe=build_dataframe([2, 1], [8.0, 2.0]),
+            score_column="SCORE_TEMA",
+            weight=0.25,
+            category="AA",
+        ),
+        ScoreDetails(
+            dataframe=build_dataframe([1, 2], [6.0, 10.0]),
+            score_column="SCORE_TEMA",
+            weight=0.75,
+            category="AB",
+        ),
+    ]
+
+    df = ScorePilarPerformance(details_list, dia=1, mes=9, ano=2024).score_pilar
+
+    assert list(df.columns) == [
+        "CD_PONTO", "DIA", "MES", "ANO",
+        "AA_SCORE", "AA_PESO", "AA_FAROL",
+        "AB_SCORE", "AB_PESO", "AB_FAROL",
+        "SCORE_PILAR", "FAROL_PILAR",
+    ]
+    assert df["CD_PONTO"].tolist() == [1, 2]
+    assert df["AA_SCORE"].tolist() == [2.0, 8.0]
+    assert df["SCORE_PILAR"].tolist() == [5.0, 9.5]
+    assert df["AA_FAROL"].tolist() == ["VERMELHO", "AMARELO"]
+    assert df["FAROL_PILAR"].tolist() == ["AMARELO", "VERDE"]
+
+
+def test_score_pilar_renormaliza_pesos_disponiveis():
+    """
+    Testa se agências ausentes em uma categoria têm o score renormalizado
+    pelos pesos das categorias disponíveis.
+    """
+    details_list = [
+        ScoreDetails(
+            dataframe=build_dataframe([1, 2], [2.0, 4.0]),
+            score_column="SCORE_TEMA",
+            weight=0.5,
+            category="AA",
+        ),
+        ScoreDetails(
+            dataframe=build_dataframe([2, 3], [8.0, 9.0]),
+            score_column="SCORE_TEMA",
+            weight=0.5,
+            category="AB",
+        ),
+    ]
+
+    df = ScorePilarPerformance(details_list, dia=1, mes=9, ano=2024).score_pilar
+
+    assert df["CD_PONTO"].tolist() == [1, 2, 3]
+    assert df["SCORE_PILAR"].tolist() == [2.0, 6.0, 9.0]
+    assert np.isnan(df.loc[0, "AB_PESO"])
+    assert df["DIA"].tolist() == [1, 1, 1]
+
+
+def test_score_global_mantem_farol_dos_pilares():
+    """
+    Testa se o score global mantém o farol informado pelos pilares.
+    """
+    details_list = [
+        ScoreDetailsGlobal(
+            dataframe=build_dataframe(
+                [1], [3.0], score_column="SCORE_PILAR", FAROL_PILAR=["AMARELO"]
+            ),
+            score_column="SCORE_PILAR",
+            farol_column="FAROL_PILAR",
+            weight=0.5,
+            category="ESG",
+        ),
+        ScoreDetailsGlobal(
+            dataframe=build_dataframe(
+                [1], [9.0], score_column="SCORE_PILAR", FAROL_PILAR=["VERDE"]
+            ),
+            score_column="SCORE_PILAR",
+            farol_column="FAROL_PILAR",
+            weight=0.5,
+            category="PERFORMANCE",
+        ),
+    ]
+
+    df = ScoreGlobalCalculator(details_list, dia=1, mes=9, ano=2024).score_global
+
+    assert df["ESG_FAROL"].tolist() == ["AMARELO"]
+    assert df["SCORE_GLOBAL"].tolist() == [6.0]
+    assert df["FAROL_GLOBAL"].tolist() == ["AMARELO"]
+
+
+def test_score_pilar_chaves_duplicadas():
+    """
+    Testa se chaves duplicadas em uma categoria geram erro.
+    """
+    details_list = [
+        ScoreDetails(
+            dataframe=build_dataframe([1, 1], [2.0, 4.0]),
+            score_column="SCORE_TEMA",
+            weight=1.0,
+            category="AA",
+        ),
+    ]
+
+    with pytest.raises(ValueError):
+        ScorePilarPerformance(details_list, dia=1, mes=9, ano=2024)
+
+
+def test_score_pilar_varios_periodos():
+    """
+    Testa se cada par (CD_PONTO, período) gera uma linha, renormalizando os pesos
+    quando uma categoria não possui o período.
+    """
+    details_list = [
+        ScoreDetails(
+            dataframe=build_dataframe([1, 1, 2], [2.0, 4.0, 6.0], MES=[8, 9, 9]),
+            score_column="SCORE_TEMA",
+            weight=0.5,
+            category="AA",
+        ),
+        ScoreDetails(
+            dataframe=build_dataframe([1, 2], [8.0, 10.0], MES=[9, 9]),
+            score_column="SCORE_TEMA",
+            weight=0.5,
+            category="AB",
+        ),
+    ]
+
+    df = ScorePilarPerformance(details_list).score_pilar
+
+    assert df["CD_PONTO"].tolist() == [1, 1, 2]
+    assert df["MES"].tolist() == [8, 9, 9]
+    assert df["ANO"].tolist() == [2024, 2024, 2024]
+    assert df["SCORE_PILAR"].tolist() == [2.0, 6.0, 8.0]
+    assert np.isnan(df.loc[0, "AB_PESO"])
+
+
+def test_score_pilar_varios_periodos_chave_texto():
+    """
+    Testa a agregação por período com CD_PONTO não numérico.
+    """
+    details_list = [
+        ScoreDetails(
+            dataframe=build_dataframe(["B", "A", "A"], [6.0, 2.0, 4.0], ANO=[2024, 2023, 2024]),
+            score_column="SCORE_TEMA",
+            weight=1.0,
+            category="AA",
+        ),
+    ]
+
+    df = ScorePilarPerformance(details_list).score_pilar
+
+    assert df["CD_PONTO"].tolist() == ["A", "A", "B"]
+    assert df["ANO"].tolist() == [2023, 2024, 2024]
+    assert df["SCORE_PILAR"].tolist() == [2.0, 4.0, 6.0]
@@ -1,6 +1,11 @@
+import numpy as np
+import pandas as pd
 import pytest
 from pydantic import ValidationError
-from src.calculator_score.esg.esg.score_ica import ICA
+from src.models.models_kpi.calculator_score.esg.esg.score_ica import (
+    ICA,
+    Model_Score_ICA_batch,
+)
 
 
 @pytest.mark.parametrize(
@@ -58,3 +63,62 @@ def test_ica_validacao_erro():
     """
     with pytest.raises(ValidationError):
         ICA(indice=1.0, percentual_acima=50)
+
+
+@pytest.mark.parametrize(
+    "minimo, maximo, casas_decimais",
+    [
+        (None, None, 2),  # Teste com a escala padrão (0 a 10)
+        (0.0, 10.0, 2),  # Teste padrão
+        (7.123, 7.5, 3),  # Teste com arredondamento específico
+    ],
+)
+def test_ica_batch_igual_escalar(minimo, maximo, casas_decimais):
+    """
+    Testa se o cálculo em lote do ICA retorna os mesmos scores do cálculo escalar.
+
+    Parameters:
+    minimo (float): O valor mínimo permitido para o score.
+    maximo (float): O valor máximo permitido para o score.
+    casas_decimais (int): O número de casas decimais para o arredondamento do score.
+    """
+    indices = np.arange(0.5, 3.0, 0.01)
+
+    scores = Model_Score_ICA_batch(indices, minimo, maximo, casas_decimais)
+
+    assert list(scores) == [
+        ICA(indice=indice).calcular_score(
+            minimo=minimo, maximo=maximo, casas_decimais=casas_decimais
+        )
+        for indice in indices
+    ]
+
+
+def test_ica_batch_percentual_acima():
+    """
+    Testa o cálculo em lote a partir de uma coluna de percentuais acima do ideal,
+    preservando o índice da pd.Series.
+    """
+    percentuais = pd.Series([50, 0, 100], index=[7, 8, 9])
+
+    ica = ICA(percentual_acima=percentuais)
+    scores = Model_Score_ICA_batch(percentuais_acima=percentuais)
+
+    assert ica.calcular_indice_batch().tolist() == [1.5, 1.0, 2.0]
+    assert scores.to_dict() == {
+        7: ICA(indice=1.5).calcular_score(),
+        8: ICA(indice=1.0).calcular_score(),
+        9: ICA(indice=2.0).calcular_score(),
+    }
+
+
+def test_ica_batch_validacao_erro():
+    """
+    Testa se a validação de erro é lançada uma vez por coluna quando ambas as colunas
+    'indice' e 'percentual_acima' são fornecidas, ou quando nenhuma é fornecida.
+    """
+    with pytest.raises(ValidationError):
+        ICA(indice=[1.0, 1.2], percentual_acima=[50, 10])
+
+    with pytest.raises(ValidationError):
+        Model_Score_ICA_batch()
@@ -0,0 +1,142 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.models.models_common import score_hierarchy
+from src.models.models_common.score_hierarchy import ScoreHierarchy
+from src.models.models_common.score_pipeline import run_pipeline
+from src.utils.sqlite_functions import load_hierarchy_status
+
+
+def build_tema(file_path, scores):
+    """
+    Cria um arquivo CSV de scores de um tema para os testes.
+
+    Parameters:
+    file_path (Path): Caminho do arquivo a ser criado.
+    scores (list): Scores das agências 1, 2, ...
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {"CD_PONTO": range(1, len(scores) + 1), "DIA": 1, "MES": 9, "ANO": 2024, "SCORE_TEMA": scores}
+    ).to_csv(file_path, index=False)
+
+
+@pytest.fixture
+def config(tmp_path):
+    build_tema(tmp_path / "input" / "AA.csv", [2.0, 8.0])
+    build_tema(tmp_path / "input" / "INFRA_CIVIL.csv", [6.0, 10.0])
+    build_tema(tmp_path / "input" / "ESG.csv", [10.0, 0.0])
+
+    # O tema INFRA_CIVIL é compartilhado pelos pilares PERFORMANCE e RISCOS
+    return {
+        "NIVEIS": ["TEMA", "PILAR", "GLOBAL"],
+        "TEMA": {
+            "AA": {"ARQUIVO": "AA.csv"},
+            "INFRA_CIVIL": {"ARQUIVO": "INFRA_CIVIL.csv"},
+            "ESG": {"ARQUIVO": "ESG.csv"},
+            "REGULATORIO": {"ARQUIVO": "NAO_EXISTE.csv"},
+        },
+        "PILAR": {
+            "PERFORMANCE": {"COMPONENTES": {"AA": 0.25, "INFRA_CIVIL": 0.75}},
+            "RISCOS": {"COMPONENTES": {"INFRA_CIVIL": 0.5, "REGULATORIO": 0.5}},
+            "ESG": {"COMPONENTES": {"ESG": 1.0}},
+        },
+        "GLOBAL": {
+            "GLOBAL": {"COMPONENTES": {"PERFORMANCE": 0.4, "RISCOS": 0.2, "ESG": 0.4}},
+        },
+    }
+
+
+def test_hierarquia_calcula_todos_os_niveis_uma_vez(tmp_path, config, monkeypatch):
+    """
+    Testa o cálculo de todos os níveis, com o tema compartilhado lido e os nós calculados uma única vez
+    e os pesos renormalizados após a remoção do tema desabilitado.
+    """
+    config["TEMA"]["REGULATORIO"]["STATUS"] = False
+    calls = []
+    aggregate_scores = score_hierarchy.aggregate_scores
+
+    def count_calls(details_list, score_column, farol_column):
+        calls.append(score_column)
+        return aggregate_scores(details_list, score_column=score_column, farol_column=farol_column)
+
+    monkeypatch.setattr(score_hierarchy, "aggregate_scores", count_calls)
+
+    result = run_pipeline(
+        tmp_path / "input", hierarchy=ScoreHierarchy.from_config(config), workers=1
+    )
+
+    assert sorted(calls) == ["SCORE_GLOBAL", "SCORE_PILAR", "SCORE_PILAR", "SCORE_PILAR"]
+    assert list(result.scores["TEMA"]) == ["AA", "INFRA_CIVIL", "ESG"]
+    assert result.pilares["PERFORMANCE"]["SCORE_PILAR"].tolist() == [5.0, 9.5]
+    assert result.pilares["RISCOS"]["SCORE_PILAR"].tolist() == [6.0, 10.0]
+    assert result.pilares["RISCOS"]["INFRA_CIVIL_PESO"].tolist() == [1.0, 1.0]
+    assert result.score_global["SCORE_GLOBAL"].tolist() == pytest.approx([7.2, 5.8])
+    assert result.score_global["FAROL_GLOBAL"].tolist() == ["AMARELO", "AMARELO"]
+
+
+def test_hierarquia_remove_pilar_desabilitado_no_banco(tmp_path, config):
+    """
+    Testa a aplicação do status de TBL_PILARES e TBL_TEMAS: o pilar desabilitado e os seus temas
+    não são lidos e os pesos do score global são renormalizados.
+    """
+    db_path = tmp_path / "DB_SCORE_AGENCIAS.db"
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE TBL_PILARES (ID_PILAR INTEGER, NOME_PILAR TEXT, STATUS_PILAR BOOLEAN)")
+    connection.execute("CREATE TABLE TBL_TEMAS (ID_TEMA INTEGER, ID_PILAR INTEGER, NOME_TEMA TEXT, STATUS_TEMA BOOLEAN)")
+    connection.executemany(
+        "INSERT INTO TBL_PILARES VALUES (?, ?, ?)",
+        [(1, "ESG", "True"), (2, "RISCOS", "False"), (3, "PERFORMANCE", "True")],
+    )
+    connection.execute("INSERT INTO TBL_TEMAS VALUES (1, 3, 'INFRA CIVIL', 'True')")
+    connection.commit()
+    connection.close()
+
+    assert load_hierarchy_status(db_path)["PILAR"]["RISCOS"] is False
+
+    result = run_pipeline(
+        tmp_path / "input", hierarchy=ScoreHierarchy.from_config(config), status_db=db_path
+    )
+
+    assert list(result.pilares) == ["PERFORMANCE", "ESG"]
+    assert "REGULATORIO" not in result.scores["TEMA"]
+    assert result.score_global["SCORE_GLOBAL"].tolist() == [7.5, 4.75]
+
+
+def test_hierarquia_invalida(config):
+    """
+    Testa a rejeição de pesos que não somam 1.0, de componentes inexistentes e da raiz desabilitada.
+    """
+    config["PILAR"]["ESG"]["COMPONENTES"] = {"ESG": 0.5}
+    with pytest.raises(ValueError, match="ESG"):
+        ScoreHierarchy.from_config(config)
+
+    config["PILAR"]["ESG"]["COMPONENTES"] = {"ICA": 1.0}
+    with pytest.raises(ValueError, match="ICA"):
+        ScoreHierarchy.from_config(config)
+
+    config["PILAR"]["ESG"]["COMPONENTES"] = {"ESG": 1.0}
+    config["GLOBAL"]["GLOBAL"]["STATUS"] = False
+    with pytest.raises(ValueError, match="GLOBAL"):
+        ScoreHierarchy.from_config(config).prune()
+
+
+def test_hierarquia_substitui_apenas_pesos_informados(tmp_path, config):
+    """
+    Testa a substituição de pesos informados: os demais pesos e o status dos nós são mantidos.
+    """
+    config["TEMA"]["REGULATORIO"]["STATUS"] = False
+    hierarchy = ScoreHierarchy.from_config(config).with_weights(
+        {"PILAR": {"PERFORMANCE": {"AA": 0.5, "INFRA_CIVIL": 0.5}}}
+    )
+
+    assert hierarchy.nodes["PILAR"]["PERFORMANCE"].components == {"AA": 0.5, "INFRA_CIVIL": 0.5}
+    assert hierarchy.nodes["GLOBAL"]["GLOBAL"].components == {"PERFORMANCE": 0.4, "RISCOS": 0.2, "ESG": 0.4}
+    assert "REGULATORIO" not in hierarchy.prune().nodes["TEMA"]
+
+    with pytest.raises(ValueError, match="PERFORMANCE"):
+        hierarchy.with_weights({"PILAR": {"PERFORMANCE": {"AA": 0.6}}})
+    with pytest.raises(ValueError, match="AB"):
+        hierarchy.with_weights({"PILAR": {"PERFORMANCE": {"AB": 0.5}}})
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_common.score_incremental import get_state_path
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+from src.utils.pandas_functions import save_data_auto
+
+
+def build_details(dataframes, weights):
+    """
+    Cria os detalhes das categorias para os testes.
+
+    Parameters:
+    dataframes (dict): DataFrames de scores, por categoria.
+    weights (dict): Pesos, por categoria.
+
+    Returns:
+    list: Lista de objetos ScoreDetails.
+    """
+    return [
+        ScoreDetails(
+            dataframe=df, score_column="SCORE_TEMA", weight=weights[category], category=category
+        )
+        for category, df in dataframes.items()
+    ]
+
+
+@pytest.fixture
+def dataframes():
+    rng = np.random.default_rng(7)
+    return {
+        category: pd.DataFrame(
+            {
+                "CD_PONTO": np.arange(1, 201),
+                "DIA": 1,
+                "MES": 9,
+                "ANO": 2024,
+                "SCORE_TEMA": np.round(rng.uniform(0, 10, size=200), 2),
+            }
+        ).sample(frac=0.9, random_state=seed).sort_values("CD_PONTO", ignore_index=True)
+        for seed, category in enumerate(["AA", "AB", "INFRA_CIVIL"])
+    }
+
+
+def assert_igual_ao_calculo_completo(result, details_list, output_path):
+    """
+    Verifica se o resultado incremental e o arquivo gravado são iguais ao cálculo completo.
+    """
+    df_completo = ScorePilarPerformance(details_list).score_pilar
+    pd.testing.assert_frame_equal(result.dataframe, df_completo, check_dtype=False)
+
+    if output_path.suffix == ".parquet":
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(output_path), df_completo, check_dtype=False
+        )
+    else:
+        assert len(pd.read_csv(output_path)) == len(df_completo)
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".csv"])
+def test_incremental_recalcula_apenas_chaves_alteradas(tmp_path, dataframes, extension):
+    """
+    Testa se apenas as chaves alteradas, novas e removidas são recalculadas,
+    com resultado idêntico ao cálculo completo.
+    """
+    weights = {"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3}
+    output_path = tmp_path / f"BASE_SCORE_PILAR{extension}"
+
+    result = ScorePilarPerformance.calculate_incremental(
+        build_details(dataframes, weights), output_path
+    )
+    assert result.full and get_state_path(output_path).exists()
+
+    # Altera o score de 3 agências, inclui uma agência nova e remove uma agência de todos os temas
+    dataframes["AA"].loc[:2, "SCORE_TEMA"] += 1
+    dataframes["AB"] = pd.concat(
+        [
+            dataframes["AB"],
+            pd.DataFrame(
+                {"CD_PONTO": [500], "DIA": 1, "MES": 9, "ANO": 2024, "SCORE_TEMA": [4.0]}
+            ),
+        ],
+        ignore_index=True,
+    )
+    removed = dataframes["INFRA_CIVIL"]["CD_PONTO"].iloc[10]
+    for category in dataframes:
+        dataframes[category] = dataframes[category][dataframes[category]["CD_PONTO"] != removed]
+
+    details_list = build_details(dataframes, weights)
+    result = ScorePilarPerformance.calculate_incremental(details_list, output_path)
+
+    assert not result.full
+    assert result.rows_recomputed == 4
+    assert result.rows_removed == 1
+    assert_igual_ao_calculo_completo(result, details_list, output_path)
+
+    # Sem alterações, nenhuma linha é recalculada
+    result = ScorePilarPerformance.calculate_incremental(details_list, output_path)
+    assert result.rows_recomputed == 0
+    assert_igual_ao_calculo_completo(result, details_list, output_path)
+
+
+def test_incremental_recalcula_categoria_com_peso_alterado(tmp_path, dataframes):
+    """
+    Testa se a alteração do peso de uma categoria recalcula todas as chaves presentes na categoria.
+    """
+    output_path = tmp_path / "BASE_SCORE_PILAR.parquet"
+    ScorePilarPerformance.calculate_incremental(
+        build_details(dataframes, {"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3}), output_path
+    )
+
+    details_list = build_details(dataframes, {"AA": 0.4, "AB": 0.3, "INFRA_CIVIL": 0.3})
+    result = ScorePilarPerformance.calculate_incremental(details_list, output_path)
+
+    # As agências presentes apenas em INFRA_CIVIL (peso inalterado) não são recalculadas
+    alteradas = set(dataframes["AA"]["CD_PONTO"]) | set(dataframes["AB"]["CD_PONTO"])
+    assert result.rows_recomputed == len(alteradas) < len(result.dataframe)
+    assert_igual_ao_calculo_completo(result, details_list, output_path)
+
+
+def test_incremental_calculo_completo_sem_estado_compativel(tmp_path, dataframes):
+    """
+    Testa se a inclusão de uma categoria força o cálculo completo.
+    """
+    output_path = tmp_path / "BASE_SCORE_PILAR.parquet"
+    ScorePilarPerformance.calculate_incremental(
+        build_details({"AA": dataframes["AA"]}, {"AA": 1.0}), output_path
+    )
+
+    details_list = build_details(dataframes, {"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3})
+    result = ScorePilarPerformance.calculate_incremental(details_list, output_path)
+
+    assert result.full
+    assert_igual_ao_calculo_completo(result, details_list, output_path)
+
+
+def test_incremental_calculo_completo_com_saida_sobrescrita(tmp_path, dataframes):
+    """
+    Testa se a saída sobrescrita por outra execução (ex.: outros pesos) força o cálculo completo.
+    """
+    output_path = tmp_path / "BASE_SCORE_PILAR.parquet"
+    details_list = build_details(dataframes, {"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3})
+    ScorePilarPerformance.calculate_incremental(details_list, output_path)
+
+    # Execução não incremental com outros pesos, gravando no mesmo arquivo
+    other = build_details(dataframes, {"AA": 0.6, "AB": 0.2, "INFRA_CIVIL": 0.2})
+    save_data_auto(ScorePilarPerformance(other).score_pilar, str(output_path))
+
+    result = ScorePilarPerformance.calculate_incremental(details_list, output_path)
+    assert result.full
+    assert_igual_ao_calculo_completo(result, details_list, output_path)
+
+
+def test_incremental_recusa_banco_sqlite(tmp_path, dataframes):
+    """
+    Testa se a saída em banco SQLite, que não pode ser relida como resultado anterior, é recusada.
+    """
+    details_list = build_details(dataframes, {"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3})
+    with pytest.raises(ValueError):
+        ScorePilarPerformance.calculate_incremental(details_list, tmp_path / "DB_SCORE.db")
+    assert not (tmp_path / "DB_SCORE.db").exists()
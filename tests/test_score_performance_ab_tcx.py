@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_kpi.calculator_score.performance.ab.score_tcx import (
+    Model_Score_TCX,
+    Model_Score_TCX_batch,
+)
+from src.models.models_kpi.model_score.modelo_score_inflexao import Score_Inflexao
+
+
+@pytest.mark.parametrize(
+    "reinicializacoes, score_esperado",
+    [
+        (0, 10.0),  # Sem reinicializações
+        (1, 8.5),  # Antes do ponto central
+        (2, 7.0),  # Ponto central
+        (3, 4.67),  # Depois do ponto central
+        (5, 0.0),  # Limite superior
+        (7, 0.0),  # Acima do limite superior
+    ],
+)
+def test_tcx_calculo_score(reinicializacoes, score_esperado):
+    """
+    Testa o cálculo do score para TCX com diferentes números de reinicializações.
+
+    Parameters:
+    reinicializacoes (float): Número de reinicializações do equipamento.
+    score_esperado (float): O valor esperado do score.
+    """
+    assert Model_Score_TCX(reinicializacoes) == score_esperado
+
+
+def test_tcx_batch_igual_escalar():
+    """
+    Testa se o cálculo em lote do TCX retorna os mesmos scores do cálculo escalar.
+    """
+    reinicializacoes = np.arange(0, 10.01, 0.01)
+
+    scores = Model_Score_TCX_batch(reinicializacoes)
+
+    assert list(scores) == [Model_Score_TCX(valor) for valor in reinicializacoes]
+
+
+def test_tcx_batch_series():
+    """
+    Testa se o cálculo em lote preserva o índice de uma pd.Series.
+    """
+    reinicializacoes = pd.Series([0, 2, 5], index=["a", "b", "c"])
+
+    scores = Model_Score_TCX_batch(reinicializacoes)
+
+    assert scores.to_dict() == {"a": 10.0, "b": 7.0, "c": 0.0}
+
+
+@pytest.mark.parametrize(
+    "valor_x, score_esperado",
+    [
+        (0, 0.0),  # Limite inferior
+        (1, 3.5),  # Antes do ponto central
+        (2, 7.0),  # Ponto central
+        (5, 10.0),  # Limite superior
+    ],
+)
+def test_inflexao_crescente(valor_x, score_esperado):
+    """
+    Testa a curva crescente nos cálculos escalar e em lote.
+
+    Parameters:
+    valor_x (float): O valor de X.
+    score_esperado (float): O valor esperado do score.
+    """
+    modelo = Score_Inflexao(
+        ponto_central=(2, 7), direcao="crescente", limite_superior=5
+    )
+
+    assert modelo.calcular_score(valor_x) == score_esperado
+    assert modelo.calcular_score_batch([valor_x])[0] == score_esperado
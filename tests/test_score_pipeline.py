@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+
+from src.models.models_common.score_pipeline import (
+    PilarConfig,
+    TemaConfig,
+    run_pipeline,
+)
+
+
+def build_tema(file_path, cd_ponto, scores):
+    """
+    Cria um arquivo CSV de scores de um tema para os testes.
+
+    Parameters:
+    file_path (Path): Caminho do arquivo a ser criado.
+    cd_ponto (list): Códigos das agências.
+    scores (list): Scores das agências.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {"CD_PONTO": cd_ponto, "DIA": 1, "MES": 9, "ANO": 2024, "SCORE_TEMA": scores}
+    ).to_csv(file_path, index=False)
+
+
+@pytest.fixture
+def pilares(tmp_path):
+    build_tema(tmp_path / "input" / "AA.csv", [1, 2], [2.0, 8.0])
+    build_tema(tmp_path / "input" / "AB.csv", [1, 2], [6.0, 10.0])
+    build_tema(tmp_path / "input" / "ESG.csv", [1, 2], [10.0, 0.0])
+
+    return [
+        PilarConfig(
+            category="PERFORMANCE",
+            weight=0.5,
+            temas=[
+                TemaConfig(category="AA", file_path="AA.csv", weight=0.25),
+                TemaConfig(category="AB", file_path="AB.csv", weight=0.75),
+            ],
+        ),
+        PilarConfig(
+            category="ESG",
+            weight=0.5,
+            temas=[TemaConfig(category="ESG", file_path="ESG.csv", weight=1.0)],
+        ),
+    ]
+
+
+def test_pipeline_calcula_pilares_e_global_em_memoria(tmp_path, pilares):
+    """
+    Testa o cálculo dos pilares e do score global sem gravar saídas.
+    """
+    result = run_pipeline(tmp_path / "input", pilares=pilares)
+
+    assert result.pilares["PERFORMANCE"]["SCORE_PILAR"].tolist() == [5.0, 9.5]
+    assert result.pilares["ESG"]["SCORE_PILAR"].tolist() == [10.0, 0.0]
+    assert result.score_global["SCORE_GLOBAL"].tolist() == [7.5, 4.75]
+    assert result.score_global["FAROL_GLOBAL"].tolist() == ["AMARELO", "AMARELO"]
+    assert not (tmp_path / "output").exists()
+
+
+@pytest.mark.parametrize("save_pilares", [False, True])
+def test_pipeline_grava_apenas_saidas_solicitadas(tmp_path, pilares, save_pilares):
+    """
+    Testa se apenas o score global e, quando solicitado, os pilares são gravados.
+    """
+    output_dir = tmp_path / "output"
+    run_pipeline(
+        tmp_path / "input",
+        output_dir=output_dir,
+        pilares=pilares,
+        output_file="BASE_SCORE_GLOBAL.csv",
+        save_pilares=save_pilares,
+    )
+
+    expected = {"BASE_SCORE_GLOBAL.csv"}
+    if save_pilares:
+        expected |= {
+            "PERFORMANCE/BASE_SCORE_TEMA_PERFORMANCE.csv",
+            "ESG/BASE_SCORE_TEMA_ESG.csv",
+        }
+
+    written = {
+        path.relative_to(output_dir).as_posix()
+        for path in output_dir.rglob("*")
+        if path.is_file()
+    }
+    assert written == expected
+
+
+def test_pipeline_grava_saida_particionada(tmp_path, pilares):
+    """
+    Testa a gravação do score global particionado por período.
+    """
+    output_dir = tmp_path / "output"
+    run_pipeline(
+        tmp_path / "input",
+        output_dir=output_dir,
+        pilares=pilares,
+        output_file="BASE_SCORE_GLOBAL.csv",
+        partitioned=True,
+    )
+
+    written = [
+        path.relative_to(output_dir).as_posix()
+        for path in output_dir.rglob("*")
+        if path.is_file()
+    ]
+    assert written == ["BASE_SCORE_GLOBAL/ANO=2024/MES=9/DIA=1/BASE_SCORE_GLOBAL.csv"]
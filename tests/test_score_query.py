@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_global.score_global.global_calculator import ScoreGlobalCalculator
+from src.models.models_global.score_global.models import ScoreDetails as ScoreDetailsGlobal
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+from src.utils.farol_functions import classificar_farol
+from src.utils.pandas_functions import save_data_auto
+
+WEIGHTS = {"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3}
+
+
+@pytest.fixture
+def dataframes():
+    rng = np.random.default_rng(25)
+    dataframes = {}
+    for seed, category in enumerate(WEIGHTS):
+        df = pd.DataFrame(
+            {
+                "CD_PONTO": np.repeat(np.arange(1, 301), 2),
+                "DIA": 1,
+                "MES": np.tile([9, 10], 300),
+                "ANO": 2024,
+                "SCORE_TEMA": np.round(rng.uniform(0, 10, size=600), 2),
+                "VOLUME": rng.integers(0, 100, size=600),
+            }
+        ).sample(frac=0.9, random_state=seed).sort_values(["CD_PONTO", "MES"], ignore_index=True)
+        dataframes[category] = df
+    return dataframes
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather", ".csv", None])
+def test_consulta_igual_ao_calculo_completo_filtrado(tmp_path, dataframes, extension):
+    """
+    Testa se a consulta com filtros de agências e de período, empurrados para a leitura de cada
+    formato (ou aplicados aos DataFrames em memória), é igual ao cálculo completo filtrado.
+    """
+    details_list = []
+    for category, df in dataframes.items():
+        if extension is None:
+            details_list.append(ScoreDetails(dataframe=df, score_column="SCORE_TEMA", weight=WEIGHTS[category], category=category))
+        else:
+            file_path = tmp_path / f"BASE_SCORE_{category}{extension}"
+            save_data_auto(df, str(file_path))
+            details_list.append(
+                ScoreDetails(file_path=str(file_path), score_column="SCORE_TEMA", weight=WEIGHTS[category], category=category)
+            )
+
+    agencias = [5, 17, 42, 250, 9999]
+    query = ScorePilarPerformance.query(details_list).where_agencies(agencias).where_period(ano=2024, mes=10)
+    df_query = query.collect()
+
+    df_full = ScorePilarPerformance(
+        [
+            ScoreDetails(dataframe=df, score_column="SCORE_TEMA", weight=WEIGHTS[category], category=category)
+            for category, df in dataframes.items()
+        ]
+    ).score_pilar
+    expected = df_full[df_full["CD_PONTO"].isin(agencias) & (df_full["MES"] == 10)].reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(df_query, expected, check_dtype=False)
+    assert "VOLUME" not in str(query.plan().read_columns)
+
+
+def test_consulta_de_categorias_le_apenas_os_arquivos_necessarios(tmp_path, dataframes):
+    """
+    Testa a seleção de colunas e o filtro de categorias: sem o score agregado, apenas os arquivos
+    das categorias consultadas são lidos.
+    """
+    df_esg = dataframes["AA"].rename(columns={"SCORE_TEMA": "SCORE_PILAR"})
+    df_esg["FAROL_PILAR"] = classificar_farol(df_esg["SCORE_PILAR"])
+    esg_path = tmp_path / "BASE_SCORE_TEMA_ESG.parquet"
+    save_data_auto(df_esg, str(esg_path))
+
+    details_list = [
+        ScoreDetailsGlobal(
+            file_path=str(esg_path), score_column="SCORE_PILAR", farol_column="FAROL_PILAR", weight=0.2, category="ESG"
+        ),
+        ScoreDetailsGlobal(
+            file_path=str(tmp_path / "INEXISTENTE.parquet"),
+            score_column="SCORE_PILAR",
+            farol_column="FAROL_PILAR",
+            weight=0.8,
+            category="PERFORMANCE",
+        ),
+    ]
+
+    query = ScoreGlobalCalculator.query(details_list).where_categories(["ESG"]).select(["ESG_SCORE", "ESG_FAROL"])
+    assert query.plan().categories == ["ESG"]
+    assert "PERFORMANCE: não lida" in query.explain()
+
+    df_query = query.where_agencies(range(1, 11)).collect()
+    assert list(df_query.columns) == ["CD_PONTO", "DIA", "MES", "ANO", "ESG_SCORE", "ESG_FAROL"]
+    assert df_query["CD_PONTO"].between(1, 10).all()
+    expected = df_esg[df_esg["CD_PONTO"] <= 10].reset_index(drop=True)
+    assert df_query["ESG_SCORE"].tolist() == expected["SCORE_PILAR"].tolist()
+
+    # Com o score agregado, todas as categorias são lidas
+    assert ScoreGlobalCalculator.query(details_list).where_categories("ESG").plan().categories == ["ESG", "PERFORMANCE"]
+    with pytest.raises(ValueError):
+        ScoreGlobalCalculator.query(details_list).where_categories(["AA"])
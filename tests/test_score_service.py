@@ -0,0 +1,189 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_common.score_hierarchy import ScoreHierarchy
+from src.models.models_common.score_service import (
+    ScoreService,
+    ScoreSnapshot,
+    ScoringEngine,
+    ServiceConfig,
+    ServiceOverloaded,
+    parse_request,
+)
+from src.models.models_kpi.lookup import get_lookup_scorer
+from src.models.models_kpi.registry import get_registry
+
+
+@pytest.fixture
+def engine():
+    hierarchy = ScoreHierarchy.from_config(
+        {
+            "TEMA": {"AA": {"ARQUIVO": "AA.xlsx"}, "AB": {"ARQUIVO": "AB.xlsx"}, "ESG": {"ARQUIVO": "ESG.xlsx"}},
+            "PILAR": {
+                "PERFORMANCE": {"COMPONENTES": {"AA": 0.4, "AB": 0.6}},
+                "ESG": {"COMPONENTES": {"ESG": 1.0}},
+            },
+            "GLOBAL": {"GLOBAL": {"COMPONENTES": {"PERFORMANCE": 0.8, "ESG": 0.2}}},
+        }
+    )
+    temas = {
+        name: pd.DataFrame({"CD_PONTO": [1, 2], "MES": [9, 9], "SCORE_TEMA": scores})
+        for name, scores in {"AA": [8.0, 2.0], "AB": [6.0, 4.0], "ESG": [5.0, 9.0]}.items()
+    }
+    pilares = {"PERFORMANCE": pd.DataFrame({"CD_PONTO": [1, 2], "SCORE_PILAR": [6.8, 3.2]})}
+    snapshot = ScoreSnapshot.from_scores({"TEMA": temas, "PILAR": pilares})
+    return ScoringEngine(hierarchy=hierarchy, snapshot=snapshot)
+
+
+def test_calculo_dos_lotes(engine):
+    """
+    Testa o cálculo vetorizado de um lote com pedidos de KPI e de agência, incluindo os erros por pedido.
+    """
+    payloads = [
+        {"kpi": "TCX", "valor": 3},
+        {"cd_ponto": 1, "temas": {"ESG": 10.0}},
+        {"cd_ponto": 2, "kpis": {"TCX": 0, "GUIA": 100}},
+        {"kpis": {"ATM": 2.0}},
+        {"kpi": "XX", "valor": 1},
+        {"cd_ponto": 1, "temas": {"ZZ": 1.0}},
+        {"cd_ponto": 1, "kpis": {"TCX": 3, "GUIA": 99.8}},
+        {"cd_ponto": 1, "kpis": {"TCX": 3}},
+    ]
+    results = engine.score_batch([parse_request(payload) for payload in payloads])
+
+    assert results[0] == {
+        "kpi": "TCX",
+        "valor": 3.0,
+        "score": get_lookup_scorer("TCX").calcular_score(3),
+        "farol": "AMARELO",
+    }
+
+    # Apenas o pilar ESG é recalculado; o pilar PERFORMANCE mantém o último score
+    assert results[1]["scores"]["PILAR"] == {"PERFORMANCE": 6.8, "ESG": 10.0}
+    assert results[1]["scores"]["GLOBAL"]["GLOBAL"] == pytest.approx(0.8 * 6.8 + 0.2 * 10.0)
+    assert results[1]["farois"]["GLOBAL"]["GLOBAL"] == "AMARELO"
+
+    # O score do tema AB é a média ponderada dos scores dos seus KPIs
+    assert results[2]["scores"]["TEMA"]["AB"] == pytest.approx(10.0)
+    assert results[2]["scores"]["PILAR"]["PERFORMANCE"] == pytest.approx(0.4 * 2.0 + 0.6 * 10.0)
+
+    # Sem agência, os pesos são renormalizados pelos nós disponíveis
+    score_atm = get_lookup_scorer("ATM").calcular_score(2.0)
+    assert results[3]["scores"]["TEMA"] == {"AA": score_atm, "AB": None, "ESG": None}
+    assert results[3]["scores"]["GLOBAL"]["GLOBAL"] == pytest.approx(score_atm)
+
+    assert isinstance(results[4], ValueError) and isinstance(results[5], ValueError)
+
+    # O score do tema pondera os scores dos KPIs pelos pesos do settings (PESO)
+    weights = {kpi: get_registry().get_config(kpi).peso for kpi in ["TCX", "GUIA"]}
+    assert results[6]["scores"]["TEMA"]["AB"] == pytest.approx(
+        sum(weights[kpi] * get_lookup_scorer(kpi).calcular_score(valor) for kpi, valor in [("TCX", 3), ("GUIA", 99.8)])
+    )
+
+    # Com parte dos KPIs do tema, o pedido é recusado
+    assert isinstance(results[7], ValueError) and "GUIA" in str(results[7])
+    with pytest.raises(ValueError):
+        parse_request({"kpi": "TCX"})
+
+
+def test_servico_http_e_json_lines(engine):
+    """
+    Testa os protocolos HTTP e JSON lines, a reunião dos pedidos concorrentes em micro-lotes e as estatísticas.
+    """
+
+    async def run():
+        service = ScoreService(engine, ServiceConfig(port=0, batch_window_ms=20, max_batch_size=64))
+        await service.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            writer.write(b"".join(json.dumps({"kpi": "TCX", "valor": i % 6}).encode() + b"\n" for i in range(100)))
+            writer.write(b"not json\n")
+            await writer.drain()
+            lines = [json.loads(await reader.readline()) for _ in range(101)]
+            writer.close()
+
+            body = json.dumps([{"cd_ponto": 1}, {"kpi": "GUIA", "valor": 99.9}]).encode()
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            writer.write(b"POST /score HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+            writer.write(b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            responses = (await reader.read()).split(b"HTTP/1.1 ")[1:]
+            writer.close()
+            return service, lines, responses
+        finally:
+            await service.close()
+
+    service, lines, responses = asyncio.run(run())
+
+    assert [line["valor"] for line in lines[:100]] == [float(i % 6) for i in range(100)]
+    assert lines[5]["score"] == get_lookup_scorer("TCX").calcular_score(5)
+    assert "error" in lines[100]
+
+    assert responses[0].startswith(b"200 OK")
+    answers = json.loads(responses[0].split(b"\r\n\r\n", 1)[1])
+    assert answers[0]["scores"]["GLOBAL"]["GLOBAL"] == pytest.approx(0.8 * 6.8 + 0.2 * 5.0)
+
+    stats = json.loads(responses[1].split(b"\r\n\r\n", 1)[1])
+    assert stats["requests"] == 102
+    assert stats["batches"] < 10
+    assert stats["mean_batch_size"] > 10
+    assert set(stats["latency_ms"]) == {"p50", "p95", "p99", "max"}
+
+
+@pytest.mark.parametrize(
+    "request_bytes",
+    [
+        b"GET \r\n\r\n",
+        b"GET /stats HTTP/1.1\r\nsem separador\r\n\r\n",
+        b"POST /score HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+        b"POST /score HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+    ],
+)
+def test_servico_http_pedido_invalido(engine, request_bytes):
+    """
+    Testa a resposta 400 (e o encerramento da conexão) para linhas de pedido e cabeçalhos ilegíveis.
+    """
+
+    async def run():
+        service = ScoreService(engine, ServiceConfig(port=0))
+        await service.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            writer.write(request_bytes)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return response
+        finally:
+            await service.close()
+
+    response = asyncio.run(run())
+
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+    assert b"Connection: close" in response
+
+
+def test_backpressure(engine):
+    """
+    Testa a recusa dos pedidos quando a fila permanece cheia.
+    """
+
+    async def run():
+        service = ScoreService(engine, ServiceConfig(max_pending=2, queue_timeout_ms=10))
+        # Sem o worker, a fila não é consumida
+        service._queue = asyncio.Queue(maxsize=service.config.max_pending)
+        tasks = [asyncio.create_task(service.submit({"kpi": "TCX", "valor": 1})) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceOverloaded):
+            await service.submit({"kpi": "TCX", "valor": 1})
+        for task in tasks:
+            task.cancel()
+        return service.get_stats()
+
+    stats = asyncio.run(run())
+    assert stats.rejected == 1
+    assert stats.pending == 2
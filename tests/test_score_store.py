@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_common.score_aggregation import _shares_key_columns, align_scores
+from src.models.models_common.score_store import MmapScoreStore
+from src.models.models_global.score_global.global_calculator import ScoreGlobalCalculator
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+
+
+@pytest.fixture
+def dataframes():
+    rng = np.random.default_rng(23)
+    agencias = np.arange(1, 301)
+    dataframes = {}
+    for category in ["AA", "AB", "INFRA_CIVIL"]:
+        df = pd.DataFrame(
+            {
+                "CD_PONTO": agencias,
+                "DIA": 1,
+                "MES": 9,
+                "ANO": 2024,
+                "SCORE_TEMA": np.round(rng.uniform(0, 10, size=len(agencias)), 2),
+            }
+        )
+        dataframes[category] = df
+    return dataframes
+
+
+def test_gravacao_leitura_e_atualizacao_no_lugar(tmp_path, dataframes):
+    """
+    Testa a gravação e a leitura das colunas, a atualização parcial e a ampliação do índice
+    com agências novas, preservando os scores já gravados.
+    """
+    store = MmapScoreStore(tmp_path)
+    store.write_scores(dataframes["AA"], category="AA")
+
+    assert store.periodo == {"DIA": 1, "MES": 9, "ANO": 2024}
+    assert store.columns() == [("SCORE_TEMA", "AA")]
+    np.testing.assert_array_equal(store.read_scores("AA"), dataframes["AA"]["SCORE_TEMA"])
+
+    # Atualização de parte das agências, sem apagar as demais
+    update = dataframes["AA"].iloc[:10].assign(SCORE_TEMA=-1.0)
+    store.write_scores(update, category="AA", replace=False)
+    scores = MmapScoreStore(tmp_path).read_scores("AA")
+    assert (scores[:10] == -1).all()
+    np.testing.assert_array_equal(scores[10:], dataframes["AA"]["SCORE_TEMA"].iloc[10:])
+
+    # Agências novas (fora de ordem) ampliam o índice de todas as colunas
+    novas = dataframes["AB"].assign(CD_PONTO=dataframes["AB"]["CD_PONTO"] + 1000).iloc[::-1]
+    store.write_scores(novas, category="AB")
+    assert len(store) == 600
+    assert store.agencies[299:302].tolist() == [300, 1001, 1002]
+    assert np.isnan(store.read_scores("AA")[300:]).all()
+    assert np.isnan(store.read_scores("AB")[:300]).all()
+    np.testing.assert_array_equal(store.read_scores("AA")[:10], -1)
+    np.testing.assert_array_equal(store.read_scores("AB")[300:], novas["SCORE_TEMA"].iloc[::-1])
+
+    with pytest.raises(ValueError):
+        store.write_scores(dataframes["AB"].assign(MES=10), category="AB")
+    with pytest.raises(ValueError):
+        store.write_scores(pd.concat([dataframes["AB"], dataframes["AB"]]), category="AB")
+    with pytest.raises(FileNotFoundError):
+        store.read_scores("ESG")
+
+
+def test_calculo_a_partir_do_repositorio_igual_ao_calculo_em_pandas(tmp_path, dataframes):
+    """
+    Testa se os scores pilar e global calculados a partir do repositório mapeado, sem join das
+    categorias, são iguais aos calculados a partir dos DataFrames.
+    """
+    weights = {"AA": 0.2, "AB": 0.5, "INFRA_CIVIL": 0.3}
+    store = MmapScoreStore(tmp_path)
+    for category, df in dataframes.items():
+        store.write_scores(df, category=category)
+
+    details_list = store.get_details(weights)
+
+    # As categorias compartilham as colunas chave e são alinhadas sem join
+    assert _shares_key_columns([detail.dataframe for detail in details_list], ["CD_PONTO", "MES"])
+    _, positions, score_matrix = align_scores(details_list)
+    np.testing.assert_array_equal(positions[0], np.arange(len(store)))
+    np.testing.assert_array_equal(score_matrix[:, 1], dataframes["AB"]["SCORE_TEMA"])
+
+    df_pilar = ScorePilarPerformance(
+        [
+            ScoreDetails(dataframe=dataframes[category], score_column="SCORE_TEMA", weight=weight, category=category)
+            for category, weight in weights.items()
+        ]
+    ).score_pilar
+    pd.testing.assert_frame_equal(ScorePilarPerformance(details_list).score_pilar, df_pilar)
+
+    # Recálculo do score global com os scores pilar gravados no repositório
+    store.write_scores(df_pilar, category="PERFORMANCE", score_column="SCORE_PILAR")
+    store.write_scores(
+        df_pilar.assign(SCORE_PILAR=10 - df_pilar["SCORE_PILAR"]), category="ESG", score_column="SCORE_PILAR"
+    )
+
+    df_global = ScoreGlobalCalculator(store.get_details({"PERFORMANCE": 0.8, "ESG": 0.2}, "SCORE_PILAR")).score_global
+    assert df_global["SCORE_GLOBAL"].to_numpy() == pytest.approx(
+        0.8 * df_pilar["SCORE_PILAR"].to_numpy() + 0.2 * (10 - df_pilar["SCORE_PILAR"].to_numpy())
+    )
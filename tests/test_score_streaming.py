@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+
+
+def build_inputs(tmp_path, extension, periods=1, n=1000):
+    """
+    Cria arquivos de score de três categorias, ordenados por CD_PONTO e com agências ausentes.
+
+    Parameters:
+    tmp_path (Path): Diretório temporário dos arquivos.
+    extension (str): Extensão dos arquivos ('.csv' ou '.parquet').
+    periods (int): Quantidade de meses de cada agência. Default: 1.
+    n (int): Quantidade de agências de cada categoria. Default: 1000.
+
+    Returns:
+    list: Lista de objetos ScoreDetails com o caminho de cada arquivo.
+    """
+    rng = np.random.default_rng(42)
+    details_list = []
+
+    for category, weight in [("AA", 0.2), ("AB", 0.5), ("INFRA_CIVIL", 0.3)]:
+        cd_ponto = np.sort(rng.choice(np.arange(1, n * 3 // 2), size=n, replace=False))
+        df = pd.DataFrame(
+            {
+                "CD_PONTO": np.repeat(cd_ponto, periods),
+                "DIA": 1,
+                "MES": np.tile(np.arange(9, 9 - periods, -1), len(cd_ponto)),
+                "ANO": 2024,
+            }
+        )
+        # Cada categoria possui períodos ausentes para algumas agências
+        if periods > 1:
+            df = df[rng.uniform(size=len(df)) > 0.2].reset_index(drop=True)
+        df["SCORE_TEMA"] = np.round(rng.uniform(0, 10, size=len(df)), 2)
+
+        file_path = tmp_path / f"BASE_SCORE_{category}{extension}"
+        if extension == ".csv":
+            df.to_csv(file_path, index=False)
+        else:
+            df.to_parquet(file_path, index=False)
+
+        details_list.append(
+            ScoreDetails(
+                file_path=str(file_path),
+                score_column="SCORE_TEMA",
+                weight=weight,
+                category=category,
+            )
+        )
+
+    return details_list
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet"])
+@pytest.mark.parametrize("chunk_size", [7, 97, 10000])
+def test_streaming_igual_ao_calculo_em_memoria(tmp_path, extension, chunk_size):
+    """
+    Testa se o cálculo em blocos produz exatamente o mesmo resultado do cálculo em memória.
+    """
+    details_list = build_inputs(tmp_path, extension)
+    output_path = tmp_path / f"BASE_SCORE_PILAR_PERFORMANCE{extension}"
+
+    rows = ScorePilarPerformance.calculate_streaming(
+        details_list, output_path=output_path, chunk_size=chunk_size
+    )
+
+    details_memoria = [
+        detail.model_copy(
+            update={"dataframe": pd.read_parquet(detail.file_path)
+                    if extension == ".parquet" else pd.read_csv(detail.file_path)}
+        )
+        for detail in details_list
+    ]
+    df_memoria = ScorePilarPerformance(details_memoria).score_pilar
+
+    if extension == ".csv":
+        df_streaming = pd.read_csv(output_path)
+        df_memoria = pd.read_csv(
+            pd.io.common.StringIO(df_memoria.to_csv(index=False))
+        )
+    else:
+        df_streaming = pd.read_parquet(output_path)
+
+    assert rows == len(df_memoria)
+    pd.testing.assert_frame_equal(df_streaming, df_memoria, check_categorical=False)
+
+
+@pytest.mark.parametrize("chunk_size", [2, 5, 97])
+def test_streaming_varios_periodos(tmp_path, chunk_size):
+    """
+    Testa se os períodos de uma agência divididos entre blocos são agregados como no cálculo em memória.
+    """
+    details_list = build_inputs(tmp_path, ".parquet", periods=3, n=200)
+    output_path = tmp_path / "BASE_SCORE_PILAR_PERFORMANCE.parquet"
+
+    rows = ScorePilarPerformance.calculate_streaming(
+        details_list, output_path=output_path, chunk_size=chunk_size
+    )
+
+    details_memoria = [
+        detail.model_copy(update={"dataframe": pd.read_parquet(detail.file_path)})
+        for detail in details_list
+    ]
+    df_memoria = ScorePilarPerformance(details_memoria).score_pilar
+    df_streaming = pd.read_parquet(output_path)
+
+    assert rows == len(df_memoria)
+    assert df_memoria["MES"].nunique() == 3
+    pd.testing.assert_frame_equal(df_streaming, df_memoria, check_categorical=False)
+
+
+def test_streaming_saida_excel(tmp_path):
+    """
+    Testa se o cálculo em blocos grava a saída em Excel com o mesmo resultado do cálculo em memória.
+    """
+    details_list = build_inputs(tmp_path, ".parquet")
+    output_path = tmp_path / "BASE_SCORE_PILAR_PERFORMANCE.xlsx"
+
+    rows = ScorePilarPerformance.calculate_streaming(
+        details_list, output_path=output_path, chunk_size=7
+    )
+
+    details_memoria = [
+        detail.model_copy(update={"dataframe": pd.read_parquet(detail.file_path)})
+        for detail in details_list
+    ]
+    df_memoria = ScorePilarPerformance(details_memoria).score_pilar
+
+    assert rows == len(df_memoria)
+    pd.testing.assert_frame_equal(
+        pd.read_excel(output_path), df_memoria, check_dtype=False, check_categorical=False
+    )
+
+
+def test_streaming_entrada_nao_ordenada(tmp_path):
+    """
+    Testa se uma entrada fora de ordem por CD_PONTO gera erro.
+    """
+    file_path = tmp_path / "BASE_SCORE_AA.csv"
+    pd.DataFrame(
+        {"CD_PONTO": [3, 1, 2], "DIA": 1, "MES": 9, "ANO": 2024, "SCORE_TEMA": [1.0, 2.0, 3.0]}
+    ).to_csv(file_path, index=False)
+
+    details_list = [
+        ScoreDetails(
+            file_path=str(file_path), score_column="SCORE_TEMA", weight=1.0, category="AA"
+        )
+    ]
+
+    with pytest.raises(ValueError):
+        ScorePilarPerformance.calculate_streaming(
+            details_list, output_path=tmp_path / "saida.csv", chunk_size=2
+        )
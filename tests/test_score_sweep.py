@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.models_common.score_sweep import build_weight_grid, sample_weights
+from src.models.models_pilar.score_pilar_performance.models import ScoreDetails
+from src.models.models_pilar.score_pilar_performance.performance_calculator import (
+    ScorePilarPerformance,
+)
+
+
+@pytest.fixture
+def details_list():
+    rng = np.random.default_rng(11)
+    return [
+        ScoreDetails(
+            dataframe=pd.DataFrame(
+                {
+                    "CD_PONTO": np.arange(1, 301),
+                    "DIA": 1,
+                    "MES": 9,
+                    "ANO": 2024,
+                    "SCORE_TEMA": np.round(rng.uniform(0, 10, size=300), 1),
+                }
+            ).sample(frac=0.7, random_state=seed).sort_values("CD_PONTO", ignore_index=True),
+            score_column="SCORE_TEMA",
+            weight=weight,
+            category=category,
+        )
+        for seed, (category, weight) in enumerate([("AA", 0.2), ("AB", 0.5), ("INFRA_CIVIL", 0.3)])
+    ]
+
+
+def test_build_weight_grid():
+    """
+    Testa se a grade contém todos os vetores de pesos múltiplos do passo que somam 1.0.
+    """
+    grid = build_weight_grid(3, step=0.5)
+
+    assert grid.tolist() == [
+        [0.0, 0.0, 1.0],
+        [0.0, 0.5, 0.5],
+        [0.0, 1.0, 0.0],
+        [0.5, 0.0, 0.5],
+        [0.5, 0.5, 0.0],
+        [1.0, 0.0, 0.0],
+    ]
+    assert len(build_weight_grid(3, step=0.01)) == 5151
+
+    with pytest.raises(ValueError):
+        build_weight_grid(2, step=0.3)
+
+
+def test_sweep_igual_ao_calculo_completo(details_list):
+    """
+    Testa se a distribuição dos faróis e as mudanças de farol de cada cenário são iguais às do
+    cálculo completo com os mesmos pesos.
+    """
+    weight_matrix = np.vstack([build_weight_grid(3, step=0.1), sample_weights(3, 20, seed=5)])
+
+    df_sweep = ScorePilarPerformance.calculate_sweep(details_list, weight_matrix)
+
+    assert len(df_sweep) == len(weight_matrix)
+    farol_atual = ScorePilarPerformance(details_list).score_pilar["FAROL_PILAR"].astype(object)
+
+    for scenario, weights in zip(df_sweep.itertuples(index=False), weight_matrix):
+        df_pilar = ScorePilarPerformance(
+            [
+                detail.model_copy(update={"weight": float(weight)})
+                for detail, weight in zip(details_list, weights)
+            ]
+        ).score_pilar
+        farol = df_pilar["FAROL_PILAR"]
+
+        assert (scenario.PESO_AA, scenario.PESO_AB) == (weights[0], weights[1])
+        assert scenario.SCORE_PILAR_MEDIO == pytest.approx(df_pilar["SCORE_PILAR"].mean())
+        assert [scenario.QTD_VERMELHO, scenario.QTD_AMARELO, scenario.QTD_VERDE] == [
+            (farol == categoria).sum() for categoria in ["VERMELHO", "AMARELO", "VERDE"]
+        ]
+        assert scenario.QTD_MUDANCA_FAROL == (
+            farol.astype(object).fillna("-") != farol_atual.fillna("-")
+        ).sum()
+
+
+def test_sweep_valida_pesos(details_list):
+    """
+    Testa se um cenário com pesos que não somam 1.0 é rejeitado pelo modelo Weights.
+    """
+    with pytest.raises(ValueError):
+        ScorePilarPerformance.calculate_sweep(details_list, [[0.2, 0.5, 0.3], [0.5, 0.5, 0.5]])
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.pandas_functions import save_data_auto
+from src.utils.sqlite_functions import SQLiteScoreStore
+
+
+def build_score_pilar(scores, mes=9):
+    """
+    Cria um resultado de score pilar com os temas AA e AB para os testes.
+
+    Parameters:
+    scores (list): Scores do pilar das agências 1..n.
+    mes (int): Mês do período.
+
+    Returns:
+    DataFrame: DataFrame no formato das calculadoras.
+    """
+    n = len(scores)
+    return pd.DataFrame(
+        {
+            "CD_PONTO": np.arange(1, n + 1),
+            "DIA": 1,
+            "MES": mes,
+            "ANO": 2024,
+            "AA_SCORE": [2.0] * n,
+            "AA_PESO": [0.5] * n,
+            "AA_FAROL": ["VERMELHO"] * n,
+            "AB_SCORE": [np.nan] * n,
+            "AB_PESO": [np.nan] * n,
+            "AB_FAROL": [np.nan] * n,
+            "SCORE_PILAR": scores,
+            "FAROL_PILAR": pd.Categorical(["AMARELO"] * n),
+        }
+    )
+
+
+def test_save_result_grava_score_e_componentes(tmp_path):
+    """
+    Testa a gravação do score pilar e dos temas que o compõem, ignorando os temas ausentes.
+    """
+    with SQLiteScoreStore(tmp_path / "DB_SCORE.db") as store:
+        rows = store.save_result(
+            build_score_pilar([5.0, 6.0]), level="PILAR", category="PERFORMANCE"
+        )
+
+        assert rows == 4
+        df_pilar = store.get_agency_history(2, level="PILAR")
+        assert df_pilar[["CATEGORIA", "SCORE", "FAROL"]].values.tolist() == [
+            ["PERFORMANCE", 6.0, "AMARELO"]
+        ]
+        df_tema = store.get_period(2024, 9, 1, level="TEMA")
+        assert df_tema["CATEGORIA"].tolist() == ["AA", "AA"]
+        assert df_tema["PESO"].tolist() == [0.5, 0.5]
+
+
+def test_upsert_atualiza_e_mantem_historico(tmp_path):
+    """
+    Testa se a regravação de um período atualiza as linhas e mantém os demais períodos.
+    """
+    with SQLiteScoreStore(tmp_path / "DB_SCORE.db") as store:
+        for mes, scores in [(8, [5.0, 6.0]), (9, [5.0, 6.0]), (9, [7.0, 8.0])]:
+            store.save_result(
+                build_score_pilar(scores, mes=mes), level="PILAR", category="PERFORMANCE"
+            )
+
+        df = store.get_agency_history(1, level="PILAR", category="PERFORMANCE")
+        assert df["MES"].tolist() == [8, 9]
+        assert df["SCORE"].tolist() == [5.0, 7.0]
+
+
+def test_consultas_utilizam_indices(tmp_path):
+    """
+    Testa se as consultas por agência e por período utilizam a chave primária e o índice do período.
+    """
+    with SQLiteScoreStore(tmp_path / "DB_SCORE.db") as store:
+        plans = [
+            " ".join(str(row[-1]) for row in store.connection.execute(f"EXPLAIN QUERY PLAN {sql}"))
+            for sql in [
+                "SELECT * FROM TBL_SCORE_GLOBAL WHERE CD_PONTO = 1",
+                "SELECT * FROM TBL_SCORE_GLOBAL WHERE ANO = 2024 AND MES = 9 AND DIA = 1",
+            ]
+        ]
+
+    assert "PRIMARY KEY" in plans[0]
+    assert "IDX_TBL_SCORE_GLOBAL_PERIODO" in plans[1]
+
+
+def test_save_data_auto_banco_sqlite(tmp_path):
+    """
+    Testa a gravação de um resultado de score global pelo save_data_auto.
+    """
+    df = pd.DataFrame(
+        {
+            "CD_PONTO": [1],
+            "DIA": 1,
+            "MES": 9,
+            "ANO": 2024,
+            "SCORE_GLOBAL": [6.0],
+            "FAROL_GLOBAL": ["AMARELO"],
+        }
+    )
+    db_path = tmp_path / "DB_SCORE.db"
+
+    save_data_auto(dataframe=df, file_path=str(db_path))
+
+    with SQLiteScoreStore(db_path) as store:
+        assert store.get_agency_history(1, level="GLOBAL")["SCORE"].tolist() == [6.0]
+
+
+def test_save_result_tema_exige_categoria(tmp_path):
+    """
+    Testa se um score de tema exige a categoria e se temas distintos não se sobrescrevem.
+    """
+    df = pd.DataFrame({"CD_PONTO": [1], "DIA": 1, "MES": 9, "ANO": 2024, "SCORE_TEMA": [6.0]})
+
+    with SQLiteScoreStore(tmp_path / "DB_SCORE.db") as store:
+        with pytest.raises(ValueError, match="categoria"):
+            store.save_result(df, level="TEMA")
+
+        store.save_result(df, level="TEMA", category="AA")
+        store.save_result(df.assign(SCORE_TEMA=7.0), level="TEMA", category="AB")
+
+        df_tema = store.get_agency_history(1, level="TEMA")
+        assert df_tema[["CATEGORIA", "SCORE"]].values.tolist() == [["AA", 6.0], ["AB", 7.0]]